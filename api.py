@@ -0,0 +1,479 @@
+# api.py
+"""Локальный HTTP API для тестовых данных (без Telegram).
+
+Сервер на asyncio (только стандартная библиотека): HTTP/1.1 с keep-alive,
+генерация выполняется в пуле исполнителей (dispatcher.py), поэтому тяжелый
+запрос не блокирует остальные соединения. Большие ответы отдаются потоком
+JSON Lines с chunked-кодированием: порции генерируются по мере отправки, и
+память сервера не зависит от count.
+
+Запуск:
+    python -m api --port 8080
+
+Запросы:
+    GET /v1/person?locale=ru&count=100      ФИО, адрес, телефон
+    GET /v1/cards?count=1000000             номера карт (JSON Lines потоком)
+    GET /v1/emails?count=10&unique=1        временные email
+    GET /v1/boundary?category=sql&lang=en   граничные строки
+    GET /v1/health
+
+Без count возвращается один JSON-объект, с count — JSON Lines (по записи
+на строку). seed и offset делают ответ воспроизводимым: записи берутся из
+streams.RecordStream с номерами [offset, offset + count).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from boundary import DEFAULT_LANGUAGE, MESSAGE_TEXTS, boundary_categories, boundary_strings
+from dispatcher import DispatcherBusy, GenerationDispatcher
+from export import RECORD_FIELDS
+from generators import (
+    CARD_NUMBER_SPACE,
+    EMAIL_USERNAME_SPACE,
+    generate_credit_cards,
+    generate_name_address,
+    generate_temp_emails
+)
+from locales import locale_registry
+from streams import RecordStream
+
+logger = logging.getLogger(__name__)
+
+# Ограничение на размер строки запроса и заголовков
+MAX_HEADER_BYTES = 16 * 1024
+
+# Ограничение на размер тела запроса (обновления Telegram — единицы КБ)
+MAX_BODY_BYTES = 1024 * 1024
+
+JSONL_CONTENT_TYPE = 'application/x-ndjson; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+# Один кодировщик на модуль: json.dumps с аргументами создает новый на каждый вызов
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+Request = namedtuple('Request', ['method', 'path', 'query', 'headers', 'version', 'body'], defaults=(b'',))
+
+
+class HTTPError(Exception):
+    """Ошибка запроса, которая возвращается клиенту как JSON {"error": ...}."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Response:
+    """Ответ: body (bytes) целиком или chunks — асинхронный поток порций bytes."""
+
+    def __init__(self, status=200, body=b'', content_type=JSON_CONTENT_TYPE, chunks=None, headers=None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.chunks = chunks
+        self.headers = headers or {}
+
+
+def json_response(data, status=200, headers=None):
+    body = _encode_json(data).encode('utf-8')
+    return Response(status, body, headers=headers)
+
+
+def error_response(error):
+    return json_response({'error': error.message}, error.status, error.headers)
+
+
+# Разбор запроса
+
+async def read_request(reader):
+    """Читает запрос из соединения; None, если клиент закрыл соединение."""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as exc:
+        if not exc.partial.strip():
+            return None
+        raise HTTPError(400, "Неполный запрос")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Слишком длинные заголовки")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, "Неверная строка запроса")
+    if not version.startswith('HTTP/1.'):
+        raise HTTPError(505, "Поддерживается только HTTP/1.x")
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(':')
+        if not sep:
+            raise HTTPError(400, "Неверный заголовок")
+        headers[name.strip().lower()] = value.strip()
+
+    # Тело должно быть прочитано до следующего запроса, даже если не нужно обработчику
+    length = headers.get('content-length', '0')
+    if not length.isdigit():
+        raise HTTPError(400, "Неверный Content-Length")
+    if int(length) > MAX_BODY_BYTES:
+        raise HTTPError(413, "Слишком большое тело запроса")
+    body = await reader.readexactly(int(length)) if int(length) else b''
+
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return Request(method.upper(), url.path, query, headers, version, body)
+
+
+def keep_alive(request):
+    """Держать ли соединение после ответа (правила HTTP/1.0 и HTTP/1.1)."""
+    connection = request.headers.get('connection', '').lower()
+    if request.version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def query_int(request, name, default=None, low=None, high=None):
+    value = request.query.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise HTTPError(400, f"Параметр {name} должен быть целым числом")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise HTTPError(400, f"Параметр {name} должен быть от {low} до {high}")
+    return value
+
+
+def query_flag(request, name):
+    return request.query.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+# Генерация
+
+@lru_cache(maxsize=32)
+def _cached_stream(kind, seed, unique):
+    # Поток ФИО держит собственный Faker: переиспользуем его между запросами,
+    # а блокировка не дает двум потокам исполнителя переустанавливать его seed одновременно
+    return RecordStream(kind, seed, unique), threading.Lock()
+
+
+def _random_records(kind, count):
+    if kind == 'card':
+        return generate_credit_cards(count).to_dicts()
+    if kind == 'email':
+        return [{'email': email} for email in generate_temp_emails(count)]
+    return [generate_name_address(kind) for _ in range(count)]
+
+
+def render_chunk(kind, start, count, seed=None, unique=False):
+    """Порция JSON Lines из count записей (выполняется в пуле исполнителей).
+
+    Если задан seed, записи берутся из потока с номерами [start, start + count).
+    """
+    if seed is None:
+        records = _random_records(kind, count)
+    else:
+        stream, lock = _cached_stream(kind, seed, unique)
+        with lock:
+            records = stream.take(start, start + count)
+    fields = RECORD_FIELDS[kind]
+    encode = _encode_json
+    lines = [encode({field: record[field] for field in fields}) for record in records]
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+
+# Размер пространства уникальных значений по виду данных
+UNIQUE_SPACES = {'card': CARD_NUMBER_SPACE, 'email': EMAIL_USERNAME_SPACE}
+
+# Что генерировать: вид, количество (None — одна запись объектом), начальный номер и поток
+GenerationPlan = namedtuple('GenerationPlan', ['kind', 'count', 'offset', 'seed', 'unique'])
+
+
+def plan_from_query(request, kind):
+    count = query_int(request, 'count', None, 1, config.API_MAX_COUNT)
+    offset = query_int(request, 'offset', 0, 0, 2 ** 62)
+    seed = query_int(request, 'seed')
+    unique = query_flag(request, 'unique')
+    if unique and kind not in ('card', 'email'):
+        raise HTTPError(400, "unique поддерживается только для cards и emails")
+    if unique and seed is None:
+        # Уникальность обеспечивается перестановкой с ключом seed
+        seed = random.getrandbits(63)
+    if offset and seed is None:
+        raise HTTPError(400, "offset имеет смысл только вместе с seed")
+    if unique:
+        # Проверяем до начала потока: иначе порция за концом пространства
+        # упала бы после отправки заголовков и оборвала ответ
+        space = UNIQUE_SPACES[kind]
+        if offset + (count or 1) > space:
+            raise HTTPError(400, f"Уникальных значений всего {space}: offset + count не должно превышать его")
+    return GenerationPlan(kind, count, offset, seed, unique)
+
+
+class HttpServer:
+    """Основа HTTP-серверов проекта: маршрутизация, keep-alive и потоковые ответы.
+
+    Наследники заполняют routes — {путь: async обработчик(request) -> Response}
+    — и при необходимости METHODS (допустимые методы запроса).
+    """
+
+    METHODS = ('GET', 'HEAD')
+    title = "HTTP"
+
+    def __init__(self, host, port, keepalive_timeout=None):
+        self.host = host
+        self.port = port
+        self.keepalive_timeout = keepalive_timeout or config.API_KEEPALIVE_TIMEOUT
+        self.requests = 0
+        self._server = None
+        # Задачи открытых соединений: закрываются вместе с сервером
+        self._handlers = set()
+        self.routes = {}
+
+    async def dispatch(self, request):
+        handler = self.routes.get(request.path)
+        if handler is None:
+            raise HTTPError(404, f"Нет такого ресурса: {request.path}")
+        if request.method not in self.METHODS:
+            allowed = ', '.join(self.METHODS)
+            raise HTTPError(405, f"Поддерживаются только {allowed}", {'Allow': allowed})
+        return await handler(request)
+
+    @property
+    def connections(self):
+        return len(self._handlers)
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.keepalive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as error:
+                    await self.send(writer, error_response(error), head_only=False, alive=False)
+                    break
+                if request is None:
+                    break
+
+                self.requests += 1
+                try:
+                    response = await self.dispatch(request)
+                except HTTPError as error:
+                    response = error_response(error)
+                except Exception:
+                    logger.exception("Ошибка обработки %s", request.path)
+                    response = error_response(HTTPError(500, "Внутренняя ошибка"))
+
+                alive = keep_alive(request)
+                await self.send(writer, response, request.method == 'HEAD', alive)
+                if not alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def send(self, writer, response, head_only, alive):
+        headers = {
+            'Content-Type': response.content_type,
+            'Connection': 'keep-alive' if alive else 'close',
+            **response.headers,
+        }
+        if response.chunks is None:
+            headers['Content-Length'] = str(len(response.body))
+        else:
+            headers['Transfer-Encoding'] = 'chunked'
+        status = HTTPStatus(response.status)
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write((head + "\r\n").encode('latin-1'))
+
+        if head_only:
+            if response.chunks is not None:
+                await response.chunks.aclose()
+        elif response.chunks is None:
+            writer.write(response.body)
+        else:
+            try:
+                async for chunk in response.chunks:
+                    writer.write(b'%x\r\n%b\r\n' % (len(chunk), chunk))
+                    # Ждем, пока клиент заберет данные: медленный клиент
+                    # не должен заставлять сервер копить порции в памяти
+                    await writer.drain()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as exc:
+                # Заголовки уже отправлены, честный код ответа невозможен.
+                # Соединение закрывается без завершающей порции 0\r\n\r\n,
+                # чтобы клиент увидел, что поток оборван
+                logger.exception("Поток ответа оборван: ошибка при генерации порции")
+                raise ConnectionAbortedError("Поток ответа оборван") from exc
+            finally:
+                await response.chunks.aclose()
+            writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        # При port=0 порт выбирает система
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Простаивающие keep-alive соединения сами не завершатся
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def serve_forever(self):
+        await self.start()
+        logger.info("%s слушает http://%s:%d", self.title, self.host, self.port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+
+class ApiServer(HttpServer):
+    """HTTP-сервер API тестовых данных."""
+
+    title = "API"
+
+    def __init__(self, host=None, port=None, dispatcher=None, chunk_size=None, keepalive_timeout=None):
+        super().__init__(host or config.API_HOST, config.API_PORT if port is None else port, keepalive_timeout)
+        self.dispatcher = dispatcher or GenerationDispatcher(
+            executor='thread',
+            max_workers=config.GENERATION_WORKERS,
+            max_concurrency=config.GENERATION_MAX_CONCURRENCY,
+            max_pending=config.GENERATION_MAX_PENDING
+        )
+        self.chunk_size = chunk_size or config.API_CHUNK_SIZE
+        self.routes = {
+            '/v1/person': self.person,
+            '/v1/cards': self.cards,
+            '/v1/emails': self.emails,
+            '/v1/boundary': self.boundary,
+            '/v1/health': self.health,
+        }
+
+    async def dispatch(self, request):
+        try:
+            return await super().dispatch(request)
+        except DispatcherBusy:
+            raise HTTPError(503, "Сервис перегружен, повторите позже", {'Retry-After': '1'})
+
+    async def close(self):
+        await super().close()
+        self.dispatcher.shutdown(wait=False)
+
+    # Обработчики маршрутов
+
+    async def person(self, request):
+        locale = request.query.get('locale', 'ru').lower()
+        if locale not in locale_registry:
+            raise HTTPError(400, f"Неизвестная локаль: {locale}. Доступны: {', '.join(locale_registry.codes())}")
+        return await self.records_response(plan_from_query(request, locale))
+
+    async def cards(self, request):
+        return await self.records_response(plan_from_query(request, 'card'))
+
+    async def emails(self, request):
+        return await self.records_response(plan_from_query(request, 'email'))
+
+    async def boundary(self, request):
+        category = request.query.get('category')
+        if category is not None and category not in boundary_categories():
+            raise HTTPError(404, f"Неизвестная категория: {category}")
+        language = request.query.get('lang', DEFAULT_LANGUAGE)
+        if language not in MESSAGE_TEXTS:
+            raise HTTPError(400, f"Неизвестный язык: {language}")
+        items = []
+        for item in boundary_strings(category):
+            title, description = item.translations.get(language, (item.title, item.description))
+            items.append({'category': item.category, 'title': title,
+                          'value': item.value, 'description': description})
+        return json_response(items)
+
+    async def health(self, request):
+        return json_response({'status': 'ok', 'requests': self.requests, 'connections': self.connections})
+
+    async def records_response(self, plan):
+        if plan.count is None:
+            # Одна запись — обычный JSON-объект
+            chunk = await self.generate(plan, plan.offset, 1)
+            return Response(body=chunk.rstrip(b'\n'))
+        if plan.count <= self.chunk_size:
+            return Response(body=await self.generate(plan, plan.offset, plan.count),
+                            content_type=JSONL_CONTENT_TYPE)
+        # Первая порция генерируется до отправки заголовков, чтобы перегрузка
+        # превратилась в честный 503, а не в оборванный поток
+        first = await self.generate(plan, plan.offset, self.chunk_size)
+        return Response(content_type=JSONL_CONTENT_TYPE, chunks=self.stream_chunks(plan, first))
+
+    async def generate(self, plan, start, count):
+        return await self.dispatcher.run(render_chunk, plan.kind, start, count, plan.seed, plan.unique)
+
+    async def stream_chunks(self, plan, first):
+        """Порции ответа; следующая порция генерируется, пока отправляется текущая."""
+        yield first
+        end = plan.offset + plan.count
+
+        def schedule(start):
+            return asyncio.ensure_future(self.generate(plan, start, min(self.chunk_size, end - start)))
+
+        upcoming = None
+        try:
+            for start in range(plan.offset + self.chunk_size, end, self.chunk_size):
+                current = upcoming or schedule(start)
+                following = start + self.chunk_size
+                upcoming = schedule(following) if following < end else None
+                yield await current
+        finally:
+            # Клиент отключился или генерация упала: заранее начатая порция не нужна
+            if upcoming is not None:
+                upcoming.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный HTTP API тестовых данных")
+    parser.add_argument('--host', default=config.API_HOST, help="адрес для прослушивания")
+    parser.add_argument('--port', type=int, default=config.API_PORT, help="порт")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    for path in config.BOUNDARY_PACKS:
+        from boundary import load_boundary_pack
+        logger.info("Загружено граничных строк из %s: %d", path, load_boundary_pack(path))
+    locale_registry.resize(config.LOCALE_CACHE_SIZE)
+    try:
+        asyncio.run(ApiServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# bench/bench_api.py
+"""Нагрузочный тест HTTP API (api.py).
+
+Несколько клиентов параллельно шлют запросы, каждый по своему keep-alive
+соединению; в конце выводятся запросы в секунду и задержка (p50/p99).
+Без --url сервер запускается отдельным процессом на свободном порту.
+Запуск из корня проекта:
+    python -m bench.bench_api --concurrency 32 --requests 5000
+    python -m bench.bench_api --url http://127.0.0.1:8080 --path '/v1/cards?count=1000'
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = (
+    '/v1/person?locale=ru',
+    '/v1/cards?count=100',
+    '/v1/emails?count=100',
+    '/v1/boundary',
+)
+
+
+class HttpConnection:
+    """Минимальный HTTP/1.1-клиент с keep-alive (Content-Length и chunked)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, path, method='GET'):
+        """Отправляет запрос; возвращает (статус, заголовки, тело)."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await self._writer.drain()
+
+        reader = self._reader
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split(' ')[1])
+        headers = {}
+        for line in head[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD':
+            body = b''
+        elif headers.get('transfer-encoding') == 'chunked':
+            parts = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).strip(), 16)
+                data = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                parts.append(data[:-2])
+            body = b''.join(parts)
+        else:
+            body = await reader.readexactly(int(headers.get('content-length', '0')))
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, headers, body
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+async def run_load(host, port, paths, concurrency, requests):
+    """Гоняет requests запросов с concurrency соединений; возвращает сводку."""
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        connection = HttpConnection(host, port)
+        try:
+            for number in counter:
+                path = paths[number % len(paths)]
+                start = time.perf_counter()
+                status, _, _ = await connection.request(path)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed > 0 else float('inf'),
+        'latency_p50_ms': statistics.median(latencies) * 1000,
+        'latency_p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, timeout=10.0):
+    """Запускает python -m api в отдельном процессе и ждет, пока откроется порт."""
+    process = subprocess.Popen([sys.executable, '-m', 'api', '--port', str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Сервер API не запустился")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP API")
+    parser.add_argument('--url', help="адрес запущенного сервера (по умолчанию запускается свой)")
+    parser.add_argument('--path', action='append', help="путь запроса (можно несколько)")
+    parser.add_argument('--concurrency', type=int, default=16, help="одновременных клиентов")
+    parser.add_argument('--requests', type=int, default=2000, help="всего запросов")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = start_server(port)
+
+    try:
+        for path in args.path or DEFAULT_PATHS:
+            result = asyncio.run(run_load(host, port, [path], args.concurrency, args.requests))
+            print(f"{path:36} {result['requests_per_sec']:9,.0f} запр/с  "
+                  f"p50 {result['latency_p50_ms']:7.2f} мс  p99 {result['latency_p99_ms']:7.2f} мс  "
+                  f"ошибок {result['errors']}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
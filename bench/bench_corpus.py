@@ -0,0 +1,71 @@
+# bench/bench_corpus.py
+"""Время на запись ФИО и адреса: Faker против корпуса (corpus.py).
+
+Корпус собирается во временный файл (или берется готовый --corpus), затем
+для каждой локали сравниваются поштучная генерация (как в боте) и пакетная
+(как в выгрузке) через Faker и по корпусу.
+Запуск из корня проекта:
+    python -m bench.bench_corpus --count 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from corpus import DEFAULT_SAMPLES, build_corpus, open_corpus
+from generators import corpus_locale, generate_name_address, generate_name_addresses, set_corpus
+
+LOCALES = ('ru', 'en')
+
+
+def per_record(generate, count):
+    """Время одного вызова в микросекундах."""
+    start = time.perf_counter()
+    generate()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации по корпусу")
+    parser.add_argument('--count', type=int, default=20_000, help="записей каждой локали")
+    parser.add_argument('--corpus', help="готовый файл корпуса (иначе собирается временный)")
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help="размер выборки значений при сборке корпуса")
+    args = parser.parse_args()
+    count = args.count
+
+    path = args.corpus
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), 'corpus.bin')
+        start = time.perf_counter()
+        build_corpus(path, samples=args.samples)
+        print(f"корпус собран за {time.perf_counter() - start:.1f} с, "
+              f"{os.path.getsize(path) / 1024:.0f} КБ")
+    corpus = open_corpus(path)
+
+    for locale in LOCALES:
+        source = corpus_locale(locale, corpus)
+        rng = random.Random(1)
+        # Прогрев: Faker и NumPy инициализируются до измерений
+        generate_name_addresses(10, locale)
+        generate_name_addresses(10, locale, corpus)
+
+        faker_one = per_record(lambda: [generate_name_address(locale) for _ in range(count)], count)
+        faker_batch = per_record(lambda: generate_name_addresses(count, locale), count)
+        set_corpus(corpus)
+        try:
+            corpus_one = per_record(lambda: [generate_name_address(locale) for _ in range(count)], count)
+        finally:
+            set_corpus(None)
+        corpus_batch = per_record(lambda: generate_name_addresses(count, locale, corpus, seed=1), count)
+        names_only = per_record(lambda: [source.generate_one('name', rng) for _ in range(count)], count)
+
+        print(f"{locale:3} поштучно: Faker {faker_one:6.1f} мкс, корпус {corpus_one:5.1f} мкс "
+              f"(x{faker_one / corpus_one:.1f}, из них ФИО {names_only:.1f}); "
+              f"пакетно: Faker {faker_batch:6.1f} мкс, корпус {corpus_batch:5.1f} мкс "
+              f"(x{faker_batch / corpus_batch:.1f})")
+
+
+if __name__ == '__main__':
+    main()
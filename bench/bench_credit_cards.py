@@ -0,0 +1,62 @@
+# bench/bench_credit_cards.py
+"""Сравнение скалярной и пакетной генерации номеров карт и проверка Луна пакетом.
+
+Запуск из корня проекта:
+    python -m bench.bench_credit_cards --count 1000000
+"""
+import argparse
+import time
+
+from cards import validate_luhn
+from generators import generate_credit_card, generate_credit_cards
+
+
+def bench_scalar(count):
+    """Время генерации count карт циклом generate_credit_card()."""
+    start = time.perf_counter()
+    for _ in range(count):
+        generate_credit_card()
+    return time.perf_counter() - start
+
+
+def bench_batch(count):
+    """Время генерации count карт одним вызовом generate_credit_cards()."""
+    start = time.perf_counter()
+    generate_credit_cards(count, seed=0)
+    return time.perf_counter() - start
+
+
+def bench_validate(count):
+    """Время проверки count номеров validate_luhn (байтовые строки и str)."""
+    numbers = generate_credit_cards(count, seed=0).number
+    texts = numbers.astype(str).tolist()
+    start = time.perf_counter()
+    assert validate_luhn(numbers).all()
+    middle = time.perf_counter()
+    assert validate_luhn(texts).all()
+    return middle - start, time.perf_counter() - middle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации карт")
+    parser.add_argument('--count', type=int, default=1_000_000, help="количество карт в пакете")
+    parser.add_argument('--scalar-count', type=int, default=100_000,
+                        help="количество карт для скалярного цикла (он заметно медленнее)")
+    args = parser.parse_args()
+
+    scalar = bench_scalar(args.scalar_count)
+    batch = bench_batch(args.count)
+    scalar_us = scalar / args.scalar_count * 1e6
+    batch_us = batch / args.count * 1e6
+
+    print(f"Скалярный цикл: {args.scalar_count} карт за {scalar:.2f} с ({scalar_us:.3f} мкс/карта)")
+    print(f"Пакетный NumPy: {args.count} карт за {batch:.2f} с ({batch_us:.3f} мкс/карта)")
+    print(f"Ускорение: x{scalar_us / batch_us:.1f}")
+
+    as_bytes, as_text = bench_validate(args.count)
+    print(f"validate_luhn: {args.count} номеров за {as_bytes:.2f} с (массив NumPy), "
+          f"{as_text:.2f} с (список str)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# bench/bench_dataset.py
+"""Память на запись: список словарей против колоночного Dataset.
+
+Для каждого вида данных генерируется одна и та же порция записей (одинаковый
+seed) двумя способами — словарями, как раньше, и сразу в Dataset — и
+сравнивается удерживаемая память (tracemalloc). Заодно измеряется время
+выгрузки порции в CSV из обоих представлений.
+
+Выигрыш растет с размером порции: у Dataset есть постоянные расходы на
+буферы колонок. При 20 000 записей ФИО и адреса занимают примерно в 5 раз
+меньше (ru x5.0, en x5.1), при 5 000 — в 4–4.4 раза; карты и email — в 9–11
+раз при любом размере. Под tracemalloc Faker работает медленно: 20 000
+записей каждого вида — несколько минут.
+Запуск из корня проекта:
+    python -m bench.bench_dataset --count 20000
+"""
+import argparse
+import csv
+import io
+import random
+import time
+import tracemalloc
+
+from export import RECORD_FIELDS, chunk_rows
+from generators import (
+    build_name_address,
+    build_name_addresses,
+    generate_credit_cards,
+    generate_temp_email,
+    temp_email_dataset
+)
+from parallel import _get_worker_faker
+
+KINDS = ('ru', 'en', 'card', 'email')
+
+
+def as_dicts(kind, count):
+    if kind == 'card':
+        return generate_credit_cards(count, seed=1).to_dicts()
+    if kind == 'email':
+        rng = random.Random(1)
+        return [generate_temp_email(rng) for _ in range(count)]
+    faker = _get_worker_faker(kind)
+    faker.seed_instance(1)
+    return [build_name_address(faker, kind) for _ in range(count)]
+
+
+def as_dataset(kind, count):
+    if kind == 'card':
+        return generate_credit_cards(count, seed=1).to_dataset()
+    if kind == 'email':
+        rng = random.Random(1)
+        return temp_email_dataset([generate_temp_email(rng)['email'] for _ in range(count)])
+    faker = _get_worker_faker(kind)
+    faker.seed_instance(1)
+    return build_name_addresses(faker, kind, count)
+
+
+def retained_bytes(generate, kind, count):
+    """Память, которую удерживает результат генерации (без временных объектов)."""
+    tracemalloc.start()
+    result = generate(kind, count)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, used
+
+
+def csv_seconds(kind, records):
+    """Время записи порции в CSV (в память), как в CsvExportWriter."""
+    writer = csv.writer(io.StringIO())
+    start = time.perf_counter()
+    writer.writerows(chunk_rows(records, RECORD_FIELDS[kind]))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк памяти Dataset")
+    parser.add_argument('--count', type=int, default=20_000, help="записей каждого вида")
+    args = parser.parse_args()
+    count = args.count
+
+    for kind in KINDS:
+        # Прогрев: Faker и NumPy инициализируются до измерений
+        as_dicts(kind, 10)
+        as_dataset(kind, 10)
+        dicts, dict_bytes = retained_bytes(as_dicts, kind, count)
+        dataset, dataset_bytes = retained_bytes(as_dataset, kind, count)
+        print(f"{kind:6} словари {dict_bytes / count:7.1f} Б/запись, "
+              f"Dataset {dataset_bytes / count:6.1f} Б/запись "
+              f"(x{dict_bytes / dataset_bytes:.1f}); "
+              f"CSV {csv_seconds(kind, dicts) / count * 1e6:.2f} / "
+              f"{csv_seconds(kind, dataset) / count * 1e6:.2f} мкс/запись")
+
+
+if __name__ == '__main__':
+    main()
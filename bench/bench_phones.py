@@ -0,0 +1,50 @@
+# bench/bench_phones.py
+"""Стоимость генерации одного телефонного номера.
+
+Сравнивает поштучную генерацию через Faker.random_int (как в
+generate_name_address) с пакетной генерацией phones.generate_phones.
+Запуск из корня проекта:
+    python -m bench.bench_phones --count 1000000
+"""
+import argparse
+import time
+
+from faker import Faker
+
+from phones import PHONE_FORMATS, generate_phones
+
+FAKER_LOCALES = {'ru': 'ru_RU', 'en': 'en_US'}
+
+
+def bench_faker(locale, count):
+    """Время count номеров через Faker.random_int по одному."""
+    faker = Faker(FAKER_LOCALES[locale])
+    draw_one = PHONE_FORMATS[locale].draw_one
+    start = time.perf_counter()
+    for _ in range(count):
+        draw_one(faker.random_int)
+    return time.perf_counter() - start
+
+
+def bench_batch(locale, count):
+    """Время count номеров одним пакетом."""
+    start = time.perf_counter()
+    generate_phones(locale, count, rng=0)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации телефонов")
+    parser.add_argument('--count', type=int, default=1_000_000, help="номеров в пакете")
+    parser.add_argument('--faker-count', type=int, default=100_000, help="номеров через Faker")
+    args = parser.parse_args()
+
+    for locale in FAKER_LOCALES:
+        faker_us = bench_faker(locale, args.faker_count) / args.faker_count * 1e6
+        batch_us = bench_batch(locale, args.count) / args.count * 1e6
+        print(f"{locale}: Faker {faker_us:.3f} мкс/номер, пакет {batch_us:.3f} мкс/номер "
+              f"(x{faker_us / batch_us:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# bench/bench_unique.py
+"""Память и время проверки уникальности.
+
+Сравнивает множество строк Python (set) с компактным множеством 64-битных
+хешей (unique.SeenSet) и биективным счетчиком, которому память не нужна.
+Запуск из корня проекта:
+    python -m bench.bench_unique --count 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+from generators import generate_credit_cards, generate_temp_emails
+from unique import SeenSet
+
+
+def dedupe_python_set(chunks):
+    seen = set()
+    for chunk in chunks:
+        for value in chunk:
+            seen.add(value)
+    return seen
+
+
+def dedupe_seen_set(chunks, count):
+    seen = SeenSet(count)
+    for chunk in chunks:
+        seen.add_many(chunk)
+    return seen
+
+
+def measure(dedupe, count, chunk_size=100_000):
+    """Время (без трассировки) и удерживаемая память дедупликации count адресов.
+
+    Адреса генерируются порциями, как при выгрузке: set удерживает сами строки,
+    SeenSet — только их хеши.
+    """
+    def chunks():
+        for start in range(0, count, chunk_size):
+            yield generate_temp_emails(min(chunk_size, count - start), seed=start)
+
+    start = time.perf_counter()
+    dedupe(chunks())
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    seen = dedupe(chunks())
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del seen
+    return elapsed, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк проверки уникальности")
+    parser.add_argument('--count', type=int, default=1_000_000, help="значений")
+    args = parser.parse_args()
+    count = args.count
+
+    for name, dedupe in (('set', dedupe_python_set), ('SeenSet', lambda chunks: dedupe_seen_set(chunks, count))):
+        elapsed, used = measure(dedupe, count)
+        print(f"{name:8} {elapsed / count * 1e6:.3f} мкс/значение (с генерацией), "
+              f"{used / count:.1f} Б/значение")
+
+    for name, generate in (('карты', generate_credit_cards), ('email', generate_temp_emails)):
+        start = time.perf_counter()
+        generate(count, seed=1)
+        random_us = (time.perf_counter() - start) / count * 1e6
+        start = time.perf_counter()
+        generate(count, seed=1, unique_key=1)
+        unique_us = (time.perf_counter() - start) / count * 1e6
+        print(f"{name}: случайные {random_us:.3f} мкс, уникальные (счетчик) {unique_us:.3f} мкс, "
+              f"память на проверку 0 Б")
+
+
+if __name__ == '__main__':
+    main()
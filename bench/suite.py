@@ -0,0 +1,288 @@
+# bench/suite.py
+"""Набор бенчмарков для всех генераторов и пути ответа бота.
+
+Для каждого бенчмарка измеряются:
+* задержка одного вызова (медиана и p99, мкс);
+* пропускная способность (записей/с) при размерах пакета 1, 1 000 и 1 000 000;
+* память на запись (байт, по tracemalloc).
+
+Результаты сохраняются в JSON; при сравнении с сохраненной базой
+ухудшение больше порога считается регрессией (код возврата 1).
+
+Запуск из корня проекта:
+    python -m bench.suite --save bench/baseline.json
+    python -m bench.suite --compare bench/baseline.json --threshold 0.2
+    python -m bench.suite --full --only card   # с пакетом 1 000 000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock
+
+from generators import (
+    generate_boundary_strings,
+    generate_credit_card,
+    generate_credit_cards,
+    generate_name_address,
+    generate_temp_email
+)
+from locales import locale_registry
+from schema import USER_SCHEMA, compile_schema
+from streams import RecordStream
+
+DEFAULT_SIZES = (1, 1000)
+FULL_SIZES = (1, 1000, 1_000_000)
+
+# Сколько одиночных вызовов делать для оценки задержки
+LATENCY_SAMPLES = 200
+
+# Сколько записей держать в памяти при оценке памяти на запись
+MEMORY_SAMPLE = 10_000
+
+DEFAULT_THRESHOLD = 0.2
+
+# Метрики, по которым ищутся регрессии, и «хорошее» направление изменения
+TRACKED_METRICS = {
+    'latency_p50_us': 'lower',
+    'memory_per_record_bytes': 'lower',
+}
+THROUGHPUT_PREFIX = 'records_per_sec_'
+
+
+class Benchmark:
+    """Бенчмарк: одиночный вызов call() и необязательная пакетная версия batch(n)."""
+
+    def __init__(self, name, call, batch=None):
+        self.name = name
+        self.call = call
+        self.batch = batch
+
+    def run_batch(self, n):
+        if self.batch is not None:
+            return self.batch(n)
+        call = self.call
+        return [call() for _ in range(n)]
+
+
+def make_update(text):
+    """Поддельный Update для handle_message (ответ никуда не отправляется)."""
+    update = MagicMock()
+    update.message.text = text
+    update.message.reply_text = AsyncMock()
+    update.effective_chat.id = 0
+    return update
+
+
+def bot_benchmarks():
+    """Полный путь handle_message: генерация, форматирование и вызов reply_text.
+
+    Пулы готовых записей не запускаются, поэтому измеряется худший случай —
+    промах пула и генерация через пул исполнителей.
+    """
+    import bot
+    from ratelimit import PressCoalescer, RequestLimiter, SendQueue
+
+    # Лимиты и объединение нажатий рассчитаны на людей, а не на бенчмарк
+    unlimited = 10 ** 9
+    bot.request_limiter = RequestLimiter(unlimited, unlimited, unlimited, unlimited)
+    bot.press_coalescer = PressCoalescer(window=0, max_batch=1)
+    bot.send_queue = SendQueue(unlimited, unlimited, unlimited, unlimited)
+
+    loop = asyncio.new_event_loop()
+
+    def press(text):
+        update = make_update(text)
+        loop.run_until_complete(bot.handle_message(update, None))
+        return update.message.reply_text.call_args.args[0]
+
+    def press_many(text, n):
+        async def run():
+            responses = []
+            for _ in range(n):
+                update = make_update(text)
+                await bot.handle_message(update, None)
+                responses.append(update.message.reply_text.call_args.args[0])
+            return responses
+        return loop.run_until_complete(run())
+
+    buttons = {
+        'bot_ru': "🇷🇺 ФИО и адрес (RU)",
+        'bot_en': "🇺🇸 ФИО и адрес (EN)",
+        'bot_card': "💳 Номер карты",
+        'bot_boundary': "📏 Граничные строки",
+        'bot_email': "📧 Временный email",
+    }
+    return [
+        Benchmark(name, partial(press, text), partial(press_many, text))
+        for name, text in buttons.items()
+    ]
+
+
+def separate_user_record():
+    """Запись «пользователь» последовательными вызовами существующих генераторов."""
+    person = generate_name_address('ru')
+    card = generate_credit_card()
+    return {
+        'full_name': person['full_name'],
+        'email': generate_temp_email()['email'],
+        'phone': person['phone'],
+        'address': person['address'],
+        'card_number': card['number'],
+        'card_type': card['type'],
+    }
+
+
+def all_benchmarks():
+    benchmarks = [
+        Benchmark(f'name_address_{code}', partial(generate_name_address, code))
+        for code in locale_registry.codes()
+    ]
+    user_schema = compile_schema(USER_SCHEMA)
+    card_stream = RecordStream('card', seed=1)
+    email_stream = RecordStream('email', seed=1)
+    benchmarks += [
+        # Составная запись «пользователь»: отдельные вызовы генераторов против схемы
+        Benchmark('user_separate_calls', separate_user_record),
+        Benchmark('user_schema', partial(user_schema.generate, 1), user_schema.generate),
+        Benchmark('credit_card', generate_credit_card),
+        Benchmark('credit_cards_batch', partial(generate_credit_cards, 1), generate_credit_cards),
+        # Произвольный доступ к записи i и срез [0, n) детерминированного потока
+        Benchmark('credit_card_stream', partial(card_stream.__getitem__, 123_456), partial(card_stream.take, 0)),
+        Benchmark('boundary_strings', generate_boundary_strings),
+        Benchmark('temp_email', generate_temp_email),
+        Benchmark('temp_email_stream', partial(email_stream.__getitem__, 123_456), partial(email_stream.take, 0)),
+    ]
+    return benchmarks + bot_benchmarks()
+
+
+def measure_latency(benchmark, samples=LATENCY_SAMPLES):
+    """Медиана и p99 задержки одиночного вызова, мкс."""
+    call = benchmark.call
+    call()  # прогрев (ленивая инициализация, кеши)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def measure_throughput(benchmark, size):
+    """Записей в секунду при генерации пакета size."""
+    start = time.perf_counter()
+    benchmark.run_batch(size)
+    elapsed = time.perf_counter() - start
+    return size / elapsed if elapsed > 0 else float('inf')
+
+
+def measure_memory(benchmark, size=MEMORY_SAMPLE):
+    """Память, занимаемая одной записью (байт), при удержании size записей."""
+    benchmark.call()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        records = benchmark.run_batch(size)
+        # Временные объекты с циклическими ссылками не должны попасть в оценку
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del records
+    return used / size
+
+
+def run_suite(benchmarks, sizes=DEFAULT_SIZES, progress=None):
+    """Прогоняет бенчмарки и возвращает результаты {имя: {метрика: значение}}."""
+    results = {}
+    for benchmark in benchmarks:
+        p50, p99 = measure_latency(benchmark)
+        result = {'latency_p50_us': p50, 'latency_p99_us': p99}
+        for size in sizes:
+            result[f'{THROUGHPUT_PREFIX}{size}'] = measure_throughput(benchmark, size)
+        result['memory_per_record_bytes'] = measure_memory(benchmark, min(MEMORY_SAMPLE, max(sizes)))
+        results[benchmark.name] = result
+        if progress is not None:
+            progress(benchmark.name, result)
+    return results
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Список регрессий: (бенчмарк, метрика, база, текущее значение, изменение)."""
+    regressions = []
+    for name, metrics in results.items():
+        base_metrics = baseline.get(name)
+        if not base_metrics:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not base:
+                continue
+            if metric.startswith(THROUGHPUT_PREFIX):
+                change = (base - value) / base          # меньше записей/с — хуже
+            elif TRACKED_METRICS.get(metric) == 'lower':
+                change = (value - base) / base          # больше задержка/память — хуже
+            else:
+                continue
+            if change > threshold:
+                regressions.append((name, metric, base, value, change))
+    return regressions
+
+
+def print_result(name, result):
+    throughput = ', '.join(
+        f"{key[len(THROUGHPUT_PREFIX):]}: {value:,.0f}/с"
+        for key, value in result.items() if key.startswith(THROUGHPUT_PREFIX)
+    )
+    print(f"{name:24} p50 {result['latency_p50_us']:9.1f} мкс  p99 {result['latency_p99_us']:9.1f} мкс  "
+          f"{throughput}  память {result['memory_per_record_bytes']:,.0f} Б/запись")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки генераторов и бота")
+    parser.add_argument('--full', action='store_true', help="добавить пакет из 1 000 000 записей")
+    parser.add_argument('--sizes', help="размеры пакетов через запятую (например, 1,1000)")
+    parser.add_argument('--only', help="запускать только бенчмарки, содержащие подстроку")
+    parser.add_argument('--save', help="сохранить результаты в JSON")
+    parser.add_argument('--compare', help="сравнить с базой из JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое ухудшение (доля, по умолчанию 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.sizes:
+        sizes = tuple(int(size) for size in args.sizes.split(','))
+    else:
+        sizes = FULL_SIZES if args.full else DEFAULT_SIZES
+
+    benchmarks = [b for b in all_benchmarks() if not args.only or args.only in b.name]
+    results = run_suite(benchmarks, sizes, progress=print_result)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, metric, base, value, change in regressions:
+            print(f"РЕГРЕССИЯ {name}.{metric}: {base:,.1f} -> {value:,.1f} ({change:+.0%})")
+        if regressions:
+            return 1
+        print("Регрессий нет")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
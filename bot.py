@@ -1,15 +1,34 @@
 # bot.py
+import asyncio
+import itertools
 import logging
-from telegram import Update, ReplyKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+import math
+import os
+import tempfile
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update, ReplyKeyboardMarkup
+from telegram.error import RetryAfter, TelegramError
+from telegram.ext import Application, CommandHandler, InlineQueryHandler, MessageHandler, filters, ContextTypes
 
 import config
-from generators import (
-    generate_name_address,
-    generate_credit_card,
-    generate_boundary_strings,
-    generate_temp_email
+from dispatcher import DispatcherBusy, GenerationDispatcher
+from export import (
+    COMPRESSIONS,
+    COMPRESSION_SUFFIXES,
+    EXPORT_FORMATS,
+    RECORD_FIELDS,
+    ExportProgress,
+    MissingDependency,
+    export_records
 )
+from boundary import boundary_categories, load_boundary_pack, render_boundary_messages, split_message
+from corpus import open_corpus
+from generators import set_corpus, warm_up
+from inline import INLINE_ALIASES, InlineQueryIndex, InlineResultCache, inline_title
+from locales import locale_registry
+from metrics import HandlerMetrics, SlowRequestProfiler, phase, start_metrics_server
+from pool import RecordPools
+from ratelimit import PressCoalescer, RequestLimiter, SendQueue
+from replies import reply_registry
 
 # Настройка логирования
 logging.basicConfig(
@@ -18,6 +37,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Пулы готовых записей: обработчики берут данные из них, не вызывая Faker
+record_pools = RecordPools(low_water=config.POOL_LOW_WATER, high_water=config.POOL_HIGH_WATER)
+
+# Пул исполнителей для генерации, которая не должна блокировать цикл событий
+dispatcher = GenerationDispatcher(
+    executor=config.GENERATION_EXECUTOR,
+    max_workers=config.GENERATION_WORKERS,
+    max_concurrency=config.GENERATION_MAX_CONCURRENCY,
+    max_pending=config.GENERATION_MAX_PENDING
+)
+
+# Задержки обработчиков по фазам (см. metrics.py) и выборочное профилирование
+handler_metrics = HandlerMetrics(profiler=SlowRequestProfiler(
+    sample_rate=config.PROFILE_SAMPLE_RATE,
+    threshold=config.PROFILE_SLOW_THRESHOLD,
+    directory=config.PROFILE_DIR
+))
+
+# Защита от флуда: лимит запросов, объединение нажатий и очередь отправки
+request_limiter = RequestLimiter(
+    chat_rate=config.RATE_CHAT_PER_SECOND,
+    chat_burst=config.RATE_CHAT_BURST,
+    global_rate=config.RATE_GLOBAL_PER_SECOND,
+    global_burst=config.RATE_GLOBAL_BURST
+)
+press_coalescer = PressCoalescer(window=config.COALESCE_WINDOW, max_batch=config.COALESCE_MAX_BATCH)
+send_queue = SendQueue(
+    chat_rate=config.SEND_CHAT_PER_SECOND,
+    chat_burst=config.SEND_CHAT_BURST,
+    global_rate=config.SEND_GLOBAL_PER_SECOND,
+    global_burst=config.SEND_GLOBAL_BURST,
+    retry_on=(RetryAfter,)
+)
+
+async def send_text(update, text, **kwargs):
+    """Отвечает на сообщение через очередь отправки с лимитами Telegram."""
+    return await send_queue.send(update.effective_chat.id, lambda: update.message.reply_text(text, **kwargs))
+
+async def admit(update):
+    """Пропускает запрос через лимиты; при первом отказе предупреждает пользователя."""
+    chat_id = update.effective_chat.id
+    retry_after = request_limiter.acquire(chat_id)
+    if not retry_after:
+        return True
+    if request_limiter.should_warn(chat_id):
+        await send_text(update, f"⏳ Слишком много запросов, повторите через {math.ceil(retry_after)} с.")
+    return False
+
+async def get_record(name):
+    """Берет готовую запись из пула; при промахе генерирует в пуле исполнителей."""
+    with phase('generation'):
+        pool = record_pools.pools[name]
+        record = pool.pop_ready()
+        if record is None:
+            record = await dispatcher.run(pool.factory)
+        return record
+
 # Клавиатура с основными кнопками 
 MAIN_KEYBOARD = [
     ["🇷🇺 ФИО и адрес (RU)", "🇺🇸 ФИО и адрес (EN)"],
@@ -25,7 +101,21 @@ MAIN_KEYBOARD = [
     ["📧 Временный email", "🆘 Помощь"]
 ]
 
+# Ключи ответов на кнопки (replies.py); они же метки кнопок в метриках
+BUTTON_LABELS = {
+    "🇷🇺 ФИО и адрес (RU)": 'ru',
+    "🇺🇸 ФИО и адрес (EN)": 'en',
+    "💳 Номер карты": 'card',
+    "📏 Граничные строки": 'boundary',
+    "📧 Временный email": 'email',
+    "🆘 Помощь": 'help',
+}
+
+def button_label(update):
+    return reply_registry.label(update.message.text)
+
 # Команда /start
+@handler_metrics.instrument('start')
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Отправляет приветственное сообщение и показывает клавиатуру."""
     welcome_text = (
@@ -38,12 +128,19 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "• *Временный email* — адрес для одноразовой почты\n\n"
         "Также используйте команды:\n"
         "/start - перезапуск бота\n"
-        "/help - справка"
+        "/help - справка\n"
+        "/boundary [категория] [ru|en] - граничные строки по категориям\n"
+        "/ru, /en, /card, /email - то же, что кнопки\n"
+        # Список видов — из реестра, как в BULK_USAGE, чтобы не расходиться с /bulk
+        f"/bulk ru 10000 csv - файл с N записями ({', '.join(RECORD_FIELDS)})"
     )
-    reply_markup = ReplyKeyboardMarkup(MAIN_KEYBOARD, resize_keyboard=True)
-    await update.message.reply_text(welcome_text, parse_mode='Markdown', reply_markup=reply_markup)
+    with phase('formatting'):
+        reply_markup = ReplyKeyboardMarkup(MAIN_KEYBOARD, resize_keyboard=True)
+    with phase('send'):
+        await send_text(update, welcome_text, parse_mode='Markdown', reply_markup=reply_markup)
 
 # Команда /help 
+@handler_metrics.instrument('help')
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает справку по использованию бота."""
     help_text = (
@@ -58,101 +155,355 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "• *Временный email* — адрес на одноразовых почтовых сервисах.\n\n"
         "⚠️ *Важно:* Все данные сгенерированы случайно и используются только для тестирования."
     )
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+    with phase('send'):
+        await send_text(update, help_text, parse_mode='Markdown')
+
+async def send_boundary_messages(update: Update, category=None, language='ru'):
+    """Отправляет каталог граничных строк (частями до 4096 символов)."""
+    with phase('formatting'):
+        messages = render_boundary_messages(category, language)
+    with phase('send'):
+        for message in messages:
+            await send_text(update, message, parse_mode='Markdown')
+
+# Команда /boundary [категория] [ru|en]
+async def boundary_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Показывает граничные строки одной категории на выбранном языке."""
+    args = [arg.lower() for arg in (context.args or [])]
+    language = 'en' if 'en' in args else 'ru'
+    categories = [arg for arg in args if arg not in ('ru', 'en')]
+    category = categories[0] if categories else None
+
+    if category is not None and category not in boundary_categories():
+        await send_text(
+            update, "Неизвестная категория. Доступные: " + ", ".join(boundary_categories())
+        )
+        return
+    if await admit(update):
+        await send_boundary_messages(update, category, language)
+
+# Пользователи, у которых сейчас выполняется массовая генерация
+active_bulk_users = set()
+
+BULK_USAGE = (
+    "Использование: /bulk <вид> <количество> [формат] [сжатие]\n"
+    f"Вид: {', '.join(RECORD_FIELDS)}\n"
+    f"Формат: {', '.join(EXPORT_FORMATS)} (по умолчанию csv)\n"
+    f"Сжатие: {', '.join(COMPRESSIONS)} (по умолчанию gzip)\n"
+    "Пример: /bulk ru 10000 csv"
+)
+
+def parse_bulk_args(args):
+    """Разбирает аргументы /bulk; возвращает (вид, количество, формат, сжатие) или None."""
+    args = [arg.lower() for arg in args]
+    if len(args) < 2 or args[0] not in RECORD_FIELDS or not args[1].isdigit():
+        return None
+    kind, count = args[0], int(args[1])
+    fmt, compression = 'csv', 'gzip'
+    for arg in args[2:]:
+        if arg in EXPORT_FORMATS:
+            fmt = arg
+        elif arg in COMPRESSIONS:
+            compression = arg
+        else:
+            return None
+    if count <= 0:
+        return None
+    return kind, count, fmt, compression
+
+async def edit_progress(message, text):
+    """Обновляет сообщение о прогрессе, не прерывая генерацию из-за ошибок Telegram."""
+    try:
+        await send_queue.send(message.chat_id, lambda: message.edit_text(text))
+    except TelegramError as error:
+        logger.debug("Не удалось обновить прогресс: %s", error)
+
+async def run_bulk_job(update: Update, kind, count, fmt, compression):
+    """Генерирует файл вне цикла событий и отправляет его документом."""
+    suffix = f".{fmt}" + ('' if fmt == 'parquet' else COMPRESSION_SUFFIXES.get(compression, ''))
+    fd, path = tempfile.mkstemp(prefix='bulk_', suffix=suffix)
+    os.close(fd)
+    progress = ExportProgress()
+    status = None
+    try:
+        if count >= config.BULK_PROGRESS_THRESHOLD:
+            status = await send_text(update, f"⏳ Генерация: 0 / {count}")
+
+        job = asyncio.ensure_future(dispatcher.run(
+            export_records, kind, count, path, fmt, compression=compression, progress=progress
+        ))
+        shown = 0
+        while not job.done():
+            await asyncio.wait({job}, timeout=config.BULK_PROGRESS_INTERVAL)
+            # При пуле процессов счетчик остается в дочернем процессе и не меняется
+            if status is not None and not job.done() and progress.rows != shown:
+                shown = progress.rows
+                await edit_progress(status, f"⏳ Генерация: {shown} / {count}")
+        stats = job.result()
+
+        size = os.path.getsize(path)
+        if size > config.BULK_MAX_FILE_BYTES:
+            await send_text(
+                update, f"Файл получился слишком большим ({size // (1024 * 1024)} МБ). Уменьшите количество записей."
+            )
+            return
+        if status is not None:
+            await edit_progress(status, f"✅ Готово: {stats.rows} записей, отправляю файл...")
+        with open(path, 'rb') as document:
+            await send_queue.send(update.effective_chat.id, lambda: update.message.reply_document(
+                document=document,
+                filename=f"{kind}_{count}{suffix}",
+                caption=f"{stats.rows} записей за {stats.seconds:.1f} с"
+            ))
+    finally:
+        os.remove(path)
+
+# Команда /bulk
+async def bulk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Генерирует N записей одним файлом вместо множества сообщений."""
+    parsed = parse_bulk_args(context.args or [])
+    if parsed is None:
+        await send_text(update, BULK_USAGE)
+        return
+    kind, count, fmt, compression = parsed
+    if not await admit(update):
+        return
+
+    user_id = update.effective_user.id
+    limit = config.BULK_USER_MAX_RECORDS.get(user_id, config.BULK_MAX_RECORDS)
+    if count > limit:
+        await send_text(update, f"Слишком много записей: ваш лимит — {limit} за запрос.")
+        return
+    if user_id in active_bulk_users:
+        await send_text(update, "У вас уже выполняется генерация файла, дождитесь ее окончания.")
+        return
+
+    active_bulk_users.add(user_id)
+    try:
+        await run_bulk_job(update, kind, count, fmt, compression)
+    except DispatcherBusy:
+        await send_text(update, "⏳ Бот сейчас перегружен, попробуйте через несколько секунд.")
+    except MissingDependency as error:
+        # Не установлен pyarrow или zstandard
+        await send_text(update, str(error))
+    finally:
+        active_bulk_users.discard(user_id)
+
+# Команда /stats
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Показывает p50/p95/p99 задержек обработчиков по фазам."""
+    # Пустой список — команда выключена, а не открыта всем
+    if update.effective_user.id not in config.ADMIN_USER_IDS:
+        await send_text(update, "⛔ Команда доступна только администраторам.")
+        return
+    # Моноширинный блок; длинная таблица делится на несколько сообщений
+    rows = [row + '\n' for row in handler_metrics.render_stats().split('\n')]
+    for part in split_message(rows, limit=4000):
+        await send_text(update, f"```\n{part}```", parse_mode='Markdown')
 
 # Обработчик кнопок клавиатуры
+@handler_metrics.instrument('handle_message', button=button_label)
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обрабатывает нажатия кнопок клавиатуры."""
-    text = update.message.text
-
-    if text == "🇷🇺 ФИО и адрес (RU)":
-        data = generate_name_address('ru')
-        response = (
-            f"*ФИО и адрес (RU):*\n\n"
-            f"👤 *ФИО:* {data['full_name']}\n"
-            f"🏠 *Адрес:* {data['address']}\n"
-            f"📞 *Телефон:* {data['phone']}"
-        )
+    try:
+        await reply_to_button(update, context)
+    except DispatcherBusy:
+        await send_text(update, "⏳ Бот сейчас перегружен, попробуйте через несколько секунд.")
 
-    elif text == "🇺🇸 ФИО и адрес (EN)":
-        data = generate_name_address('en')
-        response = (
-            f"*Name and Address (EN):*\n\n"
-            f"👤 *Full Name:* {data['full_name']}\n"
-            f"🏠 *Address:* {data['address']}\n"
-            f"📞 *Phone:* {data['phone']}"
-        )
-
-    elif text == "💳 Номер карты":
-        data = generate_credit_card()
-        response = (
-            f"*Тестовая кредитная карта:*\n\n"
-            f"🔢 *Номер:* `{data['number']}`\n"
-            f"🏷️ *Тип:* {data['type']}\n"
-            f"📅 *Срок:* {data['expiry']}\n"
-            f"🔐 *CVV:* {data['cvv']}\n\n"
-            f"⚠️ *Это НЕ настоящая карта!* Используйте только для тестов."
+async def reply_to_button(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Формирует и отправляет ответ на нажатую кнопку."""
+    reply = reply_registry.lookup(update.message.text)
+    if reply is None:
+        await send_text(
+            update, "Пожалуйста, используйте кнопки клавиатуры или команду /help.", parse_mode='Markdown'
         )
+        return
+    count = 1
+    if reply.template is not None:
+        # Повторные нажатия той же кнопки за окно уходят одним сообщением
+        count = await press_coalescer.join((update.effective_chat.id, reply.key))
+        if not count:
+            return
+    if await admit(update):
+        await send_reply(update, context, reply, count)
 
-    elif text == "📏 Граничные строки":
-        strings = generate_boundary_strings()
-        response = "*Граничные строки и инъекции:*\n\n"
-        
-        for item in strings:
-            # Форматируем вывод красиво
-            response += f"*{item['title']}*\n"
-            response += f"_{item['description']}_\n"
-            # Для пустой строки показываем специальное сообщение
-            if item['value'] == '':
-                response += "`[ПУСТАЯ СТРОКА]`\n"
-            else:
-                # Обрезаем слишком длинные строки для читаемости
-                preview = item['value']
-                if len(preview) > 100:
-                    preview = preview[:100] + "..."
-                response += f"```\n{preview}\n```\n"
-            response += f"Длина: {len(item['value'])} символов\n\n"
-        
-        response += "💡 *Совет:* Используйте эти строки для тестирования:\n"
-        response += "• Валидации полей ввода\n• Обработки спецсимволов\n• Защиты от инъекций"
-
-    elif text == "📧 Временный email":
-        data = generate_temp_email()
-        response = (
-            f"*Временный email адрес:*\n\n"
-            f"📭 `{data['email']}`\n\n"
-            f"*Примечание:* {data['note']}"
-        )
+async def send_reply(update: Update, context: ContextTypes.DEFAULT_TYPE, reply, count=1):
+    """Выполняет ответ из реестра: действие или count записей из пула по шаблону."""
+    if reply.action is not None:
+        await reply.action(update, context)
+        return
+    records = [await get_record(reply.source) for _ in range(count)]
+    with phase('formatting'):
+        response = '\n\n'.join(reply.template.render(data) for data in records)
+    with phase('send'):
+        await send_text(update, response, parse_mode='Markdown')
 
-    elif text == "🆘 Помощь":
-        # Вызываем ту же функцию, что и для команды /help
-        await help_command(update, context)
-        return  # Важно: выходим, чтобы не отправлять дополнительный ответ
+# Команды-синонимы кнопок: /ru, /en, /card, /email
+def command_label(update):
+    return update.message.text.split()[0].lstrip('/').split('@')[0]
 
-    else:
-        response = "Пожалуйста, используйте кнопки клавиатуры или команду /help."
-        await update.message.reply_text(response, parse_mode='Markdown')
+@handler_metrics.instrument('command', button=command_label)
+async def reply_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Отвечает на команду так же, как на кнопку с тем же ключом."""
+    if not await admit(update):
         return
+    try:
+        await send_reply(update, context, reply_registry.get(command_label(update)))
+    except DispatcherBusy:
+        await send_text(update, "⏳ Бот сейчас перегружен, попробуйте через несколько секунд.")
 
-    # Отправляем ответ (кроме случаев, где уже отправили, как с "Помощь")
-    await update.message.reply_text(response, parse_mode='Markdown')
+# Кнопки, которые отвечают действием, а не записью по шаблону
+reply_registry.register('boundary', action=lambda update, context: send_boundary_messages(update))
+reply_registry.register('help', action=help_command)
+reply_registry.bind_keyboard(MAIN_KEYBOARD, BUTTON_LABELS)
 
-# Основная функция
-def main():
-    """Запуск бота."""
-    # Создаем приложение
-    application = Application.builder().token(config.BOT_TOKEN).build()
+# Инлайн-режим: @bot card в любом чате
+inline_index = InlineQueryIndex({
+    **{key: key for key in reply_registry.templated_keys()},
+    **INLINE_ALIASES
+})
+
+# Номера сборок: id результатов уникальны между наборами
+_inline_builds = itertools.count()
+
+async def build_inline_results(kinds):
+    """Набор инлайн-результатов: по INLINE_RESULTS_PER_KIND записей каждого вида."""
+    build = next(_inline_builds)
+    results = []
+    for kind in kinds:
+        reply = reply_registry.get(kind)
+        for number in range(config.INLINE_RESULTS_PER_KIND):
+            record = await get_record(reply.source)
+            title, description = inline_title(kind, record)
+            results.append(InlineQueryResultArticle(
+                id=f"{kind}:{build}:{number}",
+                title=title,
+                description=description,
+                input_message_content=InputTextMessageContent(
+                    reply.template.render(record), parse_mode='Markdown'
+                )
+            ))
+    return results
+
+inline_cache = InlineResultCache(build_inline_results, ttl=config.INLINE_CACHE_TTL)
+
+async def warm_inline_cache(application):
+    """Собирает инлайн-наборы до первого запроса: пустой запрос и каждый вид."""
+    await inline_cache.warm([inline_index.kinds, *((kind,) for kind in inline_index.kinds)])
+
+def inline_label(update):
+    return ','.join(inline_index.resolve(update.inline_query.query)) or 'other'
+
+@handler_metrics.instrument('inline', button=inline_label)
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Отвечает на инлайн-запрос готовым набором из кеша."""
+    kinds = inline_index.resolve(update.inline_query.query)
+    results = await inline_cache.get(kinds) if kinds else []
+    with phase('send'):
+        # Данные случайные и одинаковые для всех: Telegram может кешировать их общим ответом
+        await update.inline_query.answer(
+            results, cache_time=config.INLINE_CACHE_TIME, is_personal=False
+        )
+
+def build_application(updater=True, token=None, base_url=None):
+    """Приложение с зарегистрированными обработчиками.
+
+    updater=False — без long polling: обновления кладутся в
+    application.update_queue снаружи (режим webhook, см. webhook.py).
+    token и base_url по умолчанию берутся из config.py.
+    """
+    # concurrent_updates позволяет обрабатывать другие чаты, пока идет тяжелая генерация
+    builder = (
+        Application.builder()
+        .token(token or config.BOT_TOKEN)
+        .base_url(base_url or config.TELEGRAM_API_URL)
+        .concurrent_updates(config.CONCURRENT_UPDATES)
+        .post_init(warm_inline_cache)
+    )
+    if not updater:
+        builder = builder.updater(None)
+    application = builder.build()
 
     # Регистрируем обработчики команд
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))  # Регистрируем команду /help
+    application.add_handler(CommandHandler("boundary", boundary_command))
+    application.add_handler(CommandHandler("bulk", bulk_command))
+    application.add_handler(CommandHandler("stats", stats_command))
+    application.add_handler(CommandHandler(list(reply_registry.templated_keys()), reply_command))
+
+    application.add_handler(InlineQueryHandler(inline_query))
 
     # Регистрируем обработчик текстовых сообщений (кнопки)
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    return application
+
+def prepare_generation():
+    """Наборы граничных строк, прогрев Faker и корпус — до приема обновлений."""
+    # Подключаем пользовательские наборы граничных строк
+    for path in config.BOUNDARY_PACKS:
+        logger.info("Загружено граничных строк из %s: %d", path, load_boundary_pack(path))
+
+    # Создаем экземпляры Faker заранее, чтобы первые запросы не ждали инициализации
+    locale_registry.resize(config.LOCALE_CACHE_SIZE)
+    warm_up()
+
+    # ФИО и адреса из корпуса: без разбора шаблонов Faker на каждую запись
+    if config.CORPUS_PATH:
+        set_corpus(open_corpus(config.CORPUS_PATH))
+        logger.info("Подключен корпус имен и адресов: %s", config.CORPUS_PATH)
+
+# Основная функция
+def main():
+    """Запуск бота: long polling или, если задан WEBHOOK_URL, режим webhook."""
+    if config.WEBHOOK_URL:
+        from webhook import run_webhook
+        run_webhook()
+        return
+
+    application = build_application()
+    prepare_generation()
+
+    # Метрики для Prometheus (если задан порт)
+    handler_metrics.register_gauge(
+        'bot_dispatcher_running', "Задач генерации в пуле исполнителей", lambda: dispatcher.running
+    )
+    handler_metrics.register_gauge(
+        'bot_dispatcher_waiting', "Задач генерации в очереди", lambda: dispatcher.waiting
+    )
+    handler_metrics.register_gauge(
+        'bot_inline_cache_misses', "Инлайн-запросов без готового набора", lambda: inline_cache.misses
+    )
+    handler_metrics.register_gauge(
+        'bot_send_queue_waiting', "Сообщений, ждущих лимита Telegram", lambda: send_queue.waiting
+    )
+    handler_metrics.register_gauge(
+        'bot_send_retries', "Повторных отправок после 429", lambda: send_queue.retries
+    )
+    handler_metrics.register_gauge(
+        'bot_requests_rejected', "Запросов, отклоненных лимитом", lambda: request_limiter.rejected
+    )
+    handler_metrics.register_gauge(
+        'bot_presses_coalesced', "Нажатий, объединенных в пакетные ответы", lambda: press_coalescer.coalesced
+    )
+    metrics_server = None
+    if config.METRICS_PORT:
+        metrics_server = start_metrics_server(handler_metrics, config.METRICS_PORT)
+        logger.info("Метрики: http://127.0.0.1:%d/metrics", config.METRICS_PORT)
 
-    # Запускаем бота
+    # Запускаем фоновое заполнение пулов и бота
+    record_pools.start()
     logger.info("Бот запущен...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    try:
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        record_pools.stop(timeout=1)
+        dispatcher.shutdown(wait=False)
+        logger.info("Статистика пулов: %s", record_pools.stats())
+        logger.info("Статистика кеша локалей: %s", locale_registry.stats())
+        logger.info("Статистика инлайн-кеша: %s", inline_cache.stats())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
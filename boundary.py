@@ -0,0 +1,231 @@
+# boundary.py
+"""Каталог граничных строк и инъекций.
+
+Каталог — модульный реестр неизменяемых записей, разбитых по категориям.
+Его можно расширять (register_boundary_string, load_boundary_pack), а готовые
+сообщения для Telegram кешируются по (категория, язык), поэтому ответ на
+кнопку сводится к поиску в словаре.
+"""
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from replies import code_value, escape_markdown
+
+# Ограничение Telegram на длину одного сообщения
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Длина превью значения в сообщении (длинные строки обрезаются)
+PREVIEW_LENGTH = 100
+
+# Длина названия и описания в сообщении: записи из наборов пользователей
+# могут быть любыми, а блок записи должен помещаться в одно сообщение
+TITLE_LENGTH = 200
+DESCRIPTION_LENGTH = 1000
+
+BoundaryString = namedtuple(
+    'BoundaryString', ['category', 'title', 'value', 'description', 'translations']
+)
+BoundaryString.__doc__ = """Запись каталога. translations: {язык: (title, description)}."""
+
+
+def make_boundary_string(category, title, value, description, translations=None):
+    """Создает запись каталога с неизменяемым словарем переводов."""
+    translations = {language: tuple(pair) for language, pair in (translations or {}).items()}
+    return BoundaryString(category, title, value, description, MappingProxyType(translations))
+
+
+# Тексты сообщения вокруг записей для каждого языка
+MESSAGE_TEXTS = {
+    'ru': {
+        'header': "*Граничные строки и инъекции:*\n\n",
+        'empty': "`[ПУСТАЯ СТРОКА]`\n",
+        'length': "Длина: {length} символов\n\n",
+        'footer': (
+            "💡 *Совет:* Используйте эти строки для тестирования:\n"
+            "• Валидации полей ввода\n• Обработки спецсимволов\n• Защиты от инъекций"
+        ),
+    },
+    'en': {
+        'header': "*Boundary strings and injections:*\n\n",
+        'empty': "`[EMPTY STRING]`\n",
+        'length': "Length: {length} characters\n\n",
+        'footer': (
+            "💡 *Tip:* Use these strings to test:\n"
+            "• Input field validation\n• Special character handling\n• Injection protection"
+        ),
+    },
+}
+
+DEFAULT_LANGUAGE = 'ru'
+
+_DEFAULT_STRINGS = (
+    make_boundary_string(
+        'length', '📏 Строка ровно 255 символов', 'A' * 255,
+        'Проверка ограничения длины (255 символов)',
+        {'en': ('📏 Exactly 255 characters', 'Length limit check (255 characters)')}
+    ),
+    make_boundary_string(
+        'special', '⚠️ Спецсимволы', '!@#$%^&*()_+{}|:"<>?[]\\;\',./`~',
+        'Строка со специальными символами',
+        {'en': ('⚠️ Special characters', 'String with special characters')}
+    ),
+    make_boundary_string(
+        'sql', '🥷 SQL-инъекция', "' OR '1'='1'; --",
+        'Базовый пример SQL-инъекции (для тестирования)',
+        {'en': ('🥷 SQL injection', 'Basic SQL injection example (for testing)')}
+    ),
+    make_boundary_string(
+        'xss', '🛡️ XSS-инъекция', '<script>alert("XSS")</script>',
+        'Базовый пример XSS-инъекции (для тестирования)',
+        {'en': ('🛡️ XSS injection', 'Basic XSS injection example (for testing)')}
+    ),
+    make_boundary_string(
+        'length', '⚫ Пустая строка', '',
+        'Пустая строка для проверки обязательных полей',
+        {'en': ('⚫ Empty string', 'Empty string for required field checks')}
+    ),
+    make_boundary_string(
+        'length', '🐌 Очень длинная строка (1000 символов)', 'B' * 1000,
+        'Строка из 1000 символов (тест на производительность)',
+        {'en': ('🐌 Very long string (1000 characters)', '1000-character string (performance test)')}
+    ),
+    make_boundary_string(
+        'unicode', '🌍 Эмодзи и юникод', 'Тест € ¥ 🌎 𐌀 𐌁 𐌂 Привет 你好',
+        'Строка с эмодзи и мультиязычными символами',
+        {'en': ('🌍 Emoji and Unicode', 'String with emoji and multilingual characters')}
+    ),
+    make_boundary_string(
+        'special', '🔤 Смешанный регистр', 'Тест Test тест TEST 123',
+        'Строка с символами в разном регистре',
+        {'en': ('🔤 Mixed case', 'String with mixed-case characters')}
+    ),
+    make_boundary_string(
+        'special', '📝 Переносы строк и табуляция',
+        'Первая строка\nВторая строка\tТабуляция\rВозврат каретки',
+        'Строка с управляющими символами',
+        {'en': ('📝 Line breaks and tabs', 'String with control characters')}
+    ),
+)
+
+# Реестр: кортеж записей в порядке добавления (заменяется целиком при расширении)
+_registry = _DEFAULT_STRINGS
+
+
+def boundary_strings(category=None):
+    """Записи каталога (все или одной категории) в порядке добавления."""
+    if category is None:
+        return _registry
+    return tuple(item for item in _registry if item.category == category)
+
+
+def boundary_categories():
+    """Категории каталога в порядке первого появления."""
+    return tuple(dict.fromkeys(item.category for item in _registry))
+
+
+def register_boundary_string(category, title, value, description, translations=None):
+    """Добавляет запись в каталог и сбрасывает кеш готовых сообщений."""
+    global _registry
+    item = make_boundary_string(category, title, value, description, translations)
+    _registry = _registry + (item,)
+    render_boundary_messages.cache_clear()
+    return item
+
+
+def load_boundary_pack(path):
+    """Загружает пользовательский набор строк из JSON или YAML.
+
+    Формат: {категория: [{title, value, description, translations?}, ...]}.
+    Для YAML нужен PyYAML. Возвращает количество добавленных записей.
+    """
+    with open(path, encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise RuntimeError("Для YAML-наборов установите PyYAML: pip install pyyaml") from exc
+            pack = yaml.safe_load(f)
+        else:
+            pack = json.load(f)
+
+    if not isinstance(pack, dict):
+        raise ValueError("Набор строк должен быть словарем {категория: [записи]}")
+
+    added = 0
+    for category, items in pack.items():
+        for item in items:
+            register_boundary_string(
+                category, item['title'], item['value'], item.get('description', ''),
+                item.get('translations')
+            )
+            added += 1
+    return added
+
+
+def reset_boundary_strings():
+    """Возвращает каталог к исходному набору строк."""
+    global _registry
+    _registry = _DEFAULT_STRINGS
+    render_boundary_messages.cache_clear()
+
+
+def _shorten(text, length):
+    return text if len(text) <= length else text[:length] + "..."
+
+
+def _render_item(item, language, texts):
+    title, description = item.translations.get(language, (item.title, item.description))
+    # Названия и описания из наборов могут содержать _ и *, ломающие разметку сообщения
+    title = escape_markdown(_shorten(title, TITLE_LENGTH))
+    description = escape_markdown(_shorten(description, DESCRIPTION_LENGTH))
+    block = f"*{title}*\n_{description}_\n"
+    if item.value == '':
+        block += texts['empty']
+    else:
+        # Обрезаем слишком длинные строки для читаемости
+        preview = item.value
+        if len(preview) > PREVIEW_LENGTH:
+            preview = preview[:PREVIEW_LENGTH] + "..."
+        # Внутри блока кода экранирование не работает: ``` из значения закрыл бы его
+        block += f"```\n{code_value(preview)}\n```\n"
+    return block + texts['length'].format(length=len(item.value))
+
+
+def split_message(blocks, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Склеивает блоки в сообщения не длиннее limit, не разрывая блоки.
+
+    Блок длиннее limit целиком не отправить: он режется на части, по
+    возможности по переводам строк.
+    """
+    messages = []
+    current = ''
+    for block in blocks:
+        if current and len(current) + len(block) > limit:
+            messages.append(current)
+            current = ''
+        while len(block) > limit:
+            cut = block.rfind('\n', 0, limit) + 1 or limit
+            messages.append(block[:cut])
+            block = block[cut:]
+        current += block
+    if current:
+        messages.append(current)
+    return messages
+
+
+@lru_cache(maxsize=128)
+def render_boundary_messages(category=None, language=DEFAULT_LANGUAGE):
+    """Готовые Markdown-сообщения для Telegram (кортеж частей до 4096 символов).
+
+    Результат кешируется по (category, language); кеш сбрасывается при
+    изменении каталога.
+    """
+    texts = MESSAGE_TEXTS.get(language, MESSAGE_TEXTS[DEFAULT_LANGUAGE])
+    items = boundary_strings(category)
+    blocks = [texts['header']]
+    blocks.extend(_render_item(item, language, texts) for item in items)
+    blocks.append(texts['footer'])
+    return tuple(split_message(blocks))
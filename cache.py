@@ -0,0 +1,250 @@
+# cache.py
+"""Постоянный кеш результатов генерации на диске (SQLite).
+
+Одни и те же наборы с фиксированным seed запрашиваются снова и снова
+(например, в CI), а генерация через Faker на порядки дороже чтения с диска.
+Кеш хранит результат по ключу — хешу от (генератор, версия, seed, параметры):
+
+* версия — отпечаток исходников модулей генерации (GENERATION_MODULES) и
+  версий Faker и NumPy. Любое изменение логики генераторов меняет ключи.
+  Записи других версий не удаляются при открытии: один файл могут делить
+  ветки и конвейеры с разными версиями пакетов. Ненужные записи со временем
+  вытесняются по размеру, явно — командой purge;
+* значения (Dataset, bytes, списки) сериализуются pickle и сжимаются zlib;
+* размер ограничен max_bytes: при превышении удаляются записи, к которым
+  дольше всего не обращались (LRU по времени последнего чтения).
+
+Файл можно делить между процессами и CI-задачами одной машины: SQLite в
+режиме WAL допускает параллельное чтение. Содержимое — pickle, поэтому
+открывайте только собственные файлы кеша.
+
+Использование:
+    cache = GenerationCache('gen-cache.sqlite')
+    dataset = cache.get_or_generate('cards', 42, {'count': 1000},
+                                    lambda: generate_credit_cards(1000, seed=42).to_dataset())
+
+    python -m export card 1000000 cards.csv --seed 42 --cache gen-cache.sqlite
+    python -m cache stats gen-cache.sqlite
+    python -m cache purge gen-cache.sqlite   # удалить записи других версий
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from importlib import metadata
+
+import config
+
+# Модули, от которых зависит результат генерации: их исходники входят в версию
+GENERATION_MODULES = (
+    'generators.py', 'cards.py', 'phones.py', 'locales.py', 'unique.py',
+    'dataset.py', 'corpus.py', 'parallel.py', 'streams.py',
+)
+
+# Сторонние пакеты, от версии которых зависят значения
+GENERATION_PACKAGES = ('faker', 'numpy')
+
+# Ожидание блокировки базы другим процессом, с
+BUSY_TIMEOUT = 30.0
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    generator TEXT NOT NULL,
+    version TEXT NOT NULL,
+    seed TEXT,
+    params TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+@lru_cache(maxsize=1)
+def generation_version():
+    """Отпечаток логики генерации: исходники GENERATION_MODULES и версии пакетов."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in GENERATION_MODULES:
+        with open(os.path.join(_ROOT, name), 'rb') as source:
+            digest.update(name.encode() + b'\0' + source.read() + b'\0')
+    for package in GENERATION_PACKAGES:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ''
+        digest.update(f'{package}={version}\0'.encode())
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """Хеш содержимого файла (например, корпуса) для параметров ключа.
+
+    Хеш запоминается по (путь, время изменения, размер): файл, пересобранный
+    на месте, хешируется заново.
+    """
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=16)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(generator, version, seed, params):
+    """Ключ записи: хеш канонического JSON от (генератор, версия, seed, параметры)."""
+    payload = json.dumps([generator, version, seed, params], sort_keys=True, ensure_ascii=False,
+                         separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+
+class GenerationCache:
+    """Кеш результатов генерации в файле SQLite с вытеснением LRU.
+
+    Методы потокобезопасны (одно соединение под блокировкой). Экземпляр не
+    передается в дочерние процессы: каждый процесс открывает файл сам.
+    """
+
+    def __init__(self, path=None, max_bytes=None, version=None,
+                 compression_level=None):
+        self.path = path or config.CACHE_PATH
+        if not self.path:
+            raise ValueError("Не задан файл кеша (CACHE_PATH)")
+        self.max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.version = version or generation_version()
+        self.compression_level = (config.CACHE_COMPRESSION_LEVEL if compression_level is None
+                                  else compression_level)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def key(self, generator, seed, params):
+        return cache_key(generator, self.version, seed, params)
+
+    def get(self, generator, seed, params):
+        """Сохраненный результат или None."""
+        key = self.key(generator, seed, params)
+        with self._lock:
+            row = self._db.execute('SELECT data FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?',
+                             (time.time(), key))
+            self.hits += 1
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def put(self, generator, seed, params, value):
+        """Сохраняет результат; значение больше max_bytes не сохраняется."""
+        data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                             self.compression_level)
+        if len(data) > self.max_bytes:
+            return False
+        now = time.time()
+        row = (self.key(generator, seed, params), generator, self.version,
+               None if seed is None else str(seed),
+               json.dumps(params, sort_keys=True, ensure_ascii=False, default=str),
+               len(data), data, now, now)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (key, generator, version, seed, params, size, data,'
+                ' created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', row
+            )
+            self._evict()
+        return True
+
+    def get_or_generate(self, generator, seed, params, generate):
+        """Результат из кеша или generate() с сохранением в кеш."""
+        value = self.get(generator, seed, params)
+        if value is None:
+            value = generate()
+            self.put(generator, seed, params, value)
+        return value
+
+    def _evict(self):
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._db.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM entries WHERE key = ?', doomed)
+        self.evicted += len(doomed)
+
+    def purge_stale(self):
+        """Удаляет записи других версий генераторов; возвращает их количество.
+
+        Не вызывается автоматически: записи других версий могут быть нужны
+        другим веткам или конвейерам, которые делят тот же файл.
+        """
+        with self._lock:
+            return self._db.execute('DELETE FROM entries WHERE version != ?', (self.version,)).rowcount
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+            self._db.execute('VACUUM')
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evicted': self.evicted,
+                'version': self.version}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Постоянный кеш результатов генерации")
+    parser.add_argument('command', choices=('stats', 'clear', 'purge'),
+                        help="stats — размер, clear — очистить, purge — удалить записи других версий")
+    parser.add_argument('path', nargs='?', default=config.CACHE_PATH, help="файл кеша")
+    args = parser.parse_args(argv)
+
+    with GenerationCache(args.path) as cache:
+        if args.command == 'clear':
+            cache.clear()
+        elif args.command == 'purge':
+            print(f"Удалено записей других версий генераторов: {cache.purge_stale()}")
+        stats = cache.stats()
+        print(f"{args.path}: {stats['entries']} записей, {stats['bytes'] / 1024 / 1024:.1f} МБ "
+              f"из {stats['max_bytes'] / 1024 / 1024:.0f} МБ, версия {stats['version']}")
+
+
+if __name__ == '__main__':
+    main()
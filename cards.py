@@ -0,0 +1,296 @@
+# cards.py
+"""Номера карт по таблице BIN/IIN платежных систем.
+
+Таблица — диапазоны префиксов (BIN) с платежной системой, допустимыми
+длинами номера и весом. Номер карты = префикс из диапазона + случайное тело +
+контрольная цифра Луна, поэтому тип карты всегда соответствует номеру: Mir
+начинается с 2200–2204, Visa — с 4, MasterCard — с 51–55 или 2221–2720.
+
+CardEngine раскладывает таблицу в строки (диапазон, длина) и выбирает строку
+по накопленным весам бинарным поиском; тело номера — целое число, поэтому
+пакет любой длины собирается операциями NumPy. Тот же движок нумерует все
+номера таблицы (space, locate) — на этом построены уникальные номера
+(unique.py) и потоки с произвольным доступом (streams.py).
+
+validate_luhn(numbers) проверяет пакет номеров (строки с пробелами или
+дефисами) без цикла по номерам.
+
+NumPy импортируется лениво.
+"""
+import bisect
+from collections import namedtuple
+
+BinRange = namedtuple('BinRange', ['network', 'low', 'high', 'lengths', 'weight'])
+BinRange.__doc__ = """Диапазон префиксов [low, high] (строки одной длины) платежной системы.
+
+lengths — допустимые длины номера (вес диапазона делится между ними поровну).
+"""
+
+# Платежные системы; код типа карты — индекс в этом кортеже
+CARD_TYPES = ('Visa', 'MasterCard', 'Mir')
+
+# Выпускаемые сейчас карты: 16 цифр у всех трех систем. Веса сохраняют
+# прежнее равное распределение по системам
+CARD_BINS = (
+    BinRange('Visa', '4', '4', (16,), 2),
+    BinRange('MasterCard', '51', '55', (16,), 1),
+    BinRange('MasterCard', '2221', '2720', (16,), 1),
+    BinRange('Mir', '2200', '2204', (16,), 2),
+)
+
+# Все длины, допустимые стандартами систем (для проверки разбора длинных номеров)
+EXTENDED_CARD_BINS = (
+    BinRange('Visa', '4', '4', (13, 16, 19), 2),
+    BinRange('MasterCard', '51', '55', (16,), 1),
+    BinRange('MasterCard', '2221', '2720', (16,), 1),
+    BinRange('Mir', '2200', '2204', (16, 17, 18, 19), 2),
+)
+
+# Самый длинный номер с пробелами между группами по 4: 19 цифр + 4 пробела
+NUMBER_WIDTH = 23
+
+_SPACE = ord(' ')
+_ZERO = ord('0')
+
+# Удвоенная цифра по правилу Луна (2d или 2d - 9)
+_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+def luhn_check_digit(payload):
+    """Контрольная цифра Луна для строки цифр без нее."""
+    total = 0
+    # Удваивается каждая вторая цифра справа, начиная с последней цифры payload
+    for position, char in enumerate(reversed(payload)):
+        digit = ord(char) - _ZERO
+        if position % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return (10 - total % 10) % 10
+
+
+def format_number(digits):
+    """Номер группами по 4 цифры через пробел."""
+    return ' '.join(digits[i:i + 4] for i in range(0, len(digits), 4))
+
+
+class CardEngine:
+    """Таблица BIN, разложенная в строки (диапазон, длина) для выборки и нумерации."""
+
+    def __init__(self, bins=CARD_BINS):
+        rows = []
+        for item in bins:
+            if item.network not in CARD_TYPES:
+                raise ValueError(f"Неизвестная платежная система: {item.network}")
+            if len(item.low) != len(item.high) or int(item.low) > int(item.high):
+                raise ValueError(f"Неверный диапазон BIN: {item.low}-{item.high}")
+            for length in item.lengths:
+                if not len(item.low) < length <= 19:
+                    raise ValueError(f"Неверная длина номера {length} для BIN {item.low}")
+                rows.append((item, length, item.weight / len(item.lengths)))
+        if not rows:
+            raise ValueError("Таблица BIN пуста")
+
+        self.bins = tuple(bins)
+        self.networks = tuple(CARD_TYPES.index(item.network) for item, _, _ in rows)
+        self.lows = tuple(int(item.low) for item, _, _ in rows)
+        self.prefix_lengths = tuple(len(item.low) for item, _, _ in rows)
+        self.spans = tuple(int(item.high) - int(item.low) + 1 for item, _, _ in rows)
+        self.lengths = tuple(length for _, length, _ in rows)
+        # Сколько цифр тела между префиксом и контрольной цифрой
+        self.body_spaces = tuple(10 ** (length - 1 - len(item.low)) for item, length, _ in rows)
+
+        total = sum(weight for _, _, weight in rows)
+        self.cumulative_weights = []
+        acc = 0.0
+        for _, _, weight in rows:
+            acc += weight / total
+            self.cumulative_weights.append(acc)
+        self.cumulative_weights[-1] = 1.0
+
+        # Нумерация всех номеров таблицы: строка за строкой
+        self.row_spaces = tuple(span * body for span, body in zip(self.spans, self.body_spaces))
+        self.space = sum(self.row_spaces)
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def _get_arrays(self):
+        if self._arrays is None:
+            import numpy as np
+            ends = np.cumsum(np.asarray(self.row_spaces, dtype=np.uint64))
+            self._arrays = {
+                'network': np.asarray(self.networks, dtype=np.uint8),
+                'low': np.asarray(self.lows, dtype=np.uint64),
+                'span': np.asarray(self.spans, dtype=np.uint64),
+                'length': np.asarray(self.lengths, dtype=np.uint8),
+                'body_space': np.asarray(self.body_spaces, dtype=np.uint64),
+                'weights': np.asarray(self.cumulative_weights),
+                'starts': ends - np.asarray(self.row_spaces, dtype=np.uint64),
+                'ends': ends,
+            }
+        return self._arrays
+
+    def pick_row(self, u):
+        """Строка таблицы для равномерного числа u из [0, 1)."""
+        return min(bisect.bisect_right(self.cumulative_weights, u), len(self.lengths) - 1)
+
+    def choose_rows(self, u):
+        """Строки таблицы для массива равномерных чисел из [0, 1)."""
+        import numpy as np
+        rows = np.searchsorted(self._get_arrays()['weights'], u, side='right')
+        return np.minimum(rows, len(self.lengths) - 1)
+
+    def select(self, u, offset_bits, body_bits):
+        """(строки, смещения префикса, тела) из готовых случайных чисел.
+
+        u — равномерные из [0, 1), offset_bits — 32-битные, body_bits —
+        64-битные целые (массивы uint64). Тело берется по модулю: смещение
+        распределения не больше body_space / 2**64 (1e-5 для 16 цифр).
+        """
+        import numpy as np
+        arrays = self._get_arrays()
+        rows = self.choose_rows(u)
+        offsets = (np.asarray(offset_bits, dtype=np.uint64) * arrays['span'][rows]) >> np.uint64(32)
+        bodies = np.asarray(body_bits, dtype=np.uint64) % arrays['body_space'][rows]
+        return rows, offsets, bodies
+
+    def sample(self, rng, n):
+        """Случайные (строки, смещения префикса, тела) для n номеров (rng NumPy)."""
+        import numpy as np
+        return self.select(
+            rng.random(n),
+            rng.integers(0, 1 << 32, size=n, dtype=np.uint64),
+            rng.integers(0, (1 << 64) - 1, size=n, dtype=np.uint64, endpoint=True),
+        )
+
+    def locate(self, values):
+        """Номера из [0, space) -> (строки, смещения префикса, тела); взаимно однозначно."""
+        import numpy as np
+        arrays = self._get_arrays()
+        values = np.asarray(values, dtype=np.uint64)
+        rows = np.searchsorted(arrays['ends'], values, side='right')
+        local = values - arrays['starts'][rows]
+        body_space = arrays['body_space'][rows]
+        return rows, local // body_space, local % body_space
+
+    def type_codes(self, rows):
+        """Коды платежных систем (индексы в CARD_TYPES) для строк таблицы."""
+        return self._get_arrays()['network'][rows]
+
+    def numbers(self, rows, offsets, bodies):
+        """Номера карт (dtype S23, группы по 4 цифры) из строк, смещений и тел."""
+        import numpy as np
+        arrays = self._get_arrays()
+        rows = np.asarray(rows)
+        lengths = arrays['length'][rows]
+        # payload — все цифры кроме контрольной: префикс, затем тело
+        payload = (arrays['low'][rows] + np.asarray(offsets, dtype=np.uint64)) * arrays['body_space'][rows]
+        payload += np.asarray(bodies, dtype=np.uint64)
+
+        number = np.zeros(len(rows), dtype=f'S{NUMBER_WIDTH}')
+        distinct = np.unique(lengths).tolist()
+        if len(distinct) == 1:
+            number[:] = _format_numbers(payload, distinct[0])
+            return number
+        # Номера разной длины собираются по группам одной длины
+        for length in distinct:
+            selected = np.flatnonzero(lengths == length)
+            number[selected] = _format_numbers(payload[selected], length)
+        return number
+
+    def generate_one(self, rng):
+        """Один номер (строка группами по 4) и платежная система; rng — random.Random."""
+        row = self.pick_row(rng.random())
+        prefix = self.lows[row] + rng.randrange(self.spans[row])
+        body_width = self.lengths[row] - 1 - self.prefix_lengths[row]
+        payload = str(prefix) + ''.join(str(rng.randint(0, 9)) for _ in range(body_width))
+        return format_number(payload + str(luhn_check_digit(payload))), CARD_TYPES[self.networks[row]]
+
+
+def digit_matrix(values, width, base=10):
+    """Матрица разрядов (n, width) из массива целых (старшие разряды слева)."""
+    import numpy as np
+    powers = np.uint64(base) ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+    return (np.asarray(values, dtype=np.uint64)[:, None] // powers % np.uint64(base)).astype(np.uint8)
+
+
+def luhn_check_digits(payload):
+    """Контрольные цифры Луна для матрицы цифр без контрольной (n, width)."""
+    import numpy as np
+    # Удваиваются цифры на четных позициях справа во всем номере, то есть
+    # последняя цифра payload и далее через одну влево
+    start = (payload.shape[1] + 1) % 2
+    doubled = payload[:, start::2] * 2
+    doubled[doubled > 9] -= 9
+    total = doubled.sum(axis=1, dtype=np.int64) + payload[:, 1 - start::2].sum(axis=1, dtype=np.int64)
+    return ((10 - total % 10) % 10).astype(np.uint8)
+
+
+def _format_numbers(payload, length):
+    """Номера длины length (S<length + пробелы>) из payload — всех цифр кроме контрольной."""
+    import numpy as np
+    digits = np.empty((len(payload), length), dtype=np.uint8)
+    digits[:, :-1] = digit_matrix(payload, length - 1)
+    digits[:, -1] = luhn_check_digits(digits[:, :-1])
+    digits += _ZERO
+
+    groups = (length + 3) // 4
+    formatted = np.full((len(payload), length + groups - 1), _SPACE, dtype=np.uint8)
+    for group in range(groups):
+        chunk = digits[:, group * 4:group * 4 + 4]
+        formatted[:, group * 5:group * 5 + chunk.shape[1]] = chunk
+    return formatted.view(f'S{formatted.shape[1]}').ravel()
+
+
+def validate_luhn(numbers):
+    """Проверка пакета номеров алгоритмом Луна; булев массив NumPy.
+
+    numbers — строки или массив NumPy (str или bytes). Пробелы и дефисы
+    игнорируются; номер с другими символами или короче двух цифр невалиден.
+    """
+    import numpy as np
+    array = np.asarray(numbers)
+    if array.ndim != 1:
+        array = array.reshape(-1)
+    if not len(array):
+        return np.zeros(0, dtype=bool)
+    if array.dtype.kind == 'U':
+        codes = array.view(np.uint32).reshape(len(array), -1)
+    elif array.dtype.kind == 'S':
+        codes = array.view(np.uint8).reshape(len(array), -1)
+    else:
+        raise TypeError("Номера должны быть строками")
+
+    is_digit = (codes >= _ZERO) & (codes <= _ZERO + 9)
+    # Нулевые коды — дополнение строк фиксированной длины до ширины массива
+    allowed = is_digit | (codes == _SPACE) | (codes == ord('-')) | (codes == 0)
+    valid = allowed.all(axis=1)
+
+    if (is_digit == is_digit[0]).all():
+        # Все номера одного формата (обычный случай — наш же вывод): позиции
+        # цифр общие, суммируются только нужные столбцы
+        columns = np.flatnonzero(is_digit[0])
+        digits = (codes[:, columns] - _ZERO).astype(np.uint8)
+        # Удваивается каждая вторая цифра справа, начиная с предпоследней
+        from_right = np.arange(len(columns))[::-1]
+        doubled = np.asarray(_DOUBLED, dtype=np.uint8)[digits[:, from_right[1::2]]]
+        total = doubled.sum(axis=1, dtype=np.int64) + digits[:, from_right[0::2]].sum(axis=1, dtype=np.int64)
+        return valid & (len(columns) >= 2) & (total % 10 == 0)
+
+    # Позиция каждой цифры справа (1 — последняя), без учета разделителей
+    position = np.cumsum(is_digit[:, ::-1], axis=1, dtype=np.int32)[:, ::-1]
+    digit = np.where(is_digit, codes.astype(np.int32) - _ZERO, 0)
+    doubled = is_digit & (position % 2 == 0)
+    digit = np.where(doubled, digit * 2, digit)
+    digit -= np.where(digit > 9, 9, 0)
+
+    total = digit.sum(axis=1)
+    count = is_digit.sum(axis=1)
+    return valid & (count >= 2) & (total % 10 == 0)
+
+
+# Движок по умолчанию: 16-значные номера трех систем
+DEFAULT_CARD_ENGINE = CardEngine(CARD_BINS)
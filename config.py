@@ -1 +1,74 @@
-BOT_TOKEN = "ВАШ_ТОКЕН_БОТА"  # Замените на свой токен
\ No newline at end of file
+BOT_TOKEN = "ВАШ_ТОКЕН_БОТА"  # Замените на свой токен
+
+# Пулы заранее сгенерированных записей (см. pool.py)
+POOL_LOW_WATER = 20    # при стольких оставшихся записях запускается пополнение
+POOL_HIGH_WATER = 100  # до скольких записей пополняется каждый пул
+
+# Генерация вне цикла событий (см. dispatcher.py)
+GENERATION_EXECUTOR = 'thread'  # 'thread' или 'process'
+GENERATION_WORKERS = 4          # размер пула исполнителей
+GENERATION_MAX_CONCURRENCY = 4  # сколько генераций выполняется одновременно
+GENERATION_MAX_PENDING = 100    # сколько генераций может ждать в очереди
+CONCURRENT_UPDATES = 32         # сколько обновлений Telegram обрабатывается параллельно
+
+# Пользовательские наборы граничных строк (JSON/YAML), см. boundary.py
+BOUNDARY_PACKS = []
+
+# Массовая генерация файлом: /bulk <ru|en|card|email> <N> [csv|jsonl|parquet] [gzip|zstd|none]
+BULK_MAX_RECORDS = 100_000              # лимит записей за один запрос по умолчанию
+BULK_USER_MAX_RECORDS = {}              # индивидуальные лимиты: {user_id: лимит}
+BULK_MAX_FILE_BYTES = 50 * 1024 * 1024  # Telegram не принимает от ботов файлы больше 50 МБ
+BULK_PROGRESS_THRESHOLD = 20_000        # с какого размера показывать прогресс
+BULK_PROGRESS_INTERVAL = 2.0            # как часто обновлять сообщение о прогрессе, с
+
+# Сколько экземпляров Faker (по локалям) держать в памяти, см. locales.py
+LOCALE_CACHE_SIZE = 8
+
+# Локальный HTTP API (см. api.py): python -m api
+API_HOST = '127.0.0.1'
+API_PORT = 8080
+API_MAX_COUNT = 1_000_000      # лимит записей за один запрос
+API_CHUNK_SIZE = 1_000         # записей в одной порции потокового ответа
+API_KEEPALIVE_TIMEOUT = 15.0   # сколько держать простаивающее соединение, с
+
+# Метрики обработчиков (см. metrics.py)
+METRICS_PORT = None            # порт HTTP с /metrics для Prometheus (None — не запускать)
+ADMIN_USER_IDS = set()         # кому доступна команда /stats (пусто — никому)
+PROFILE_SAMPLE_RATE = 0.0      # доля запросов, выполняемых под cProfile (0 — выключено)
+PROFILE_SLOW_THRESHOLD = 1.0   # профиль сохраняется, если запрос дольше, с
+PROFILE_DIR = 'profiles'       # куда сохранять профили медленных запросов
+
+# Защита от флуда (см. ratelimit.py)
+RATE_CHAT_PER_SECOND = 1.0     # запросов в секунду от одного чата в среднем
+RATE_CHAT_BURST = 5            # сколько запросов чата подряд допускается
+RATE_GLOBAL_PER_SECOND = 50.0  # запросов в секунду ко всему боту
+RATE_GLOBAL_BURST = 100        # всплеск запросов ко всему боту
+COALESCE_WINDOW = 1.0          # повторные нажатия кнопки за окно, с, — одним ответом
+COALESCE_MAX_BATCH = 5         # сколько записей в объединенном ответе (не больше)
+SEND_CHAT_PER_SECOND = 1.0     # лимит Telegram: около 1 сообщения в секунду в чат
+SEND_CHAT_BURST = 3            # короткий всплеск сообщений в один чат
+SEND_GLOBAL_PER_SECOND = 30.0  # лимит Telegram: около 30 сообщений в секунду от бота
+SEND_GLOBAL_BURST = 30         # всплеск сообщений от бота
+
+# Инлайн-режим (см. inline.py); включается у @BotFather командой /setinline
+INLINE_CACHE_TTL = 10.0        # через сколько секунд набор результатов обновляется в фоне
+INLINE_CACHE_TIME = 10         # сколько секунд Telegram может кешировать ответ сам
+INLINE_RESULTS_PER_KIND = 5    # результатов каждого вида данных в ответе
+
+# Корпус имен и адресов (см. corpus.py): python -m corpus build corpus.bin
+CORPUS_PATH = None             # путь к файлу корпуса (None — генерация через Faker)
+
+# Режим webhook (см. webhook.py): прием обновлений отделен от обработки
+WEBHOOK_URL = None             # публичный HTTPS-адрес приемника (None — long polling)
+WEBHOOK_HOST = '0.0.0.0'       # адрес, на котором слушает приемник
+WEBHOOK_PORT = 8443            # порт приемника
+WEBHOOK_PATH = '/telegram'     # путь, на который Telegram присылает обновления
+WEBHOOK_SECRET = None          # секрет для заголовка X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_WORKERS = 2            # процессов-обработчиков с обработчиками бота
+WEBHOOK_QUEUE_SIZE = 1000      # обновлений в очереди одного обработчика (дальше — 503)
+TELEGRAM_API_URL = 'https://api.telegram.org/bot'  # адрес Bot API (для проверки — FakeTelegramApi)
+
+# Постоянный кеш наборов с фиксированным seed (см. cache.py)
+CACHE_PATH = None              # файл SQLite (None — без кеша)
+CACHE_MAX_BYTES = 1024 ** 3    # предел размера; старые записи вытесняются (LRU)
+CACHE_COMPRESSION_LEVEL = 6    # уровень сжатия zlib (1 — быстрее, 9 — компактнее)
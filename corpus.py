@@ -0,0 +1,488 @@
+# corpus.py
+"""Готовые корпуса имен и адресов в файле, отображаемом в память.
+
+faker.name() и faker.address() на каждый вызов разбирают шаблоны и ищут
+провайдеры — это основная часть стоимости записи. Корпус собирается
+заранее (шаг сборки) и хранит для каждой локали Faker:
+
+* таблицы значений — имена, фамилии, отчества, префиксы (из провайдеров
+  Faker, с их весами), города и улицы (выборка значений методов Faker с
+  частотами в качестве весов);
+* таблицы цифровых шаблонов Faker ('%##', '######') — номера домов и индексы;
+* шаблоны ФИО и адреса ('{{last_name_male}} {{first_name_male}} ...').
+
+Во время работы файл отображается в память (mmap): таблицы — представления
+его страниц, поэтому процессы-генераторы делят одни и те же страницы вместо
+загрузки таблиц провайдеров в каждом процессе. Генерация сводится к выбору
+индексов NumPy и склейке строк по заранее разобранным шаблонам.
+
+Без файла корпус локали можно собрать прямо в памяти (memory_locale) — так
+делает schema.py: сборка стоит доли секунды один раз на процесс.
+
+Сборка и просмотр:
+    python -m corpus build corpus.bin
+    python -m corpus build corpus.bin --locales ru_RU en_US de_DE --samples 50000
+    python -m corpus info corpus.bin
+"""
+import argparse
+import json
+import mmap
+import re
+import struct
+import threading
+from bisect import bisect_right
+from collections import Counter
+
+# Сигнатура и версия формата файла
+CORPUS_MAGIC = b'TDCORP\x00\x01'
+
+# Локали Faker, собираемые по умолчанию
+DEFAULT_CORPUS_LOCALES = ('ru_RU', 'en_US')
+
+# Сколько раз вызывать метод Faker для таблиц-выборок (города, улицы)
+DEFAULT_SAMPLES = 20_000
+
+# То же для корпуса в памяти (memory_locale): сборка не должна заметно задерживать первый вызов
+MEMORY_SAMPLES = 2_000
+
+DEFAULT_CORPUS_PATH = 'corpus.bin'
+
+# Цифровые шаблоны, которые Faker строит кодом, а не по *_formats
+PATTERN_OVERRIDES = {
+    # en_US: postcode() — пятизначный индекс, postcode_formats не используется
+    'en_US': {'postcode': ('#####',)},
+}
+
+_HEADER = struct.Struct('<8sQ')
+_PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+_PLURALS = {'name': 'names', 'prefix': 'prefixes', 'suffix': 'suffixes'}
+
+
+class CorpusError(ValueError):
+    """Файл корпуса поврежден или в нем нет нужной локали."""
+
+
+# --- Сборка ---------------------------------------------------------------
+
+def _provider_attribute(provider, name):
+    # Методы провайдера (city(), state_abbr()) — не таблицы
+    value = getattr(provider, name, None)
+    return None if callable(value) else value
+
+
+def _weighted(values):
+    """(значения, веса или None) из кортежа или словаря значение -> вес Faker."""
+    if isinstance(values, dict):
+        return list(values), [float(weight) for weight in values.values()]
+    return list(values), None
+
+
+def _plural_attribute(name):
+    # first_name_male -> first_names_male, prefix_female -> prefixes_female
+    return '_'.join(_PLURALS.get(part, part) for part in name.split('_'))
+
+
+def _is_pattern(formats):
+    return all(isinstance(item, str) and '{{' not in item for item in formats)
+
+
+def _overridden(provider, name):
+    """True, если метод name переопределен в провайдере локали (своя логика)."""
+    for cls in type(provider).__mro__:
+        if name in cls.__dict__:
+            # Базовый провайдер лежит в пакете faker.providers.<вид>
+            return cls.__module__.count('.') > 2
+    return False
+
+
+def _collect_table(faker, provider, faker_locale, name, samples):
+    """Таблица для поля шаблона: значения провайдера, цифровые шаблоны или выборка."""
+    overrides = PATTERN_OVERRIDES.get(faker_locale, {})
+    if name in overrides:
+        return {'values': list(overrides[name]), 'weights': None, 'pattern': True}
+    values = None if _overridden(provider, name) else _provider_attribute(provider, _plural_attribute(name))
+    if isinstance(values, (tuple, list, dict)) and values:
+        values, weights = _weighted(values)
+        return {'values': values, 'weights': weights, 'pattern': False}
+    formats = _provider_attribute(provider, f'{name}_formats')
+    if isinstance(formats, (tuple, list, dict)) and formats and _is_pattern(formats):
+        values, weights = _weighted(formats)
+        return {'values': values, 'weights': weights, 'pattern': True}
+    method = getattr(faker, name, None)
+    if method is None:
+        raise CorpusError(f"{faker_locale}: не удалось собрать таблицу {name}")
+    counts = Counter(method() for _ in range(samples))
+    return {'values': list(counts), 'weights': [float(count) for count in counts.values()],
+            'pattern': False}
+
+
+def _address_formats(provider):
+    """Однострочные шаблоны адреса: основной формат Faker с раскрытым street_address."""
+    formats, weights = _weighted(_provider_attribute(provider, 'address_formats'))
+    # Основной (самый частый) формат; в en_US остальные — военные адреса
+    main = formats[0] if weights is None else formats[weights.index(max(weights))]
+    street_formats, _ = _weighted(_provider_attribute(provider, 'street_address_formats') or ())
+    if '{{street_address}}' in main and street_formats:
+        expanded = [main.replace('{{street_address}}', street) for street in street_formats]
+    else:
+        expanded = [main]
+    # Как join_address_lines: строки адреса через запятую
+    return [[text.replace('\n', ', '), 1.0] for text in expanded]
+
+
+def collect_locale(faker_locale, samples=DEFAULT_SAMPLES, seed=0):
+    """Таблицы и шаблоны корпуса для одной локали Faker."""
+    from faker import Faker
+    faker = Faker(faker_locale)
+    faker.seed_instance(seed)
+
+    person = faker.provider('faker.providers.person')
+    address = faker.provider('faker.providers.address')
+    name_formats, name_weights = _weighted(_provider_attribute(person, 'formats'))
+    formats = {
+        'name': [[text, weight] for text, weight in zip(name_formats, name_weights or [1.0] * len(name_formats))],
+        'address': _address_formats(address),
+    }
+    tables = {}
+    for kind, provider in (('name', person), ('address', address)):
+        for text, _ in formats[kind]:
+            for name in _PLACEHOLDER.findall(text):
+                if name not in tables:
+                    tables[name] = _collect_table(faker, provider, faker_locale, name, samples)
+    return {'formats': formats, 'tables': tables}
+
+
+def _padding(size, boundary=8):
+    return b'\0' * (-size % boundary)
+
+
+def _encode_table(table):
+    """Таблица -> (смещения uint32, байты UTF-8, накопленные веса float64 или None)."""
+    import numpy as np
+    encoded = [value.encode('utf-8') for value in table['values']]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    weights = table['weights']
+    cumulative = None if weights is None else np.cumsum(weights, dtype='<f8').tobytes()
+    return offsets.tobytes(), b''.join(encoded), cumulative
+
+
+def build_corpus(path, locales=DEFAULT_CORPUS_LOCALES, samples=DEFAULT_SAMPLES, seed=0):
+    """Собирает корпус для локалей Faker и записывает его в path.
+
+    Формат файла: сигнатура, длина оглавления, оглавление (JSON), затем блобы
+    таблиц (смещения uint32, байты UTF-8, накопленные веса float64), каждый
+    выровнен на 8 байт. Позиции в оглавлении отсчитываются от начала блобов.
+    """
+    import faker
+
+    blobs = []
+    position = 0
+
+    def add_blob(data):
+        nonlocal position
+        location = [position, len(data)]
+        blobs.append(data + _padding(len(data)))
+        position += len(blobs[-1])
+        return location
+
+    directory = {'faker_version': faker.VERSION, 'locales': {}}
+    for faker_locale in locales:
+        collected = collect_locale(faker_locale, samples, seed)
+        tables = {}
+        for name, table in collected['tables'].items():
+            offsets, data, cumulative = _encode_table(table)
+            tables[name] = {
+                'pattern': table['pattern'],
+                'offsets': add_blob(offsets),
+                'data': add_blob(data),
+                'weights': None if cumulative is None else add_blob(cumulative),
+            }
+        directory['locales'][faker_locale] = {'formats': collected['formats'], 'tables': tables}
+
+    header = json.dumps(directory, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(CORPUS_MAGIC, len(header)))
+        file.write(header)
+        file.write(_padding(_HEADER.size + len(header)))
+        for blob in blobs:
+            file.write(blob)
+    return directory
+
+
+# --- Чтение -----------------------------------------------------------------
+
+class CorpusTable:
+    """Таблица строк корпуса: смещения, байты UTF-8 и веса — представления mmap.
+
+    Пакетная выборка идет через массивы NumPy, поштучная — через memoryview
+    тех же страниц (обращение к элементу memoryview дешевле, чем к NumPy).
+    """
+
+    __slots__ = ('name', 'pattern', 'data', '_offsets', '_cumulative', 'offsets', 'cumulative',
+                 '_patterns')
+
+    def __init__(self, name, pattern, offsets, data, cumulative):
+        import numpy as np
+        self.name = name
+        self.pattern = pattern
+        self.data = data
+        # memoryview с форматами 'I' (uint32) и 'd' (float64)
+        self._offsets = offsets
+        self._cumulative = cumulative
+        self.offsets = np.frombuffer(offsets, dtype=np.uint32)
+        self.cumulative = None if cumulative is None else np.frombuffer(cumulative, dtype=np.float64)
+        # Цифровых шаблонов единицы — разбираем их сразу
+        self._patterns = [_compile_pattern(self[index]) for index in range(len(self))] if pattern else None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def sample(self, rng, n):
+        """n индексов с учетом весов таблицы."""
+        if self.cumulative is None:
+            return rng.integers(0, len(self), size=n)
+        return _weighted_choice(self.cumulative, rng.random(n))
+
+    def values(self, indexes):
+        """Строки по индексам."""
+        data = self.data
+        starts = self.offsets[indexes].tolist()
+        stops = self.offsets[indexes + 1].tolist()
+        return [str(data[start:stop], 'utf-8') for start, stop in zip(starts, stops)]
+
+    def draw(self, rng, n):
+        """n случайных значений (для цифровых шаблонов — с подставленными цифрами)."""
+        indexes = self.sample(rng, n)
+        if not self.pattern:
+            return self.values(indexes)
+        result = [None] * n
+        for index, (template, lows, spans) in enumerate(self._patterns):
+            rows = (indexes == index).nonzero()[0]
+            if not len(rows):
+                continue
+            numbers = rng.integers(lows, [low + span for low, span in zip(lows, spans)],
+                                   size=(len(rows), len(lows))).tolist()
+            for row, row_numbers in zip(rows.tolist(), numbers):
+                result[row] = template(*row_numbers)
+        return result
+
+    def draw_one(self, random):
+        """Одно значение; random — random.Random или модуль random."""
+        cumulative = self._cumulative
+        size = len(self._offsets) - 1
+        if cumulative is None:
+            index = int(random.random() * size)
+        else:
+            index = min(bisect_right(cumulative, random.random() * cumulative[-1]), size - 1)
+        if not self.pattern:
+            return str(self.data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+        template, lows, spans = self._patterns[index]
+        return template(*[low + int(random.random() * span) for low, span in zip(lows, spans)])
+
+
+def _weighted_choice(cumulative, uniform):
+    """Индексы по накопленным весам для равномерных чисел из [0, 1)."""
+    import numpy as np
+    # Округление uniform * total может дать ровно total — последний индекс
+    return np.minimum(np.searchsorted(cumulative, uniform * cumulative[-1], side='right'),
+                      len(cumulative) - 1)
+
+
+def _compile_pattern(pattern):
+    """Цифровой шаблон Faker -> (строка формата, нижние границы, размеры диапазонов).
+
+    '#' — любая цифра, '%' — от 1 до 9 (как numerify в Faker). Подряд идущие
+    '#' заполняются одним числом с ведущими нулями: '######' — одно число
+    из [0, 10**6) вместо шести цифр.
+    """
+    pieces = []
+    lows = []
+    spans = []
+    for run in re.finditer(r'#+|%|[^#%]+', pattern):
+        text = run.group()
+        if text[0] == '#':
+            pieces.append(f'{{:0{len(text)}d}}')
+            lows.append(0)
+            spans.append(10 ** len(text))
+        elif text == '%':
+            pieces.append('{}')
+            lows.append(1)
+            spans.append(9)
+        else:
+            pieces.append(text.replace('{', '{{').replace('}', '}}'))
+    return ''.join(pieces).format, lows, spans
+
+
+class CompiledFormat:
+    """Шаблон корпуса, разобранный на строку формата и имена таблиц."""
+
+    __slots__ = ('source', 'fields', 'render')
+
+    def __init__(self, source):
+        pieces = _PLACEHOLDER.split(source)
+        self.source = source
+        self.fields = tuple(pieces[1::2])
+        literals = (piece.replace('{', '{{').replace('}', '}}') for piece in pieces[0::2])
+        self.render = '{}'.join(literals).format
+
+
+class CorpusLocale:
+    """Генератор ФИО и адресов одной локали Faker по таблицам корпуса."""
+
+    def __init__(self, faker_locale, tables, formats):
+        import numpy as np
+        self.faker_locale = faker_locale
+        self.tables = tables
+        self.formats = {}
+        for kind, entries in formats.items():
+            compiled = [CompiledFormat(text) for text, _ in entries]
+            cumulative = np.cumsum([weight for _, weight in entries], dtype=np.float64)
+            self.formats[kind] = (compiled, cumulative, cumulative.tolist())
+
+    def generate(self, kind, n, rng):
+        """n строк вида kind ('name' или 'address'); rng — numpy.random.Generator."""
+        compiled, cumulative, _ = self.formats[kind]
+        choice = _weighted_choice(cumulative, rng.random(n))
+        result = [None] * n
+        for index, template in enumerate(compiled):
+            rows = (choice == index).nonzero()[0]
+            if not len(rows):
+                continue
+            columns = [self.tables[field].draw(rng, len(rows)) for field in template.fields]
+            render = template.render
+            for row, values in zip(rows.tolist(), zip(*columns)):
+                result[row] = render(*values)
+        return result
+
+    def generate_one(self, kind, random):
+        """Одна строка вида kind; random — random.Random или модуль random."""
+        compiled, _, cumulative = self.formats[kind]
+        template = compiled[min(bisect_right(cumulative, random.random() * cumulative[-1]), len(compiled) - 1)]
+        return template.render(*[self.tables[field].draw_one(random) for field in template.fields])
+
+    def names(self, n, rng):
+        return self.generate('name', n, rng)
+
+    def addresses(self, n, rng):
+        return self.generate('address', n, rng)
+
+
+class Corpus:
+    """Корпус, отображенный в память; локали Faker — по ключу faker_locale."""
+
+    def __init__(self, path):
+        import numpy as np
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if len(buffer) < _HEADER.size:
+            raise CorpusError(f"Файл корпуса поврежден: {path}")
+        magic, header_size = _HEADER.unpack_from(buffer)
+        if magic != CORPUS_MAGIC:
+            raise CorpusError(f"Не файл корпуса или другая версия формата: {path}")
+        directory = json.loads(bytes(buffer[_HEADER.size:_HEADER.size + header_size]))
+        self.faker_version = directory['faker_version']
+        base = _HEADER.size + header_size
+        base += -base % 8
+
+        def blob(location, fmt='B'):
+            position, size = location
+            return buffer[base + position:base + position + size].cast(fmt)
+
+        self.locales = {}
+        for faker_locale, entry in directory['locales'].items():
+            tables = {}
+            for name, table in entry['tables'].items():
+                tables[name] = CorpusTable(
+                    name, table['pattern'],
+                    blob(table['offsets'], 'I'),
+                    blob(table['data']),
+                    None if table['weights'] is None else blob(table['weights'], 'd'),
+                )
+            self.locales[faker_locale] = CorpusLocale(faker_locale, tables, entry['formats'])
+
+    def __contains__(self, faker_locale):
+        return faker_locale in self.locales
+
+    def locale(self, faker_locale):
+        """Генератор для локали Faker."""
+        try:
+            return self.locales[faker_locale]
+        except KeyError:
+            raise CorpusError(f"В корпусе нет локали {faker_locale}") from None
+
+    def stats(self):
+        """Размеры таблиц по локалям."""
+        return {
+            faker_locale: {name: len(table) for name, table in generator.tables.items()}
+            for faker_locale, generator in self.locales.items()
+        }
+
+
+_open_corpora = {}
+_open_lock = threading.Lock()
+
+
+def open_corpus(path):
+    """Корпус из файла; в пределах процесса файл отображается один раз."""
+    with _open_lock:
+        corpus = _open_corpora.get(path)
+        if corpus is None:
+            corpus = _open_corpora[path] = Corpus(path)
+        return corpus
+
+
+_memory_locales = {}
+
+
+def memory_locale(faker_locale, samples=MEMORY_SAMPLES, seed=0):
+    """Генератор локали по таблицам, собранным в памяти (без файла корпуса).
+
+    Собирается один раз на процесс; при одинаковых samples и seed таблицы
+    одинаковы, поэтому генерация с seed воспроизводима между запусками.
+    """
+    key = (faker_locale, samples, seed)
+    with _open_lock:
+        generator = _memory_locales.get(key)
+        if generator is None:
+            collected = collect_locale(faker_locale, samples, seed)
+            tables = {}
+            for name, table in collected['tables'].items():
+                offsets, data, cumulative = _encode_table(table)
+                tables[name] = CorpusTable(
+                    name, table['pattern'], memoryview(offsets).cast('I'), memoryview(data),
+                    None if cumulative is None else memoryview(cumulative).cast('d'),
+                )
+            generator = _memory_locales[key] = CorpusLocale(faker_locale, tables, collected['formats'])
+        return generator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Корпуса имен и адресов для быстрой генерации")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="собрать корпус из таблиц Faker")
+    build.add_argument('path', nargs='?', default=DEFAULT_CORPUS_PATH, help="файл корпуса")
+    build.add_argument('--locales', nargs='+', default=list(DEFAULT_CORPUS_LOCALES), help="локали Faker")
+    build.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                       help="вызовов Faker для таблиц-выборок (города, улицы)")
+    build.add_argument('--seed', type=int, default=0, help="seed выборок")
+    info = commands.add_parser('info', help="показать таблицы корпуса")
+    info.add_argument('path', nargs='?', default=DEFAULT_CORPUS_PATH, help="файл корпуса")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        build_corpus(args.path, args.locales, args.samples, args.seed)
+    corpus = Corpus(args.path)
+    print(f"{args.path}: Faker {corpus.faker_version}")
+    for faker_locale, tables in corpus.stats().items():
+        print(f"  {faker_locale}: " + ', '.join(f"{name} {size}" for name, size in tables.items()))
+    return corpus
+
+
+if __name__ == '__main__':
+    main()
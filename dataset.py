@@ -0,0 +1,469 @@
+# dataset.py
+"""Колоночный набор записей в памяти (Dataset) вместо списка словарей.
+
+Запись в виде словаря обходится в сотни байт: сам словарь, заголовки строк
+Python и указатели на них. Dataset хранит каждое поле одной колонкой:
+
+* StringColumn — строки переменной длины в раскладке Arrow: общий буфер
+  байтов и массив смещений (int32, при буфере больше 2 ГБ — int64). Если
+  все значения колонки помещаются в однобайтовую кодировку (cp1251 для
+  кириллицы, latin-1), буфер хранится в ней: кириллица в UTF-8 занимает
+  вдвое больше;
+* FixedColumn — ASCII-строки фиксированной ширины (массив NumPy dtype S<k>),
+  например номера карт, сроки действия и CVV; string_column выбирает ее и
+  для ASCII-строк близкой длины, если так выходит меньше, чем со смещениями;
+* CategoryColumn — повторяющиеся значения (локаль, тип карты): коды uint8 и
+  кортеж самих значений, по одной строке на все записи.
+
+Срез набора (dataset[a:b]) не копирует данные: колонки среза — представления
+массивов исходного набора. Обход дает легкие представления строк Row (со
+__slots__), которые читают значения из колонок по требованию и ведут себя
+как словарь только для чтения. Выгрузка (export.py) берет колонки целиком,
+а Parquet получает их как массивы Arrow без построчного разбора.
+"""
+from collections.abc import Mapping
+
+# Максимальное смещение для колонок с int32 (тип string в Arrow)
+_INT32_LIMIT = 2 ** 31 - 1
+
+# Однобайтовые кодировки, которые пробуются для не-ASCII колонок (по порядку)
+COMPACT_ENCODINGS = ('cp1251', 'latin-1')
+
+
+def _offsets_dtype(total):
+    import numpy as np
+    return np.int32 if total <= _INT32_LIMIT else np.int64
+
+
+def _offsets_from_lengths(lengths):
+    import numpy as np
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets.astype(_offsets_dtype(offsets[-1]), copy=False)
+
+
+def _choose_encoding(strings):
+    """Самая компактная кодировка, в которую помещаются все строки."""
+    text = ''.join(strings)
+    if text.isascii():
+        return 'utf-8'
+    for encoding in COMPACT_ENCODINGS:
+        try:
+            text.encode(encoding)
+        except UnicodeEncodeError:
+            continue
+        return encoding
+    return 'utf-8'
+
+
+_UTF8_TABLES = {}
+
+
+def _utf8_table(encoding):
+    """Байты UTF-8 каждого из 256 символов однобайтовой кодировки: (матрица, длины)."""
+    import numpy as np
+    table = _UTF8_TABLES.get(encoding)
+    if table is None:
+        matrix = np.zeros((256, 4), dtype=np.uint8)
+        lengths = np.zeros(256, dtype=np.int64)
+        for byte in range(256):
+            char = bytes([byte]).decode(encoding, errors='replace').encode('utf-8')
+            matrix[byte, :len(char)] = list(char)
+            lengths[byte] = len(char)
+        table = _UTF8_TABLES[encoding] = (matrix, lengths)
+    return table
+
+
+class StringColumn:
+    """Строки переменной длины: буфер data и смещения offsets (n + 1).
+
+    Строка i — data[offsets[i]:offsets[i + 1]] в кодировке encoding. После
+    среза offsets может начинаться не с нуля: буфер остается общим с
+    исходной колонкой.
+    """
+
+    __slots__ = ('offsets', 'data', 'encoding')
+
+    def __init__(self, offsets, data, encoding='utf-8'):
+        self.offsets = offsets
+        self.data = data
+        self.encoding = encoding
+
+    @classmethod
+    def from_strings(cls, strings, encoding=None):
+        """Колонка из последовательности str (кодировка по умолчанию — самая компактная)."""
+        import numpy as np
+        if encoding is None:
+            strings = list(strings)
+            encoding = _choose_encoding(strings)
+        encoded = [value.encode(encoding) for value in strings]
+        offsets = _offsets_from_lengths([len(value) for value in encoded])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8), encoding)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        """Размер данных колонки (без неиспользуемой после среза части буфера)."""
+        return int(self.offsets[-1] - self.offsets[0]) + self.offsets.nbytes
+
+    def value(self, index):
+        start, stop = self.offsets[index:index + 2].tolist()
+        return self.data[start:stop].tobytes().decode(self.encoding)
+
+    def values(self):
+        """Все значения списком str."""
+        offsets = self.offsets.tolist()
+        buffer = self.data[offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+        if self.encoding != 'utf-8' or buffer.isascii():
+            # В однобайтовой кодировке смещения в байтах совпадают со смещениями
+            # в символах: декодируем буфер один раз и режем готовую строку
+            text = buffer.decode(self.encoding)
+            return [text[start - base:stop - base] for start, stop in zip(offsets, offsets[1:])]
+        return [buffer[start - base:stop - base].decode('utf-8')
+                for start, stop in zip(offsets, offsets[1:])]
+
+    def slice(self, start, stop):
+        return StringColumn(self.offsets[start:stop + 1], self.data, self.encoding)
+
+    def take(self, indexes):
+        import numpy as np
+        starts = self.offsets[:-1][indexes].astype(np.int64)
+        lengths = self.offsets[1:][indexes] - starts
+        offsets = _offsets_from_lengths(lengths)
+        # Позиция каждого байта результата в исходном буфере
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(offsets, self.data[positions], self.encoding)
+
+    def compact(self):
+        """Колонка со своим буфером: смещения с нуля, без лишних байт."""
+        base, end = int(self.offsets[0]), int(self.offsets[-1])
+        if base == 0 and end == len(self.data):
+            return self
+        offsets = (self.offsets - base).astype(_offsets_dtype(end - base))
+        return StringColumn(offsets, self.data[base:end].copy(), self.encoding)
+
+    def as_string_column(self):
+        return self
+
+    def to_utf8(self):
+        """Та же колонка в UTF-8 (перекодировка таблицей, без разбора по строкам)."""
+        import numpy as np
+        if self.encoding == 'utf-8':
+            return self
+        column = self.compact()
+        matrix, char_lengths = _utf8_table(self.encoding)
+        byte_lengths = char_lengths[column.data]
+        # Новые длины строк — суммы длин UTF-8 их символов
+        totals = np.concatenate(([0], np.cumsum(byte_lengths)))
+        offsets = totals[column.offsets.astype(np.int64)]
+        data = matrix[column.data][np.arange(4) < byte_lengths[:, None]]
+        return StringColumn(offsets.astype(_offsets_dtype(offsets[-1])), data)
+
+    @staticmethod
+    def concat(columns):
+        import numpy as np
+        encodings = {column.encoding for column in columns}
+        if len(encodings) > 1:
+            columns = [column.to_utf8() for column in columns]
+        columns = [column.compact() for column in columns]
+        lengths = np.concatenate([np.diff(column.offsets) for column in columns])
+        return StringColumn(_offsets_from_lengths(lengths),
+                            np.concatenate([column.data for column in columns]),
+                            columns[0].encoding)
+
+    def to_arrow(self):
+        import numpy as np
+        import pyarrow
+        column = self.to_utf8()
+        kind = pyarrow.string() if column.offsets.dtype == np.int32 else pyarrow.large_string()
+        # Буферы UTF-8 передаются в Arrow без копирования
+        return pyarrow.Array.from_buffers(
+            kind, len(column), [None, pyarrow.py_buffer(column.offsets), pyarrow.py_buffer(column.data)])
+
+    def __getstate__(self):
+        # При передаче в другой процесс (pickle) не тянем весь общий буфер
+        column = self.compact()
+        return column.offsets, column.data, column.encoding
+
+    def __setstate__(self, state):
+        self.offsets, self.data, self.encoding = state
+
+
+class FixedColumn:
+    """ASCII-строки фиксированной ширины (массив NumPy dtype S<k>).
+
+    Значения короче ширины дополняются нулевыми байтами, которые NumPy
+    отбрасывает при чтении.
+    """
+
+    __slots__ = ('array',)
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    @property
+    def nbytes(self):
+        return self.array.nbytes
+
+    def value(self, index):
+        return self.array[index].decode('ascii')
+
+    def values(self):
+        return self.array.astype(f'U{self.array.dtype.itemsize}').tolist()
+
+    def slice(self, start, stop):
+        return FixedColumn(self.array[start:stop])
+
+    def take(self, indexes):
+        return FixedColumn(self.array[indexes])
+
+    @staticmethod
+    def concat(columns):
+        import numpy as np
+        return FixedColumn(np.concatenate([column.array for column in columns]))
+
+    def as_string_column(self):
+        import numpy as np
+        array = np.ascontiguousarray(self.array)
+        width = array.dtype.itemsize
+        lengths = np.char.str_len(array)
+        matrix = array.view(np.uint8).reshape(len(array), width)
+        # Байты значений без нулевого дополнения, подряд
+        data = matrix[np.arange(width) < lengths[:, None]]
+        return StringColumn(_offsets_from_lengths(lengths), data)
+
+    def to_arrow(self):
+        return self.as_string_column().to_arrow()
+
+
+def string_column(strings):
+    """Самая компактная колонка для строк: FixedColumn или StringColumn."""
+    import numpy as np
+    strings = list(strings)
+    if strings and ''.join(strings).isascii():
+        width = max(map(len, strings))
+        total = sum(map(len, strings))
+        # Смещения стоят 4 байта на строку (int32), нулевое дополнение — width - len
+        if width * len(strings) <= total + 4 * len(strings):
+            return FixedColumn(np.array(strings, dtype=f'S{max(width, 1)}'))
+    return StringColumn.from_strings(strings)
+
+
+class CategoryColumn:
+    """Повторяющиеся значения: коды uint8 и кортеж значений categories."""
+
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = tuple(categories)
+
+    @classmethod
+    def from_values(cls, values, categories=None):
+        """Колонка из последовательности str (categories — в порядке появления)."""
+        import numpy as np
+        index = {value: code for code, value in enumerate(categories or ())}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                            dtype=np.int64)
+        if len(index) > 256:
+            raise ValueError("Категорий больше 256: используйте StringColumn")
+        return cls(codes.astype(np.uint8), index)
+
+    @classmethod
+    def constant(cls, value, n):
+        """Колонка из n одинаковых значений (коды не занимают памяти)."""
+        import numpy as np
+        return cls(np.broadcast_to(np.uint8(0), (n,)), (value,))
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self):
+        # У constant-колонки коды — представление одного байта (шаг 0)
+        return self.codes.nbytes if self.codes.strides != (0,) else self.codes.itemsize
+
+    def value(self, index):
+        return self.categories[self.codes[index]]
+
+    def values(self):
+        categories = self.categories
+        return [categories[code] for code in self.codes.tolist()]
+
+    def slice(self, start, stop):
+        return CategoryColumn(self.codes[start:stop], self.categories)
+
+    def take(self, indexes):
+        return CategoryColumn(self.codes[indexes], self.categories)
+
+    @staticmethod
+    def concat(columns):
+        import numpy as np
+        categories = columns[0].categories
+        if all(column.categories == categories for column in columns):
+            return CategoryColumn(np.concatenate([column.codes for column in columns]), categories)
+        index = {}
+        parts = []
+        for column in columns:
+            remap = np.array([index.setdefault(value, len(index)) for value in column.categories],
+                             dtype=np.int64)
+            parts.append(remap[column.codes])
+        if len(index) > 256:
+            raise ValueError("Категорий больше 256: используйте StringColumn")
+        return CategoryColumn(np.concatenate(parts).astype(np.uint8), index)
+
+    def as_string_column(self):
+        return StringColumn.from_strings(self.values())
+
+    def to_arrow(self):
+        import pyarrow
+        return pyarrow.array(self.categories, pyarrow.string()).take(pyarrow.array(self.codes))
+
+
+class Row(Mapping):
+    """Представление одной записи набора: словарь только для чтения.
+
+    Хранит лишь ссылку на набор и номер строки; значения читаются из колонок
+    при обращении. dict(row) дает обычный словарь.
+    """
+
+    __slots__ = ('_dataset', '_index')
+
+    def __init__(self, dataset, index):
+        self._dataset = dataset
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._dataset.columns[name].value(self._index)
+
+    def __iter__(self):
+        return iter(self._dataset.columns)
+
+    def __len__(self):
+        return len(self._dataset.columns)
+
+    def __repr__(self):
+        return f"Row({dict(self)!r})"
+
+
+class Dataset:
+    """Набор записей с одинаковыми полями, по колонке на поле.
+
+    columns — словарь имя поля -> колонка (StringColumn, FixedColumn,
+    CategoryColumn) одинаковой длины; порядок задает порядок полей.
+    """
+
+    __slots__ = ('columns',)
+
+    def __init__(self, columns):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Колонки набора должны быть одной длины")
+        self.columns = dict(columns)
+
+    @classmethod
+    def from_records(cls, records, fields=None):
+        """Набор из последовательности словарей (все значения — строки)."""
+        records = list(records)
+        if fields is None:
+            fields = tuple(records[0]) if records else ()
+        return cls({field: StringColumn.from_strings([record[field] for record in records])
+                    for field in fields})
+
+    @property
+    def fields(self):
+        return tuple(self.columns)
+
+    def __len__(self):
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    @property
+    def nbytes(self):
+        """Размер данных всех колонок в байтах."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def column(self, name):
+        return self.columns[name]
+
+    def values(self, name):
+        """Значения поля name списком str."""
+        return self.columns[name].values()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Поддерживаются только срезы с шагом 1")
+            stop = max(start, stop)
+            return Dataset({name: column.slice(start, stop) for name, column in self.columns.items()})
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Номер записи вне набора")
+        return Row(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Row(self, index)
+
+    def take(self, indexes):
+        """Новый набор из записей с номерами indexes (с копированием)."""
+        import numpy as np
+        indexes = np.asarray(indexes, dtype=np.int64)
+        return Dataset({name: column.take(indexes) for name, column in self.columns.items()})
+
+    def to_dicts(self):
+        """Материализует набор в список словарей."""
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in zip(*(self.values(field) for field in fields))]
+
+    def to_arrow(self, fields=None):
+        """Таблица pyarrow из колонок набора (строки без разбора по записям)."""
+        import pyarrow
+        fields = self.fields if fields is None else tuple(fields)
+        return pyarrow.Table.from_arrays([self.columns[field].to_arrow() for field in fields],
+                                         names=list(fields))
+
+    def __eq__(self, other):
+        if not isinstance(other, Dataset):
+            return NotImplemented
+        return (self.fields == other.fields and len(self) == len(other)
+                and all(self.values(field) == other.values(field) for field in self.fields))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Dataset({len(self)} записей, поля: {', '.join(self.fields)})"
+
+
+def concat_datasets(datasets):
+    """Объединяет наборы с одинаковыми полями в один (с копированием)."""
+    datasets = list(datasets)
+    # Пустые наборы не влияют на результат, но задают поля, если других нет
+    datasets = [dataset for dataset in datasets if len(dataset)] or datasets[:1]
+    if not datasets:
+        return Dataset({})
+    fields = datasets[0].fields
+    if any(dataset.fields != fields for dataset in datasets):
+        raise ValueError("У объединяемых наборов разные поля")
+    columns = {}
+    for field in fields:
+        parts = [dataset.columns[field] for dataset in datasets]
+        kind = type(parts[0])
+        if any(type(part) is not kind for part in parts):
+            # Раскладка колонки выбирается по каждой порции (string_column) и
+            # может различаться: общий знаменатель — StringColumn
+            kind = StringColumn
+            parts = [part.as_string_column() for part in parts]
+        columns[field] = kind.concat(parts)
+    return Dataset(columns)
@@ -0,0 +1,63 @@
+# dispatcher.py
+"""Вынос CPU-нагруженной генерации из цикла событий бота в пул исполнителей.
+
+Вызовы генераторов выполняются через loop.run_in_executor в пуле потоков или
+процессов. Одновременно выполняется не больше max_concurrency задач, а если
+в очереди уже ждут max_pending задач, новая отклоняется с DispatcherBusy
+(backpressure), чтобы очередь не росла бесконечно.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+
+class DispatcherBusy(RuntimeError):
+    """Очередь генерации переполнена — запрос стоит повторить позже."""
+
+
+class GenerationDispatcher:
+    """Запускает функции генерации в пуле потоков или процессов."""
+
+    def __init__(self, executor='thread', max_workers=None, max_concurrency=None, max_pending=None):
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(f"Неизвестный тип исполнителя: {executor}")
+        max_workers = max_workers or os.cpu_count() or 1
+        if executor == 'thread':
+            self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='generation')
+        else:
+            # Для процессов функции и аргументы должны сериализоваться pickle
+            self._executor = ProcessPoolExecutor(max_workers)
+        self.max_concurrency = max_concurrency or max_workers
+        self.max_pending = max_pending
+        self.running = 0
+        self.waiting = 0
+        # Семафор создается внутри работающего цикла событий
+        self._semaphore = None
+
+    async def run(self, func, *args, **kwargs):
+        """Выполняет func(*args, **kwargs) в пуле и возвращает результат."""
+        if self.max_pending is not None and self.waiting >= self.max_pending:
+            raise DispatcherBusy("Слишком много запросов на генерацию")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def shutdown(self, wait=True):
+        """Останавливает пул исполнителей."""
+        self._executor.shutdown(wait=wait)
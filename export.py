@@ -0,0 +1,354 @@
+# export.py
+"""Потоковая выгрузка сгенерированных записей в CSV / JSON Lines / Parquet.
+
+Записи генерируются и пишутся порциями, поэтому потребление памяти не зависит
+от общего количества строк. Пример запуска:
+    python -m export ru 1000000 people.csv
+    python -m export card 50000000 cards.jsonl --chunk-size 100000
+    python -m export en 10000000 people.csv --seed 42 --workers 8
+    python -m export email 1000000 emails.csv.gz
+    python -m export card 100000000 cards.csv.gz --unique --seed 1
+    python -m export ru 10000000 people.csv --corpus corpus.bin
+    python -m export card 1000000 cards.csv --seed 42 --cache gen-cache.sqlite
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+import config
+from cache import GenerationCache
+from corpus import open_corpus
+from dataset import Dataset
+from generators import (
+    generate_name_addresses,
+    generate_credit_cards,
+    generate_temp_emails,
+    temp_email_dataset
+)
+from locales import locale_registry
+from parallel import iter_parallel_chunks
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PERSON_FIELDS = ('full_name', 'address', 'phone', 'locale')
+
+# Поля выгружаемых записей для каждого вида данных: ФИО и адрес — для каждой
+# зарегистрированной локали (ru, en, de, ...), а также карты и email
+RECORD_FIELDS = {
+    **{code: PERSON_FIELDS for code in locale_registry.codes()},
+    'card': ('number', 'type', 'expiry', 'cvv'),
+    'email': ('email',),
+}
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Сжатие файла: для CSV/JSONL — весь поток, для Parquet — встроенное сжатие колонок
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Размер буфера файла: пишем на диск крупными блоками
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+class MissingDependency(RuntimeError):
+    """Для выбранного формата или сжатия не установлена необязательная зависимость."""
+
+
+def iter_chunks(kind, count, chunk_size=DEFAULT_CHUNK_SIZE, corpus_path=None):
+    """Порции записей (колоночные наборы dataset.Dataset) общим объемом count штук.
+
+    corpus_path — файл корпуса ФИО и адресов (см. corpus.py) вместо Faker.
+    """
+    if kind not in RECORD_FIELDS:
+        raise ValueError(f"Неизвестный вид данных: {kind}")
+    if chunk_size <= 0:
+        raise ValueError("Размер блока должен быть положительным")
+    corpus = open_corpus(corpus_path) if corpus_path else None
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        if kind == 'card':
+            # Для карт используем пакетный генератор — он на порядок быстрее
+            yield generate_credit_cards(size).to_dataset()
+        elif kind == 'email':
+            yield temp_email_dataset(generate_temp_emails(size))
+        else:
+            yield generate_name_addresses(size, kind, corpus)
+
+
+def chunk_rows(records, fields):
+    """Значения полей fields по записям порции (списка словарей или Dataset)."""
+    if isinstance(records, Dataset):
+        # Колонки декодируются целиком: это быстрее обращений к каждой записи
+        return zip(*(records.values(field) for field in fields))
+    return ([record[field] for field in fields] for record in records)
+
+
+def open_text_output(path, compression=None):
+    """Открывает текстовый файл для записи с необязательным сжатием.
+
+    zstd требует необязательную зависимость zstandard.
+    """
+    if compression in (None, 'none'):
+        return open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise MissingDependency("Для сжатия zstd установите zstandard: pip install zstandard") from exc
+        return zstandard.open(path, 'wt', encoding='utf-8', newline='')
+    raise ValueError(f"Неподдерживаемое сжатие: {compression}")
+
+
+class CsvExportWriter:
+    """Запись порций в CSV с заголовком."""
+
+    def __init__(self, path, fields, compression=None):
+        self.fields = fields
+        self.file = open_text_output(path, compression)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(fields)
+
+    def write_chunk(self, records):
+        self.writer.writerows(chunk_rows(records, self.fields))
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlExportWriter:
+    """Запись порций в JSON Lines (одна запись — одна строка)."""
+
+    def __init__(self, path, fields, compression=None):
+        self.fields = fields
+        self.file = open_text_output(path, compression)
+
+    def write_chunk(self, records):
+        fields = self.fields
+        self.file.write(''.join(
+            json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+            for row in chunk_rows(records, fields)
+        ))
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExportWriter:
+    """Запись порций в Parquet (каждая порция — отдельная row group).
+
+    Требует необязательную зависимость pyarrow.
+    """
+
+    def __init__(self, path, fields, compression=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise MissingDependency("Для выгрузки в Parquet установите pyarrow: pip install pyarrow") from exc
+
+        self.pa = pyarrow
+        self.fields = fields
+        self.schema = pyarrow.schema([(field, pyarrow.string()) for field in fields])
+        options = {} if compression is None else {'compression': compression}
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, **options)
+
+    def write_chunk(self, records):
+        if isinstance(records, Dataset):
+            # Колонки набора передаются в Arrow буферами, без разбора по записям
+            self.writer.write_table(records.to_arrow(self.fields).cast(self.schema))
+            return
+        columns = [[record[field] for record in records] for field in self.fields]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'jsonl': JsonlExportWriter,
+    'parquet': ParquetExportWriter,
+}
+
+
+class ExportProgress:
+    """Счетчик записанных строк для отображения прогресса.
+
+    Передается в export_records как progress; обновляется после каждой порции.
+    """
+
+    def __init__(self):
+        self.rows = 0
+
+    def __call__(self, rows):
+        self.rows = rows
+
+
+@dataclass
+class ExportStats:
+    """Итоги выгрузки."""
+    rows: int
+    seconds: float
+    peak_rss_bytes: int = None
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        text = f"{self.rows} строк за {self.seconds:.2f} с ({self.rows_per_sec:,.0f} строк/с)"
+        if self.peak_rss_bytes is not None:
+            text += f", пиковый RSS: {self.peak_rss_bytes / (1 << 20):.1f} МБ"
+        return text
+
+
+def peak_rss_bytes():
+    """Пиковый размер резидентной памяти процесса (None, если недоступно)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS — байты
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def detect_compression(path):
+    """Определяет сжатие по суффиксу файла (.gz, .zst)."""
+    suffix = os.path.splitext(path)[1].lower()
+    for compression, compression_suffix in COMPRESSION_SUFFIXES.items():
+        if suffix == compression_suffix:
+            return compression
+    return None
+
+
+def detect_format(path):
+    """Определяет формат по расширению файла (с учетом суффикса сжатия)."""
+    if detect_compression(path) is not None:
+        path = os.path.splitext(path)[0]
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension == 'json':
+        extension = 'jsonl'
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Не удалось определить формат по имени файла: {path}")
+    return extension
+
+
+def write_chunks(chunks, path, fields, fmt, compression=None, progress=None):
+    """Пишет поток порций в файл и возвращает количество строк.
+
+    progress — необязательная функция, получающая число записанных строк
+    после каждой порции.
+    """
+    writer = EXPORT_WRITERS[fmt](path, fields, compression)
+    rows = 0
+    try:
+        for chunk in chunks:
+            writer.write_chunk(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    finally:
+        writer.close()
+    return rows
+
+
+def export_records(kind, count, path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   seed=None, workers=None, compression=None, progress=None, unique=False,
+                   corpus_path=None, cache=None):
+    """Генерирует count записей вида kind и потоково пишет их в path.
+
+    Если задан seed или workers, генерация идет блоками по chunk_size на пуле
+    процессов (см. parallel.py), и при одном seed файл получается одинаковым
+    независимо от количества процессов. compression ('gzip', 'zstd', 'none')
+    для CSV и JSONL по умолчанию определяется по суффиксу файла; Parquet
+    сжимается внутри файла, и для него суффикс .gz/.zst — ошибка, а сжатие
+    задается только параметром. unique=True — без повторов
+    номеров карт, адресов email и ФИО (без seed берется случайный).
+    corpus_path — файл корпуса (corpus.py): ФИО и адреса без Faker.
+    cache (cache.GenerationCache) используется только с заданным seed: блоки
+    повторных выгрузок читаются из кеша, а не генерируются заново.
+    Возвращает ExportStats со скоростью и пиковым потреблением памяти.
+    """
+    if kind not in RECORD_FIELDS:
+        raise ValueError(f"Неизвестный вид данных: {kind}")
+    if chunk_size <= 0:
+        # Проверяем до создания файла: иначе остался бы пустой файл «на 0 строк»
+        raise ValueError("Размер блока должен быть положительным")
+    fmt = fmt or detect_format(path)
+    if fmt not in EXPORT_WRITERS:
+        raise ValueError(f"Неподдерживаемый формат: {fmt}")
+    if compression is None:
+        compression = detect_compression(path)
+        if compression is not None and fmt == 'parquet':
+            # Иначе out.parquet.gz оказался бы обычным Parquet с внутренним gzip
+            raise ValueError(
+                f"Суффикс {COMPRESSION_SUFFIXES[compression]} не подходит для Parquet: файл сжимается "
+                f"внутри, уберите суффикс и задайте сжатие параметром compression"
+            )
+    if compression == 'none':
+        compression = None
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Неподдерживаемое сжатие: {compression}")
+
+    if seed is None:
+        # Случайный набор больше никогда не запросят — кешировать его незачем
+        cache = None
+    if unique:
+        if seed is None:
+            seed = random.getrandbits(63)
+        chunks = iter_parallel_chunks(kind, count, seed, workers, chunk_size, unique=True,
+                                      corpus_path=corpus_path, cache=cache)
+    elif seed is not None or workers is not None:
+        chunks = iter_parallel_chunks(kind, count, seed or 0, workers, chunk_size, corpus_path=corpus_path,
+                                      cache=cache)
+    else:
+        chunks = iter_chunks(kind, count, chunk_size, corpus_path)
+
+    start = time.perf_counter()
+    rows = write_chunks(chunks, path, RECORD_FIELDS[kind], fmt, compression, progress)
+    return ExportStats(rows, time.perf_counter() - start, peak_rss_bytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка тестовых данных")
+    parser.add_argument('kind', choices=sorted(RECORD_FIELDS), help="вид данных")
+    parser.add_argument('count', type=int, help="количество записей")
+    parser.add_argument('path', help="файл для записи")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help="формат (по умолчанию — по расширению)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="размер порции")
+    parser.add_argument('--compression', choices=COMPRESSIONS,
+                        help="сжатие (по умолчанию — по суффиксу .gz/.zst)")
+    parser.add_argument('--seed', type=int, help="master seed для воспроизводимой генерации")
+    parser.add_argument('--workers', type=int, help="количество процессов генерации")
+    parser.add_argument('--unique', action='store_true', help="без повторяющихся значений")
+    parser.add_argument('--corpus', help="файл корпуса ФИО и адресов (python -m corpus build)")
+    parser.add_argument('--cache', default=config.CACHE_PATH,
+                        help="файл постоянного кеша блоков (используется вместе с --seed)")
+    args = parser.parse_args(argv)
+
+    cache = GenerationCache(args.cache) if args.cache and args.seed is not None else None
+    try:
+        stats = export_records(args.kind, args.count, args.path, args.format, args.chunk_size,
+                               args.seed, args.workers, args.compression, unique=args.unique,
+                               corpus_path=args.corpus, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    print(stats, file=sys.stderr)
+    return stats
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,511 @@
+# fuzz.py
+"""Комбинаторный перебор граничных значений и фаззинг-строк.
+
+Пространство случаев (CaseSpace) — декартово произведение осей: длина,
+символ-заполнитель, категория Unicode, кодировка, контекст, полезная
+нагрузка. Случаи строятся лениво: обход, доступ по номеру (номер — число в
+смешанной системе счисления по размерам осей) и случайная выборка не
+материализуют произведение, поэтому миллионы случаев можно подавать в тесты
+потоком. Дополнительно:
+
+* дедупликация по значению (deduplicate) — через unique.SeenSet, 8 байт на
+  значение вместо самой строки;
+* покрывающие наборы силы t (CaseSpace.covering): каждая комбинация значений
+  любых t осей встречается хотя бы в одном случае; при t=2 (pairwise) это
+  десятки случаев вместо тысяч;
+* оценки размера: полное произведение и нижняя граница покрывающего набора.
+
+Пример:
+    space = fuzz_space('injection')
+    space.size                              # 2376
+    for case in space.covering(2):          # ~300 случаев
+        check(case.value)
+
+Запуск из корня проекта:
+    python -m fuzz list
+    python -m fuzz dump injection --strength 2 --unique > cases.jsonl
+"""
+import argparse
+import base64
+import itertools
+import json
+import math
+import random
+import sys
+from collections import namedtuple
+from urllib.parse import quote
+
+from boundary import boundary_strings
+from unique import SeenSet
+
+# Ограничения длины, вокруг которых строятся значения (0, 1, N-1, N, N+1)
+LENGTH_LIMITS = (255, 1000, 65535)
+
+# Размер партии при дедупликации: хеши считаются и проверяются пачкой
+DEDUP_BATCH_SIZE = 1024
+
+# Сколько строк-кандидатов сравнивается при построении покрывающего набора
+COVERING_CANDIDATES = 8
+
+FuzzCase = namedtuple('FuzzCase', ['space', 'index', 'value', 'params'])
+FuzzCase.__doc__ = """Случай: номер в пространстве, строка и метки значений осей."""
+
+# Заполнители длинных строк: длина считается в кодовых точках, а в байтах
+# UTF-8 (или единицах UTF-16) одна и та же длина выходит разной
+FILLERS = {
+    'ascii': 'A',
+    'cyrillic': 'Я',       # 2 байта UTF-8
+    'cjk': '你',            # 3 байта UTF-8
+    'emoji': '🐉',          # 4 байта UTF-8, суррогатная пара в UTF-16
+    'combining': '\u0438\u0306',  # «й» из двух кодовых точек
+    'space': ' ',
+}
+
+# Последний символ строки: проверка обрезки пробелов и нулевого байта
+TAILS = {'none': None, 'space': ' ', 'newline': '\n', 'nul': '\x00'}
+
+# По символу на каждую общую категорию Unicode (unicodedata.category)
+UNICODE_CATEGORIES = {
+    'Lu': 'Ж', 'Ll': 'ж', 'Lt': 'ǅ', 'Lm': 'ʰ', 'Lo': '你',
+    'Mn': '\u0301', 'Mc': '\u0903', 'Me': '\u20dd',
+    'Nd': '٣', 'Nl': 'Ⅻ', 'No': '½',
+    'Pc': '‿', 'Pd': '—', 'Ps': '「', 'Pe': '」', 'Pi': '«', 'Pf': '»', 'Po': '¡',
+    'Sm': '∑', 'Sc': '€', 'Sk': '˜', 'So': '🌍',
+    'Zs': '\xa0', 'Zl': '\u2028', 'Zp': '\u2029',
+    'Cc': '\x00', 'Cf': '\u202e', 'Co': '\ue000', 'Cs': '\ud800', 'Cn': '\uffff',
+}
+
+# Положение символа в строке: (префикс, суффикс)
+POSITIONS = {
+    'alone': ('', ''),
+    'prefix': ('', 'test'),
+    'suffix': ('test', ''),
+    'inside': ('te', 'st'),
+}
+
+# Контексты полезной нагрузки: (префикс, суффикс)
+CONTEXTS = {
+    'bare': ('', ''),
+    'single_quoted': ("'", "'"),
+    'double_quoted': ('"', '"'),
+    'after_value': ('test', ''),
+    'html_attribute': ('<input value="', '">'),
+    'json_string': ('{"q": "', '"}'),
+    'url_param': ('?q=', '&page=1'),
+    'comment': ('/*', '*/'),
+    'new_line': ('\n', '\n'),
+}
+
+INJECTION_PAYLOADS = {
+    'sql': (
+        "' OR '1'='1' --", '" OR ""="', "1; DROP TABLE users --",
+        "' UNION SELECT NULL, NULL --", "1' AND SLEEP(5) --",
+    ),
+    'xss': (
+        '<script>alert(1)</script>', '"><img src=x onerror=alert(1)>', 'javascript:alert(1)',
+        '<svg/onload=alert(1)>', "'-alert(1)-'",
+    ),
+    'command': ('; id', '| id', '$(id)', '`id`', '&& id'),
+    'path': ('../../../../etc/passwd', '..\\..\\..\\windows\\win.ini', '/etc/passwd\x00.png'),
+    'template': ('{{7*7}}', '${7*7}', '<%= 7*7 %>', '#{7*7}'),
+    'nosql': ('{"$gt": ""}', '{"$ne": null}', "'; return true; var x='"),
+    'ldap': ('*)(uid=*))(|(uid=*', 'admin*)((|userPassword=*)'),
+    'format': ('%s%s%s%s', '%x%x%x%n', '{0.__class__}'),
+    'crlf': ('test\r\nSet-Cookie: injected=1', 'test\rX-Injected: 1'),
+    'xxe': ('<?xml version="1.0"?><!DOCTYPE x [<!ENTITY e SYSTEM "file:///etc/passwd">]><x>&e;</x>',),
+}
+
+
+def _escape_chars(value, escape):
+    return ''.join(char if char.isascii() and char.isalnum() else escape(char) for char in value)
+
+
+def _js_escape(char):
+    encoded = char.encode('utf-16-be', 'surrogatepass')
+    return ''.join(f'\\u{encoded[i]:02x}{encoded[i + 1]:02x}' for i in range(0, len(encoded), 2))
+
+
+def _fullwidth(value):
+    # ASCII 0x21-0x7E -> U+FF01-U+FF5E: после NFKC снова становится ASCII
+    return ''.join(chr(ord(char) + 0xFEE0) if '!' <= char <= '~' else char for char in value)
+
+
+# Кодировки, в которых нагрузка доходит до приложения
+ENCODINGS = {
+    'raw': lambda value: value,
+    'url': lambda value: quote(value, safe='', errors='surrogatepass'),
+    'double_url': lambda value: quote(quote(value, safe='', errors='surrogatepass'), safe=''),
+    'html_entities': lambda value: _escape_chars(value, lambda char: f'&#{ord(char)};'),
+    'js_escape': lambda value: _escape_chars(value, _js_escape),
+    'fullwidth': _fullwidth,
+    'mojibake': lambda value: value.encode('utf-8', 'surrogatepass').decode('latin-1'),
+    'base64': lambda value: base64.b64encode(value.encode('utf-8', 'surrogatepass')).decode('ascii'),
+}
+
+
+def boundary_lengths(limits=LENGTH_LIMITS):
+    """Длины вокруг ограничений: 0, 1, N-1, N, N+1 для каждого N."""
+    return tuple(sorted({max(length, 0) for limit in limits
+                         for length in (0, 1, limit - 1, limit, limit + 1)}))
+
+
+class CaseSpace:
+    """Декартово произведение осей и функция сборки строки из значений осей.
+
+    axes — {имя оси: {метка: значение}} (или последовательность значений,
+    тогда метки совпадают со значениями). build(**значения) -> строка.
+    Номер случая — число в смешанной системе счисления, последняя ось
+    меняется быстрее всех (как в itertools.product).
+    """
+
+    def __init__(self, name, axes, build, description=''):
+        self.name = name
+        self.description = description
+        self.build = build
+        self.axis_names = tuple(axes)
+        self.labels = []
+        self.values = []
+        for axis, choices in axes.items():
+            if not hasattr(choices, 'items'):
+                choices = {choice: choice for choice in choices}
+            if not choices:
+                raise ValueError(f"Ось {axis} пустая")
+            self.labels.append(tuple(choices))
+            self.values.append(tuple(choices.values()))
+        self.labels = tuple(self.labels)
+        self.values = tuple(self.values)
+        self.sizes = tuple(len(values) for values in self.values)
+
+    @property
+    def size(self):
+        """Количество случаев (полное произведение осей)."""
+        return math.prod(self.sizes)
+
+    def __len__(self):
+        # len() ограничен sys.maxsize; для огромных пространств есть size
+        return self.size
+
+    def __repr__(self):
+        axes = ' × '.join(f'{axis}[{size}]' for axis, size in zip(self.axis_names, self.sizes))
+        return f"CaseSpace({self.name!r}: {axes} = {self.size})"
+
+    def index_of(self, positions):
+        """Номер случая по позициям значений на осях."""
+        index = 0
+        for position, size in zip(positions, self.sizes):
+            index = index * size + position
+        return index
+
+    def positions_of(self, index):
+        """Позиции значений на осях по номеру случая."""
+        positions = []
+        for size in reversed(self.sizes):
+            index, position = divmod(index, size)
+            positions.append(position)
+        return positions[::-1]
+
+    def case(self, positions, index=None):
+        """Случай по позициям значений на осях."""
+        values = {axis: self.values[number][position]
+                  for number, (axis, position) in enumerate(zip(self.axis_names, positions))}
+        params = {axis: self.labels[number][position]
+                  for number, (axis, position) in enumerate(zip(self.axis_names, positions))}
+        if index is None:
+            index = self.index_of(positions)
+        return FuzzCase(self.name, index, self.build(**values), params)
+
+    def __getitem__(self, index):
+        size = self.size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"Номер случая вне диапазона [0, {size})")
+        return self.case(self.positions_of(index), index)
+
+    def __iter__(self):
+        for index, positions in enumerate(itertools.product(*map(range, self.sizes))):
+            yield self.case(positions, index)
+
+    def sample(self, n, seed=None):
+        """n случаев без повторов номеров; номера выбираются без материализации."""
+        rng = random.Random(seed)
+        size = self.size
+        if size <= sys.maxsize:
+            indexes = rng.sample(range(size), n)
+        else:
+            # range длиннее sys.maxsize не поддерживает len(): выборка с отбраковкой
+            # повторов, которые при таком размере почти не встречаются
+            indexes = {}
+            while len(indexes) < n:
+                indexes.setdefault(rng.randrange(size))
+        for index in indexes:
+            yield self[index]
+
+    def restrict(self, **selected):
+        """Подпространство: для указанных осей остаются только перечисленные метки."""
+        axes = {}
+        for number, axis in enumerate(self.axis_names):
+            pairs = dict(zip(self.labels[number], self.values[number]))
+            if axis in selected:
+                unknown = set(selected[axis]) - set(pairs)
+                if unknown:
+                    raise ValueError(f"Ось {axis}: неизвестные метки {sorted(map(str, unknown))}")
+                pairs = {label: pairs[label] for label in selected[axis]}
+            axes[axis] = pairs
+        unknown_axes = set(selected) - set(self.axis_names)
+        if unknown_axes:
+            raise ValueError(f"Неизвестные оси: {', '.join(sorted(unknown_axes))}")
+        return CaseSpace(self.name, axes, self.build, self.description)
+
+    def covering_lower_bound(self, strength=2):
+        """Нижняя граница размера покрывающего набора силы strength."""
+        strength = min(strength, len(self.sizes))
+        return math.prod(sorted(self.sizes, reverse=True)[:strength])
+
+    def covering(self, strength=2, seed=0):
+        """Покрывающий набор силы strength (pairwise при 2), выдается лениво.
+
+        Жадный алгоритм в духе AETG: каждая новая строка начинается с еще не
+        покрытой комбинации, остальные оси заполняются значениями, которые
+        покрывают больше всего новых комбинаций; из COVERING_CANDIDATES
+        кандидатов берется лучший. Размер обычно на 10–40% больше нижней
+        границы covering_lower_bound. При strength не меньше числа осей
+        выдается все пространство.
+        """
+        if strength < 1:
+            raise ValueError("Сила покрытия должна быть не меньше 1")
+        axes_count = len(self.sizes)
+        if strength >= axes_count:
+            yield from self
+            return
+
+        rng = random.Random(seed)
+        combos = list(itertools.combinations(range(axes_count), strength))
+        uncovered = {
+            combo: set(itertools.product(*(range(self.sizes[axis]) for axis in combo)))
+            for combo in combos
+        }
+        combos_by_axis = {axis: [combo for combo in combos if axis in combo]
+                          for axis in range(axes_count)}
+
+        def gain(row, axis, position):
+            count = 0
+            for combo in combos_by_axis[axis]:
+                key = []
+                for other in combo:
+                    value = position if other == axis else row[other]
+                    if value is None:
+                        break
+                    key.append(value)
+                else:
+                    count += tuple(key) in uncovered[combo]
+            return count
+
+        while True:
+            remaining = [combo for combo in combos if uncovered[combo]]
+            if not remaining:
+                return
+            seed_combo = max(remaining, key=lambda combo: len(uncovered[combo]))
+            seed_values = min(uncovered[seed_combo])
+
+            best_row = None
+            best_covered = -1
+            for _ in range(COVERING_CANDIDATES):
+                row = [None] * axes_count
+                for axis, position in zip(seed_combo, seed_values):
+                    row[axis] = position
+                free = [axis for axis in range(axes_count) if row[axis] is None]
+                rng.shuffle(free)
+                for axis in free:
+                    gains = [gain(row, axis, position) for position in range(self.sizes[axis])]
+                    top = max(gains)
+                    row[axis] = rng.choice([position for position, value in enumerate(gains)
+                                            if value == top])
+                covered = sum(tuple(row[axis] for axis in combo) in uncovered[combo]
+                              for combo in combos)
+                if covered > best_covered:
+                    best_row, best_covered = row, covered
+
+            for combo in combos:
+                uncovered[combo].discard(tuple(best_row[axis] for axis in combo))
+            yield self.case(best_row)
+
+
+def deduplicate(cases, capacity, batch_size=DEDUP_BATCH_SIZE):
+    """Случаи без повторов значения (первый экземпляр остается), лениво.
+
+    capacity — сколько уникальных значений может встретиться (размер таблицы
+    unique.SeenSet выделяется сразу); при переполнении — UniqueSpaceExhausted.
+    """
+    seen = SeenSet(max(capacity, 1))
+    iterator = iter(cases)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        fresh = seen.add_many([case.value for case in batch])
+        yield from itertools.compress(batch, fresh.tolist())
+
+
+# --- Готовые пространства ----------------------------------------------------
+
+def _build_length(length, filler, tail):
+    value = (filler * (length // len(filler) + 1))[:length]
+    if tail is not None and length:
+        value = value[:-1] + tail
+    return value
+
+
+def _build_unicode(char, position, repeat):
+    prefix, suffix = position
+    return prefix + char * repeat + suffix
+
+
+def _build_payload(payload, context, encoding):
+    prefix, suffix = context
+    return encoding(prefix + payload + suffix)
+
+
+def _flat_payloads(payloads=None):
+    """{семейство: варианты} -> {'семейство.номер': нагрузка}."""
+    payloads = INJECTION_PAYLOADS if payloads is None else payloads
+    return {f'{family}.{number}': payload for family, variants in payloads.items()
+            for number, payload in enumerate(variants)}
+
+
+def length_space(limits=LENGTH_LIMITS):
+    """Длины вокруг ограничений × заполнители × последний символ."""
+    return CaseSpace(
+        'length',
+        {'length': boundary_lengths(limits), 'filler': FILLERS, 'tail': TAILS},
+        _build_length,
+        "Длины 0, 1, N-1, N, N+1 строками из символов разной ширины",
+    )
+
+
+def unicode_space():
+    """Символ каждой категории Unicode в разных положениях строки."""
+    return CaseSpace(
+        'unicode',
+        {'char': UNICODE_CATEGORIES, 'position': POSITIONS, 'repeat': (1, 2, 64)},
+        _build_unicode,
+        "Общие категории Unicode, включая управляющие, суррогаты и неназначенные",
+    )
+
+
+def injection_space(payloads=None):
+    """Нагрузки инъекций × контексты × кодировки."""
+    return CaseSpace(
+        'injection',
+        {'payload': _flat_payloads(payloads), 'context': CONTEXTS, 'encoding': ENCODINGS},
+        _build_payload,
+        "Нагрузки SQL, XSS, команд и др. в разных контекстах и кодировках",
+    )
+
+
+def _build_mixed(payload, char, context, encoding):
+    middle = len(payload) // 2
+    prefix, suffix = context
+    return encoding(prefix + payload[:middle] + char + payload[middle:] + suffix)
+
+
+def mixed_space(payloads=None):
+    """Нагрузки со вставленным символом каждой категории Unicode × контексты × кодировки.
+
+    Самое большое из готовых пространств (десятки тысяч случаев): его имеет
+    смысл обходить покрывающим набором или выборкой.
+    """
+    return CaseSpace(
+        'mixed',
+        {'payload': _flat_payloads(payloads), 'char': UNICODE_CATEGORIES, 'context': CONTEXTS, 'encoding': ENCODINGS},
+        _build_mixed,
+        "Нагрузки инъекций, разорванные символами Unicode (обход фильтров)",
+    )
+
+
+def catalog_space(category=None):
+    """Записи каталога boundary.py × контексты × кодировки."""
+    items = boundary_strings(category)
+    return CaseSpace(
+        'catalog',
+        {'payload': {f'{item.category}.{number}': item.value for number, item in enumerate(items)},
+         'context': CONTEXTS, 'encoding': ENCODINGS},
+        _build_payload,
+        "Каталог граничных строк (включая загруженные наборы) в контекстах и кодировках",
+    )
+
+
+# Пространства по имени; фабрики вызываются при каждом запросе, поэтому
+# catalog_space видит записи, добавленные в каталог позже
+SPACE_FACTORIES = {
+    'length': length_space,
+    'unicode': unicode_space,
+    'injection': injection_space,
+    'mixed': mixed_space,
+    'catalog': catalog_space,
+}
+
+
+def register_space(name, factory):
+    """Добавляет фабрику пространства (без аргументов) под именем name."""
+    SPACE_FACTORIES[name] = factory
+
+
+def fuzz_space(name):
+    """Пространство случаев по имени."""
+    try:
+        factory = SPACE_FACTORIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестное пространство: {name}") from None
+    return factory()
+
+
+def expand(names=None, strength=None, unique=False, seed=0):
+    """Поток случаев нескольких пространств подряд.
+
+    strength — сила покрывающего набора (None — все случаи); unique — без
+    повторов значения в пределах всего потока.
+    """
+    spaces = [fuzz_space(name) for name in (names or SPACE_FACTORIES)]
+    streams = (space if strength is None else space.covering(strength, seed) for space in spaces)
+    cases = itertools.chain.from_iterable(streams)
+    if unique:
+        cases = deduplicate(cases, sum(space.size for space in spaces))
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Комбинаторный перебор граничных и фаззинг-строк")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="пространства, их оси и размеры")
+    dump = commands.add_parser('dump', help="случаи в формате JSON Lines")
+    dump.add_argument('spaces', nargs='*', help="пространства (по умолчанию все)")
+    dump.add_argument('--strength', type=int, help="покрывающий набор силы N (2 — pairwise)")
+    dump.add_argument('--sample', type=int, help="случайная выборка N случаев каждого пространства")
+    dump.add_argument('--seed', type=int, default=0)
+    dump.add_argument('--unique', action='store_true', help="без повторов значения")
+    dump.add_argument('--limit', type=int, help="не больше N случаев")
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name in SPACE_FACTORIES:
+            space = fuzz_space(name)
+            print(f"{space!r}; pairwise >= {space.covering_lower_bound(2)}, "
+                  f"3-wise >= {space.covering_lower_bound(3)}")
+        return
+
+    if args.sample is not None:
+        spaces = [fuzz_space(name) for name in (args.spaces or SPACE_FACTORIES)]
+        cases = itertools.chain.from_iterable(
+            space.sample(min(args.sample, space.size), args.seed) for space in spaces
+        )
+        if args.unique:
+            cases = deduplicate(cases, args.sample * len(spaces))
+    else:
+        cases = expand(args.spaces or None, args.strength, args.unique, args.seed)
+    for case in itertools.islice(cases, args.limit):
+        sys.stdout.write(json.dumps(case._asdict()) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,57 +1,85 @@
 # generators.py
-from faker import Faker
 import random
 import string
 
-# Инициализируем Faker только для RU и EN
-fake_ru = Faker('ru_RU')
-fake_en = Faker('en_US')
+from boundary import boundary_strings
+from cards import CARD_TYPES, DEFAULT_CARD_ENGINE, NUMBER_WIDTH, digit_matrix
+from locales import join_address_lines, locale_registry
+from phones import PHONE_FORMATS
+
+def get_faker(locale):
+    """Экземпляр Faker для зарегистрированной локали (см. locales.py).
+
+    Экземпляры создаются лениво при первом обращении и кешируются в реестре:
+    импорт faker и загрузка таблиц провайдеров заметно замедляют старт процесса.
+    """
+    return locale_registry.get_faker(locale)
+
+def warm_up(locales=None):
+    """Заранее создает экземпляры Faker и прогревает их провайдеры.
+
+    Вызывается ботом при старте, чтобы первый запрос не платил за инициализацию.
+    """
+    for locale in locales or ('ru', 'en'):
+        faker = get_faker(locale)
+        faker.name()
+        faker.address()
+
+def __getattr__(name):
+    # Совместимость со старым кодом: generators.fake_ru / generators.fake_en
+    if name == 'fake_ru':
+        return get_faker('ru')
+    if name == 'fake_en':
+        return get_faker('en')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Корпус имен и адресов (corpus.Corpus), если подключен через set_corpus
+_corpus = None
+
+def set_corpus(corpus):
+    """Подключает корпус (corpus.open_corpus) вместо Faker; None — отключает.
+
+    Локали, которых нет в корпусе или для которых нет формата телефона,
+    по-прежнему генерируются через Faker.
+    """
+    global _corpus
+    _corpus = corpus
+
+def corpus_locale(locale, corpus=None):
+    """Генератор корпуса для локали или None, если генерировать через Faker."""
+    corpus = corpus if corpus is not None else _corpus
+    if corpus is None or locale not in locale_registry or locale not in PHONE_FORMATS:
+        return None
+    faker_locale = locale_registry.spec(locale).faker_locale
+    return corpus.locale(faker_locale) if faker_locale in corpus else None
 
 def generate_name_address(locale='ru'):
     """Генерация ФИО и адреса для указанной локали."""
-    fakers = {'ru': fake_ru, 'en': fake_en}
-    
     # Нормализуем локаль: приводим к нижнему регистру, если это строка
     if isinstance(locale, str):
         locale = locale.lower()
     
-    # Если локаль не 'ru' или 'en', используем 'ru' по умолчанию
-    if locale not in fakers:
+    # Если локаль не зарегистрирована (см. locales.py), используем 'ru' по умолчанию
+    if locale not in locale_registry:
         locale = 'ru'
-    
-    faker = fakers[locale]
 
-    # Генерируем данные
-    full_name = faker.name()
-    address = faker.address().replace("\n", ", ")
-    
-    # Генерируем телефон в зависимости от локали
-    if locale == 'ru':
-        # Для России: +7 (XXX) XXX-XX-XX
-        area_code = faker.random_int(900, 999)  # 900-999 - мобильные коды
-        first_part = faker.random_int(100, 999)
-        second_part = faker.random_int(10, 99)
-        third_part = faker.random_int(10, 99)
-        phone = f"+7 ({area_code}) {first_part}-{second_part}-{third_part}"
-        
-        # С вероятностью 20% добавляем добавочный номер (для офисных телефонов)
-        if faker.random_int(1, 100) <= 20:
-            extension = faker.random_int(1000, 9999)
-            phone += f" доб. {extension}"
-            
-    elif locale == 'en':
-        # Для США: (XXX) XXX-XXXX
-        area_code = faker.random_int(200, 999)  # 200-999 - допустимые коды зон в US
-        exchange_code = faker.random_int(200, 999)  # 200-999 - центральный офис коды
-        subscriber_number = faker.random_int(1000, 9999)  # 1000-9999 - номер абонента
-        phone = f"({area_code}) {exchange_code}-{subscriber_number}"
-        
-        # С вероятностью 10% добавляем код страны
-        if faker.random_int(1, 100) <= 10:
-            phone = f"+1 {phone}"
-    else:
-        phone = faker.phone_number()
+    source = corpus_locale(locale)
+    if source is not None:
+        return {
+            'full_name': source.generate_one('name', random),
+            'address': source.generate_one('address', random),
+            'phone': PHONE_FORMATS[locale].draw_one(random.randint),
+            'locale': locale.upper()
+        }
+    return build_name_address(get_faker(locale), locale)
 
+def build_name_address(faker, locale):
+    """Генерация ФИО и адреса с помощью переданного экземпляра Faker.
+
+    Вся случайность берется из faker, поэтому при faker.seed_instance(...)
+    результат воспроизводим.
+    """
+    full_name, address, phone = _name_address_values(faker, locale)
     data = {
         'full_name': full_name,
         'address': address,
@@ -60,33 +88,86 @@ def generate_name_address(locale='ru'):
     }
     return data
 
+def _name_address_values(faker, locale):
+    """(ФИО, адрес, телефон) — общая часть build_name_address и build_name_addresses."""
+    # Генерируем данные; адрес форматируется по правилам локали, если она зарегистрирована
+    full_name = faker.name()
+    if locale in locale_registry:
+        address = locale_registry.spec(locale).format_address(faker)
+    else:
+        address = join_address_lines(faker)
+    
+    # Генерируем телефон по формату локали (см. phones.py), иначе — средствами Faker
+    phone_format = PHONE_FORMATS.get(locale)
+    if phone_format is not None:
+        phone = phone_format.draw_one(faker.random_int)
+    else:
+        phone = faker.phone_number()
+    return full_name, address, phone
+
+def build_name_addresses(faker, locale, n):
+    """n записей ФИО и адреса сразу в колоночном наборе (dataset.Dataset).
+
+    Значения те же, что дали бы n вызовов build_name_address, но без словаря
+    на запись: строки складываются в буферы колонок, локаль хранится один раз.
+    """
+    values = [_name_address_values(faker, locale) for _ in range(n)]
+    full_names, addresses, phones = zip(*values) if values else ((), (), ())
+    return _name_address_dataset(locale, full_names, addresses, phones)
+
+def build_corpus_name_addresses(source, locale, n, rng):
+    """n записей ФИО и адреса по корпусу (corpus.CorpusLocale) — без Faker.
+
+    rng — numpy.random.Generator: при одном seed результат воспроизводим.
+    """
+    from phones import generate_phones
+    return _name_address_dataset(
+        locale, source.names(n, rng), source.addresses(n, rng), generate_phones(locale, n, rng)
+    )
+
+def _name_address_dataset(locale, full_names, addresses, phones):
+    from dataset import CategoryColumn, Dataset, string_column
+    return Dataset({
+        'full_name': string_column(full_names),
+        'address': string_column(addresses),
+        'phone': string_column(phones),
+        'locale': CategoryColumn.constant(locale.upper(), len(full_names)),
+    })
+
+def generate_name_addresses(n, locale='ru', corpus=None, seed=None):
+    """Пакетная генерация n записей ФИО и адреса (dataset.Dataset).
+
+    corpus — корпус имен и адресов (по умолчанию подключенный через set_corpus);
+    seed учитывается только при генерации по корпусу.
+    """
+    if n < 0:
+        raise ValueError("Количество записей не может быть отрицательным")
+    if isinstance(locale, str):
+        locale = locale.lower()
+    if locale not in locale_registry:
+        locale = 'ru'
+    source = corpus_locale(locale, corpus)
+    if source is not None:
+        import numpy as np
+        return build_corpus_name_addresses(source, locale, n, np.random.default_rng(seed))
+    return build_name_addresses(get_faker(locale), locale, n)
+
 # Остальные функции остаются без изменений
-def generate_credit_card():
-    """Генерация номера кредитной карты с помощью алгоритма Луна."""
-    # Генерируем 15 случайных цифр (без последней контрольной)
-    card_number = [str(random.randint(0, 9)) for _ in range(15)]
-
-    # Алгоритм Луна для вычисления контрольной цифры (16-й)
-    total = 0
-    for i, digit in enumerate(card_number):
-        n = int(digit)
-        if (i + 1) % 2 != 0:  # Нечетные позиции (для алгоритма, считая с 1)
-            n *= 2
-            if n > 9:
-                n -= 9
-        total += n
-
-    check_digit = (10 - (total % 10)) % 10
-    card_number.append(str(check_digit))
-
-    # Форматируем как настоящую карту (XXXX XXXX XXXX XXXX)
-    formatted_number = ''.join(card_number)
-    formatted_number = ' '.join([formatted_number[i:i+4] for i in range(0, 16, 4)])
+def generate_credit_card(rng=None):
+    """Генерация номера кредитной карты с помощью алгоритма Луна.
+
+    Префикс номера берется из таблицы BIN (cards.py), поэтому тип карты
+    соответствует номеру. rng — необязательный random.Random для
+    воспроизводимой генерации (по умолчанию используется глобальный модуль random).
+    """
+    if rng is None:
+        rng = random
+    # Номер: префикс платежной системы, случайные цифры и контрольная цифра Луна
+    formatted_number, card_type = DEFAULT_CARD_ENGINE.generate_one(rng)
 
     # Дополнительные данные карты
-    card_type = random.choice(['Visa', 'MasterCard', 'Mir'])
-    expiry_date = f"{random.randint(1, 12):02d}/{random.randint(23, 30)}"
-    cvv = f"{random.randint(0, 999):03d}"
+    expiry_date = f"{rng.randint(1, 12):02d}/{rng.randint(23, 30)}"
+    cvv = f"{rng.randint(0, 999):03d}"
 
     return {
         'number': formatted_number,
@@ -95,66 +176,256 @@ def generate_credit_card():
         'cvv': cvv
     }
 
-def generate_boundary_strings():
-    """Генерация строк с граничными значениями и инъекциями."""
-    # Создаем список словарей для удобства
-    strings = [
-        {
-            'title': '📏 Строка ровно 255 символов',
-            'value': 'A' * 255,
-            'description': 'Проверка ограничения длины (255 символов)'
-        },
-        {
-            'title': '⚠️ Спецсимволы',
-            'value': '!@#$%^&*()_+{}|:"<>?[]\\;\',./`~',
-            'description': 'Строка со специальными символами'
-        },
-        {
-            'title': '🥷 SQL-инъекция',
-            'value': "' OR '1'='1'; --",
-            'description': 'Базовый пример SQL-инъекции (для тестирования)'
-        },
-        {
-            'title': '🛡️ XSS-инъекция',
-            'value': '<script>alert("XSS")</script>',
-            'description': 'Базовый пример XSS-инъекции (для тестирования)'
-        },
-        {
-            'title': '⚫ Пустая строка',
-            'value': '',
-            'description': 'Пустая строка для проверки обязательных полей'
-        },
-        {
-            'title': '🐌 Очень длинная строка (1000 символов)',
-            'value': 'B' * 1000,
-            'description': 'Строка из 1000 символов (тест на производительность)'
-        },
-        {
-            'title': '🌍 Эмодзи и юникод',
-            'value': 'Тест € ¥ 🌎 𐌀 𐌁 𐌂 Привет 你好',
-            'description': 'Строка с эмодзи и мультиязычными символами'
-        },
-        {
-            'title': '🔤 Смешанный регистр',
-            'value': 'Тест Test тест TEST 123',
-            'description': 'Строка с символами в разном регистре'
-        },
-        {
-            'title': '📝 Переносы строк и табуляция',
-            'value': 'Первая строка\nВторая строка\tТабуляция\rВозврат каретки',
-            'description': 'Строка с управляющими символами'
+# Размер порции для пакетной генерации: ограничивает объём временных матриц
+CARD_CHUNK_SIZE = 1_000_000
+
+# Количество различных номеров карт в таблице BIN по умолчанию
+CARD_NUMBER_SPACE = DEFAULT_CARD_ENGINE.space
+
+# ASCII-коды нуля и косой черты для сборки строк из матриц цифр
+_ZERO = ord('0')
+_SLASH = ord('/')
+
+
+class CreditCardBatch:
+    """Колоночный результат пакетной генерации карт.
+
+    Данные хранятся в компактных массивах NumPy (ASCII-строки фиксированной
+    длины и коды типов), а словари в формате ``generate_credit_card``
+    создаются лениво — только при обращении к конкретной записи.
+    """
+
+    __slots__ = ('number', 'type_code', 'expiry', 'cvv')
+
+    def __init__(self, number, type_code, expiry, cvv):
+        self.number = number        # dtype S23: 'XXXX XXXX XXXX XXXX' (до 19 цифр)
+        self.type_code = type_code  # dtype uint8: индекс в CARD_TYPES
+        self.expiry = expiry        # dtype S5: 'MM/YY'
+        self.cvv = cvv              # dtype S3: '000'-'999'
+
+    @property
+    def type(self):
+        """Массив названий типов карт (строки)."""
+        import numpy as np
+        return np.asarray(CARD_TYPES)[self.type_code]
+
+    def __len__(self):
+        return len(self.number)
+
+    def __getitem__(self, index):
+        # Срез возвращает новый пакет (представления массивов без копирования)
+        if isinstance(index, slice):
+            return CreditCardBatch(
+                self.number[index], self.type_code[index],
+                self.expiry[index], self.cvv[index]
+            )
+        return {
+            'number': self.number[index].decode('ascii'),
+            'type': CARD_TYPES[self.type_code[index]],
+            'expiry': self.expiry[index].decode('ascii'),
+            'cvv': self.cvv[index].decode('ascii')
         }
+
+    def __iter__(self):
+        """Обход в виде словарей (совместимо с generate_credit_card)."""
+        # Колонки переводятся в str целиком: поэлементная индексация массивов
+        # NumPy во много раз медленнее
+        columns = (
+            self.number.astype(f'U{NUMBER_WIDTH}').tolist(),
+            [CARD_TYPES[code] for code in self.type_code.tolist()],
+            self.expiry.astype('U5').tolist(),
+            self.cvv.astype('U3').tolist(),
+        )
+        for number, card_type, expiry, cvv in zip(*columns):
+            yield {'number': number, 'type': card_type, 'expiry': expiry, 'cvv': cvv}
+
+    def to_dicts(self):
+        """Материализует весь пакет в список словарей."""
+        return list(self)
+
+    def to_dataset(self):
+        """Пакет как dataset.Dataset (колонки те же, без копирования)."""
+        from dataset import CategoryColumn, Dataset, FixedColumn
+        return Dataset({
+            'number': FixedColumn(self.number),
+            'type': CategoryColumn(self.type_code, CARD_TYPES),
+            'expiry': FixedColumn(self.expiry),
+            'cvv': FixedColumn(self.cvv),
+        })
+
+
+def _ascii_rows(matrix):
+    """Превращает матрицу ASCII-кодов (n, k) в массив строк dtype S<k>."""
+    import numpy as np
+    matrix = np.ascontiguousarray(matrix, dtype=np.uint8)
+    return matrix.view(f'S{matrix.shape[1]}').ravel()
+
+
+def _generate_card_chunk(rng, n, engine, indexes=None):
+    """Генерирует одну порцию из n карт и возвращает колонки.
+
+    indexes — необязательные номера из [0, engine.space): тогда номер карты
+    определяется ими (engine.locate), а не выбирается случайно.
+    """
+    import numpy as np
+    if indexes is None:
+        rows, offsets, bodies = engine.sample(rng, n)
+    else:
+        rows, offsets, bodies = engine.locate(indexes)
+    # Срок действия: месяц 1-12, год 23-30 (как в generate_credit_card)
+    month = rng.integers(1, 13, size=n, dtype=np.uint8)
+    year = rng.integers(23, 31, size=n, dtype=np.uint8)
+    cvv_digits = rng.integers(0, 10, size=(n, 3), dtype=np.uint8)
+    return card_columns(engine.numbers(rows, offsets, bodies), engine.type_codes(rows), month, year, cvv_digits)
+
+
+def card_columns(number, type_code, month, year, cvv_digits):
+    """Колонки карт (number, type_code, expiry, cvv) из уже выбранных значений.
+
+    number — готовые номера (CardEngine.numbers), cvv_digits — матрица (n, 3);
+    строки срока действия и CVV собираются здесь.
+    """
+    import numpy as np
+    n = len(number)
+
+    # Срок действия: MM/YY
+    expiry = np.empty((n, 5), dtype=np.uint8)
+    expiry[:, 0] = month // 10 + _ZERO
+    expiry[:, 1] = month % 10 + _ZERO
+    expiry[:, 2] = _SLASH
+    expiry[:, 3] = year // 10 + _ZERO
+    expiry[:, 4] = year % 10 + _ZERO
+
+    return number, type_code, _ascii_rows(expiry), _ascii_rows(cvv_digits + _ZERO)
+
+
+def generate_credit_cards(n, seed=None, unique_key=None, start=0, engine=None):
+    """Пакетная генерация n номеров карт (алгоритм Луна) операциями NumPy.
+
+    Возвращает CreditCardBatch с колонками number/type/expiry/cvv.
+    При одинаковом seed результат воспроизводим. engine — таблица BIN
+    (cards.CardEngine), по умолчанию 16-значные номера Visa/MasterCard/Mir.
+
+    Если задан unique_key, номера не повторяются: карта с номером i (от start)
+    получает номер engine.locate(perm(i)) перестановки всех номеров таблицы
+    с этим ключом (см. unique.py). Вызовы с одним unique_key и
+    непересекающимися диапазонами [start, start + n) тоже дают разные номера,
+    без хранения уже выданных. Системы в этом режиме встречаются пропорционально
+    числу их номеров, а не весам таблицы.
+    """
+    if n < 0:
+        raise ValueError("Количество карт не может быть отрицательным")
+    # NumPy импортируется лениво: он нужен только пакетной генерации
+    import numpy as np
+
+    if engine is None:
+        engine = DEFAULT_CARD_ENGINE
+    permutation = None
+    if unique_key is not None:
+        from unique import FeistelPermutation, UniqueSpaceExhausted
+        # Проверяем объем заранее, чтобы не сгенерировать часть пакета впустую
+        if start < 0 or start + n > engine.space:
+            raise UniqueSpaceExhausted(f"Уникальных номеров карт всего {engine.space}")
+        permutation = FeistelPermutation(engine.space, unique_key)
+
+    rng = np.random.default_rng(seed)
+    number = np.empty(n, dtype=f'S{NUMBER_WIDTH}')
+    type_code = np.empty(n, dtype=np.uint8)
+    expiry = np.empty(n, dtype='S5')
+    cvv = np.empty(n, dtype='S3')
+
+    # Генерируем порциями, чтобы временные матрицы не росли вместе с n
+    for offset in range(0, n, CARD_CHUNK_SIZE):
+        stop = min(offset + CARD_CHUNK_SIZE, n)
+        indexes = None if permutation is None else permutation.range(start + offset, stop - offset)
+        chunk = _generate_card_chunk(rng, stop - offset, engine, indexes)
+        number[offset:stop], type_code[offset:stop], expiry[offset:stop], cvv[offset:stop] = chunk
+
+    return CreditCardBatch(number, type_code, expiry, cvv)
+
+def generate_boundary_strings(category=None):
+    """Генерация строк с граничными значениями и инъекциями.
+
+    Значения берутся из каталога boundary.py; category ограничивает выборку
+    одной категорией (length, special, sql, xss, unicode, ...).
+    Систематический перебор длин, категорий Unicode, кодировок и контекстов
+    вокруг этих значений — fuzz.py.
+    """
+    return [
+        {'title': item.title, 'value': item.value, 'description': item.description}
+        for item in boundary_strings(category)
     ]
-    return strings
 
-def generate_temp_email():
-    """Генерация временного email-адреса (на основе случайной строки)."""
-    domains = ["temp-mail.org", "10minutemail.com", "guerrillamail.com", "yopmail.com"]
-    username = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
-    domain = random.choice(domains)
+TEMP_EMAIL_DOMAINS = ("temp-mail.org", "10minutemail.com", "guerrillamail.com", "yopmail.com")
+
+EMAIL_USERNAME_ALPHABET = string.ascii_lowercase + string.digits
+EMAIL_USERNAME_LENGTH = 10
+
+TEMP_EMAIL_NOTE = "Это домен для временной почты. Проверьте сайт сервиса для доступа к письмам."
+
+# Количество различных имен ящиков: 36 символов на каждой из 10 позиций
+EMAIL_USERNAME_SPACE = len(EMAIL_USERNAME_ALPHABET) ** EMAIL_USERNAME_LENGTH
+
+def generate_temp_email(rng=None):
+    """Генерация временного email-адреса (на основе случайной строки).
+
+    rng — необязательный random.Random для воспроизводимой генерации.
+    """
+    if rng is None:
+        rng = random
+    domains = list(TEMP_EMAIL_DOMAINS)
+    username = ''.join(rng.choices(EMAIL_USERNAME_ALPHABET, k=EMAIL_USERNAME_LENGTH))
+    domain = rng.choice(domains)
     email = f"{username}@{domain}"
 
     return {
         'email': email,
-        'note': "Это домен для временной почты. Проверьте сайт сервиса для доступа к письмам."
-    }
\ No newline at end of file
+        'note': TEMP_EMAIL_NOTE
+    }
+
+def generate_temp_emails(n, seed=None, unique_key=None, start=0):
+    """Пакетная генерация n временных email-адресов (список строк).
+
+    При одинаковом seed результат воспроизводим. unique_key, как в
+    generate_credit_cards, делает имена ящиков (а значит, и адреса)
+    неповторяющимися: ящик с номером i получает имя perm(i) в системе
+    счисления по основанию 36.
+    """
+    if n < 0:
+        raise ValueError("Количество адресов не может быть отрицательным")
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    base = len(EMAIL_USERNAME_ALPHABET)
+    if unique_key is None:
+        letters = rng.integers(0, base, size=(n, EMAIL_USERNAME_LENGTH), dtype=np.uint8)
+    else:
+        from unique import FeistelPermutation, UniqueSpaceExhausted
+        if start < 0 or start + n > EMAIL_USERNAME_SPACE:
+            raise UniqueSpaceExhausted(f"Уникальных имен ящиков всего {EMAIL_USERNAME_SPACE}")
+        indexes = FeistelPermutation(EMAIL_USERNAME_SPACE, unique_key).range(start, n)
+        letters = digit_matrix(indexes, EMAIL_USERNAME_LENGTH, base)
+
+    domains = rng.integers(0, len(TEMP_EMAIL_DOMAINS), size=n)
+    return temp_email_strings(letters, domains)
+
+
+def temp_email_dataset(emails):
+    """Набор записей email (dataset.Dataset) из списка адресов."""
+    from dataset import CategoryColumn, Dataset, string_column
+    return Dataset({
+        'email': string_column(emails),
+        'note': CategoryColumn.constant(TEMP_EMAIL_NOTE, len(emails)),
+    })
+
+
+def temp_email_strings(letters, domains, domain_names=TEMP_EMAIL_DOMAINS):
+    """Адреса email из матрицы кодов символов имени (n, 10) и индексов доменов
+    в domain_names."""
+    import numpy as np
+    alphabet = np.frombuffer(EMAIL_USERNAME_ALPHABET.encode('ascii'), dtype=np.uint8)
+    usernames = _ascii_rows(alphabet[letters]).tolist()
+    return [
+        f"{username.decode('ascii')}@{domain_names[domain]}"
+        for username, domain in zip(usernames, domains.tolist())
+    ]
@@ -0,0 +1,142 @@
+# inline.py
+"""Инлайн-режим бота: @bot card в любом чате.
+
+Инлайн-запрос приходит на каждое нажатие клавиши, поэтому обработчик не
+генерирует данные, а только:
+
+1. сводит текст запроса к набору видов данных (InlineQueryIndex): все
+   префиксы синонимов посчитаны заранее, и «c», «ca», «car», «card» дают
+   один и тот же ключ ('card',);
+2. берет готовый набор результатов из InlineResultCache по этому ключу.
+
+Устаревший набор (старше ttl) отдается сразу, а новый строится в фоне;
+одновременные запросы к отсутствующему ключу ждут одну и ту же сборку.
+Результаты не зависят от пользователя, поэтому бот отвечает с
+is_personal=False, а cache_time позволяет Telegram самому кешировать ответ.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Синонимы видов данных в инлайн-запросе (ключи ответов из replies.py)
+INLINE_ALIASES = {
+    'карта': 'card',
+    'card': 'card',
+    'mail': 'email',
+    'почта': 'email',
+    'email': 'email',
+    'фио': 'ru',
+    'name': 'en',
+}
+
+# Заголовок и описание результата для каждого вида (str.format по записи)
+INLINE_TITLES = {
+    'ru': ("👤 {full_name}", "{address}"),
+    'en': ("👤 {full_name}", "{address}"),
+    'card': ("💳 {number}", "{type} · {expiry} · CVV {cvv}"),
+    'email': ("📧 {email}", "Временный адрес"),
+}
+
+
+class InlineQueryIndex:
+    """Текст инлайн-запроса -> кортеж видов данных (поиск по префиксу)."""
+
+    def __init__(self, aliases):
+        self.kinds = tuple(sorted(set(aliases.values())))
+        matches = {}
+        for alias, kind in aliases.items():
+            alias = alias.lower()
+            for end in range(1, len(alias) + 1):
+                matches.setdefault(alias[:end], set()).add(kind)
+        # Одинаковые наборы — один и тот же кортеж (ключ кеша результатов)
+        canonical = {}
+        self._prefixes = {
+            prefix: canonical.setdefault(frozenset(kinds), tuple(sorted(kinds)))
+            for prefix, kinds in matches.items()
+        }
+
+    def resolve(self, query):
+        """Виды данных для запроса; пустой запрос — все виды, неизвестный — ()."""
+        query = query.strip().lower()
+        if not query:
+            return self.kinds
+        return self._prefixes.get(query.split()[0], ())
+
+
+class InlineResultCache:
+    """Наборы результатов по ключу с TTL и обновлением в фоне.
+
+    build(key) — корутина, собирающая набор результатов для ключа.
+    """
+
+    def __init__(self, build, ttl, clock=time.monotonic):
+        if ttl <= 0:
+            raise ValueError("TTL должен быть положительным")
+        self.build = build
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries = {}
+        self._pending = {}
+
+    async def get(self, key):
+        """Набор результатов: из кеша (устаревший обновляется в фоне) или собранный."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            created, results = entry
+            if self.clock() - created >= self.ttl:
+                self._refresh(key)
+            return results
+        self.misses += 1
+        # shield: отмена одного запроса не должна прерывать общую сборку
+        return await asyncio.shield(self._refresh(key))
+
+    async def warm(self, keys):
+        """Заранее собирает наборы для ключей."""
+        await asyncio.gather(*(self._refresh(key) for key in keys))
+
+    def _refresh(self, key):
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._build(key))
+            task.add_done_callback(_log_failure)
+        return task
+
+    async def _build(self, key):
+        try:
+            results = await self.build(key)
+            self._entries[key] = (self.clock(), results)
+            self.refreshes += 1
+            return results
+        finally:
+            del self._pending[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'keys': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'refreshes': self.refreshes,
+        }
+
+
+def _log_failure(task):
+    # Ошибка фонового обновления иначе потерялась бы: его никто не ждет
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Не удалось собрать инлайн-результаты: %r", task.exception())
+
+
+def inline_title(kind, record):
+    """(заголовок, описание) результата для записи вида kind."""
+    title, description = INLINE_TITLES.get(kind, (kind, ''))
+    return title.format(**record), description.format(**record)
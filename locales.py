@@ -0,0 +1,146 @@
+# locales.py
+"""Реестр локалей для генерации ФИО, адресов и телефонов.
+
+Локаль регистрируется один раз (код, локаль Faker, формат телефона и
+форматирование адреса). Экземпляры Faker создаются лениво и хранятся в
+ограниченном LRU-кеше по локали Faker (коды с одной локалью Faker делят
+один экземпляр): бот, обслуживающий десятки локалей, держит в памяти
+только самые используемые, а статистика кеша помогает подобрать его размер.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from phones import PhoneFormat, PhoneOption, register_phone_format
+
+DEFAULT_MAX_FAKERS = 8
+
+LocaleSpec = namedtuple('LocaleSpec', ['code', 'faker_locale', 'format_address'])
+
+
+def join_address_lines(faker):
+    """Адрес Faker в одну строку (переносы заменяются запятыми)."""
+    return faker.address().replace("\n", ", ")
+
+
+class LocaleRegistry:
+    """Зарегистрированные локали и LRU-кеш их экземпляров Faker."""
+
+    def __init__(self, max_fakers=DEFAULT_MAX_FAKERS):
+        if max_fakers < 1:
+            raise ValueError("Размер кеша должен быть положительным")
+        self.max_fakers = max_fakers
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._specs = {}
+        self._fakers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, code, faker_locale, phone_format=None, format_address=join_address_lines):
+        """Регистрирует локаль; экземпляр Faker будет создан при первом обращении."""
+        spec = LocaleSpec(code, faker_locale, format_address)
+        with self._lock:
+            self._specs[code] = spec
+        if phone_format is not None:
+            register_phone_format(code, phone_format)
+        return spec
+
+    def __contains__(self, code):
+        return code in self._specs
+
+    def codes(self):
+        """Коды зарегистрированных локалей."""
+        return tuple(self._specs)
+
+    def spec(self, code):
+        """Описание зарегистрированной локали."""
+        return self._specs[code]
+
+    def get_faker(self, code):
+        """Экземпляр Faker для локали из кеша (создается при промахе)."""
+        faker_locale = self._specs[code].faker_locale
+        with self._lock:
+            faker = self._fakers.get(faker_locale)
+            if faker is not None:
+                self._fakers.move_to_end(faker_locale)
+                self.hits += 1
+                return faker
+            self.misses += 1
+
+        # Создание Faker занимает десятки миллисекунд — делаем это без блокировки,
+        # чтобы не задерживать обращения к уже закешированным локалям
+        from faker import Faker
+        faker = Faker(faker_locale)
+
+        with self._lock:
+            existing = self._fakers.get(faker_locale)
+            if existing is not None:
+                return existing
+            self._fakers[faker_locale] = faker
+            self._evict()
+        return faker
+
+    def resize(self, max_fakers):
+        """Меняет размер кеша (лишние экземпляры вытесняются сразу)."""
+        if max_fakers < 1:
+            raise ValueError("Размер кеша должен быть положительным")
+        with self._lock:
+            self.max_fakers = max_fakers
+            self._evict()
+
+    def _evict(self):
+        while len(self._fakers) > self.max_fakers:
+            self._fakers.popitem(last=False)
+            self.evictions += 1
+
+    def cached(self):
+        """Локали Faker, для которых сейчас есть экземпляр (от старых к новым)."""
+        with self._lock:
+            return tuple(self._fakers)
+
+    def stats(self):
+        """Статистика кеша для подбора его размера."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._fakers),
+                'max_size': self.max_fakers,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+locale_registry = LocaleRegistry()
+
+# Россия и США: форматы телефонов заданы в phones.py
+locale_registry.register('ru', 'ru_RU')
+locale_registry.register('en', 'en_US')
+locale_registry.register(
+    'de', 'de_DE',
+    # Германия, мобильные: +49 15X-17X XXXXXXX
+    PhoneFormat('+49 {0} {1}', [(150, 179), (1000000, 9999999)])
+)
+locale_registry.register(
+    'fr', 'fr_FR',
+    # Франция, мобильные: +33 6 XX XX XX XX / +33 7 XX XX XX XX
+    PhoneFormat('+33 {0} {1} {2} {3} {4}', [(6, 7), (10, 99), (10, 99), (10, 99), (10, 99)])
+)
+locale_registry.register(
+    'pl', 'pl_PL',
+    # Польша, мобильные: +48 5XX-8XX XXX XXX
+    PhoneFormat('+48 {0} {1} {2}', [(500, 899), (100, 999), (100, 999)])
+)
+locale_registry.register(
+    'uk', 'uk_UA',
+    # Украина, мобильные: +380 (XX) XXX-XX-XX
+    PhoneFormat('+380 ({0}) {1}-{2}-{3}', [(50, 99), (100, 999), (10, 99), (10, 99)])
+)
+locale_registry.register(
+    # В Faker нет казахстанской локали: имена и адреса берутся из ru_RU,
+    # телефон — в формате Казахстана +7 (7XX) XXX-XX-XX
+    'kz', 'ru_RU',
+    PhoneFormat('+7 ({0}) {1}-{2}-{3}', [(700, 778), (100, 999), (10, 99), (10, 99)],
+                PhoneOption(0.1, '{phone} доб. {0}', [(100, 999)]))
+)
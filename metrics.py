@@ -0,0 +1,305 @@
+# metrics.py
+"""Метрики задержки обработчиков бота.
+
+Для каждой тройки (обработчик, кнопка, фаза) ведется гистограмма с
+фиксированными границами корзин: наблюдение — это бинарный поиск корзины и
+два сложения, поэтому метрики можно не выключать в работе. Фазы запроса:
+generation (получение данных), formatting (сборка текста), send (отправка
+в Telegram) и total (весь обработчик).
+
+Обработчик оборачивается декоратором HandlerMetrics.instrument, а фазы
+внутри него отмечаются контекстным менеджером phase('generation'); вне
+инструментированного обработчика phase ничего не делает.
+
+Метрики отдаются в текстовом формате Prometheus (render_prometheus,
+start_metrics_server) и в виде таблицы с p50/p95/p99 (render_stats, команда
+/stats). SlowRequestProfiler выполняет под cProfile случайную долю запросов
+и сохраняет профили тех, что оказались медленнее порога.
+"""
+import contextvars
+import cProfile
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин, секунды (последняя корзина — +Inf)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+PHASES = ('generation', 'formatting', 'send', 'total')
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRIC_NAME = 'bot_handler_seconds'
+
+# Таймер запроса, выполняющегося в текущей задаче asyncio
+_current_timer = contextvars.ContextVar('current_timer', default=None)
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с фиксированными корзинами."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Оценка квантиля: линейная интерполяция внутри корзины."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    # Выше последней границы оценить точнее нельзя
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class RequestTimer:
+    """Время фаз одного запроса; фазы записываются в метрики при выходе."""
+
+    __slots__ = ('metrics', 'handler', 'button', 'phases', 'start', 'token', 'profile')
+
+    def __init__(self, metrics, handler, button):
+        self.metrics = metrics
+        self.handler = handler
+        self.button = button
+        self.phases = {}
+        self.start = None
+        self.token = None
+        self.profile = None
+
+    def __enter__(self):
+        self.token = _current_timer.set(self)
+        self.profile = self.metrics.profiler.maybe_start() if self.metrics.profiler else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        total = time.perf_counter() - self.start
+        _current_timer.reset(self.token)
+        if self.profile is not None:
+            self.metrics.profiler.finish(self.profile, total, f"{self.handler}_{self.button}")
+        observe = self.metrics.observe
+        for phase, seconds in self.phases.items():
+            observe(self.handler, self.button, phase, seconds)
+        observe(self.handler, self.button, 'total', total)
+        return False
+
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        phases = self.timer.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+def phase(name):
+    """Контекстный менеджер фазы текущего запроса (без запроса — пустой)."""
+    timer = _current_timer.get()
+    if timer is None:
+        return nullcontext()
+    return _Phase(timer, name)
+
+
+class SlowRequestProfiler:
+    """Выборочный cProfile: сохраняет профили запросов медленнее threshold.
+
+    Под профилировщиком выполняется доля sample_rate запросов и не больше
+    одного одновременно. Профиль охватывает весь поток цикла событий, поэтому
+    в него попадают и другие задачи, работавшие в это время.
+    """
+
+    def __init__(self, sample_rate=0.0, threshold=1.0, directory='profiles', keep=20):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Доля запросов должна быть от 0 до 1")
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.directory = directory
+        self.keep = keep
+        self.sampled = 0
+        self.saved = []
+        self._active = False
+
+    def maybe_start(self):
+        if not self.sample_rate or self._active or random.random() >= self.sample_rate:
+            return None
+        self._active = True
+        self.sampled += 1
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile, seconds, label):
+        profile.disable()
+        self._active = False
+        if seconds < self.threshold:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        # Номер выборки в имени: профили одной секунды не перезаписывают друг друга
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{self.sampled:05d}_{label}_{seconds * 1000:.0f}ms.prof"
+        path = os.path.join(self.directory, name)
+        profile.dump_stats(path)
+        self.saved.append(path)
+        # Храним только последние keep профилей
+        while len(self.saved) > self.keep:
+            old = self.saved.pop(0)
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        logger.info("Профиль медленного запроса (%.0f мс) сохранен: %s", seconds * 1000, path)
+        return path
+
+
+class HandlerMetrics:
+    """Гистограммы задержек по (обработчик, кнопка, фаза)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, profiler=None):
+        self.buckets = tuple(buckets)
+        self.profiler = profiler
+        self.histograms = {}
+        # Дополнительные показатели для Prometheus: имя -> (описание, функция)
+        self.gauges = {}
+
+    def observe(self, handler, button, phase_name, seconds):
+        key = (handler, button, phase_name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram(self.buckets)
+        histogram.observe(seconds)
+
+    def request(self, handler, button='-'):
+        """Таймер запроса (контекстный менеджер)."""
+        return RequestTimer(self, handler, button)
+
+    def instrument(self, handler, button=None):
+        """Декоратор асинхронного обработчика (update, context).
+
+        button(update) -> метка кнопки. Если обработчик вызван из другого
+        инструментированного (например, «Помощь» вызывает /help), отдельный
+        запрос не заводится: время попадает в объемлющий.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(update, context, *args, **kwargs):
+                if _current_timer.get() is not None:
+                    return await func(update, context, *args, **kwargs)
+                label = button(update) if button is not None else '-'
+                with self.request(handler, label):
+                    return await func(update, context, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_gauge(self, name, description, callback):
+        """Показатель, значение которого читается при выдаче метрик."""
+        self.gauges[name] = (description, callback)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def render_prometheus(self):
+        """Метрики в текстовом формате Prometheus."""
+        lines = [
+            f"# HELP {METRIC_NAME} Время обработки запросов бота по обработчикам, кнопкам и фазам",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        bounds = [_format_float(bound) for bound in self.buckets] + ['+Inf']
+        # Снимок словаря: метрики читаются из потока HTTP-сервера, пока цикл
+        # событий добавляет новые ключи (list() по словарю не отпускает GIL)
+        for (handler, button, phase_name), histogram in sorted(list(self.histograms.items())):
+            labels = (f'handler="{_escape(handler)}",button="{_escape(button)}",'
+                      f'phase="{_escape(phase_name)}"')
+            cumulative = 0
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{{labels}}} {_format_float(histogram.sum)}')
+            lines.append(f'{METRIC_NAME}_count{{{labels}}} {histogram.count}')
+        for name, (description, callback) in sorted(self.gauges.items()):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_float(callback())}")
+        return '\n'.join(lines) + '\n'
+
+    def render_stats(self):
+        """Таблица p50/p95/p99 (мс) по обработчикам, кнопкам и фазам."""
+        if not self.histograms:
+            return "Запросов еще не было"
+        rows = [f"{'обработчик/кнопка':24} {'фаза':10} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        order = {name: index for index, name in enumerate(PHASES)}
+        keys = sorted(self.histograms, key=lambda key: (key[0], key[1], order.get(key[2], len(order)), key[2]))
+        for handler, button, phase_name in keys:
+            histogram = self.histograms[(handler, button, phase_name)]
+            p50, p95, p99 = (histogram.quantile(q) * 1000 for q in QUANTILES)
+            name = handler if button == '-' else f"{handler}/{button}"
+            rows.append(f"{name[:24]:24} {phase_name:10} {histogram.count:>6} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}")
+        if self.profiler is not None and self.profiler.sample_rate:
+            rows.append(f"\nПрофилей: выполнено {self.profiler.sampled}, сохранено медленных {len(self.profiler.saved)}")
+        return '\n'.join(rows)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_float(value):
+    return repr(float(value))
+
+
+def start_metrics_server(metrics, port, host='127.0.0.1'):
+    """HTTP-сервер с /metrics в фоновом потоке; возвращает сервер (для shutdown)."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    return server
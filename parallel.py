@@ -0,0 +1,212 @@
+# parallel.py
+"""Многопроцессная генерация с детерминированным посевом по блокам.
+
+Запрос на N записей делится на блоки фиксированного размера. Блок k
+генерируется с seed, выведенным из (master_seed, k), поэтому один и тот же
+master_seed дает один и тот же набор данных при любом количестве процессов.
+
+В режиме уникальности (unique=True) карты и email нумеруются сквозь все
+блоки и строятся биективным счетчиком с ключом master_seed (см. unique.py),
+а повторяющиеся ФИО отбрасываются в родительском процессе по компактному
+множеству хешей, и недостающие записи добираются дополнительными блоками.
+
+Блоки — колоночные наборы dataset.Dataset: между процессами передаются
+несколько массивов вместо тысяч словарей.
+
+С corpus_path ФИО и адреса берутся из корпуса (corpus.py): каждый процесс
+отображает файл в память, и все процессы делят одни и те же страницы.
+
+Блок зависит только от своих параметров, поэтому с cache (cache.GenerationCache)
+готовые блоки читаются с диска, а в пул процессов уходят только промахи.
+"""
+import hashlib
+import itertools
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from faker import Faker
+
+from cache import file_digest
+from corpus import open_corpus
+from dataset import concat_datasets
+from generators import (
+    build_corpus_name_addresses,
+    build_name_addresses,
+    corpus_locale,
+    generate_credit_cards,
+    generate_temp_email,
+    generate_temp_emails,
+    temp_email_dataset
+)
+from locales import locale_registry
+from unique import DEFAULT_MAX_ATTEMPTS_RATIO, SeenSet, UniqueSpaceExhausted
+
+# Размер блока входит в «идентичность» набора данных: при другом размере
+# блока тот же master_seed даст другие записи
+DEFAULT_BLOCK_SIZE = 10_000
+
+# Сколько блоков на процесс может быть в работе одновременно (backpressure)
+IN_FLIGHT_PER_WORKER = 2
+
+# Помимо карт и email поддерживается любая локаль из locale_registry
+RECORD_KINDS = ('card', 'email')
+
+# Экземпляры Faker текущего процесса (создаются один раз на процесс).
+# Общие экземпляры generators.get_faker не используются: здесь их seed
+# переустанавливается для каждого блока
+_worker_fakers = {}
+
+
+def derive_seed(master_seed, block_index):
+    """64-битный seed блока, выведенный из (master_seed, block_index)."""
+    digest = hashlib.blake2b(f"{master_seed}:{block_index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _get_worker_faker(kind):
+    """Собственный экземпляр Faker процесса для локали kind."""
+    faker_locale = locale_registry.spec(kind).faker_locale
+    faker = _worker_fakers.get(faker_locale)
+    if faker is None:
+        faker = _worker_fakers[faker_locale] = Faker(faker_locale)
+    return faker
+
+
+def generate_block(kind, master_seed, block_index, size, unique_offset=None, corpus_path=None):
+    """Генерирует блок записей (Dataset); результат зависит только от аргументов.
+
+    unique_offset — сквозной номер первой записи блока: если задан, номера
+    карт и адреса email уникальны среди всех блоков с тем же master_seed.
+    corpus_path — файл корпуса для ФИО и адресов (иначе — Faker).
+    """
+    seed = derive_seed(master_seed, block_index)
+
+    source = corpus_locale(kind, open_corpus(corpus_path)) if corpus_path else None
+    if source is not None:
+        import numpy as np
+        return build_corpus_name_addresses(source, kind, size, np.random.default_rng(seed))
+    if kind in locale_registry:
+        faker = _get_worker_faker(kind)
+        faker.seed_instance(seed)
+        return build_name_addresses(faker, kind, size)
+    if kind == 'card' and unique_offset is not None:
+        return generate_credit_cards(size, seed=seed, unique_key=master_seed, start=unique_offset).to_dataset()
+    if kind == 'card':
+        return generate_credit_cards(size, seed=seed).to_dataset()
+    if kind == 'email' and unique_offset is not None:
+        return temp_email_dataset(generate_temp_emails(size, seed=seed, unique_key=master_seed, start=unique_offset))
+    if kind == 'email':
+        rng = random.Random(seed)
+        return temp_email_dataset([generate_temp_email(rng)['email'] for _ in range(size)])
+    raise ValueError(f"Неизвестный вид данных: {kind}")
+
+
+def _generate_block_task(task):
+    return generate_block(*task)
+
+
+def _block_tasks(kind, count, master_seed, block_size, unique=False, corpus_path=None):
+    for block_index, start in enumerate(range(0, count, block_size)):
+        yield (kind, master_seed, block_index, min(block_size, count - start),
+               start if unique else None, corpus_path)
+
+
+def _block_params(task):
+    """Параметры блока для ключа кеша (корпус — по содержимому файла)."""
+    kind, master_seed, block_index, size, unique_offset, corpus_path = task
+    return {'kind': kind, 'block_index': block_index, 'size': size, 'unique_offset': unique_offset,
+            'corpus': file_digest(corpus_path) if corpus_path else None}
+
+
+def _run_tasks(tasks, workers, cache=None):
+    """Результаты задач в исходном порядке (в текущем процессе при workers=1).
+
+    С cache блоки сначала ищутся в кеше; сгенерированные сохраняются в него.
+    """
+    def cached(task):
+        return None if cache is None else cache.get('block', task[1], _block_params(task))
+
+    def store(task, block):
+        if cache is not None:
+            cache.put('block', task[1], _block_params(task), block)
+        return block
+
+    if workers == 1:
+        for task in tasks:
+            block = cached(task)
+            yield store(task, _generate_block_task(task)) if block is None else block
+        return
+
+    # Держим ограниченное окно задач, чтобы готовые блоки не копились в памяти,
+    # если потребитель (например, запись на диск) медленнее генерации.
+    # Процессы пула создаются при первой отправке задачи: если все блоки
+    # нашлись в кеше, пул так и не запускается
+    def finish(task, block, future):
+        return block if future is None else store(task, future.result())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            block = cached(task)
+            future = executor.submit(_generate_block_task, task) if block is None else None
+            pending.append((task, block, future))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
+
+
+def _iter_unique_people(kind, count, master_seed, workers, block_size, corpus_path=None, cache=None):
+    """Блоки ФИО без повторов: дубликаты отбрасываются, недостающее добирается.
+
+    Всего генерируется не больше count * DEFAULT_MAX_ATTEMPTS_RATIO записей,
+    иначе выбрасывается UniqueSpaceExhausted (в локали кончились сочетания).
+    """
+    max_blocks = -(-count * DEFAULT_MAX_ATTEMPTS_RATIO // block_size)
+    tasks = ((kind, master_seed, block_index, block_size, None, corpus_path)
+             for block_index in itertools.islice(itertools.count(), max_blocks))
+    # Запас на один блок: свежие значения последнего блока тоже попадают в множество
+    seen = SeenSet(count + block_size)
+    remaining = count
+    for chunk in _run_tasks(tasks, workers, cache):
+        fresh = seen.add_many(chunk.values('full_name'))
+        chunk = chunk.take(fresh.nonzero()[0][:remaining])
+        remaining -= len(chunk)
+        yield chunk
+        if remaining == 0:
+            return
+    raise UniqueSpaceExhausted(f"Уникальных ФИО найдено {count - remaining} из {count}")
+
+
+def iter_parallel_chunks(kind, count, master_seed=0, workers=None, block_size=DEFAULT_BLOCK_SIZE,
+                         unique=False, corpus_path=None, cache=None):
+    """Поток блоков записей в исходном порядке.
+
+    workers — количество процессов (по умолчанию os.cpu_count());
+    при workers=1 генерация идет в текущем процессе. unique=True — режим
+    уникальности (см. описание модуля); при нем блоки ФИО могут быть короче
+    block_size. corpus_path — файл корпуса ФИО и адресов (см. corpus.py).
+    cache — постоянный кеш блоков (cache.GenerationCache).
+    """
+    if kind not in RECORD_KINDS and kind not in locale_registry:
+        raise ValueError(f"Неизвестный вид данных: {kind}")
+    if block_size <= 0:
+        raise ValueError("Размер блока должен быть положительным")
+
+    workers = workers or os.cpu_count() or 1
+    if unique and kind in locale_registry:
+        if count > 0:
+            yield from _iter_unique_people(kind, count, master_seed, workers, block_size, corpus_path,
+                                           cache)
+        return
+    yield from _run_tasks(_block_tasks(kind, count, master_seed, block_size, unique, corpus_path), workers,
+                          cache)
+
+
+def generate_parallel(kind, count, master_seed=0, workers=None, block_size=DEFAULT_BLOCK_SIZE,
+                      unique=False, corpus_path=None, cache=None):
+    """Генерирует count записей на нескольких процессах и возвращает один Dataset."""
+    return concat_datasets(iter_parallel_chunks(kind, count, master_seed, workers, block_size, unique,
+                                                corpus_path, cache))
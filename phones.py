@@ -0,0 +1,140 @@
+# phones.py
+"""Генерация телефонных номеров по шаблонам стран.
+
+Формат страны описывается один раз (шаблон + диапазоны частей номера +
+необязательная надбавка вроде добавочного номера или кода страны).
+Для пакетной генерации все части для всей партии вытягиваются одним
+генератором NumPy, а строки собираются заранее скомпилированным шаблоном.
+NumPy импортируется лениво — только при пакетной генерации.
+"""
+from string import Formatter
+
+
+class PhoneTemplate:
+    """Шаблон str.format с полями {0}, {1}, ..., {имя}, разобранный заранее.
+
+    Разбор идет один раз при создании (как у replies.ReplyTemplate), а номер
+    собирается %-форматированием: оно не разбирает поля заново на каждый
+    вызов и примерно вдвое быстрее связанного str.format.
+    """
+
+    __slots__ = ('source', 'format', 'fields', 'positional')
+
+    def __init__(self, source):
+        pieces = []
+        fields = []
+        auto = 0
+        for literal, name, format_spec, conversion in Formatter().parse(source):
+            pieces.append(literal.replace('%', '%%'))
+            if name is None:
+                continue
+            if format_spec or conversion:
+                raise ValueError(f"Неподдерживаемое поле шаблона телефона: {{{name}}}")
+            if name == '':
+                name, auto = str(auto), auto + 1
+            pieces.append('%s')
+            fields.append(int(name) if name.isdigit() else name)
+        self.source = source
+        self.format = ''.join(pieces)
+        self.fields = tuple(fields)
+        # Поля {0}, {1}, ... по порядку: аргументы подставляются кортежем как есть
+        self.positional = self.fields == tuple(range(len(fields)))
+
+    def __call__(self, *args, **named):
+        if self.positional and len(args) == len(self.fields):
+            return self.format % args
+        return self.format % tuple(named[field] if isinstance(field, str) else args[field]
+                                   for field in self.fields)
+
+    def render_columns(self, n, args, named=None):
+        """n строк по колонкам значений: args — позиционных полей, named — именованных."""
+        columns = [named[field] if isinstance(field, str) else args[field] for field in self.fields]
+        template = self.format
+        if not columns:
+            return [template % ()] * n
+        return [template % values for values in zip(*columns)]
+
+
+class PhoneOption:
+    """Необязательная часть номера, добавляемая с вероятностью probability.
+
+    template оборачивает основной номер: '{phone}' — сам номер,
+    '{0}', '{1}', ... — дополнительные части из parts.
+    """
+
+    def __init__(self, probability, template, parts=()):
+        self.probability = probability
+        # Для поштучной генерации вероятность проверяется как random_int(1, 100) <= percent
+        self.percent = round(probability * 100)
+        self.parts = tuple(parts)
+        self.render = PhoneTemplate(template)
+
+
+class PhoneFormat:
+    """Формат телефонного номера страны."""
+
+    def __init__(self, template, parts, option=None):
+        self.parts = tuple(parts)
+        self.option = option
+        self.render = PhoneTemplate(template)
+
+    def draw_one(self, random_int):
+        """Один номер; random_int(low, high) — источник случайных чисел (например, Faker)."""
+        phone = self.render(*(random_int(low, high) for low, high in self.parts))
+        option = self.option
+        if option is not None and random_int(1, 100) <= option.percent:
+            extra = [random_int(low, high) for low, high in option.parts]
+            phone = option.render(*extra, phone=phone)
+        return phone
+
+    def draw_batch(self, n, rng):
+        """Партия из n номеров; rng — numpy.random.Generator."""
+        import numpy as np
+        columns = [rng.integers(low, high + 1, size=n).tolist() for low, high in self.parts]
+        phones = self.render.render_columns(n, columns)
+
+        option = self.option
+        if option is not None and n:
+            selected = np.flatnonzero(rng.random(n) < option.probability).tolist()
+            extras = [rng.integers(low, high + 1, size=len(selected)).tolist() for low, high in option.parts]
+            current = [phones[index] for index in selected]
+            rendered = option.render.render_columns(len(selected), extras, {'phone': current})
+            for index, phone in zip(selected, rendered):
+                phones[index] = phone
+        return phones
+
+
+# Форматы по локалям; расширяются через register_phone_format
+PHONE_FORMATS = {
+    # Россия: +7 (9XX) XXX-XX-XX, мобильные коды 900-999;
+    # в 20% случаев добавочный номер (офисные телефоны)
+    'ru': PhoneFormat(
+        '+7 ({0}) {1}-{2}-{3}',
+        [(900, 999), (100, 999), (10, 99), (10, 99)],
+        PhoneOption(0.2, '{phone} доб. {0}', [(1000, 9999)])
+    ),
+    # США: (NXX) NXX-XXXX, коды зон и офисов 200-999; в 10% случаев код страны +1
+    'en': PhoneFormat(
+        '({0}) {1}-{2}',
+        [(200, 999), (200, 999), (1000, 9999)],
+        PhoneOption(0.1, '+1 {phone}')
+    ),
+}
+
+
+def register_phone_format(locale, phone_format):
+    """Добавляет или заменяет формат номеров для локали."""
+    PHONE_FORMATS[locale] = phone_format
+
+
+def generate_phones(locale, n, rng=None):
+    """Генерация n номеров для локали одним пакетом.
+
+    rng — numpy.random.Generator или seed (int/None) для него.
+    """
+    if locale not in PHONE_FORMATS:
+        raise ValueError(f"Нет формата телефонов для локали: {locale}")
+    import numpy as np
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    return PHONE_FORMATS[locale].draw_batch(n, rng)
@@ -0,0 +1,166 @@
+# pool.py
+"""Пулы заранее сгенерированных записей для мгновенных ответов бота.
+
+Фоновый поток держит каждый пул заполненным до верхней отметки (high_water).
+Обработчик просто забирает готовую запись; когда в пуле остается не больше
+нижней отметки (low_water), поток получает сигнал на пополнение.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+
+from generators import generate_name_address, generate_credit_card, generate_temp_email
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOW_WATER = 20
+DEFAULT_HIGH_WATER = 100
+
+# Генераторы, для которых бот держит пулы
+DEFAULT_FACTORIES = {
+    'ru': partial(generate_name_address, 'ru'),
+    'en': partial(generate_name_address, 'en'),
+    'card': generate_credit_card,
+    'email': generate_temp_email,
+}
+
+
+class PoolStats:
+    """Счетчики попаданий/промахов и время пополнения пула."""
+
+    __slots__ = ('hits', 'misses', 'refills', 'refill_seconds_total', 'refill_seconds_max')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_seconds_total = 0.0
+        self.refill_seconds_max = 0.0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def refill_seconds_avg(self):
+        return self.refill_seconds_total / self.refills if self.refills else 0.0
+
+    def record_refill(self, seconds):
+        self.refills += 1
+        self.refill_seconds_total += seconds
+        self.refill_seconds_max = max(self.refill_seconds_max, seconds)
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'refills': self.refills,
+            'refill_seconds_avg': self.refill_seconds_avg,
+            'refill_seconds_max': self.refill_seconds_max,
+        }
+
+
+class RecordPool:
+    """Пул записей одного генератора с фоновым пополнением."""
+
+    def __init__(self, name, factory, low_water=DEFAULT_LOW_WATER, high_water=DEFAULT_HIGH_WATER):
+        if not 0 <= low_water < high_water:
+            raise ValueError("Должно выполняться 0 <= low_water < high_water")
+        self.name = name
+        self.factory = factory
+        self.low_water = low_water
+        self.high_water = high_water
+        self.stats = PoolStats()
+        # deque.append/popleft потокобезопасны, отдельная блокировка не нужна
+        self._items = deque()
+        self._refill_needed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def pop_ready(self):
+        """Возвращает готовую запись или None, если пул пуст (промах)."""
+        try:
+            record = self._items.popleft()
+            self.stats.hits += 1
+        except IndexError:
+            self.stats.misses += 1
+            record = None
+        if len(self._items) <= self.low_water:
+            self._refill_needed.set()
+        return record
+
+    def get(self):
+        """Возвращает готовую запись; при пустом пуле генерирует синхронно."""
+        record = self.pop_ready()
+        if record is None:
+            record = self.factory()
+        return record
+
+    def refill(self):
+        """Пополняет пул до high_water в текущем потоке."""
+        start = time.perf_counter()
+        while len(self._items) < self.high_water and not self._stopped.is_set():
+            self._items.append(self.factory())
+        self.stats.record_refill(time.perf_counter() - start)
+
+    def start(self):
+        """Запускает фоновый поток пополнения (сразу заполняет пул)."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._refill_needed.set()
+        self._thread = threading.Thread(target=self._run, name=f"pool-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Останавливает фоновый поток."""
+        self._stopped.set()
+        self._refill_needed.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            self._refill_needed.wait()
+            if self._stopped.is_set():
+                return
+            self._refill_needed.clear()
+            try:
+                self.refill()
+            except Exception:
+                logger.exception("Ошибка пополнения пула %s", self.name)
+
+
+class RecordPools:
+    """Набор пулов по именам генераторов."""
+
+    def __init__(self, factories=None, low_water=DEFAULT_LOW_WATER, high_water=DEFAULT_HIGH_WATER):
+        factories = DEFAULT_FACTORIES if factories is None else factories
+        self.pools = {
+            name: RecordPool(name, factory, low_water, high_water)
+            for name, factory in factories.items()
+        }
+
+    def get(self, name):
+        """Готовая запись генератора name."""
+        return self.pools[name].get()
+
+    def start(self):
+        for pool in self.pools.values():
+            pool.start()
+
+    def stop(self, timeout=None):
+        for pool in self.pools.values():
+            pool.stop(timeout)
+
+    def stats(self):
+        """Метрики всех пулов: {имя: {hits, misses, ...}}."""
+        return {name: pool.stats.as_dict() for name, pool in self.pools.items()}
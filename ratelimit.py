@@ -0,0 +1,266 @@
+# ratelimit.py
+"""Ограничение частоты запросов к боту и отправки сообщений в Telegram.
+
+* TokenBucket — ведро токенов: пополняется со скоростью rate в секунду,
+  вмещает не больше capacity (допустимый всплеск).
+* RequestLimiter — ведро на каждый чат и общее ведро бота для входящих
+  запросов: лишние нажатия отклоняются до генерации данных, и один чат не
+  может занять бота целиком.
+* PressCoalescer — повторные нажатия одной кнопки в течение окна
+  объединяются: первое получает ответ сразу, остальные — одним сообщением
+  с несколькими записями в конце окна.
+* SendQueue — исходящие сообщения по очереди с учетом лимитов Telegram (на
+  чат и на бота); при ответе 429 отправка повторяется после retry_after.
+
+Часы (clock) и ожидание (sleep) передаются параметрами, чтобы тесты не
+зависели от времени.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+# Сколько чатов помнить (LRU); забытый чат получает полное ведро
+DEFAULT_MAX_CHATS = 10_000
+
+# Сколько раз повторять отправку после ответа 429
+DEFAULT_MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """Ведро токенов со скоростью rate в секунду и емкостью capacity."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'clock')
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Скорость должна быть положительной, а емкость — не меньше 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Забирает токены, если они есть; иначе False."""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def wait_time(self, tokens=1):
+        """Через сколько секунд накопится tokens токенов."""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def reserve(self, tokens=1):
+        """Забирает токены в долг; возвращает, сколько ждать до их появления.
+
+        Следующий вызов получит время после уже выданных резервов, поэтому
+        ожидающие обслуживаются в порядке вызова.
+        """
+        self._refill()
+        self.tokens -= tokens
+        return max(0.0, -self.tokens / self.rate)
+
+    def hold(self, seconds):
+        """Не выдавать токены ближайшие seconds секунд (пауза после 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, 1.0) - seconds * self.rate
+
+
+class _ChatBuckets:
+    """Ведра по чатам в LRU ограниченного размера."""
+
+    def __init__(self, rate, capacity, max_chats, clock):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_chats = max_chats
+        self.clock = clock
+        self._buckets = OrderedDict()
+
+    def get(self, chat_id):
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(self.rate, self.capacity, self.clock)
+            if len(self._buckets) > self.max_chats:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(chat_id)
+        return bucket
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RequestLimiter:
+    """Лимит входящих запросов: ведро на чат и общее ведро бота."""
+
+    def __init__(self, chat_rate, chat_burst, global_rate, global_burst,
+                 max_chats=DEFAULT_MAX_CHATS, clock=time.monotonic):
+        self.chats = _ChatBuckets(chat_rate, chat_burst, max_chats, clock)
+        self.global_bucket = TokenBucket(global_rate, global_burst, clock)
+        self.rejected = 0
+        # Чаты, которым уже сказали «слишком часто» в текущей серии отказов
+        self._warned = set()
+
+    def acquire(self, chat_id):
+        """0.0, если запрос можно выполнять; иначе через сколько секунд повторить."""
+        bucket = self.chats.get(chat_id)
+        if not bucket.try_acquire():
+            self.rejected += 1
+            return bucket.wait_time()
+        if not self.global_bucket.try_acquire():
+            # Токен чата возвращается: запрос не выполнен не по его вине
+            bucket.tokens += 1
+            self.rejected += 1
+            return self.global_bucket.wait_time()
+        self._warned.discard(chat_id)
+        return 0.0
+
+    def should_warn(self, chat_id):
+        """True при первом отказе в серии: предупреждение отправляется один раз."""
+        if chat_id in self._warned:
+            return False
+        if len(self._warned) >= self.chats.max_chats:
+            self._warned.clear()
+        self._warned.add(chat_id)
+        return True
+
+
+class _Window:
+    __slots__ = ('deadline', 'extra', 'owned')
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.extra = 0
+        self.owned = False
+
+
+class PressCoalescer:
+    """Объединение повторных нажатий одной кнопки в течение window секунд.
+
+    join(key) возвращает, сколько записей отправить на это нажатие: 1 —
+    первое нажатие, ответ сразу; n — пакет из повторных нажатий, ответ в конце
+    окна; 0 — нажатие вошло в пакет другого нажатия, отвечать не нужно.
+    Так на поток нажатий уходит не больше двух сообщений за окно.
+    """
+
+    def __init__(self, window, max_batch, max_keys=DEFAULT_MAX_CHATS, clock=time.monotonic):
+        if window < 0 or max_batch < 1:
+            raise ValueError("Окно не может быть отрицательным, а пакет — пустым")
+        self.window = window
+        self.max_batch = max_batch
+        self.max_keys = max_keys
+        self.clock = clock
+        self.coalesced = 0
+        self._windows = {}
+
+    async def join(self, key):
+        now = self.clock()
+        entry = self._windows.get(key)
+        if entry is None or now >= entry.deadline:
+            if len(self._windows) >= self.max_keys:
+                self._purge(now)
+            self._windows[key] = _Window(now + self.window)
+            return 1
+
+        entry.extra += 1
+        self.coalesced += 1
+        if entry.owned:
+            return 0
+        # Первое повторное нажатие ждет конца окна и отвечает за все
+        entry.owned = True
+        await asyncio.sleep(entry.deadline - now)
+        if self._windows.get(key) is entry:
+            del self._windows[key]
+        return min(entry.extra, self.max_batch)
+
+    def _purge(self, now):
+        expired = [key for key, entry in self._windows.items()
+                   if now >= entry.deadline and not entry.owned]
+        for key in expired:
+            del self._windows[key]
+
+    def __len__(self):
+        return len(self._windows)
+
+
+def retry_after_seconds(error, default=1.0):
+    """Пауза из ошибки 429 (retry_after в секундах или timedelta)."""
+    value = getattr(error, 'retry_after', None)
+    if value is None:
+        return default
+    if hasattr(value, 'total_seconds'):
+        return value.total_seconds()
+    return float(value)
+
+
+class SendQueue:
+    """Отправка сообщений с лимитами Telegram на чат и на бота.
+
+    Каждая отправка резервирует токен в ведре своего чата и в общем ведре и
+    ждет своей очереди. Ошибки из retry_on (RetryAfter) приостанавливают все
+    отправки на retry_after секунд — Telegram ограничивает бота целиком — и
+    отправка повторяется, не больше max_retries раз.
+
+    Пауза хранится сроком paused_until и проверяется перед каждым вызовом
+    send(): отправки, которые уже дождались своего токена и спят, тоже не
+    выходят до ее конца.
+    """
+
+    def __init__(self, chat_rate, chat_burst, global_rate, global_burst, retry_on=(),
+                 max_retries=DEFAULT_MAX_RETRIES, max_chats=DEFAULT_MAX_CHATS, clock=time.monotonic,
+                 sleep=asyncio.sleep):
+        self.chats = _ChatBuckets(chat_rate, chat_burst, max_chats, clock)
+        self.global_bucket = TokenBucket(global_rate, global_burst, clock)
+        self.clock = clock
+        self.sleep = sleep
+        self.paused_until = clock()
+        self.retry_on = tuple(retry_on)
+        self.max_retries = max_retries
+        self.sent = 0
+        self.retries = 0
+        self.waiting = 0
+        self.waited_seconds = 0.0
+
+    async def send(self, chat_id, send):
+        """Вызывает send() (корутину отправки) в свою очередь; возвращает ее результат."""
+        attempt = 0
+        while True:
+            await self._wait(self.chats.get(chat_id).reserve())
+            await self._wait(self.global_bucket.reserve())
+            await self._wait_pause()
+            try:
+                result = await send()
+            except self.retry_on as error:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                seconds = retry_after_seconds(error)
+                self.paused_until = max(self.paused_until, self.clock() + seconds)
+                self.global_bucket.hold(seconds)
+                continue
+            self.sent += 1
+            return result
+
+    async def _wait(self, delay):
+        if delay <= 0:
+            return
+        self.waiting += 1
+        self.waited_seconds += delay
+        try:
+            await self.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+    async def _wait_pause(self):
+        # Пока отправка спала, пауза могла начаться или продлиться
+        while (delay := self.paused_until - self.clock()) > 0:
+            await self._wait(delay)
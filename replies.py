@@ -0,0 +1,166 @@
+# replies.py
+"""Реестр ответов бота на кнопки и команды.
+
+Каждый ответ регистрируется один раз под коротким ключом ('card', 'ru'):
+либо как пара (источник записи, шаблон), либо как действие — асинхронная
+функция (update, context). Тексты кнопок и команды-синонимы привязываются к
+ключам, поэтому ответ на сообщение — это поиск в словаре, а его стоимость не
+зависит от числа кнопок.
+
+Шаблоны разбираются заранее (ReplyTemplate): при ответе остается подставить
+значения в готовую строку формата. Сгенерированные значения экранируются для
+Markdown Telegram; поле с !c выводится внутри `...`, где экранирование не
+работает, поэтому из него убираются обратные кавычки.
+
+Новый генератор подключается без изменения обработчика:
+    reply_registry.register('iban', source='iban', template="*IBAN:* `{iban!c}`")
+    reply_registry.bind("🏦 IBAN", 'iban')
+(источник — имя пула записей, см. pool.py).
+"""
+from collections import namedtuple
+from string import Formatter
+
+# Символы разметки Markdown (устаревший режим Telegram)
+MARKDOWN_SPECIAL = '_*`['
+
+_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in MARKDOWN_SPECIAL})
+
+# Метка для сообщений, не привязанных ни к одному ответу
+UNKNOWN_KEY = 'other'
+
+
+def escape_markdown(value):
+    """Экранирует символы разметки Markdown в значении."""
+    value = str(value)
+    # Обычно спецсимволов нет: проверка in быстрее, чем translate
+    if '_' in value or '*' in value or '`' in value or '[' in value:
+        return value.translate(_ESCAPE_TABLE)
+    return value
+
+
+def code_value(value):
+    """Значение для блока `...`: внутри него экранирование не работает."""
+    value = str(value)
+    return value.replace('`', "'") if '`' in value else value
+
+
+_CONVERSIONS = {None: escape_markdown, 'c': code_value}
+
+
+class ReplyTemplate:
+    """Markdown-шаблон с полями {имя} и {имя!c}, разобранный заранее."""
+
+    __slots__ = ('source', 'fields', '_format', '_converters')
+
+    def __init__(self, source):
+        pieces = []
+        fields = []
+        converters = []
+        for literal, name, format_spec, conversion in Formatter().parse(source):
+            pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+            if name is None:
+                continue
+            if not name or format_spec or conversion not in _CONVERSIONS:
+                raise ValueError(f"Неподдерживаемое поле шаблона: {{{name}}}")
+            pieces.append('{}')
+            fields.append(name)
+            converters.append(_CONVERSIONS[conversion])
+        self.source = source
+        self.fields = tuple(fields)
+        self._format = ''.join(pieces).format
+        self._converters = tuple(zip(fields, converters))
+
+    def render(self, record):
+        """Текст ответа для записи (словаря с полями шаблона)."""
+        return self._format(*[convert(record[name]) for name, convert in self._converters])
+
+
+Reply = namedtuple('Reply', ['key', 'source', 'template', 'action'])
+Reply.__doc__ = """Ответ: запись из пула source по шаблону template либо действие action."""
+
+
+class ReplyRegistry:
+    """Ответы по ключам и привязка к ним текстов кнопок и команд."""
+
+    def __init__(self):
+        self._replies = {}
+        self._texts = {}
+
+    def register(self, key, source=None, template=None, action=None):
+        """Регистрирует ответ (заменяя прежний с тем же ключом)."""
+        if (action is None) == (template is None):
+            raise ValueError("Нужен либо шаблон, либо действие")
+        if template is not None:
+            if not isinstance(template, ReplyTemplate):
+                template = ReplyTemplate(template)
+            source = source or key
+        reply = Reply(key, source, template, action)
+        self._replies[key] = reply
+        # Уже привязанные тексты указывают на новый ответ
+        for text, bound in self._texts.items():
+            if bound.key == key:
+                self._texts[text] = reply
+        return reply
+
+    def bind(self, text, key):
+        """Привязывает текст кнопки или синоним к ответу."""
+        if key not in self._replies:
+            raise KeyError(f"Ответ не зарегистрирован: {key}")
+        self._texts[text] = self._replies[key]
+
+    def bind_keyboard(self, keyboard, labels):
+        """Привязывает все кнопки клавиатуры; labels: текст кнопки -> ключ."""
+        for row in keyboard:
+            for text in row:
+                if text not in labels:
+                    raise KeyError(f"Для кнопки нет ответа: {text}")
+                self.bind(text, labels[text])
+
+    def __contains__(self, key):
+        return key in self._replies
+
+    def get(self, key):
+        """Ответ по ключу."""
+        return self._replies[key]
+
+    def lookup(self, text):
+        """Ответ на текст сообщения или None."""
+        return self._texts.get(text)
+
+    def label(self, text):
+        """Ключ ответа на текст (для метрик); UNKNOWN_KEY, если ответа нет."""
+        reply = self._texts.get(text)
+        return reply.key if reply is not None else UNKNOWN_KEY
+
+    def templated_keys(self):
+        """Ключи ответов с шаблоном (для команд вида /card)."""
+        return tuple(key for key, reply in self._replies.items() if reply.template is not None)
+
+
+reply_registry = ReplyRegistry()
+
+reply_registry.register('ru', template=(
+    "*ФИО и адрес (RU):*\n\n"
+    "👤 *ФИО:* {full_name}\n"
+    "🏠 *Адрес:* {address}\n"
+    "📞 *Телефон:* {phone}"
+))
+reply_registry.register('en', template=(
+    "*Name and Address (EN):*\n\n"
+    "👤 *Full Name:* {full_name}\n"
+    "🏠 *Address:* {address}\n"
+    "📞 *Phone:* {phone}"
+))
+reply_registry.register('card', template=(
+    "*Тестовая кредитная карта:*\n\n"
+    "🔢 *Номер:* `{number!c}`\n"
+    "🏷️ *Тип:* {type}\n"
+    "📅 *Срок:* {expiry}\n"
+    "🔐 *CVV:* {cvv}\n\n"
+    "⚠️ *Это НЕ настоящая карта!* Используйте только для тестов."
+))
+reply_registry.register('email', template=(
+    "*Временный email адрес:*\n\n"
+    "📭 `{email!c}`\n\n"
+    "*Примечание:* {note}"
+))
@@ -0,0 +1,366 @@
+# schema.py
+"""Декларативные схемы составных записей (например, «пользователь»).
+
+Схема — словарь (или JSON/YAML-файл) со списком полей: генератор поля,
+вероятность заполнения (probability) и зависимости от других полей
+(source — поле-источник значения, when — поле заполняется только вместе
+с указанным, depends_on — просто порядок вычисления). Схема компилируется
+один раз: порядок полей с учетом зависимостей вычисляется заранее, а
+случайность для всей партии берется одним генератором NumPy.
+
+ФИО и адреса — самая дорогая часть записи, если звать Faker на каждую строку.
+Поэтому они берутся колонками из корпуса (corpus.py): подключенного через
+generators.set_corpus, а без него — собранного в памяти из таблиц Faker
+(один раз на процесс). 'corpus': False в схеме возвращает вызовы Faker.
+
+Пример:
+    USER = {
+        'locale': 'ru',
+        'fields': {
+            'full_name': {'generator': 'name'},
+            'email': {'generator': 'email_from_name', 'source': 'full_name'},
+            'phone': {'generator': 'phone', 'probability': 0.8},
+            'card': {'generator': 'card', 'part': 'number'},
+        }
+    }
+    users = compile_schema(USER).generate(1000, seed=42)
+"""
+import json
+import os
+import re
+import unicodedata
+
+from corpus import CorpusError, memory_locale
+from generators import (
+    EMAIL_USERNAME_ALPHABET,
+    EMAIL_USERNAME_LENGTH,
+    TEMP_EMAIL_DOMAINS,
+    corpus_locale,
+    generate_credit_cards,
+    temp_email_strings
+)
+from locales import locale_registry
+from phones import PHONE_FORMATS
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# Транслитерация кириллицы для адресов email (упрощенная, в духе ГОСТ 7.79-2000 Б)
+_TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'і': 'i', 'ї': 'yi', 'є': 'ye', 'ґ': 'g',
+})
+
+_NOT_USERNAME = re.compile(r'[^a-z0-9]+')
+
+
+def transliterate(text):
+    """Латинская запись строки: кириллица транслитерируется, диакритика снимается."""
+    text = text.lower().translate(_TRANSLIT)
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+def username_from_name(full_name, max_parts=2):
+    """Имя пользователя из ФИО: 'Иванов Петр' -> 'ivanov.petr'."""
+    words = [word for word in _NOT_USERNAME.split(transliterate(full_name)) if len(word) > 1]
+    return '.'.join(words[:max_parts]) or 'user'
+
+
+class BatchContext:
+    """Состояние генерации одной партии, доступное генераторам полей."""
+
+    __slots__ = ('n', 'rng', 'faker', 'corpus', 'locale', 'columns', 'cache')
+
+    def __init__(self, n, rng, faker, locale, corpus=None):
+        self.n = n
+        self.rng = rng
+        self.faker = faker
+        # corpus.CorpusLocale для ФИО и адресов или None (тогда — Faker)
+        self.corpus = corpus
+        self.locale = locale
+        self.columns = {}
+        # Общие для нескольких полей результаты (например, одна карта на запись)
+        self.cache = {}
+
+
+# Генераторы полей: (ctx, spec) -> список из ctx.n значений
+
+def _faker_column(method):
+    def generate(ctx, spec):
+        call = getattr(ctx.faker, method)
+        return [call() for _ in range(ctx.n)]
+    return generate
+
+
+def _name_column(ctx, spec):
+    if ctx.corpus is not None:
+        return ctx.corpus.names(ctx.n, ctx.rng)
+    faker = ctx.faker
+    return [faker.name() for _ in range(ctx.n)]
+
+
+_name_column.uses_corpus = True
+
+
+def _name_part_column(part):
+    """Имя или фамилия: таблица корпуса part, иначе мужская и женская поровну."""
+    by_faker = _faker_column(part)
+
+    def generate(ctx, spec):
+        tables = ctx.corpus.tables if ctx.corpus is not None else {}
+        if part in tables:
+            return tables[part].draw(ctx.rng, ctx.n)
+        male, female = tables.get(f'{part}_male'), tables.get(f'{part}_female')
+        if male is None or female is None:
+            return by_faker(ctx, spec)
+        flags = (ctx.rng.random(ctx.n) < 0.5).tolist()
+        return [m if flag else f
+                for m, f, flag in zip(male.draw(ctx.rng, ctx.n), female.draw(ctx.rng, ctx.n), flags)]
+    generate.uses_corpus = True
+    return generate
+
+
+def _address_column(ctx, spec):
+    if ctx.corpus is not None:
+        return ctx.corpus.addresses(ctx.n, ctx.rng)
+    format_address = locale_registry.spec(ctx.locale).format_address
+    faker = ctx.faker
+    return [format_address(faker) for _ in range(ctx.n)]
+
+
+_address_column.uses_corpus = True
+
+
+def _phone_column(ctx, spec):
+    return PHONE_FORMATS[spec.get('locale', ctx.locale)].draw_batch(ctx.n, ctx.rng)
+
+
+def _card_column(ctx, spec):
+    cards = ctx.cache.get('card')
+    if cards is None:
+        cards = ctx.cache['card'] = generate_credit_cards(ctx.n, seed=int(ctx.rng.integers(2 ** 63)))
+    part = spec.get('part', 'number')
+    if part == 'type':
+        return cards.type.tolist()
+    if part not in ('number', 'expiry', 'cvv'):
+        raise ValueError(f"Неизвестная часть карты: {part}")
+    return [value.decode('ascii') for value in getattr(cards, part).tolist()]
+
+
+def _domains(ctx, spec):
+    domains = tuple(spec.get('domains', TEMP_EMAIL_DOMAINS))
+    return [domains[index] for index in ctx.rng.integers(0, len(domains), size=ctx.n).tolist()]
+
+
+def _temp_email_column(ctx, spec):
+    import numpy as np
+    domains = tuple(spec.get('domains', TEMP_EMAIL_DOMAINS))
+    letters = ctx.rng.integers(0, len(EMAIL_USERNAME_ALPHABET), size=(ctx.n, EMAIL_USERNAME_LENGTH),
+                               dtype=np.uint8)
+    return temp_email_strings(letters, ctx.rng.integers(0, len(domains), size=ctx.n), domains)
+
+
+def _email_from_name_column(ctx, spec):
+    names = ctx.columns[spec['source']]
+    # Две случайные цифры снижают число совпадений у однофамильцев
+    suffixes = ctx.rng.integers(10, 100, size=ctx.n).tolist()
+    return [
+        None if name is None else f"{username_from_name(name)}{suffix}@{domain}"
+        for name, suffix, domain in zip(names, suffixes, _domains(ctx, spec))
+    ]
+
+
+def _choice_column(ctx, spec):
+    values = list(spec['values'])
+    weights = spec.get('weights')
+    if weights is not None:
+        total = float(sum(weights))
+        weights = [weight / total for weight in weights]
+    indexes = ctx.rng.choice(len(values), size=ctx.n, p=weights).tolist()
+    return [values[index] for index in indexes]
+
+
+def _integer_column(ctx, spec):
+    return ctx.rng.integers(spec.get('low', 0), spec.get('high', 100) + 1, size=ctx.n).tolist()
+
+
+def _constant_column(ctx, spec):
+    return [spec['value']] * ctx.n
+
+
+FIELD_GENERATORS = {
+    'name': _name_column,
+    'first_name': _name_part_column('first_name'),
+    'last_name': _name_part_column('last_name'),
+    'address': _address_column,
+    'phone': _phone_column,
+    'card': _card_column,
+    'temp_email': _temp_email_column,
+    'email_from_name': _email_from_name_column,
+    'choice': _choice_column,
+    'integer': _integer_column,
+    'constant': _constant_column,
+}
+
+
+def register_field_generator(name, generator):
+    """Подключает генератор поля: generator(ctx, spec) -> список из ctx.n значений.
+
+    Генератору, которому нужен ctx.corpus, выставьте generator.uses_corpus = True.
+    """
+    FIELD_GENERATORS[name] = generator
+
+
+def _dependency_order(fields):
+    """Порядок вычисления полей: зависимые поля идут после своих источников."""
+    order = []
+    state = {}
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Циклическая зависимость полей: {' -> '.join(path + [name])}")
+        if name not in fields:
+            raise ValueError(f"Поле {path[-1]} зависит от неизвестного поля {name}")
+        state[name] = 'visiting'
+        for source in _sources(fields[name]):
+            visit(source, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in fields:
+        visit(name, [])
+    return order
+
+
+def _sources(spec):
+    sources = spec.get('depends_on', [])
+    if isinstance(sources, str):
+        sources = [sources]
+    for key in ('source', 'when'):
+        if key in spec:
+            sources = [spec[key], *sources]
+    return sources
+
+
+class CompiledSchema:
+    """Скомпилированная схема: генерирует записи партиями."""
+
+    def __init__(self, schema):
+        locale = schema.get('locale', 'ru')
+        if locale not in locale_registry:
+            raise ValueError(f"Неизвестная локаль: {locale}")
+        fields = schema.get('fields') or {}
+        if not fields:
+            raise ValueError("В схеме нет полей")
+
+        self.locale = locale
+        self.field_names = tuple(fields)
+        steps = []
+        for name in _dependency_order(fields):
+            spec = dict(fields[name])
+            generator = FIELD_GENERATORS.get(spec.get('generator'))
+            if generator is None:
+                raise ValueError(f"Неизвестный генератор поля {name}: {spec.get('generator')}")
+            probability = float(spec.get('probability', 1.0))
+            if not 0.0 <= probability <= 1.0:
+                raise ValueError(f"Вероятность поля {name} должна быть от 0 до 1")
+            steps.append((name, generator, spec, probability))
+        self._steps = tuple(steps)
+        # Корпус нужен только генераторам с атрибутом uses_corpus (ФИО, адрес)
+        self.use_corpus = bool(schema.get('corpus', True)) and any(
+            getattr(generator, 'uses_corpus', False) for _, generator, _, _ in steps
+        )
+        self._faker = None
+
+    def _get_faker(self):
+        # Собственный экземпляр: его seed переустанавливается для каждой генерации,
+        # и это не должно влиять на общие экземпляры бота
+        if self._faker is None:
+            from faker import Faker
+            self._faker = Faker(locale_registry.spec(self.locale).faker_locale)
+        return self._faker
+
+    def _get_corpus(self):
+        """Корпус локали: подключенный (generators.set_corpus) или собранный в памяти."""
+        if not self.use_corpus:
+            return None
+        source = corpus_locale(self.locale)
+        if source is not None:
+            return source
+        try:
+            return memory_locale(locale_registry.spec(self.locale).faker_locale)
+        except CorpusError:
+            # Шаблоны локали не раскладываются на таблицы — остаемся на Faker
+            return None
+
+    def generate_columns(self, n, rng):
+        """Колонки партии из n записей: {поле: список значений}."""
+        ctx = BatchContext(n, rng, self._get_faker(), self.locale, self._get_corpus())
+        for name, generator, spec, probability in self._steps:
+            column = generator(ctx, spec)
+            if probability < 1.0:
+                import numpy as np
+                empty = np.flatnonzero(rng.random(n) >= probability).tolist()
+                for index in empty:
+                    column[index] = None
+            if 'when' in spec:
+                # Поле заполняется только там, где заполнено поле-условие
+                condition = ctx.columns[spec['when']]
+                column = [None if flag is None else value for value, flag in zip(column, condition)]
+            ctx.columns[name] = column
+        return {name: ctx.columns[name] for name in self.field_names}
+
+    def iter_batches(self, count, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Поток партий записей (списков словарей) общим объемом count."""
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        if seed is not None:
+            self._get_faker().seed_instance(seed)
+        names = self.field_names
+        for start in range(0, count, batch_size):
+            columns = self.generate_columns(min(batch_size, count - start), rng)
+            yield [dict(zip(names, row)) for row in zip(*(columns[name] for name in names))]
+
+    def generate(self, count, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Список из count записей."""
+        records = []
+        for batch in self.iter_batches(count, seed, batch_size):
+            records.extend(batch)
+        return records
+
+
+def compile_schema(schema):
+    """Компилирует схему (словарь) в CompiledSchema."""
+    return CompiledSchema(schema)
+
+
+def load_schema(path):
+    """Загружает схему из JSON или YAML (для YAML нужен PyYAML) и компилирует ее."""
+    with open(path, encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise RuntimeError("Для YAML-схем установите PyYAML: pip install pyyaml") from exc
+            schema = yaml.safe_load(f)
+        else:
+            schema = json.load(f)
+    return compile_schema(schema)
+
+
+# Готовая схема «пользователь»: email связан с ФИО, карта есть у половины
+USER_SCHEMA = {
+    'locale': 'ru',
+    'fields': {
+        'full_name': {'generator': 'name'},
+        'email': {'generator': 'email_from_name', 'source': 'full_name'},
+        'phone': {'generator': 'phone'},
+        'address': {'generator': 'address'},
+        'card_number': {'generator': 'card', 'part': 'number', 'probability': 0.5},
+        'card_type': {'generator': 'card', 'part': 'type', 'when': 'card_number'},
+    }
+}
@@ -0,0 +1,184 @@
+# streams.py
+"""Детерминированные потоки записей с произвольным доступом.
+
+Запись с номером i вычисляется только из (seed, i): случайные числа берутся
+из счетчиковой хеш-функции (SplitMix64 от seed и номера записи), а не из
+общего генератора с состоянием. Поэтому:
+
+* любой срез [a, b) генерируется независимо — на другой машине, в другом
+  процессе, в любом порядке;
+* упавший тест может заново получить ровно ту запись, которую видел:
+  RecordStream('card', seed=42)[123456].
+
+Пример:
+    cards = RecordStream('card', seed=42)
+    cards[10]            # одна запись
+    cards[1000:2000]     # срез без генерации первых 1000 записей
+    for chunk in cards.iter_chunks(0, 10_000_000, 100_000): ...
+
+Для карт и email срез собирается векторно (NumPy); ФИО и адреса — через
+Faker, который перед каждой записью получает seed, выведенный из (seed, i).
+"""
+import hashlib
+
+from cards import DEFAULT_CARD_ENGINE
+from generators import (
+    CARD_NUMBER_SPACE,
+    EMAIL_USERNAME_ALPHABET,
+    EMAIL_USERNAME_LENGTH,
+    EMAIL_USERNAME_SPACE,
+    TEMP_EMAIL_DOMAINS,
+    TEMP_EMAIL_NOTE,
+    CreditCardBatch,
+    build_name_address,
+    card_columns,
+    digit_matrix,
+    temp_email_strings
+)
+from locales import locale_registry
+from unique import FeistelPermutation, mix64
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Шаг между словами одной записи (дробная часть золотого сечения, как в SplitMix64)
+_GAMMA = 0x9E3779B97F4A7C15
+
+# Сколько 32-битных случайных значений нужно одной записи
+_CARD_LANES = 1 + 1 + 2 + 1 + 1 + 3   # строка BIN, префикс, тело (64 бита), месяц, год, CVV
+_EMAIL_LANES = EMAIL_USERNAME_LENGTH + 1   # символы имени и домен
+
+
+def stream_key(seed):
+    """64-битный ключ потока из произвольного seed (int или str)."""
+    digest = hashlib.blake2b(f"stream:{seed}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def counter_lanes(key, indexes, lanes):
+    """Матрица (n, lanes) 32-битных случайных чисел для записей с номерами indexes.
+
+    Строка i зависит только от (key, indexes[i]).
+    """
+    import numpy as np
+    indexes = np.asarray(indexes, dtype=np.uint64)
+    words = (lanes + 1) // 2
+    base = mix64(mix64(indexes) ^ np.uint64(key))
+    steps = np.arange(1, words + 1, dtype=np.uint64) * np.uint64(_GAMMA)
+    block = mix64(base[:, None] + steps)
+    mask = np.uint64(0xFFFFFFFF)
+    halves = np.empty((len(indexes), words * 2), dtype=np.uint64)
+    halves[:, 0::2] = block & mask
+    halves[:, 1::2] = block >> np.uint64(32)
+    return halves[:, :lanes]
+
+
+def _uniform(lanes, low, high):
+    """Числа в [low, high] из 32-битных значений (умножение со сдвигом, без деления)."""
+    import numpy as np
+    span = np.uint64(high - low + 1)
+    return ((lanes * span) >> np.uint64(32)).astype(np.uint8 if high < 256 else np.uint64) + low
+
+
+def _cards(key, indexes, permutation=None):
+    import numpy as np
+    engine = DEFAULT_CARD_ENGINE
+    lanes = counter_lanes(key, indexes, _CARD_LANES)
+    if permutation is None:
+        rows, offsets, bodies = engine.select(
+            lanes[:, 0] / float(1 << 32), lanes[:, 1], (lanes[:, 2] << np.uint64(32)) | lanes[:, 3]
+        )
+    else:
+        rows, offsets, bodies = engine.locate(permutation.permute(indexes))
+    columns = card_columns(
+        engine.numbers(rows, offsets, bodies),
+        engine.type_codes(rows),
+        _uniform(lanes[:, 4], 1, 12),
+        _uniform(lanes[:, 5], 23, 30),
+        _uniform(lanes[:, 6:9], 0, 9),
+    )
+    return CreditCardBatch(*columns).to_dicts()
+
+
+def _emails(key, indexes, permutation=None):
+    lanes = counter_lanes(key, indexes, _EMAIL_LANES)
+    base = len(EMAIL_USERNAME_ALPHABET)
+    if permutation is None:
+        letters = _uniform(lanes[:, :EMAIL_USERNAME_LENGTH], 0, base - 1)
+    else:
+        letters = digit_matrix(permutation.permute(indexes), EMAIL_USERNAME_LENGTH, base)
+    domains = _uniform(lanes[:, EMAIL_USERNAME_LENGTH], 0, len(TEMP_EMAIL_DOMAINS) - 1)
+    return [{'email': email, 'note': TEMP_EMAIL_NOTE} for email in temp_email_strings(letters, domains)]
+
+
+class RecordStream:
+    """Бесконечный поток записей вида kind, где запись i = f(seed, i).
+
+    kind — 'card', 'email' или код зарегистрированной локали (ФИО и адрес).
+    unique=True (для карт и email) — номера карт и имена ящиков не
+    повторяются во всем потоке (перестановка с ключом seed, см. unique.py).
+    """
+
+    def __init__(self, kind, seed=0, unique=False):
+        if kind not in ('card', 'email') and kind not in locale_registry:
+            raise ValueError(f"Неизвестный вид данных: {kind}")
+        if unique and kind not in ('card', 'email'):
+            raise ValueError("Уникальный поток поддерживается только для card и email")
+        self.kind = kind
+        self.seed = seed
+        self.key = stream_key(seed)
+        self.permutation = None
+        if unique:
+            space = CARD_NUMBER_SPACE if kind == 'card' else EMAIL_USERNAME_SPACE
+            self.permutation = FeistelPermutation(space, self.key)
+        self._faker = None
+
+    def _get_faker(self):
+        # Собственный экземпляр: его seed переустанавливается для каждой записи
+        if self._faker is None:
+            from faker import Faker
+            self._faker = Faker(locale_registry.spec(self.kind).faker_locale)
+        return self._faker
+
+    def records(self, indexes):
+        """Записи с указанными номерами (список словарей в том же порядке)."""
+        import numpy as np
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if indexes.size and indexes.min() < 0:
+            raise IndexError("Номер записи не может быть отрицательным")
+        indexes = indexes.astype(np.uint64)
+        if self.kind == 'card':
+            return _cards(self.key, indexes, self.permutation)
+        if self.kind == 'email':
+            return _emails(self.key, indexes, self.permutation)
+
+        faker = self._get_faker()
+        seeds = mix64(mix64(indexes) ^ np.uint64(self.key)).tolist()
+        records = []
+        for seed in seeds:
+            faker.seed_instance(seed)
+            records.append(build_name_address(faker, self.kind))
+        return records
+
+    def take(self, start, stop):
+        """Записи с номерами [start, stop)."""
+        import numpy as np
+        if stop < start:
+            raise ValueError("Конец среза меньше начала")
+        return self.records(np.arange(start, stop, dtype=np.int64))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is None:
+                raise ValueError("Поток бесконечен: укажите конец среза")
+            start = index.start or 0
+            step = index.step or 1
+            if step < 1:
+                raise ValueError("Шаг среза должен быть положительным")
+            import numpy as np
+            return self.records(np.arange(start, index.stop, step, dtype=np.int64))
+        return self.records([index])[0]
+
+    def iter_chunks(self, start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Порции записей [start, stop) по chunk_size штук."""
+        for offset in range(start, stop, chunk_size):
+            yield self.take(offset, min(offset + chunk_size, stop))
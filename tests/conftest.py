@@ -0,0 +1,20 @@
+# tests/conftest.py
+"""Общие помощники тестов."""
+import asyncio
+
+
+class FakeClock:
+    """Управляемые часы для тестов."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        """Ожидание по этим часам: управление отдается циклу, при пробуждении
+        время сдвигается не меньше чем до срока этого ожидания."""
+        deadline = self.now + delay
+        await asyncio.sleep(0)
+        self.now = max(self.now, deadline)
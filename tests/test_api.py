@@ -0,0 +1,238 @@
+# tests/test_api.py
+import asyncio
+import json
+
+import pytest
+
+import generators
+from api import ApiServer
+from bench.bench_api import HttpConnection, run_load
+from dispatcher import GenerationDispatcher
+
+
+async def start_server(**kwargs):
+    kwargs.setdefault('dispatcher', GenerationDispatcher(max_workers=2))
+    return await ApiServer('127.0.0.1', 0, **kwargs).start()
+
+
+def jsonl(body):
+    return [json.loads(line) for line in body.decode('utf-8').splitlines()]
+
+
+class TestApiEndpoints:
+    """Тесты маршрутов HTTP API."""
+
+    @pytest.mark.asyncio
+    async def test_person(self):
+        """Тест: без count — один объект, с count — JSON Lines."""
+        server = await start_server()
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            status, headers, body = await connection.request('/v1/person?locale=en')
+            assert status == 200
+            assert headers['content-type'].startswith('application/json')
+            assert json.loads(body)['locale'] == 'EN'
+
+            status, headers, body = await connection.request('/v1/person?locale=ru&count=5')
+            records = jsonl(body)
+            assert headers['content-type'].startswith('application/x-ndjson')
+            assert len(records) == 5
+            assert set(records[0]) == {'full_name', 'address', 'phone', 'locale'}
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_streamed_cards(self):
+        """Тест: большой ответ отдается chunked-потоком порциями."""
+        server = await start_server(chunk_size=40)
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            status, headers, body = await connection.request('/v1/cards?count=130')
+            cards = jsonl(body)
+
+            assert status == 200
+            assert headers['transfer-encoding'] == 'chunked'
+            assert len(cards) == 130
+            assert set(cards[0]) == {'number', 'type', 'expiry', 'cvv'}
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_seed_and_offset(self):
+        """Тест: seed и offset дают воспроизводимый срез потока."""
+        server = await start_server(chunk_size=16)
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            _, _, whole = await connection.request('/v1/emails?count=50&seed=3')
+            _, _, part = await connection.request('/v1/emails?count=10&seed=3&offset=20')
+            _, _, single = await connection.request('/v1/emails?seed=3&offset=25')
+
+            assert jsonl(part) == jsonl(whole)[20:30]
+            assert json.loads(single) == jsonl(whole)[25]
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_unique_cards(self):
+        """Тест: unique=1 без повторов номеров."""
+        server = await start_server(chunk_size=100)
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            _, _, body = await connection.request('/v1/cards?count=500&unique=1')
+            assert len({card['number'] for card in jsonl(body)}) == 500
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_unique_range(self):
+        """Тест: уникальный срез за концом пространства отклоняется до начала потока."""
+        space = generators.CARD_NUMBER_SPACE
+        server = await start_server(chunk_size=2)
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            status, _, body = await connection.request(f'/v1/cards?seed=1&unique=1&offset={2 ** 62}&count=2')
+            assert status == 400
+            assert 'error' in json.loads(body)
+
+            status, _, _ = await connection.request(f'/v1/cards?seed=1&unique=1&offset={space - 3}&count=5')
+            assert status == 400
+
+            status, _, body = await connection.request(f'/v1/cards?seed=1&unique=1&offset={space - 5}&count=5')
+            assert status == 200
+            assert len({card['number'] for card in jsonl(body)}) == 5
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_boundary(self):
+        """Тест граничных строк с категорией и языком."""
+        server = await start_server()
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            _, _, body = await connection.request('/v1/boundary?category=sql&lang=en')
+            items = json.loads(body)
+            assert [item['category'] for item in items] == ['sql']
+            assert items[0]['title'] == '🥷 SQL injection'
+
+            status, _, _ = await connection.request('/v1/boundary?category=nope')
+            assert status == 404
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('path, method, expected', [
+        ('/v1/unknown', 'GET', 404),
+        ('/v1/person?locale=xx', 'GET', 400),
+        ('/v1/cards?count=0', 'GET', 400),
+        ('/v1/cards?count=abc', 'GET', 400),
+        ('/v1/person?unique=1', 'GET', 400),
+        ('/v1/cards?offset=5', 'GET', 400),
+        ('/v1/cards', 'POST', 405),
+    ])
+    async def test_errors(self, path, method, expected):
+        """Тест ошибок запроса: JSON с описанием и верный код."""
+        server = await start_server()
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            status, _, body = await connection.request(path, method)
+            assert status == expected
+            assert 'error' in json.loads(body)
+        finally:
+            await connection.close()
+            await server.close()
+
+
+class TestApiConnections:
+    """Тесты соединений и перегрузки."""
+
+    @pytest.mark.asyncio
+    async def test_keep_alive(self):
+        """Тест: несколько запросов по одному соединению."""
+        server = await start_server()
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            for _ in range(3):
+                status, headers, body = await connection.request('/v1/health')
+                assert status == 200
+                assert headers['connection'] == 'keep-alive'
+            assert json.loads(body) == {'status': 'ok', 'requests': 3, 'connections': 1}
+
+            status, headers, body = await connection.request('/v1/cards?count=5', 'HEAD')
+            assert status == 200 and body == b''
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_close(self):
+        """Тест: Connection: close закрывает соединение после ответа."""
+        server = await start_server()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        try:
+            writer.write(b"GET /v1/health HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+            response = await asyncio.wait_for(reader.read(), 5)
+            assert response.startswith(b'HTTP/1.1 200 OK')
+            assert b'Connection: close' in response
+        finally:
+            writer.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_busy(self):
+        """Тест: при переполненной очереди генерации — 503 с Retry-After."""
+        server = await start_server(dispatcher=GenerationDispatcher(max_workers=1, max_pending=0))
+        connection = HttpConnection('127.0.0.1', server.port)
+        try:
+            status, headers, _ = await connection.request('/v1/cards?count=5')
+            assert status == 503
+            assert headers['retry-after'] == '1'
+        finally:
+            await connection.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_failure(self, monkeypatch, caplog):
+        """Тест: ошибка во второй порции обрывает поток без завершающей порции и пишется в лог."""
+        server = await start_server(chunk_size=10)
+        generate = server.generate
+        calls = []
+
+        async def failing(plan, start, count):
+            calls.append(start)
+            if len(calls) > 1:
+                raise RuntimeError("генерация упала")
+            return await generate(plan, start, count)
+
+        monkeypatch.setattr(server, 'generate', failing)
+        connection = HttpConnection('127.0.0.1', server.port)
+        health = HttpConnection('127.0.0.1', server.port)
+        try:
+            with pytest.raises(asyncio.IncompleteReadError):
+                await asyncio.wait_for(connection.request('/v1/cards?count=30'), 5)
+            # Сервер продолжает работать
+            assert (await health.request('/v1/health'))[0] == 200
+        finally:
+            await connection.close()
+            await health.close()
+            await server.close()
+
+        assert 'Поток ответа оборван' in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_load_harness(self):
+        """Тест нагрузочного прогона: сводка по запросам и задержке."""
+        server = await start_server()
+        try:
+            result = await run_load('127.0.0.1', server.port, ['/v1/health', '/v1/emails?count=3'], 4, 40)
+
+            assert result['requests'] == 40
+            assert result['errors'] == 0
+            assert result['latency_p99_ms'] >= result['latency_p50_ms'] > 0
+        finally:
+            await server.close()
@@ -0,0 +1,39 @@
+# tests/test_bench.py
+from bench.suite import Benchmark, find_regressions, run_suite
+
+
+class TestBenchSuite:
+    """Тесты набора бенчмарков (без проверки абсолютных цифр)."""
+
+    def test_run_suite_metrics(self):
+        """Тест: для бенчмарка считаются задержка, скорость и память."""
+        benchmark = Benchmark('counter', lambda: {'value': 'x' * 10})
+        results = run_suite([benchmark], sizes=(1, 50))
+
+        metrics = results['counter']
+        assert set(metrics) == {
+            'latency_p50_us', 'latency_p99_us',
+            'records_per_sec_1', 'records_per_sec_50',
+            'memory_per_record_bytes'
+        }
+        assert metrics['latency_p99_us'] >= metrics['latency_p50_us'] > 0
+        assert metrics['memory_per_record_bytes'] > 0
+
+    def test_batch_function_used(self):
+        """Тест: пакетная версия используется вместо цикла вызовов."""
+        calls = []
+        benchmark = Benchmark('batch', lambda: 1, lambda n: calls.append(n) or [0] * n)
+        benchmark.run_batch(10)
+
+        assert calls == [10]
+
+    def test_find_regressions(self):
+        """Тест поиска регрессий относительно базы."""
+        baseline = {'gen': {'latency_p50_us': 10.0, 'records_per_sec_1000': 1000.0,
+                            'memory_per_record_bytes': 100.0, 'latency_p99_us': 10.0}}
+        current = {'gen': {'latency_p50_us': 11.0, 'records_per_sec_1000': 700.0,
+                           'memory_per_record_bytes': 130.0, 'latency_p99_us': 50.0}}
+
+        regressions = {(name, metric) for name, metric, *_ in find_regressions(current, baseline, 0.2)}
+        assert regressions == {('gen', 'records_per_sec_1000'), ('gen', 'memory_per_record_bytes')}
+        assert find_regressions(current, {}, 0.2) == []
@@ -0,0 +1,387 @@
+# tests/test_bot.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import bot
+from dispatcher import DispatcherBusy
+from unique import UniqueSpaceExhausted
+
+
+def make_update(text):
+    """Поддельный Update с сообщением text."""
+    update = MagicMock()
+    update.message.text = text
+    update.message.reply_text = AsyncMock()
+    return update
+
+
+class TestHandleMessage:
+    """Тесты обработчика кнопок."""
+
+    @pytest.mark.asyncio
+    async def test_card_button(self):
+        """Тест ответа на кнопку карты."""
+        update = make_update("💳 Номер карты")
+        await bot.handle_message(update, None)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert response.startswith("*Тестовая кредитная карта:*")
+
+    @pytest.mark.asyncio
+    async def test_person_button(self):
+        """Тест ответа на кнопку ФИО (RU)."""
+        update = make_update("🇷🇺 ФИО и адрес (RU)")
+        await bot.handle_message(update, None)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert "*ФИО:*" in response
+        assert "+7" in response
+
+    @pytest.mark.asyncio
+    async def test_unknown_text(self):
+        """Тест ответа на произвольный текст."""
+        update = make_update("привет")
+        await bot.handle_message(update, None)
+
+        assert "/help" in update.message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_busy_dispatcher(self, monkeypatch):
+        """Тест ответа при переполненной очереди генерации."""
+        monkeypatch.setattr(bot.dispatcher, 'run', AsyncMock(side_effect=DispatcherBusy))
+        update = make_update("📧 Временный email")
+        await bot.handle_message(update, None)
+
+        assert "перегружен" in update.message.reply_text.call_args.args[0]
+
+
+class TestBoundaryCommand:
+    """Тесты граничных строк в боте."""
+
+    @pytest.mark.asyncio
+    async def test_boundary_button(self):
+        """Тест ответа на кнопку граничных строк."""
+        update = make_update("📏 Граничные строки")
+        await bot.handle_message(update, None)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert response.startswith("*Граничные строки и инъекции:*")
+
+    @pytest.mark.asyncio
+    async def test_boundary_command_category(self):
+        """Тест команды /boundary с категорией и языком."""
+        update = make_update("/boundary sql en")
+        context = MagicMock(args=['sql', 'en'])
+        await bot.boundary_command(update, context)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert "SQL injection" in response
+        assert "XSS" not in response
+
+    @pytest.mark.asyncio
+    async def test_boundary_command_unknown_category(self):
+        """Тест команды /boundary с неизвестной категорией."""
+        update = make_update("/boundary nope")
+        await bot.boundary_command(update, MagicMock(args=['nope']))
+
+        assert "Неизвестная категория" in update.message.reply_text.call_args.args[0]
+
+
+class TestBulkCommand:
+    """Тесты команды /bulk."""
+
+    @staticmethod
+    def make_bulk_update(user_id=1):
+        update = make_update("/bulk")
+        update.effective_user.id = user_id
+        update.sent_documents = []
+
+        async def capture(document, filename, caption):
+            update.sent_documents.append((filename, document.read()))
+
+        update.message.reply_document = AsyncMock(side_effect=capture)
+        return update
+
+    def test_parse_bulk_args(self):
+        """Тест разбора аргументов."""
+        assert bot.parse_bulk_args(['ru', '100']) == ('ru', 100, 'csv', 'gzip')
+        assert bot.parse_bulk_args(['CARD', '5', 'jsonl', 'none']) == ('card', 5, 'jsonl', 'none')
+        assert bot.parse_bulk_args(['ru']) is None
+        assert bot.parse_bulk_args(['xx', '10']) is None
+        assert bot.parse_bulk_args(['ru', '0']) is None
+        assert bot.parse_bulk_args(['ru', '10', 'xml']) is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_sends_gzip_document(self):
+        """Тест: файл отправляется одним сжатым документом."""
+        import gzip
+
+        update = self.make_bulk_update()
+        await bot.bulk_command(update, MagicMock(args=['email', '25']))
+
+        filename, content = update.sent_documents[0]
+        lines = gzip.decompress(content).decode('utf-8').splitlines()
+        assert filename == 'email_25.csv.gz'
+        assert lines[0] == 'email'
+        assert len(lines) == 26
+        assert not bot.active_bulk_users
+
+    @pytest.mark.asyncio
+    async def test_bulk_progress_messages(self, monkeypatch):
+        """Тест сообщения о прогрессе для больших заданий."""
+        monkeypatch.setattr(bot.config, 'BULK_PROGRESS_THRESHOLD', 10)
+        update = self.make_bulk_update()
+        status = MagicMock(edit_text=AsyncMock())
+        update.message.reply_text = AsyncMock(return_value=status)
+
+        await bot.bulk_command(update, MagicMock(args=['card', '50', 'jsonl', 'none']))
+
+        assert update.message.reply_text.call_args.args[0].startswith("⏳ Генерация")
+        assert status.edit_text.call_args.args[0].startswith("✅ Готово: 50")
+        assert update.sent_documents[0][0] == 'card_50.jsonl'
+
+    @pytest.mark.asyncio
+    async def test_bulk_user_limit(self, monkeypatch):
+        """Тест персонального лимита записей."""
+        monkeypatch.setattr(bot.config, 'BULK_USER_MAX_RECORDS', {7: 10})
+        update = self.make_bulk_update(user_id=7)
+        await bot.bulk_command(update, MagicMock(args=['ru', '11']))
+
+        assert "лимит" in update.message.reply_text.call_args.args[0]
+        assert update.sent_documents == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_one_job_per_user(self, monkeypatch):
+        """Тест: у пользователя может быть только одно задание одновременно."""
+        monkeypatch.setattr(bot, 'active_bulk_users', {3})
+        update = self.make_bulk_update(user_id=3)
+        await bot.bulk_command(update, MagicMock(args=['ru', '5']))
+
+        assert "уже выполняется" in update.message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_start_lists_bulk_kinds(self):
+        """Тест: /start перечисляет виды /bulk из реестра."""
+        update = make_update("/start")
+        await bot.start(update, None)
+
+        text = update.message.reply_text.call_args.args[0]
+        assert f"({', '.join(bot.RECORD_FIELDS)})" in text
+
+    @pytest.mark.asyncio
+    async def test_bulk_rate_limited(self, monkeypatch):
+        """Тест: /bulk проходит через общий лимит запросов."""
+        monkeypatch.setattr(bot, 'request_limiter', bot.RequestLimiter(1, 1, 100, 100))
+        first, second = self.make_bulk_update(), self.make_bulk_update()
+        second.effective_chat.id = first.effective_chat.id
+        await bot.bulk_command(first, MagicMock(args=['email', '5']))
+        await bot.bulk_command(second, MagicMock(args=['email', '5']))
+
+        assert len(first.sent_documents) == 1
+        assert second.sent_documents == []
+        assert "Слишком много запросов" in second.message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_bulk_missing_dependency(self, monkeypatch):
+        """Тест: об отсутствующей необязательной зависимости сообщается пользователю."""
+        async def run(*args, **kwargs):
+            raise bot.MissingDependency("Для сжатия zstd установите zstandard")
+
+        monkeypatch.setattr(bot.dispatcher, 'run', run)
+        update = self.make_bulk_update()
+        await bot.bulk_command(update, MagicMock(args=['email', '5', 'csv', 'zstd']))
+
+        assert "установите zstandard" in update.message.reply_text.call_args.args[0]
+        assert not bot.active_bulk_users
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('error, expected', [
+        (DispatcherBusy(), "перегружен"),
+        (UniqueSpaceExhausted("мало значений"), None),
+    ])
+    async def test_bulk_other_errors(self, monkeypatch, error, expected):
+        """Тест: перегрузка дает ответ «занято», прочие ошибки не перехватываются."""
+        async def run(*args, **kwargs):
+            raise error
+
+        monkeypatch.setattr(bot.dispatcher, 'run', run)
+        update = self.make_bulk_update()
+        if expected is None:
+            with pytest.raises(type(error)):
+                await bot.bulk_command(update, MagicMock(args=['email', '5']))
+        else:
+            await bot.bulk_command(update, MagicMock(args=['email', '5']))
+            assert expected in update.message.reply_text.call_args.args[0]
+        assert not bot.active_bulk_users
+
+    @pytest.mark.asyncio
+    async def test_bulk_usage(self):
+        """Тест подсказки при неверных аргументах."""
+        update = self.make_bulk_update()
+        await bot.bulk_command(update, MagicMock(args=[]))
+
+        assert update.message.reply_text.call_args.args[0].startswith("Использование")
+
+
+class TestStatsCommand:
+    """Тесты метрик обработчиков и команды /stats."""
+
+    @pytest.mark.asyncio
+    async def test_button_phases_recorded(self):
+        """Тест записи фаз нажатия кнопки в метрики."""
+        bot.handler_metrics.reset()
+        await bot.handle_message(make_update("💳 Номер карты"), None)
+
+        keys = set(bot.handler_metrics.histograms)
+        for phase_name in ('generation', 'formatting', 'send', 'total'):
+            assert ('handle_message', 'card', phase_name) in keys
+
+    @pytest.mark.asyncio
+    async def test_help_button_single_request(self):
+        """Тест: «Помощь» вызывает /help, но считается одним запросом."""
+        bot.handler_metrics.reset()
+        await bot.handle_message(make_update("🆘 Помощь"), None)
+
+        assert ('handle_message', 'help', 'total') in bot.handler_metrics.histograms
+        assert not any(key[0] == 'help' for key in bot.handler_metrics.histograms)
+
+    @pytest.mark.asyncio
+    async def test_stats_table(self, monkeypatch):
+        """Тест вывода таблицы задержек."""
+        monkeypatch.setattr(bot.config, 'ADMIN_USER_IDS', {1})
+        bot.handler_metrics.reset()
+        await bot.handle_message(make_update("📧 Временный email"), None)
+
+        update = make_update("/stats")
+        update.effective_user.id = 1
+        await bot.stats_command(update, None)
+        response = update.message.reply_text.call_args.args[0]
+        assert response.startswith("```")
+        assert "handle_message/email" in response
+        assert "p99" in response
+
+    @pytest.mark.asyncio
+    async def test_stats_admin_only(self, monkeypatch):
+        """Тест: при заданном списке администраторов остальным /stats недоступна."""
+        monkeypatch.setattr(bot.config, 'ADMIN_USER_IDS', {1})
+        update = make_update("/stats")
+        update.effective_user.id = 2
+        await bot.stats_command(update, None)
+
+        assert "администратор" in update.message.reply_text.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_stats_denied_without_admins(self, monkeypatch):
+        """Тест: пока список администраторов пуст, /stats недоступна никому."""
+        monkeypatch.setattr(bot.config, 'ADMIN_USER_IDS', set())
+        update = make_update("/stats")
+        await bot.stats_command(update, None)
+
+        assert "администратор" in update.message.reply_text.call_args.args[0]
+
+
+class TestReplyCommands:
+    """Тесты команд-синонимов кнопок."""
+
+    @pytest.mark.asyncio
+    async def test_card_command(self):
+        """Тест: /card отвечает так же, как кнопка карты."""
+        update = make_update("/card@test_bot")
+        await bot.reply_command(update, None)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert response.startswith("*Тестовая кредитная карта:*")
+
+    def test_all_keyboard_buttons_bound(self):
+        """Тест: у каждой кнопки клавиатуры есть ответ."""
+        for row in bot.MAIN_KEYBOARD:
+            for text in row:
+                assert bot.reply_registry.lookup(text) is not None
+
+    @pytest.mark.asyncio
+    async def test_generated_values_escaped(self, monkeypatch):
+        """Тест экранирования разметки в данных из пула."""
+        record = {'full_name': 'Иван_Иванов', 'address': 'ул. *Мира*', 'phone': '+7 900'}
+        monkeypatch.setattr(bot.record_pools.pools['ru'], 'pop_ready', lambda: record)
+        update = make_update("🇷🇺 ФИО и адрес (RU)")
+        await bot.handle_message(update, None)
+
+        response = update.message.reply_text.call_args.args[0]
+        assert r"Иван\_Иванов" in response
+        assert r"ул. \*Мира\*" in response
+
+
+class TestFloodProtection:
+    """Тесты защиты от флуда в обработчике кнопок."""
+
+    @staticmethod
+    def make_chat_update(text, chat_id):
+        update = make_update(text)
+        update.effective_chat.id = chat_id
+        return update
+
+    @pytest.mark.asyncio
+    async def test_presses_coalesced(self, monkeypatch):
+        """Тест: серия нажатий — ответ сразу и один пакетный ответ."""
+        monkeypatch.setattr(bot, 'press_coalescer', bot.PressCoalescer(window=0.05, max_batch=3))
+        updates = [self.make_chat_update("💳 Номер карты", 'coalesce') for _ in range(5)]
+        await bot.handle_message(updates[0], None)
+        await asyncio.gather(*(bot.handle_message(update, None) for update in updates[1:]))
+
+        replies = [update.message.reply_text.call_args.args[0]
+                   for update in updates if update.message.reply_text.called]
+        assert len(replies) == 2
+        assert replies[0].count("Тестовая кредитная карта") == 1
+        assert replies[1].count("Тестовая кредитная карта") == 3
+
+    @pytest.mark.asyncio
+    async def test_flood_rejected_with_single_warning(self, monkeypatch):
+        """Тест: сверх лимита запросы отклоняются, предупреждение одно."""
+        monkeypatch.setattr(bot, 'request_limiter', bot.RequestLimiter(1, 2, 100, 100))
+        updates = [self.make_chat_update("/card", 'flood') for _ in range(5)]
+        for update in updates:
+            await bot.reply_command(update, None)
+
+        texts = [update.message.reply_text.call_args.args[0] for update in updates[:3]]
+        assert all(text.startswith("*Тестовая кредитная карта:*") for text in texts[:2])
+        assert "Слишком много запросов" in texts[2]
+        assert not updates[3].message.reply_text.called
+        assert not updates[4].message.reply_text.called
+
+
+class TestInlineQuery:
+    """Тесты инлайн-режима."""
+
+    @staticmethod
+    def make_inline_update(query):
+        update = MagicMock()
+        update.inline_query.query = query
+        update.inline_query.answer = AsyncMock()
+        return update
+
+    @pytest.mark.asyncio
+    async def test_card_results(self):
+        """Тест: @bot car — результаты с картами и общим кешем."""
+        update = self.make_inline_update("car")
+        await bot.inline_query(update, None)
+
+        results = update.inline_query.answer.call_args.args[0]
+        kwargs = update.inline_query.answer.call_args.kwargs
+        assert len(results) == bot.config.INLINE_RESULTS_PER_KIND
+        assert len({result.id for result in results}) == len(results)
+        assert results[0].title.startswith("💳")
+        assert results[0].input_message_content.message_text.startswith("*Тестовая кредитная карта:*")
+        assert kwargs == {'cache_time': bot.config.INLINE_CACHE_TIME, 'is_personal': False}
+
+        again = self.make_inline_update("card")
+        await bot.inline_query(again, None)
+        assert again.inline_query.answer.call_args.args[0] is results
+
+    @pytest.mark.asyncio
+    async def test_unknown_query(self):
+        """Тест: неизвестный запрос — пустой ответ без генерации."""
+        update = self.make_inline_update("zzz")
+        await bot.inline_query(update, None)
+        assert update.inline_query.answer.call_args.args[0] == []
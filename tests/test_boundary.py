@@ -0,0 +1,140 @@
+# tests/test_boundary.py
+import json
+
+import pytest
+
+from boundary import (
+    TELEGRAM_MESSAGE_LIMIT,
+    boundary_categories,
+    boundary_strings,
+    load_boundary_pack,
+    register_boundary_string,
+    render_boundary_messages,
+    reset_boundary_strings,
+    split_message
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_catalog():
+    """Каждый тест начинает с исходного каталога."""
+    reset_boundary_strings()
+    yield
+    reset_boundary_strings()
+
+
+class TestCatalog:
+    """Тесты реестра граничных строк."""
+
+    def test_default_categories(self):
+        """Тест категорий исходного каталога."""
+        assert set(boundary_categories()) == {'length', 'special', 'sql', 'xss', 'unicode'}
+        assert len(boundary_strings()) == 9
+
+    def test_filter_by_category(self):
+        """Тест выборки по категории."""
+        lengths = {len(item.value) for item in boundary_strings('length')}
+        assert lengths == {0, 255, 1000}
+
+    def test_entries_immutable(self):
+        """Тест неизменяемости записей."""
+        item = boundary_strings()[0]
+        with pytest.raises(AttributeError):
+            item.value = 'x'
+        with pytest.raises(TypeError):
+            item.translations['de'] = ('a', 'b')
+
+    def test_register_invalidates_cache(self):
+        """Тест: новая запись сбрасывает кеш готовых сообщений."""
+        before = render_boundary_messages('sql')
+        register_boundary_string('sql', 'UNION', "' UNION SELECT NULL --", 'UNION-инъекция')
+        after = render_boundary_messages('sql')
+
+        assert before != after
+        assert 'UNION SELECT' in after[0]
+
+    def test_load_json_pack(self, tmp_path):
+        """Тест загрузки пользовательского набора из JSON."""
+        path = tmp_path / 'pack.json'
+        path.write_text(json.dumps({
+            'path': [{'title': 'Traversal', 'value': '../../etc/passwd', 'description': 'Обход пути',
+                      'translations': {'en': ['Traversal', 'Path traversal']}}]
+        }), encoding='utf-8')
+
+        assert load_boundary_pack(str(path)) == 1
+        assert 'path' in boundary_categories()
+        assert '_Path traversal_' in render_boundary_messages('path', 'en')[0]
+
+    def test_load_yaml_pack(self, tmp_path):
+        """Тест загрузки пользовательского набора из YAML."""
+        pytest.importorskip('yaml')
+        path = tmp_path / 'pack.yaml'
+        path.write_text("nosql:\n  - title: NoSQL\n    value: '{\"$gt\": \"\"}'\n", encoding='utf-8')
+
+        assert load_boundary_pack(str(path)) == 1
+        assert boundary_strings('nosql')[0].value == '{"$gt": ""}'
+
+
+class TestRendering:
+    """Тесты готовых сообщений."""
+
+    def test_render_memoized(self):
+        """Тест: повторный вызов возвращает тот же объект из кеша."""
+        assert render_boundary_messages() is render_boundary_messages()
+
+    def test_render_languages(self):
+        """Тест рендеринга на русском и английском."""
+        ru = render_boundary_messages(None, 'ru')[0]
+        en = render_boundary_messages(None, 'en')[0]
+
+        assert ru.startswith('*Граничные строки и инъекции:*')
+        assert en.startswith('*Boundary strings and injections:*')
+        assert '`[EMPTY STRING]`' in en
+
+    def test_split_under_limit(self):
+        """Тест разбиения длинного каталога на части до 4096 символов."""
+        for i in range(80):
+            register_boundary_string('bulk', f'Строка {i}', 'X' * 500, 'Длинное значение')
+        messages = render_boundary_messages('bulk')
+
+        assert len(messages) > 1
+        assert all(len(message) <= TELEGRAM_MESSAGE_LIMIT for message in messages)
+        assert sum(message.count('*Строка ') for message in messages) == 80
+
+    def test_split_message(self):
+        """Тест склейки блоков."""
+        assert split_message(['aa', 'bb', 'cc'], limit=4) == ['aabb', 'cc']
+        assert split_message([]) == []
+
+    def test_split_oversize_block(self):
+        """Тест: блок длиннее лимита режется, по возможности по переводам строк."""
+        assert split_message(['x', 'ab\ncdefgh', 'y'], limit=5) == ['x', 'ab\n', 'cdefg', 'hy']
+        assert all(len(part) <= 5 for part in split_message(['z' * 23], limit=5))
+
+    def test_long_title_and_description(self):
+        """Тест: запись с огромным описанием помещается в сообщения до лимита."""
+        register_boundary_string('huge', 'T' * 5000, 'value', 'D' * 10000)
+        messages = render_boundary_messages('huge')
+
+        assert all(len(message) <= TELEGRAM_MESSAGE_LIMIT for message in messages)
+        assert 'value' in ''.join(messages)
+
+    def test_markdown_escaped(self):
+        """Тест: _ и * в названии и описании из набора экранируются."""
+        register_boundary_string('md', 'snake_case *bold*', 'v', 'под_черк')
+        text = render_boundary_messages('md')[0]
+
+        assert '*snake\\_case \\*bold\\**' in text
+        assert '_под\\_черк_' in text
+
+    def test_backticks_in_value(self, tmp_path):
+        """Тест: обратные кавычки в значении из набора не закрывают блок кода."""
+        path = tmp_path / 'pack.json'
+        path.write_text(json.dumps({
+            'fence': [{'title': 'Fence', 'value': 'a```b`c', 'description': 'Кавычки'}]
+        }), encoding='utf-8')
+        load_boundary_pack(str(path))
+        text = render_boundary_messages('fence')[0]
+
+        assert "```\na'''b'c\n```" in text
+        assert text.count('```') == 2
@@ -0,0 +1,158 @@
+# tests/test_cache.py
+import os
+
+import pytest
+
+import parallel
+from cache import GenerationCache, cache_key, file_digest, main
+from export import export_records
+from generators import generate_credit_cards
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'cache.sqlite')
+
+
+class TestGenerationCache:
+    """Тесты постоянного кеша."""
+
+    def test_roundtrip(self, cache_path):
+        """Тест: набор читается из кеша таким же, как был сохранен."""
+        dataset = generate_credit_cards(50, seed=1).to_dataset()
+        with GenerationCache(cache_path) as cache:
+            assert cache.get('cards', 1, {'count': 50}) is None
+            assert cache.put('cards', 1, {'count': 50}, dataset)
+        with GenerationCache(cache_path) as cache:
+            assert cache.get('cards', 1, {'count': 50}) == dataset
+            assert cache.get('cards', 2, {'count': 50}) is None
+            assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_canonical(self):
+        """Тест: порядок параметров не влияет на ключ, seed и версия — влияют."""
+        assert cache_key('g', 'v', 1, {'a': 1, 'b': 2}) == cache_key('g', 'v', 1, {'b': 2, 'a': 1})
+        assert cache_key('g', 'v', 1, {'a': 1}) != cache_key('g', 'v', 2, {'a': 1})
+        assert cache_key('g', 'v', 1, {'a': 1}) != cache_key('g', 'w', 1, {'a': 1})
+
+    def test_versions_share_file(self, cache_path):
+        """Тест: версии не видят записи друг друга, но и не удаляют их при открытии."""
+        with GenerationCache(cache_path, version='a') as cache:
+            cache.put('cards', 1, {}, [1, 2, 3])
+        with GenerationCache(cache_path, version='b') as cache:
+            assert cache.get('cards', 1, {}) is None
+            cache.put('cards', 1, {}, [4])
+        with GenerationCache(cache_path, version='a') as cache:
+            assert cache.get('cards', 1, {}) == [1, 2, 3]
+            assert cache.stats()['entries'] == 2
+
+    def test_purge_stale(self, cache_path):
+        """Тест: явная очистка удаляет записи других версий."""
+        with GenerationCache(cache_path, version='old') as cache:
+            cache.put('cards', 1, {}, [1, 2, 3])
+        with GenerationCache(cache_path, version='new') as cache:
+            cache.put('cards', 2, {}, [4])
+            assert cache.purge_stale() == 1
+            assert cache.stats()['entries'] == 1
+
+    def test_file_digest_follows_rebuild(self, tmp_path):
+        """Тест: файл, переписанный на месте, получает новый хеш."""
+        path = tmp_path / 'corpus.bin'
+        path.write_bytes(b'first')
+        before = file_digest(str(path))
+        path.write_bytes(b'second build')
+        os.utime(path, ns=(1, 1))
+
+        assert file_digest(str(path)) != before
+
+    def test_lru_eviction(self, cache_path):
+        """Тест: при превышении размера вытесняются давно не читавшиеся записи."""
+        value = bytes(range(256)) * 40
+        with GenerationCache(cache_path, max_bytes=25000, compression_level=0) as cache:
+            cache.put('blob', 1, {}, value)
+            cache.put('blob', 2, {}, value)
+            cache.get('blob', 1, {})
+            cache.put('blob', 3, {}, value)
+
+            assert cache.get('blob', 2, {}) is None
+            assert cache.get('blob', 1, {}) == value
+            assert cache.get('blob', 3, {}) == value
+            assert cache.evicted == 1
+            assert cache.stats()['bytes'] <= 25000
+
+    def test_oversized_not_stored(self, cache_path):
+        """Тест: значение больше предела не сохраняется."""
+        with GenerationCache(cache_path, max_bytes=100, compression_level=0) as cache:
+            assert not cache.put('blob', 1, {}, b'x' * 1000)
+            assert cache.stats()['entries'] == 0
+
+    def test_get_or_generate(self, cache_path):
+        """Тест: функция генерации вызывается только при промахе."""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return 'value'
+
+        with GenerationCache(cache_path) as cache:
+            assert cache.get_or_generate('g', 1, {}, generate) == 'value'
+            assert cache.get_or_generate('g', 1, {}, generate) == 'value'
+
+        assert len(calls) == 1
+
+
+class TestParallelCache:
+    """Тесты кеширования блоков многопроцессной генерации."""
+
+    @pytest.mark.parametrize('unique', [False, True])
+    def test_blocks_from_cache(self, cache_path, monkeypatch, unique):
+        """Тест: повторный запуск берет все блоки из кеша и дает тот же набор."""
+        expected = parallel.generate_parallel('card', 95, master_seed=3, workers=1, block_size=20,
+                                              unique=unique)
+        with GenerationCache(cache_path) as cache:
+            first = parallel.generate_parallel('card', 95, master_seed=3, workers=1, block_size=20,
+                                               unique=unique, cache=cache)
+            assert cache.stats()['entries'] == 5
+
+            def fail(task):
+                raise AssertionError("блок сгенерирован повторно")
+
+            monkeypatch.setattr(parallel, '_generate_block_task', fail)
+            again = parallel.generate_parallel('card', 95, master_seed=3, workers=2, block_size=20,
+                                               unique=unique, cache=cache)
+
+        assert first == again == expected
+
+    def test_export_with_seed(self, cache_path, tmp_path):
+        """Тест: выгрузка с seed заполняет кеш, без seed — не трогает."""
+        first, second = tmp_path / 'a.csv', tmp_path / 'b.csv'
+        with GenerationCache(cache_path) as cache:
+            export_records('email', 30, str(first), chunk_size=10, seed=4, workers=1, cache=cache)
+            assert cache.stats()['entries'] == 3
+            export_records('email', 30, str(second), chunk_size=10, seed=4, workers=1, cache=cache)
+            assert cache.hits == 3
+            export_records('email', 30, str(tmp_path / 'c.csv'), chunk_size=10, cache=cache)
+            assert cache.stats()['entries'] == 3
+
+        assert first.read_bytes() == second.read_bytes()
+
+
+class TestCli:
+    """Тесты командной строки."""
+
+    def test_stats_and_clear(self, cache_path, capsys):
+        """Тест вывода статистики и очистки."""
+        with GenerationCache(cache_path) as cache:
+            cache.put('g', 1, {}, 'value')
+        main(['stats', cache_path])
+        assert '1 записей' in capsys.readouterr().out
+
+        main(['clear', cache_path])
+        assert '0 записей' in capsys.readouterr().out
+
+    def test_purge(self, cache_path, capsys):
+        """Тест команды purge."""
+        with GenerationCache(cache_path, version='old') as cache:
+            cache.put('g', 1, {}, 'value')
+        main(['purge', cache_path])
+
+        assert 'Удалено записей других версий генераторов: 1' in capsys.readouterr().out
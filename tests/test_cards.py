@@ -0,0 +1,141 @@
+# tests/test_cards.py
+import random
+
+import numpy as np
+import pytest
+
+from cards import (
+    CARD_BINS,
+    EXTENDED_CARD_BINS,
+    BinRange,
+    CardEngine,
+    format_number,
+    luhn_check_digit,
+    validate_luhn
+)
+from generators import generate_credit_card, generate_credit_cards
+
+
+def network_of(number):
+    """Платежная система по префиксу номера."""
+    digits = number.replace(' ', '')
+    if digits[0] == '4':
+        return 'Visa'
+    if 2200 <= int(digits[:4]) <= 2204:
+        return 'Mir'
+    if 51 <= int(digits[:2]) <= 55 or 2221 <= int(digits[:4]) <= 2720:
+        return 'MasterCard'
+    return None
+
+
+class TestLuhnHelpers:
+    """Тесты функций алгоритма Луна."""
+
+    def test_check_digit(self):
+        """Тест контрольной цифры на известных номерах."""
+        assert luhn_check_digit('411111111111111') == 1
+        assert luhn_check_digit('7992739871') == 3
+
+    def test_format_number(self):
+        """Тест группировки цифр по 4."""
+        assert format_number('4111111111111111') == '4111 1111 1111 1111'
+        assert format_number('4111111111111111123') == '4111 1111 1111 1111 123'
+
+
+class TestValidateLuhn:
+    """Тесты пакетной проверки номеров."""
+
+    def test_known_numbers(self):
+        """Тест валидных и невалидных номеров в разных форматах."""
+        result = validate_luhn([
+            '4111 1111 1111 1111', '4111-1111-1111-1111', '4111111111111111',
+            '4111 1111 1111 1112', '79927398713', '41x1', '', '0',
+        ])
+        assert result.tolist() == [True, True, True, False, True, False, False, False]
+
+    def test_numpy_bytes(self):
+        """Тест массива байтовых строк (колонка CreditCardBatch.number)."""
+        numbers = generate_credit_cards(1000, seed=1).number.copy()
+        numbers[10] = b'4111 1111 1111 1112'
+        result = validate_luhn(numbers)
+        assert result.sum() == 999
+        assert not result[10]
+
+    def test_mixed_formats(self):
+        """Тест номеров разной длины и с разными разделителями в одном пакете."""
+        result = validate_luhn(['4111111111111111', '4111 1111 1111 1111 ', '79927398713', '4111 1111'])
+        assert result.tolist() == [True, True, True, False]
+
+    def test_empty(self):
+        """Тест пустого пакета."""
+        assert validate_luhn([]).shape == (0,)
+
+    def test_not_strings(self):
+        """Тест отказа для чисел."""
+        with pytest.raises(TypeError):
+            validate_luhn(np.arange(3))
+
+
+class TestCardEngine:
+    """Тесты таблицы BIN."""
+
+    def test_network_matches_prefix(self):
+        """Тест: тип карты соответствует префиксу номера."""
+        for card in generate_credit_cards(5000, seed=3):
+            assert network_of(card['number']) == card['type']
+
+    def test_scalar_network_matches_prefix(self):
+        """Тест скалярной генерации с random.Random."""
+        rng = random.Random(5)
+        cards = [generate_credit_card(rng) for _ in range(500)]
+        assert all(network_of(card['number']) == card['type'] for card in cards)
+        assert {card['type'] for card in cards} == {'Visa', 'MasterCard', 'Mir'}
+        assert validate_luhn([card['number'] for card in cards]).all()
+
+    def test_weights(self):
+        """Тест выбора по весам: по умолчанию системы равновероятны."""
+        types = generate_credit_cards(30000, seed=4).type
+        counts = {name: int((types == name).sum()) for name in ('Visa', 'MasterCard', 'Mir')}
+        assert all(9000 < count < 11000 for count in counts.values())
+
+        engine = CardEngine((BinRange('Mir', '2200', '2204', (16,), 1),))
+        assert set(generate_credit_cards(100, seed=1, engine=engine).type) == {'Mir'}
+
+    def test_extended_lengths(self):
+        """Тест длин номеров расширенной таблицы."""
+        engine = CardEngine(EXTENDED_CARD_BINS)
+        cards = generate_credit_cards(5000, seed=2, engine=engine).to_dicts()
+        lengths = {}
+        for card in cards:
+            digits = card['number'].replace(' ', '')
+            lengths.setdefault(card['type'], set()).add(len(digits))
+            assert network_of(digits) == card['type']
+        assert lengths == {'Visa': {13, 16, 19}, 'MasterCard': {16}, 'Mir': {16, 17, 18, 19}}
+        assert validate_luhn([card['number'] for card in cards]).all()
+
+    def test_locate_is_bijective(self):
+        """Тест нумерации: разные номера в пространстве — разные карты."""
+        engine = CardEngine(CARD_BINS)
+        values = np.array([0, 1, engine.space // 2, engine.space - 1], dtype=np.uint64)
+        numbers = engine.numbers(*engine.locate(values)).tolist()
+        assert len(set(numbers)) == 4
+        assert numbers[0].replace(b' ', b'').startswith(b'4')
+        assert engine.space == 10 ** 14 + 5 * 10 ** 13 + 500 * 10 ** 11 + 5 * 10 ** 11
+
+    def test_unique_cards_all_networks(self):
+        """Тест уникального режима: номера из всех строк таблицы."""
+        batch = generate_credit_cards(20000, unique_key=1)
+        assert len(set(batch.number.tolist())) == 20000
+        assert set(batch.type) == {'Visa', 'MasterCard', 'Mir'}
+        assert validate_luhn(batch.number).all()
+
+    @pytest.mark.parametrize('bins', [
+        (),
+        (BinRange('Amex', '34', '34', (15,), 1),),
+        (BinRange('Visa', '5', '4', (16,), 1),),
+        (BinRange('Visa', '4', '4', (20,), 1),),
+    ])
+    def test_invalid_tables(self, bins):
+        """Тест проверки таблицы BIN."""
+        with pytest.raises(ValueError):
+            CardEngine(bins)
@@ -0,0 +1,129 @@
+# tests/test_corpus.py
+import random
+
+import numpy as np
+import pytest
+
+import generators
+from corpus import Corpus, CorpusError, _compile_pattern, build_corpus, memory_locale, open_corpus
+from generators import generate_name_address, generate_name_addresses, set_corpus
+from parallel import generate_parallel
+
+
+@pytest.fixture(scope='module')
+def corpus_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('corpus') / 'corpus.bin'
+    build_corpus(str(path), samples=300, seed=1)
+    return str(path)
+
+
+@pytest.fixture
+def corpus(corpus_path):
+    return open_corpus(corpus_path)
+
+
+@pytest.fixture
+def attached(corpus):
+    set_corpus(corpus)
+    yield corpus
+    set_corpus(None)
+
+
+class TestCorpusFile:
+    """Тесты сборки и чтения файла корпуса."""
+
+    def test_tables(self, corpus):
+        """Тест: таблицы и шаблоны обеих локалей по умолчанию."""
+        stats = corpus.stats()
+
+        assert set(stats) == {'ru_RU', 'en_US'}
+        assert all(size > 0 for size in stats['ru_RU'].values())
+        assert stats['ru_RU']['postcode'] == 1  # цифровой шаблон, а не выборка значений
+        assert corpus.locale('en_US').formats['name']
+
+    def test_tables_are_memory_mapped(self, corpus):
+        """Тест: массивы таблиц — представления mmap, а не копии."""
+        table = corpus.locale('ru_RU').tables['last_name_male']
+
+        assert not table.offsets.flags.writeable
+        assert not table.offsets.flags.owndata
+
+    def test_bad_magic(self, tmp_path):
+        """Тест чтения файла, не являющегося корпусом."""
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'x' * 64)
+
+        with pytest.raises(CorpusError):
+            Corpus(str(path))
+
+    def test_missing_locale(self, corpus):
+        """Тест запроса локали, которой нет в корпусе."""
+        with pytest.raises(CorpusError):
+            corpus.locale('de_DE')
+
+    def test_open_once(self, corpus_path):
+        """Тест: в пределах процесса файл отображается один раз."""
+        assert open_corpus(corpus_path) is open_corpus(corpus_path)
+
+    @pytest.mark.parametrize('pattern', ['###', '%##-#', 'д. {#}'])
+    def test_compile_pattern(self, pattern):
+        """Тест цифровых шаблонов: длина и позиции цифр сохраняются."""
+        template, lows, spans = _compile_pattern(pattern)
+        value = template(*lows)
+
+        assert len(value) == len(pattern)
+        assert all(char.isdigit() for char, source in zip(value, pattern) if source in '#%')
+
+
+class TestCorpusGeneration:
+    """Тесты генерации ФИО и адресов по корпусу."""
+
+    def test_deterministic(self, corpus):
+        """Тест: при одном seed значения совпадают."""
+        first = generate_name_addresses(100, 'ru', corpus, seed=5)
+        second = generate_name_addresses(100, 'ru', corpus, seed=5)
+
+        assert first == second
+        assert first != generate_name_addresses(100, 'ru', corpus, seed=6)
+
+    def test_dataset_shape(self, corpus):
+        """Тест: набор тех же полей, что и при генерации через Faker."""
+        dataset = generate_name_addresses(50, 'en', corpus, seed=1)
+
+        assert dataset.fields == ('full_name', 'address', 'phone', 'locale')
+        assert all(record['full_name'] and record['address'] for record in dataset)
+        assert not any('{{' in record['address'] or '#' in record['address'] for record in dataset)
+
+    def test_generate_one(self, corpus):
+        """Тест поштучной генерации."""
+        source = corpus.locale('ru_RU')
+        rng = random.Random(2)
+
+        names = [source.generate_one('name', rng) for _ in range(20)]
+        assert all(len(name.split()) >= 2 for name in names)
+
+    def test_memory_locale(self, corpus):
+        """Тест: корпус в памяти собирается один раз и устроен как корпус из файла."""
+        source = memory_locale('ru_RU', samples=300, seed=1)
+        rng = np.random.default_rng(0)
+
+        assert memory_locale('ru_RU', samples=300, seed=1) is source
+        assert set(source.tables) == set(corpus.locale('ru_RU').tables)
+        assert all(len(name.split()) >= 2 for name in source.names(50, rng))
+
+    def test_set_corpus(self, attached):
+        """Тест: подключенный корпус используется по умолчанию, None — возвращает Faker."""
+        assert generators.corpus_locale('ru') is attached.locale('ru_RU')
+        assert generate_name_address('ru')['locale'] == 'RU'
+
+        set_corpus(None)
+        assert generators.corpus_locale('ru') is None
+
+    def test_parallel(self, corpus_path):
+        """Тест параллельной генерации по корпусу."""
+        dataset = generate_parallel('ru', 300, master_seed=3, workers=1, block_size=128,
+                                    corpus_path=corpus_path)
+
+        assert len(dataset) == 300
+        assert dataset == generate_parallel('ru', 300, master_seed=3, workers=1, block_size=128,
+                                             corpus_path=corpus_path)
@@ -0,0 +1,186 @@
+# tests/test_dataset.py
+import pickle
+
+import numpy as np
+import pytest
+
+from dataset import (
+    CategoryColumn,
+    Dataset,
+    FixedColumn,
+    Row,
+    StringColumn,
+    concat_datasets,
+    string_column
+)
+from generators import generate_credit_cards, generate_name_addresses, temp_email_dataset
+
+RECORDS = [
+    {'full_name': 'Иванов Иван', 'city': 'Москва', 'locale': 'RU'},
+    {'full_name': 'Jürgen Müller', 'city': 'Berlin', 'locale': 'DE'},
+    {'full_name': 'John Smith', 'city': 'London', 'locale': 'EN'},
+    {'full_name': '李小龙 🐉', 'city': '', 'locale': 'RU'},
+]
+
+
+def make_dataset():
+    return Dataset({
+        'full_name': StringColumn.from_strings([r['full_name'] for r in RECORDS]),
+        'city': string_column([r['city'] for r in RECORDS]),
+        'locale': CategoryColumn.from_values([r['locale'] for r in RECORDS]),
+    })
+
+
+class TestColumns:
+    """Тесты колонок."""
+
+    @pytest.mark.parametrize('strings, encoding', [
+        (['abc', '', 'de'], 'utf-8'),
+        (['Москва', 'Ёлки'], 'cp1251'),
+        (['Müller', 'Straße'], 'latin-1'),
+        (['Müller', 'Москва'], 'utf-8'),
+    ])
+    def test_string_encoding(self, strings, encoding):
+        """Тест: выбирается самая компактная кодировка, значения не меняются."""
+        column = StringColumn.from_strings(strings)
+
+        assert column.encoding == encoding
+        assert column.values() == strings
+        assert [column.value(i) for i in range(len(strings))] == strings
+
+    def test_to_utf8(self):
+        """Тест перекодировки однобайтовой колонки в UTF-8."""
+        strings = ['Иванов', '', 'ул. Ленина, д. 5', 'Ёж']
+        column = StringColumn.from_strings(strings).slice(1, 4).to_utf8()
+
+        assert column.encoding == 'utf-8'
+        assert column.data.tobytes() == ''.join(strings[1:]).encode('utf-8')
+        assert column.values() == strings[1:]
+
+    def test_string_column_layout(self):
+        """Тест: ASCII-строки близкой длины хранятся фиксированной ширины."""
+        assert isinstance(string_column(['+7 900', '+7 901']), FixedColumn)
+        assert isinstance(string_column(['a', 'b' * 40]), StringColumn)
+        assert isinstance(string_column(['Москва', 'Тверь']), StringColumn)
+
+    def test_category_constant_has_no_codes(self):
+        """Тест: у колонки одного значения коды не занимают памяти."""
+        column = CategoryColumn.constant('RU', 1000)
+
+        assert column.nbytes == 1
+        assert column.values() == ['RU'] * 1000
+
+    def test_category_concat_remaps_codes(self):
+        """Тест объединения категорий с разными наборами значений."""
+        left = CategoryColumn.from_values(['a', 'b'])
+        right = CategoryColumn.from_values(['c', 'a'])
+
+        assert CategoryColumn.concat([left, right]).values() == ['a', 'b', 'c', 'a']
+
+
+class TestDataset:
+    """Тесты колоночного набора записей."""
+
+    def test_rows_as_mappings(self):
+        """Тест: строки — представления со __slots__, равные исходным словарям."""
+        dataset = make_dataset()
+
+        assert len(dataset) == 4
+        assert dataset.fields == ('full_name', 'city', 'locale')
+        assert list(dataset) == RECORDS
+        assert dataset[-1] == RECORDS[-1]
+        assert dataset[1]['city'] == 'Berlin'
+        assert not hasattr(dataset[0], '__dict__')
+        assert isinstance(dataset[0], Row)
+        assert dataset.to_dicts() == RECORDS
+        with pytest.raises(IndexError):
+            dataset[4]
+
+    def test_slice_is_view(self):
+        """Тест: срез не копирует данные колонок."""
+        dataset = make_dataset()
+        part = dataset[1:3]
+
+        assert part.to_dicts() == RECORDS[1:3]
+        assert part.columns['full_name'].data is dataset.columns['full_name'].data
+        assert np.shares_memory(part.columns['locale'].codes, dataset.columns['locale'].codes)
+        assert len(dataset[3:1]) == 0
+        with pytest.raises(ValueError):
+            dataset[::2]
+
+    def test_take_and_concat(self):
+        """Тест выборки записей и объединения наборов."""
+        dataset = make_dataset()
+
+        assert dataset.take([3, 0]).to_dicts() == [RECORDS[3], RECORDS[0]]
+        assert concat_datasets([dataset[:1], dataset[1:1], dataset[1:]]) == dataset
+        assert len(concat_datasets([])) == 0
+
+    def test_concat_mixed_layouts(self):
+        """Тест объединения порций с разной раскладкой одной колонки."""
+        fixed = Dataset({'phone': string_column(['+7 900', '+7 901'])})
+        variable = Dataset({'phone': string_column(['1', '+7 (900) 000-00-00'])})
+        merged = concat_datasets([fixed, variable])
+
+        assert isinstance(merged.columns['phone'], StringColumn)
+        assert merged.values('phone') == ['+7 900', '+7 901', '1', '+7 (900) 000-00-00']
+
+    def test_pickle_slice(self):
+        """Тест: при pickle среза передается только его часть буфера."""
+        dataset = generate_name_addresses(200, 'ru')
+        part = dataset[190:]
+        restored = pickle.loads(pickle.dumps(part))
+
+        assert restored == part
+        assert len(restored.columns['address'].data) < len(dataset.columns['address'].data) / 5
+
+    def test_from_records(self):
+        """Тест построения набора из словарей."""
+        assert Dataset.from_records(RECORDS).to_dicts() == RECORDS
+
+    def test_columns_must_match(self):
+        """Тест с колонками разной длины."""
+        with pytest.raises(ValueError):
+            Dataset({'a': StringColumn.from_strings(['x']), 'b': StringColumn.from_strings([])})
+
+    def test_to_arrow(self):
+        """Тест передачи колонок в pyarrow."""
+        pytest.importorskip('pyarrow')
+        dataset = make_dataset()
+
+        assert dataset[1:].to_arrow().to_pylist() == RECORDS[1:]
+        assert dataset.to_arrow(['locale']).column_names == ['locale']
+
+
+class TestBulkGenerators:
+    """Тесты пакетных генераторов, заполняющих Dataset."""
+
+    def test_people(self):
+        """Тест: ФИО и адреса, локаль хранится одним значением."""
+        dataset = generate_name_addresses(50, 'ru')
+
+        assert len(dataset) == 50
+        assert dataset.fields == ('full_name', 'address', 'phone', 'locale')
+        assert dataset.columns['locale'].categories == ('RU',)
+        assert all(record['full_name'] and record['locale'] == 'RU' for record in dataset)
+
+    def test_cards_without_copy(self):
+        """Тест: набор карт использует массивы пакета без копирования."""
+        batch = generate_credit_cards(100, seed=3)
+        dataset = batch.to_dataset()
+
+        assert dataset.columns['number'].array is batch.number
+        assert dataset.to_dicts() == batch.to_dicts()
+
+    def test_emails(self):
+        """Тест набора email."""
+        dataset = temp_email_dataset(['a@b.c', 'dd@ee.ff'])
+
+        assert dataset.values('email') == ['a@b.c', 'dd@ee.ff']
+        assert dataset[0]['note'] == dataset[1]['note']
+
+    def test_memory_per_record(self):
+        """Тест: набор в несколько раз компактнее списка словарей."""
+        batch = generate_credit_cards(1000, seed=1)
+
+        assert batch.to_dataset().nbytes / len(batch) <= 32
@@ -0,0 +1,68 @@
+# tests/test_dispatcher.py
+import asyncio
+import threading
+
+import pytest
+
+from dispatcher import DispatcherBusy, GenerationDispatcher
+from generators import generate_temp_email
+
+
+class TestGenerationDispatcher:
+    """Тесты выноса генерации в пул исполнителей."""
+
+    @pytest.mark.asyncio
+    async def test_runs_outside_event_loop_thread(self):
+        """Тест: функция выполняется не в потоке цикла событий."""
+        dispatcher = GenerationDispatcher(max_workers=2)
+        try:
+            thread_name = await dispatcher.run(lambda: threading.current_thread().name)
+            email = await dispatcher.run(generate_temp_email)
+        finally:
+            dispatcher.shutdown()
+
+        assert thread_name.startswith('generation')
+        assert '@' in email['email']
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Тест: одновременно выполняется не больше max_concurrency задач."""
+        dispatcher = GenerationDispatcher(max_workers=4, max_concurrency=2)
+        peak = 0
+
+        def work():
+            nonlocal peak
+            peak = max(peak, dispatcher.running)
+            threading.Event().wait(0.02)
+
+        try:
+            await asyncio.gather(*(dispatcher.run(work) for _ in range(6)))
+        finally:
+            dispatcher.shutdown()
+
+        assert peak <= 2
+        assert dispatcher.running == 0
+        assert dispatcher.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        """Тест: при переполненной очереди новые запросы отклоняются."""
+        dispatcher = GenerationDispatcher(max_workers=1, max_concurrency=1, max_pending=1)
+        release = threading.Event()
+        try:
+            first = asyncio.ensure_future(dispatcher.run(release.wait))
+            second = asyncio.ensure_future(dispatcher.run(release.wait))
+            await asyncio.sleep(0.01)
+
+            with pytest.raises(DispatcherBusy):
+                await dispatcher.run(release.wait)
+
+            release.set()
+            await asyncio.gather(first, second)
+        finally:
+            dispatcher.shutdown()
+
+    def test_unknown_executor(self):
+        """Тест с неизвестным типом исполнителя."""
+        with pytest.raises(ValueError):
+            GenerationDispatcher(executor='fiber')
@@ -0,0 +1,152 @@
+# tests/test_export.py
+import csv
+import json
+
+import pytest
+
+from dataset import Dataset
+
+from export import (
+    RECORD_FIELDS,
+    detect_format,
+    export_records,
+    iter_chunks,
+    main
+)
+
+
+class TestChunks:
+    """Тесты порционной генерации."""
+
+    @pytest.mark.parametrize('kind', sorted(RECORD_FIELDS))
+    def test_chunk_sizes(self, kind):
+        """Тест: порции не превышают chunk_size и в сумме дают count."""
+        chunks = list(iter_chunks(kind, 25, chunk_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        for record in chunks[0]:
+            assert set(RECORD_FIELDS[kind]) <= set(record)
+
+    def test_chunks_are_datasets(self):
+        """Тест: порции — колоночные наборы, записи которых читаются как словари."""
+        chunk = next(iter_chunks('card', 5, chunk_size=5))
+
+        assert isinstance(chunk, Dataset)
+        assert chunk.to_dicts() == [dict(record) for record in chunk]
+
+    def test_unknown_kind(self):
+        """Тест с неизвестным видом данных."""
+        with pytest.raises(ValueError):
+            export_records('unknown', 1, 'out.csv')
+
+    @pytest.mark.parametrize('chunk_size', [0, -5])
+    def test_invalid_chunk_size(self, tmp_path, chunk_size):
+        """Тест: неположительный размер порции отклоняется, файл не создается."""
+        path = tmp_path / 'out.csv'
+        with pytest.raises(ValueError, match="Размер блока"):
+            export_records('email', 10, str(path), chunk_size=chunk_size)
+        with pytest.raises(ValueError, match="Размер блока"):
+            next(iter_chunks('email', 10, chunk_size=chunk_size))
+
+        assert not path.exists()
+
+
+class TestExportFormats:
+    """Тесты выгрузки в разные форматы."""
+
+    def test_csv_export(self, tmp_path):
+        """Тест выгрузки в CSV."""
+        path = tmp_path / 'people.csv'
+        stats = export_records('ru', 30, str(path), chunk_size=7)
+
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0] == list(RECORD_FIELDS['ru'])
+        assert len(rows) == 31
+        assert all(row[3] == 'RU' for row in rows[1:])
+        assert stats.rows == 30
+        assert stats.rows_per_sec > 0
+
+    def test_jsonl_export(self, tmp_path):
+        """Тест выгрузки в JSON Lines."""
+        path = tmp_path / 'cards.jsonl'
+        stats = export_records('card', 50, str(path), chunk_size=16)
+
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+        assert len(records) == 50
+        assert set(records[0]) == set(RECORD_FIELDS['card'])
+        assert stats.rows == 50
+
+    def test_parquet_export(self, tmp_path):
+        """Тест выгрузки в Parquet (если установлен pyarrow)."""
+        pq = pytest.importorskip('pyarrow.parquet')
+        path = tmp_path / 'emails.parquet'
+        export_records('email', 40, str(path), chunk_size=15)
+
+        table = pq.read_table(str(path))
+        assert table.num_rows == 40
+        assert table.column_names == ['email']
+
+    def test_parquet_compression_suffix(self, tmp_path):
+        """Тест: суффикс сжатия у Parquet отклоняется, сжатие задается параметром."""
+        pq = pytest.importorskip('pyarrow.parquet')
+        path = tmp_path / 'emails.parquet.gz'
+        with pytest.raises(ValueError, match='Parquet'):
+            export_records('email', 10, str(path))
+        assert not path.exists()
+
+        path = tmp_path / 'emails.parquet'
+        export_records('email', 10, str(path), compression='gzip')
+        assert pq.ParquetFile(str(path)).metadata.row_group(0).column(0).compression == 'GZIP'
+
+    def test_detect_format(self):
+        """Тест определения формата по расширению."""
+        assert detect_format('a.csv') == 'csv'
+        assert detect_format('a.JSON') == 'jsonl'
+        assert detect_format('a.parquet') == 'parquet'
+        with pytest.raises(ValueError):
+            detect_format('a.txt')
+
+    def test_cli(self, tmp_path, capsys):
+        """Тест запуска через командную строку."""
+        path = tmp_path / 'emails.csv'
+        stats = main(['email', '12', str(path)])
+
+        assert stats.rows == 12
+        assert 'строк/с' in capsys.readouterr().err
+
+    def test_seeded_export_independent_of_workers(self, tmp_path):
+        """Тест: выгрузка с seed одинакова при разном числе процессов."""
+        first = tmp_path / 'a.jsonl'
+        second = tmp_path / 'b.jsonl'
+        export_records('en', 30, str(first), chunk_size=8, seed=5, workers=1)
+        export_records('en', 30, str(second), chunk_size=8, seed=5, workers=2)
+
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_gzip_export_and_progress(self, tmp_path):
+        """Тест сжатия gzip по суффиксу и счетчика прогресса."""
+        import gzip
+        from export import ExportProgress, detect_compression
+
+        path = tmp_path / 'people.jsonl.gz'
+        progress = ExportProgress()
+        export_records('en', 20, str(path), chunk_size=6, progress=progress)
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert len(f.readlines()) == 20
+        assert progress.rows == 20
+        assert detect_compression(str(path)) == 'gzip'
+        assert detect_format(str(path)) == 'jsonl'
+
+    def test_unique_export(self, tmp_path):
+        """Тест выгрузки без повторов через командную строку."""
+        path = tmp_path / 'cards.csv'
+        main(['card', '500', str(path), '--unique', '--workers', '1', '--chunk-size', '64'])
+
+        with open(path, encoding='utf-8') as f:
+            numbers = [row['number'] for row in csv.DictReader(f)]
+        assert len(numbers) == len(set(numbers)) == 500
@@ -0,0 +1,206 @@
+# tests/test_fuzz.py
+import itertools
+import json
+import unicodedata
+
+import pytest
+
+from boundary import register_boundary_string, reset_boundary_strings
+from fuzz import (
+    ENCODINGS,
+    FILLERS,
+    LENGTH_LIMITS,
+    UNICODE_CATEGORIES,
+    CaseSpace,
+    boundary_lengths,
+    catalog_space,
+    deduplicate,
+    expand,
+    fuzz_space,
+    length_space,
+    main
+)
+from unique import UniqueSpaceExhausted
+
+
+def make_space(*sizes):
+    axes = {f'a{number}': range(size) for number, size in enumerate(sizes)}
+    return CaseSpace('test', axes, lambda **values: ','.join(map(str, values.values())))
+
+
+def covered(cases, space, strength):
+    """Все ли комбинации значений любых strength осей встречаются в cases."""
+    rows = [[case.params[axis] for axis in space.axis_names] for case in cases]
+    for combo in itertools.combinations(range(len(space.sizes)), strength):
+        seen = {tuple(row[axis] for axis in combo) for row in rows}
+        if len(seen) != len(list(itertools.product(*(space.labels[axis] for axis in combo)))):
+            return False
+    return True
+
+
+class TestCaseSpace:
+    """Тесты ленивого пространства случаев."""
+
+    def test_order_and_random_access(self):
+        """Тест: обход совпадает с itertools.product, номер — с позицией в обходе."""
+        space = make_space(2, 3, 4)
+        cases = list(space)
+
+        assert len(space) == 24
+        assert [case.value for case in cases] == [
+            ','.join(map(str, values)) for values in itertools.product(range(2), range(3), range(4))
+        ]
+        assert all(space[case.index] == case for case in cases)
+        assert space[-1] == cases[-1]
+        with pytest.raises(IndexError):
+            space[24]
+
+    def test_huge_space_is_lazy(self):
+        """Тест: пространство из 10**30 случаев не материализуется."""
+        space = make_space(*[10] * 30)
+
+        assert space.size == 10 ** 30
+        assert space[10 ** 30 - 1].value == ','.join(['9'] * 30)
+        assert len(list(space.sample(5, seed=1))) == 5
+        assert next(iter(space)).value == ','.join(['0'] * 30)
+
+    def test_sample_deterministic(self):
+        """Тест выборки без повторов номеров."""
+        space = make_space(5, 5)
+        first = [case.index for case in space.sample(10, seed=3)]
+
+        assert first == [case.index for case in space.sample(10, seed=3)]
+        assert len(set(first)) == 10
+
+    @pytest.mark.parametrize('sizes, strength', [
+        ((3, 3, 3, 3), 2), ((10, 2, 5, 4, 3), 2), ((4, 4, 4, 4), 3), ((3, 2), 2),
+    ])
+    def test_covering(self, sizes, strength):
+        """Тест: покрывающий набор покрывает все комбинации и меньше пространства."""
+        space = make_space(*sizes)
+        cases = list(space.covering(strength))
+
+        assert covered(cases, space, strength)
+        assert space.covering_lower_bound(strength) <= len(cases) <= space.size
+        assert len({case.index for case in cases}) == len(cases)
+
+    def test_covering_size(self):
+        """Тест: pairwise для 5 осей по 10 значений близок к нижней границе (100)."""
+        space = make_space(*[10] * 5)
+
+        assert len(list(space.covering(2))) <= 150
+
+    def test_restrict(self):
+        """Тест подпространства по меткам."""
+        space = fuzz_space('injection').restrict(encoding=['raw'], context=['bare', 'json_string'])
+
+        assert space.sizes[1:] == (2, 1)
+        assert {case.params['encoding'] for case in space} == {'raw'}
+        with pytest.raises(ValueError):
+            space.restrict(encoding=['rot13'])
+        with pytest.raises(ValueError):
+            space.restrict(colour=['red'])
+
+
+class TestDeduplicate:
+    """Тесты дедупликации потока случаев."""
+
+    def test_first_kept(self):
+        """Тест: остается первый случай с данным значением, порядок сохраняется."""
+        space = CaseSpace('dup', {'a': range(6)}, lambda a: str(a % 3))
+
+        assert [case.index for case in deduplicate(space, capacity=6, batch_size=4)] == [0, 1, 2]
+
+    def test_capacity(self):
+        """Тест переполнения таблицы уникальных значений."""
+        with pytest.raises(UniqueSpaceExhausted):
+            list(deduplicate(make_space(10), capacity=3))
+
+    def test_surrogates(self):
+        """Тест: строки с одиночными суррогатами тоже проверяются на повторы."""
+        space = fuzz_space('unicode').restrict(char=['Cs'])
+
+        assert len(list(deduplicate(space, space.size))) == space.size
+
+
+class TestSpaces:
+    """Тесты готовых пространств."""
+
+    def test_lengths(self):
+        """Тест: длины 0, 1, N-1, N, N+1 для каждого ограничения."""
+        lengths = boundary_lengths()
+
+        assert all({limit - 1, limit, limit + 1} <= set(lengths) for limit in LENGTH_LIMITS)
+        assert lengths[:2] == (0, 1)
+        for case in length_space():
+            assert len(case.value) == case.params['length']
+
+    def test_length_bytes_differ(self):
+        """Тест: при одной длине в символах длина в байтах зависит от заполнителя."""
+        space = length_space((255,)).restrict(length=[255], tail=['none'])
+        sizes = {case.params['filler']: len(case.value.encode('utf-8')) for case in space}
+
+        assert sizes['ascii'] == 255
+        assert sizes['emoji'] == 4 * 255
+        assert len(set(sizes.values())) >= 4
+        assert set(sizes) == set(FILLERS)
+
+    def test_unicode_categories(self):
+        """Тест: по символу на каждую общую категорию Unicode."""
+        assert all(unicodedata.category(char) == category
+                   for category, char in UNICODE_CATEGORIES.items())
+
+    @pytest.mark.parametrize('encoding', sorted(ENCODINGS))
+    def test_encodings(self, encoding):
+        """Тест: кодировки применяются к строкам с суррогатами и эмодзи."""
+        value = ENCODINGS[encoding]("' OR 1=1 🌍\ud800")
+
+        assert isinstance(value, str)
+        if encoding != 'raw':
+            assert "'" not in value or encoding == 'mojibake'
+
+    def test_catalog_follows_registry(self):
+        """Тест: пространство каталога видит добавленные записи."""
+        try:
+            before = catalog_space().sizes[0]
+            register_boundary_string('custom', 'Свой', 'x\u0000y', 'Нулевой байт')
+            assert fuzz_space('catalog').sizes[0] == before + 1
+        finally:
+            reset_boundary_strings()
+
+    def test_expand_unique(self):
+        """Тест общего потока: без повторов значения."""
+        values = [case.value for case in expand(['length', 'unicode'], unique=True)]
+
+        assert len(values) == len(set(values))
+        assert len(values) < fuzz_space('length').size + fuzz_space('unicode').size
+
+    def test_expand_pairwise(self):
+        """Тест: pairwise по всем пространствам на порядок меньше полного перебора."""
+        total = sum(fuzz_space(name).size for name in ('injection', 'mixed'))
+
+        assert sum(1 for _ in expand(['injection', 'mixed'], strength=2)) * 10 < total
+
+    def test_unknown_space(self):
+        with pytest.raises(ValueError):
+            fuzz_space('nope')
+
+
+class TestCli:
+    """Тесты командной строки."""
+
+    def test_dump(self, capsys):
+        """Тест выгрузки в JSON Lines."""
+        main(['dump', 'injection', '--strength', '2', '--limit', '5'])
+        lines = capsys.readouterr().out.splitlines()
+        cases = [json.loads(line) for line in lines]
+
+        assert len(cases) == 5
+        assert cases[0]['space'] == 'injection'
+        assert fuzz_space('injection')[cases[0]['index']].value == cases[0]['value']
+
+    def test_list(self, capsys):
+        """Тест списка пространств."""
+        main(['list'])
+
+        assert 'pairwise' in capsys.readouterr().out
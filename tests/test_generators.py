@@ -3,6 +3,7 @@ import pytest
 from generators import (
     generate_name_address,
     generate_credit_card,
+    generate_credit_cards,
     generate_boundary_strings,
     generate_temp_email
 )
@@ -50,8 +51,16 @@ class TestNameAddressGenerator:
         
     def test_generate_name_address_invalid_locale2(self):
         """Тест с другой неверной локалью."""
-        result = generate_name_address('fr')
+        result = generate_name_address('xx')
         assert result['locale'] == 'RU'
+
+    def test_generate_name_address_registered_locales(self):
+        """Тест локалей из реестра (fr, de, pl, uk, kz)."""
+        assert generate_name_address('fr')['locale'] == 'FR'
+        assert generate_name_address('de')['phone'].startswith('+49 ')
+        assert generate_name_address('PL')['phone'].startswith('+48 ')
+        assert generate_name_address('uk')['phone'].startswith('+380 ')
+        assert generate_name_address('kz')['phone'].startswith('+7 (7')
         
     def test_generate_name_address_case_insensitive(self):
         """Тест с локалью в разном регистре."""
@@ -157,6 +166,77 @@ class TestCreditCardGenerator:
             assert len(part) == 4
             assert part.isdigit()
 
+class TestBulkCreditCardGenerator:
+    """Тесты для пакетной генерации карт."""
+
+    @staticmethod
+    def luhn_valid(card_number):
+        total = 0
+        for i, digit in enumerate(card_number[::-1]):
+            n = int(digit)
+            if i % 2 == 1:
+                n *= 2
+                if n > 9:
+                    n -= 9
+            total += n
+        return total % 10 == 0
+
+    def test_batch_length_and_columns(self):
+        """Тест размера пакета и колонок."""
+        batch = generate_credit_cards(1000, seed=42)
+
+        assert len(batch) == 1000
+        assert len(batch.number) == len(batch.type) == len(batch.expiry) == len(batch.cvv) == 1000
+        assert set(batch.type) <= {'Visa', 'MasterCard', 'Mir'}
+
+    def test_batch_records_match_scalar_format(self):
+        """Тест: записи пакета имеют тот же формат, что и generate_credit_card."""
+        for card in generate_credit_cards(500, seed=1):
+            assert set(card) == {'number', 'type', 'expiry', 'cvv'}
+
+            parts = card['number'].split(' ')
+            assert len(parts) == 4
+            assert all(len(part) == 4 and part.isdigit() for part in parts)
+            assert self.luhn_valid(card['number'].replace(' ', ''))
+
+            month, year = card['expiry'].split('/')
+            assert 1 <= int(month) <= 12
+            assert 23 <= int(year) <= 30
+            assert len(card['cvv']) == 3 and card['cvv'].isdigit()
+
+    def test_batch_seed_reproducible(self):
+        """Тест воспроизводимости по seed."""
+        first = generate_credit_cards(100, seed=7).to_dicts()
+        second = generate_credit_cards(100, seed=7).to_dicts()
+        other = generate_credit_cards(100, seed=8).to_dicts()
+
+        assert first == second
+        assert first != other
+
+    def test_batch_chunking(self, monkeypatch):
+        """Тест генерации порциями (размер пакета больше порции)."""
+        import generators
+        monkeypatch.setattr(generators, 'CARD_CHUNK_SIZE', 64)
+
+        batch = generate_credit_cards(1000, seed=3)
+        assert len(batch) == 1000
+        assert all(self.luhn_valid(card['number'].replace(' ', '')) for card in batch)
+
+    def test_batch_slicing(self):
+        """Тест срезов и индексации пакета."""
+        batch = generate_credit_cards(10, seed=5)
+        part = batch[2:5]
+
+        assert len(part) == 3
+        assert part[0] == batch[2]
+        assert batch[-1] == batch.to_dicts()[-1]
+
+    def test_batch_empty_and_negative(self):
+        """Тест пустого пакета и отрицательного размера."""
+        assert len(generate_credit_cards(0)) == 0
+        with pytest.raises(ValueError):
+            generate_credit_cards(-1)
+
 class TestBoundaryStringsGenerator:
     """Тесты для генерации граничных строк."""
     
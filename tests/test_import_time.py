@@ -0,0 +1,80 @@
+# tests/test_import_time.py
+"""Защита от регрессий времени импорта.
+
+Модули запускаются в отдельном интерпретаторе с `python -X importtime`,
+чтобы кеш sys.modules текущего процесса не влиял на результат.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджет на импорт модуля вместе с зависимостями, микросекунды.
+# Взят с большим запасом: ленивый импорт занимает ~10-20 мс, а
+# «жадная» инициализация Faker и NumPy — сотни миллисекунд
+IMPORT_TIME_BUDGET_US = {
+    'generators': 100_000,
+    'boundary': 50_000,
+    'phones': 50_000,
+}
+
+
+def run_python(*args):
+    result = subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result
+
+
+def cumulative_import_time(module):
+    """Кумулятивное время импорта модуля (мкс) по данным -X importtime."""
+    stderr = run_python('-X', 'importtime', '-c', f'import {module}').stderr
+    for line in stderr.splitlines():
+        # Формат: "import time:  self | cumulative | name"
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"Нет данных importtime для {module}")
+
+
+class TestImportTime:
+    """Тесты времени импорта."""
+
+    @pytest.mark.parametrize('module', sorted(IMPORT_TIME_BUDGET_US))
+    def test_import_time_budget(self, module):
+        """Тест: импорт укладывается в бюджет."""
+        assert cumulative_import_time(module) < IMPORT_TIME_BUDGET_US[module]
+
+    def test_heavy_modules_not_imported(self):
+        """Тест: импорт generators не тянет faker и numpy."""
+        stdout = run_python('-c', (
+            "import sys, generators; "
+            "print('faker' in sys.modules, 'numpy' in sys.modules, bool(generators.locale_registry.cached()))"
+        )).stdout
+        assert stdout.split() == ['False', 'False', 'False']
+
+    def test_dataset_numpy_lazy(self):
+        """Тест: импорт dataset не тянет numpy, пока не создана колонка."""
+        stdout = run_python('-c', (
+            "import sys, dataset; print('numpy' in sys.modules); "
+            "dataset.string_column(['a']); print('numpy' in sys.modules)"
+        )).stdout
+        assert stdout.split() == ['False', 'True']
+
+    def test_lazy_faker_created_on_first_use(self):
+        """Тест: Faker создается при первом вызове и затем переиспользуется."""
+        stdout = run_python('-c', (
+            "import generators; generators.generate_name_address('en'); "
+            "print(generators.locale_registry.cached(), generators.get_faker('en') is generators.fake_en)"
+        )).stdout
+        assert stdout.strip() == "('en_US',) True"
+
+    def test_warm_up(self):
+        """Тест прогрева всех локалей."""
+        stdout = run_python('-c', (
+            "import generators; generators.warm_up(); print(sorted(generators.locale_registry.cached()))"
+        )).stdout
+        assert stdout.strip() == "['en_US', 'ru_RU']"
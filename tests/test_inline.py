@@ -0,0 +1,118 @@
+# tests/test_inline.py
+import asyncio
+
+import pytest
+
+from inline import INLINE_ALIASES, InlineQueryIndex, InlineResultCache, inline_title
+from tests.conftest import FakeClock
+
+
+class TestInlineQueryIndex:
+    """Тесты разбора инлайн-запросов."""
+
+    def test_prefixes_share_key(self):
+        """Тест: все префиксы синонима дают один и тот же ключ."""
+        index = InlineQueryIndex(INLINE_ALIASES)
+        keys = {index.resolve(query) for query in ('c', 'ca', 'car', 'card', 'CARD ', 'ка', 'карта')}
+        assert keys == {('card',)}
+        assert index.resolve('car') is index.resolve('card')
+
+    def test_ambiguous_prefix(self):
+        """Тест: общий префикс нескольких синонимов дает все их виды."""
+        index = InlineQueryIndex({'email': 'email', 'en': 'en'})
+        assert index.resolve('e') == ('email', 'en')
+        assert index.resolve('em') == ('email',)
+
+    def test_empty_and_unknown(self):
+        """Тест пустого и неизвестного запроса."""
+        index = InlineQueryIndex({'card': 'card', 'ru': 'ru'})
+        assert index.resolve('') == ('card', 'ru')
+        assert index.resolve('zzz') == ()
+
+    def test_title(self):
+        """Тест заголовка результата."""
+        title, description = inline_title('email', {'email': 'a@b.c'})
+        assert title == "📧 a@b.c"
+        assert description
+
+
+class TestInlineResultCache:
+    """Тесты кеша инлайн-результатов."""
+
+    @staticmethod
+    def make_cache(clock, ttl=10):
+        builds = []
+
+        async def build(key):
+            builds.append(key)
+            number = len(builds)
+            await asyncio.sleep(0)
+            return [f"{key}-{number}"]
+
+        return InlineResultCache(build, ttl=ttl, clock=clock), builds
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        """Тест: первый запрос собирает набор, следующие берут его из кеша."""
+        cache, builds = self.make_cache(FakeClock())
+        assert await cache.get('card') == ['card-1']
+        assert await cache.get('card') == ['card-1']
+        assert builds == ['card']
+        assert cache.stats()['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_build_once(self):
+        """Тест: одновременные промахи ждут одну сборку."""
+        cache, builds = self.make_cache(FakeClock())
+        results = await asyncio.gather(*(cache.get('card') for _ in range(5)))
+        assert builds == ['card']
+        assert all(result == ['card-1'] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_stale_served_and_refreshed(self):
+        """Тест: устаревший набор отдается сразу и обновляется в фоне."""
+        clock = FakeClock()
+        cache, builds = self.make_cache(clock)
+        await cache.get('card')
+        clock.now = 11
+
+        assert await cache.get('card') == ['card-1']
+        assert await cache.get('card') == ['card-1']
+        await asyncio.sleep(0.01)
+        assert await cache.get('card') == ['card-2']
+        assert len(builds) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_old(self, caplog):
+        """Тест: ошибка фонового обновления не портит кеш."""
+        clock = FakeClock()
+        calls = []
+
+        async def build(key):
+            calls.append(key)
+            if len(calls) > 1:
+                raise RuntimeError("нет данных")
+            return ['old']
+
+        cache = InlineResultCache(build, ttl=1, clock=clock)
+        await cache.get('k')
+        clock.now = 5
+        assert await cache.get('k') == ['old']
+        await asyncio.sleep(0.01)
+
+        assert await cache.get('k') == ['old']
+        assert "инлайн" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_warm(self):
+        """Тест предварительной сборки."""
+        cache, builds = self.make_cache(FakeClock())
+        await cache.warm(['a', 'b'])
+        assert len(cache) == 2
+        assert await cache.get('a') == ['a-1']
+        assert cache.misses == 0
+
+    def test_invalid_ttl(self):
+        """Тест проверки TTL."""
+        with pytest.raises(ValueError):
+            InlineResultCache(None, ttl=0)
@@ -0,0 +1,63 @@
+# tests/test_locales.py
+import pytest
+
+from locales import LocaleRegistry, join_address_lines, locale_registry
+from phones import PHONE_FORMATS
+
+
+class TestLocaleRegistry:
+    """Тесты реестра локалей и LRU-кеша Faker."""
+
+    def test_builtin_locales(self):
+        """Тест встроенных локалей."""
+        assert {'ru', 'en', 'de', 'fr', 'pl', 'uk', 'kz'} <= set(locale_registry.codes())
+        for code in ('de', 'fr', 'pl', 'uk', 'kz'):
+            assert code in PHONE_FORMATS
+
+    def test_faker_cached(self):
+        """Тест: повторное обращение берет экземпляр из кеша."""
+        registry = LocaleRegistry(max_fakers=2)
+        registry.register('ru', 'ru_RU')
+
+        assert registry.get_faker('ru') is registry.get_faker('ru')
+        assert registry.stats()['misses'] == 1
+        assert registry.stats()['hits'] == 1
+
+    def test_shared_faker_locale(self):
+        """Тест: коды с одной локалью Faker делят экземпляр."""
+        registry = LocaleRegistry()
+        registry.register('ru', 'ru_RU')
+        registry.register('kz', 'ru_RU')
+
+        assert registry.get_faker('ru') is registry.get_faker('kz')
+        assert registry.cached() == ('ru_RU',)
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных экземпляров."""
+        registry = LocaleRegistry(max_fakers=2)
+        for code, faker_locale in (('ru', 'ru_RU'), ('en', 'en_US'), ('de', 'de_DE')):
+            registry.register(code, faker_locale)
+
+        registry.get_faker('ru')
+        registry.get_faker('en')
+        registry.get_faker('ru')
+        registry.get_faker('de')
+
+        assert registry.cached() == ('ru_RU', 'de_DE')
+        assert registry.stats()['evictions'] == 1
+
+        registry.resize(1)
+        assert registry.cached() == ('de_DE',)
+
+    def test_custom_address_formatter(self):
+        """Тест собственного форматирования адреса."""
+        registry = LocaleRegistry()
+        registry.register('en', 'en_US', format_address=lambda faker: faker.city())
+
+        assert registry.spec('en').format_address is not join_address_lines
+        assert '\n' not in registry.spec('en').format_address(registry.get_faker('en'))
+
+    def test_invalid_size(self):
+        """Тест с неверным размером кеша."""
+        with pytest.raises(ValueError):
+            LocaleRegistry(max_fakers=0)
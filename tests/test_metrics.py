@@ -0,0 +1,185 @@
+# tests/test_metrics.py
+import asyncio
+import os
+import urllib.request
+
+import pytest
+
+from metrics import HandlerMetrics, LatencyHistogram, SlowRequestProfiler, phase, start_metrics_server
+
+
+class TestLatencyHistogram:
+    """Тесты гистограммы задержек."""
+
+    def test_empty(self):
+        """Тест квантиля пустой гистограммы."""
+        assert LatencyHistogram().quantile(0.5) == 0.0
+
+    def test_quantiles(self):
+        """Тест оценки квантилей по корзинам."""
+        histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.005)
+        for _ in range(10):
+            histogram.observe(0.5)
+
+        assert histogram.count == 100
+        assert 0.0 < histogram.quantile(0.5) <= 0.01
+        assert 0.1 < histogram.quantile(0.99) <= 1.0
+
+    def test_overflow_bucket(self):
+        """Тест значения выше последней границы."""
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+        histogram.observe(5.0)
+
+        assert histogram.counts == [0, 0, 1]
+        assert histogram.quantile(0.99) == 1.0
+
+
+class TestHandlerMetrics:
+    """Тесты инструментирования обработчиков."""
+
+    def test_phase_without_request(self):
+        """Тест: вне запроса фаза ничего не делает."""
+        with phase('generation'):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_instrument_records_phases(self):
+        """Тест записи фаз и общего времени обработчика."""
+        metrics = HandlerMetrics()
+
+        @metrics.instrument('handler', button=lambda update: update)
+        async def handler(update, context):
+            with phase('generation'):
+                await asyncio.sleep(0)
+            with phase('send'):
+                pass
+
+        await handler('card', None)
+        await handler('card', None)
+
+        assert set(metrics.histograms) == {
+            ('handler', 'card', 'generation'),
+            ('handler', 'card', 'send'),
+            ('handler', 'card', 'total'),
+        }
+        assert metrics.histograms[('handler', 'card', 'total')].count == 2
+
+    @pytest.mark.asyncio
+    async def test_nested_handlers(self):
+        """Тест: вложенный инструментированный обработчик не заводит запрос."""
+        metrics = HandlerMetrics()
+
+        @metrics.instrument('inner')
+        async def inner(update, context):
+            with phase('send'):
+                pass
+
+        @metrics.instrument('outer')
+        async def outer(update, context):
+            await inner(update, context)
+
+        await outer(None, None)
+
+        assert set(metrics.histograms) == {('outer', '-', 'send'), ('outer', '-', 'total')}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_isolated(self):
+        """Тест: фазы параллельных запросов не смешиваются."""
+        metrics = HandlerMetrics()
+
+        @metrics.instrument('handler', button=lambda update: update)
+        async def handler(update, context):
+            with phase(update):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(handler('a', None), handler('b', None))
+
+        assert ('handler', 'a', 'a') in metrics.histograms
+        assert ('handler', 'a', 'b') not in metrics.histograms
+        assert ('handler', 'b', 'b') in metrics.histograms
+
+    def test_render_prometheus(self):
+        """Тест текстового формата Prometheus."""
+        metrics = HandlerMetrics(buckets=(0.1, 1.0))
+        metrics.observe('handle_message', 'card', 'total', 0.05)
+        metrics.observe('handle_message', 'card', 'total', 2.0)
+        metrics.register_gauge('bot_queue', "Очередь", lambda: 3)
+        text = metrics.render_prometheus()
+
+        assert '# TYPE bot_handler_seconds histogram' in text
+        labels = 'handler="handle_message",button="card",phase="total"'
+        assert f'bot_handler_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'bot_handler_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f'bot_handler_seconds_count{{{labels}}} 2' in text
+        assert 'bot_queue 3.0' in text
+
+    def test_render_stats(self):
+        """Тест таблицы для /stats."""
+        metrics = HandlerMetrics()
+        assert "еще не было" in metrics.render_stats()
+
+        metrics.observe('start', '-', 'total', 0.002)
+        metrics.observe('handle_message', 'ru', 'generation', 0.001)
+        rows = metrics.render_stats().splitlines()
+
+        assert "p95" in rows[0]
+        assert rows[1].startswith('handle_message/ru')
+        assert rows[2].startswith('start ')
+
+
+class TestSlowRequestProfiler:
+    """Тесты выборочного профилирования."""
+
+    def test_invalid_rate(self):
+        """Тест проверки доли запросов."""
+        with pytest.raises(ValueError):
+            SlowRequestProfiler(sample_rate=2)
+
+    def test_disabled_by_default(self):
+        """Тест: при нулевой доле профилирование не запускается."""
+        assert SlowRequestProfiler().maybe_start() is None
+
+    @pytest.mark.asyncio
+    async def test_saves_slow_profiles(self, tmp_path):
+        """Тест сохранения профилей только медленных запросов."""
+        profiler = SlowRequestProfiler(sample_rate=1.0, threshold=0.0, directory=str(tmp_path), keep=1)
+        metrics = HandlerMetrics(profiler=profiler)
+
+        @metrics.instrument('slow')
+        async def slow(update, context):
+            sum(range(1000))
+
+        await slow(None, None)
+        await slow(None, None)
+
+        assert profiler.sampled == 2
+        assert len(profiler.saved) == 1
+        assert os.listdir(tmp_path) == [os.path.basename(profiler.saved[0])]
+
+        profiler.threshold = 60.0
+        await slow(None, None)
+        assert len(profiler.saved) == 1
+
+
+class TestMetricsServer:
+    """Тесты HTTP-выдачи метрик."""
+
+    def test_metrics_endpoint(self):
+        """Тест GET /metrics и 404 для других путей."""
+        metrics = HandlerMetrics()
+        metrics.observe('start', '-', 'total', 0.01)
+        server = start_metrics_server(metrics, 0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                body = response.read().decode('utf-8')
+                assert response.headers['Content-Type'].startswith('text/plain')
+            assert 'bot_handler_seconds_count{handler="start",button="-",phase="total"} 1' in body
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.shutdown()
+            server.server_close()
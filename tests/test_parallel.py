@@ -0,0 +1,58 @@
+# tests/test_parallel.py
+import pytest
+
+from parallel import derive_seed, generate_block, generate_parallel, iter_parallel_chunks
+
+
+class TestSeeding:
+    """Тесты вывода seed для блоков."""
+
+    def test_derive_seed_stable(self):
+        """Тест: seed зависит только от (master_seed, block_index)."""
+        assert derive_seed(42, 0) == derive_seed(42, 0)
+        assert derive_seed(42, 0) != derive_seed(42, 1)
+        assert derive_seed(42, 0) != derive_seed(43, 0)
+        assert 0 <= derive_seed(1, 1) < 2 ** 64
+
+    @pytest.mark.parametrize('kind', ['ru', 'en', 'card', 'email'])
+    def test_block_reproducible(self, kind):
+        """Тест воспроизводимости блока."""
+        assert generate_block(kind, 7, 3, 20) == generate_block(kind, 7, 3, 20)
+        assert generate_block(kind, 7, 3, 20) != generate_block(kind, 7, 4, 20)
+
+
+class TestParallelGeneration:
+    """Тесты многопроцессной генерации."""
+
+    @pytest.mark.parametrize('kind', ['ru', 'card', 'email'])
+    def test_same_dataset_for_any_worker_count(self, kind):
+        """Тест: один master_seed дает один набор при любом числе процессов."""
+        single = generate_parallel(kind, 95, master_seed=11, workers=1, block_size=10)
+        multi = generate_parallel(kind, 95, master_seed=11, workers=3, block_size=10)
+
+        assert len(single) == 95
+        assert single == multi
+
+    def test_chunks_in_order(self):
+        """Тест: блоки приходят в исходном порядке и нужного размера."""
+        chunks = list(iter_parallel_chunks('email', 25, master_seed=1, workers=2, block_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert chunks[1] == generate_block('email', 1, 1, 10)
+
+    def test_invalid_arguments(self):
+        """Тест с неверными аргументами."""
+        with pytest.raises(ValueError):
+            generate_parallel('unknown', 10)
+        with pytest.raises(ValueError):
+            generate_parallel('ru', 10, block_size=0)
+
+    @pytest.mark.parametrize('kind, key', [('en', 'full_name'), ('card', 'number'), ('email', 'email')])
+    def test_unique_mode(self, kind, key):
+        """Тест режима уникальности: без повторов и независимо от числа процессов."""
+        single = generate_parallel(kind, 950, master_seed=5, workers=1, block_size=100, unique=True)
+        multi = generate_parallel(kind, 950, master_seed=5, workers=2, block_size=100, unique=True)
+
+        assert len(single) == 950
+        assert len({record[key] for record in single}) == 950
+        assert single == multi
@@ -0,0 +1,87 @@
+# tests/test_phones.py
+import re
+
+import numpy as np
+import pytest
+
+from phones import (
+    PHONE_FORMATS,
+    PhoneFormat,
+    PhoneOption,
+    PhoneTemplate,
+    generate_phones,
+    register_phone_format
+)
+
+RU_PHONE = re.compile(r'^\+7 \(9\d\d\) \d{3}-\d{2}-\d{2}( доб\. \d{4})?$')
+EN_PHONE = re.compile(r'^(\+1 )?\([2-9]\d\d\) [2-9]\d\d-\d{4}$')
+
+
+class TestBatchPhones:
+    """Тесты пакетной генерации телефонов."""
+
+    def test_ru_format(self):
+        """Тест формата российских номеров и доли добавочных."""
+        phones = generate_phones('ru', 5000, rng=1)
+
+        assert len(phones) == 5000
+        assert all(RU_PHONE.match(phone) for phone in phones)
+        share = sum('доб.' in phone for phone in phones) / len(phones)
+        assert 0.15 < share < 0.25
+
+    def test_en_format(self):
+        """Тест формата американских номеров и доли с кодом страны."""
+        phones = generate_phones('en', 5000, rng=2)
+
+        assert all(EN_PHONE.match(phone) for phone in phones)
+        share = sum(phone.startswith('+1 ') for phone in phones) / len(phones)
+        assert 0.06 < share < 0.14
+
+    def test_seed_reproducible(self):
+        """Тест воспроизводимости по seed и генератору NumPy."""
+        assert generate_phones('ru', 100, rng=3) == generate_phones('ru', 100, rng=3)
+        assert generate_phones('en', 10, rng=np.random.default_rng(4)) == generate_phones('en', 10, rng=4)
+
+    def test_empty_batch(self):
+        """Тест пустой партии."""
+        assert generate_phones('ru', 0) == []
+
+    def test_unknown_locale(self):
+        """Тест с локалью без формата."""
+        with pytest.raises(ValueError):
+            generate_phones('xx', 1)
+
+
+class TestPhoneFormat:
+    """Тесты описания форматов."""
+
+    def test_register_format(self, monkeypatch):
+        """Тест подключения формата новой страны."""
+        monkeypatch.setitem(PHONE_FORMATS, 'de', None)
+        register_phone_format('de', PhoneFormat('+49 {0} {1}', [(150, 179), (1000000, 9999999)]))
+
+        phones = generate_phones('de', 50, rng=0)
+        assert all(re.match(r'^\+49 1[5-7]\d \d{7}$', phone) for phone in phones)
+
+    def test_draw_one_uses_random_int(self):
+        """Тест поштучной генерации из заданного источника чисел."""
+        values = iter([900, 123, 45, 67, 10, 1234])
+        phone_format = PhoneFormat('+7 ({0}) {1}-{2}-{3}', [(900, 999), (100, 999), (10, 99), (10, 99)],
+                                   PhoneOption(0.2, '{phone} доб. {0}', [(1000, 9999)]))
+
+        assert phone_format.draw_one(lambda low, high: next(values)) == '+7 (900) 123-45-67 доб. 1234'
+
+    @pytest.mark.parametrize('source, args, named', [
+        ('+7 ({0}) {1}-{2}-{3}', (900, 123, 45, 67), {}),
+        ('{1} {0} 100%', (1, 2), {}),
+        ('{} {}', (3, 4), {}),
+        ('{phone} доб. {0}', (1234,), {'phone': '+1 555'}),
+    ])
+    def test_template_matches_str_format(self, source, args, named):
+        """Тест: заранее разобранный шаблон дает то же, что str.format."""
+        assert PhoneTemplate(source)(*args, **named) == source.format(*args, **named)
+
+    def test_template_rejects_format_spec(self):
+        """Тест: спецификации формата в шаблоне телефона не поддерживаются."""
+        with pytest.raises(ValueError):
+            PhoneTemplate('{0:03d}')
@@ -0,0 +1,78 @@
+# tests/test_pool.py
+import itertools
+import time
+
+import pytest
+
+from pool import RecordPool, RecordPools
+
+
+def wait_until(condition, timeout=2.0):
+    """Ждет выполнения условия фоновым потоком."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestRecordPool:
+    """Тесты пула записей."""
+
+    def test_miss_on_empty_pool(self):
+        """Тест: пустой пул генерирует запись синхронно и считает промах."""
+        pool = RecordPool('test', itertools.count().__next__, low_water=1, high_water=5)
+
+        assert pool.get() == 0
+        assert pool.stats.misses == 1
+        assert pool.stats.hits == 0
+
+    def test_refill_to_high_water(self):
+        """Тест пополнения до верхней отметки."""
+        pool = RecordPool('test', itertools.count().__next__, low_water=2, high_water=10)
+        pool.refill()
+
+        assert len(pool) == 10
+        assert [pool.get() for _ in range(3)] == [0, 1, 2]
+        assert pool.stats.hits == 3
+        assert pool.stats.refills == 1
+
+    def test_background_refill(self):
+        """Тест фонового пополнения при достижении нижней отметки."""
+        pool = RecordPool('test', itertools.count().__next__, low_water=3, high_water=8)
+        pool.start()
+        try:
+            assert wait_until(lambda: len(pool) == 8)
+            for _ in range(6):
+                pool.get()
+            assert wait_until(lambda: len(pool) == 8)
+            assert pool.stats.hits == 6
+            assert pool.stats.refills >= 2
+        finally:
+            pool.stop(timeout=1)
+
+    def test_invalid_water_marks(self):
+        """Тест с неверными отметками."""
+        with pytest.raises(ValueError):
+            RecordPool('test', object, low_water=10, high_water=10)
+
+
+class TestRecordPools:
+    """Тесты набора пулов по генераторам."""
+
+    def test_default_generators(self):
+        """Тест: пулы по умолчанию выдают записи в формате генераторов."""
+        pools = RecordPools(low_water=1, high_water=3)
+        pools.start()
+        try:
+            assert pools.get('ru')['locale'] == 'RU'
+            assert pools.get('en')['locale'] == 'EN'
+            assert len(pools.get('card')['number']) == 19
+            assert '@' in pools.get('email')['email']
+
+            stats = pools.stats()
+            assert set(stats) == {'ru', 'en', 'card', 'email'}
+            assert stats['ru']['hits'] + stats['ru']['misses'] == 1
+        finally:
+            pools.stop(timeout=1)
@@ -0,0 +1,227 @@
+# tests/test_ratelimit.py
+import asyncio
+
+import pytest
+
+from ratelimit import PressCoalescer, RequestLimiter, SendQueue, TokenBucket, retry_after_seconds
+from tests.conftest import FakeClock
+
+
+class TestTokenBucket:
+    """Тесты ведра токенов."""
+
+    def test_burst_then_refill(self):
+        """Тест всплеска до емкости и пополнения со скоростью rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+        assert bucket.wait_time() == pytest.approx(0.5)
+        clock.now = 0.5
+        assert bucket.try_acquire()
+        clock.now = 100
+        bucket.try_acquire(0)
+        assert bucket.tokens == 3
+
+    def test_reserve_in_order(self):
+        """Тест резервов: каждый следующий ждет дольше предыдущего."""
+        bucket = TokenBucket(rate=10, capacity=1, clock=FakeClock())
+        waits = [bucket.reserve() for _ in range(3)]
+        assert waits == pytest.approx([0.0, 0.1, 0.2])
+
+    def test_hold(self):
+        """Тест паузы после 429."""
+        bucket = TokenBucket(rate=10, capacity=5, clock=FakeClock())
+        bucket.hold(2.0)
+        assert bucket.reserve() == pytest.approx(2.0)
+
+    def test_invalid(self):
+        """Тест проверки параметров."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+
+class TestRequestLimiter:
+    """Тесты лимита входящих запросов."""
+
+    def test_per_chat(self):
+        """Тест: флуд одного чата не мешает другим."""
+        clock = FakeClock()
+        limiter = RequestLimiter(chat_rate=1, chat_burst=2, global_rate=100, global_burst=100, clock=clock)
+
+        assert limiter.acquire(1) == 0.0
+        assert limiter.acquire(1) == 0.0
+        assert limiter.acquire(1) == pytest.approx(1.0)
+        assert limiter.acquire(2) == 0.0
+        assert limiter.rejected == 1
+        clock.now = 1.0
+        assert limiter.acquire(1) == 0.0
+
+    def test_global(self):
+        """Тест общего лимита бота; токен чата при отказе возвращается."""
+        limiter = RequestLimiter(chat_rate=1, chat_burst=2, global_rate=1, global_burst=1, clock=FakeClock())
+
+        assert limiter.acquire(1) == 0.0
+        assert limiter.acquire(2) > 0
+        assert limiter.chats.get(2).tokens == 2
+
+    def test_warn_once_per_streak(self):
+        """Тест: предупреждение один раз за серию отказов."""
+        clock = FakeClock()
+        limiter = RequestLimiter(chat_rate=1, chat_burst=1, global_rate=100, global_burst=100, clock=clock)
+        limiter.acquire(1)
+
+        assert limiter.acquire(1) > 0
+        assert limiter.should_warn(1)
+        assert not limiter.should_warn(1)
+        clock.now = 1.0
+        assert limiter.acquire(1) == 0.0
+        assert limiter.should_warn(1)
+
+    def test_chats_lru(self):
+        """Тест ограничения числа запоминаемых чатов."""
+        limiter = RequestLimiter(1, 1, 100, 100, max_chats=2, clock=FakeClock())
+        for chat_id in range(5):
+            limiter.acquire(chat_id)
+        assert len(limiter.chats) == 2
+
+
+class TestPressCoalescer:
+    """Тесты объединения нажатий."""
+
+    @pytest.mark.asyncio
+    async def test_burst_coalesced(self):
+        """Тест: первое нажатие сразу, остальные — одним пакетом."""
+        coalescer = PressCoalescer(window=0.05, max_batch=3)
+        first = await coalescer.join('k')
+        counts = await asyncio.gather(*(coalescer.join('k') for _ in range(5)))
+
+        assert first == 1
+        assert sorted(counts) == [0, 0, 0, 0, 3]
+        assert coalescer.coalesced == 5
+        assert len(coalescer) == 0
+        assert await coalescer.join('k') == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_independent(self):
+        """Тест: разные кнопки и чаты не объединяются."""
+        coalescer = PressCoalescer(window=10, max_batch=5)
+        assert await coalescer.join((1, 'card')) == 1
+        assert await coalescer.join((1, 'email')) == 1
+        assert await coalescer.join((2, 'card')) == 1
+
+    @pytest.mark.asyncio
+    async def test_window_expired(self):
+        """Тест: после окна нажатие снова получает ответ сразу."""
+        clock = FakeClock()
+        coalescer = PressCoalescer(window=1, max_batch=5, max_keys=1, clock=clock)
+        assert await coalescer.join('a') == 1
+        clock.now = 2
+        assert await coalescer.join('a') == 1
+        clock.now = 4
+        assert await coalescer.join('b') == 1
+        assert len(coalescer) == 1
+
+
+class TestSendQueue:
+    """Тесты очереди отправки."""
+
+    @pytest.mark.asyncio
+    async def test_sends_and_returns_result(self):
+        """Тест отправки и возврата результата."""
+        queue = SendQueue(chat_rate=100, chat_burst=10, global_rate=100, global_burst=10)
+
+        async def send():
+            return 'ok'
+
+        assert await queue.send(1, send) == 'ok'
+        assert queue.sent == 1
+
+    @pytest.mark.asyncio
+    async def test_chat_rate_respected(self):
+        """Тест: сообщения в один чат выходят не чаще лимита.
+
+        Слоты резервируются по абсолютному времени, поэтому после позднего
+        пробуждения следующий интервал может быть короче — проверяется
+        накопленный темп: k-е сообщение не раньше k интервалов от начала.
+        """
+        queue = SendQueue(chat_rate=50, chat_burst=1, global_rate=1000, global_burst=100)
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def send():
+            times.append(loop.time())
+
+        start = loop.time()
+        await asyncio.gather(*(queue.send(1, send) for _ in range(6)))
+
+        # Допуск — на разрешение таймера цикла событий
+        assert all(time - start >= number * 0.02 - 0.005 for number, time in enumerate(times))
+        assert queue.waited_seconds > 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after(self):
+        """Тест повторной отправки после 429."""
+
+        class Flood(Exception):
+            retry_after = 0.01
+
+        queue = SendQueue(100, 10, 100, 10, retry_on=(Flood,), max_retries=2)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Flood()
+            return 'sent'
+
+        assert await queue.send(1, flaky) == 'sent'
+        assert queue.retries == 2
+
+        attempts.clear()
+
+        async def always():
+            raise Flood()
+
+        with pytest.raises(Flood):
+            await queue.send(1, always)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_sleeping_senders(self):
+        """Тест: 429 задерживает и те отправки, что уже ждут своего токена."""
+
+        class Flood(Exception):
+            retry_after = 5
+
+        clock = FakeClock()
+        queue = SendQueue(chat_rate=1000, chat_burst=100, global_rate=100, global_burst=1,
+                          retry_on=(Flood,), clock=clock, sleep=clock.sleep)
+        sent = []
+        flooded = []
+
+        async def send():
+            if not flooded:
+                flooded.append(1)
+                # Остальные отправки успевают зарезервировать токены и уснуть
+                await asyncio.sleep(0)
+                raise Flood()
+            sent.append(clock())
+
+        await asyncio.gather(*(queue.send(chat_id, send) for chat_id in range(4)))
+
+        assert len(sent) == 4
+        assert queue.retries == 1
+        assert all(time >= queue.paused_until for time in sent)
+        assert queue.paused_until >= 5
+
+    def test_retry_after_seconds(self):
+        """Тест чтения паузы из ошибки."""
+        from datetime import timedelta
+
+        class Error(Exception):
+            def __init__(self, value):
+                self.retry_after = value
+
+        assert retry_after_seconds(Error(3)) == 3.0
+        assert retry_after_seconds(Error(timedelta(seconds=2))) == 2.0
+        assert retry_after_seconds(ValueError()) == 1.0
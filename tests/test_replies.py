@@ -0,0 +1,92 @@
+# tests/test_replies.py
+import pytest
+
+from replies import ReplyRegistry, ReplyTemplate, code_value, escape_markdown, reply_registry
+
+
+class TestReplyTemplate:
+    """Тесты заранее разобранных шаблонов."""
+
+    def test_render(self):
+        """Тест подстановки полей."""
+        template = ReplyTemplate("*Имя:* {name}\n`{code!c}`")
+        assert template.fields == ('name', 'code')
+        assert template.render({'name': 'Иван', 'code': '1234'}) == "*Имя:* Иван\n`1234`"
+
+    def test_escapes_markdown(self):
+        """Тест экранирования разметки в сгенерированных значениях."""
+        template = ReplyTemplate("*Адрес:* {address}")
+        assert template.render({'address': 'ул_Мира *5* [кв]'}) == r"*Адрес:* ул\_Мира \*5\* \[кв]"
+
+    def test_code_field(self):
+        """Тест поля в блоке кода: без экранирования, без обратных кавычек."""
+        assert ReplyTemplate("`{email!c}`").render({'email': 'a_b`c@x.io'}) == "`a_b'c@x.io`"
+
+    def test_literal_braces(self):
+        """Тест двойных фигурных скобок в тексте шаблона."""
+        assert ReplyTemplate("{{x}} {value}").render({'value': 1}) == "{x} 1"
+
+    @pytest.mark.parametrize('source', ["{name:>10}", "{name!r}", "{}"])
+    def test_unsupported_fields(self, source):
+        """Тест отказа на форматы, преобразования и безымянные поля."""
+        with pytest.raises(ValueError):
+            ReplyTemplate(source)
+
+    def test_helpers(self):
+        """Тест функций экранирования."""
+        assert escape_markdown(42) == '42'
+        assert escape_markdown('a_b') == r'a\_b'
+        assert code_value('`x`') == "'x'"
+
+
+class TestReplyRegistry:
+    """Тесты реестра ответов."""
+
+    def test_default_replies(self):
+        """Тест встроенных ответов на данные."""
+        assert set(reply_registry.templated_keys()) >= {'ru', 'en', 'card', 'email'}
+        reply = reply_registry.get('card')
+        assert reply.source == 'card'
+        assert 'number' in reply.template.fields
+
+    def test_bind_and_lookup(self):
+        """Тест привязки текста кнопки и синонима."""
+        registry = ReplyRegistry()
+        registry.register('iban', template="*IBAN:* `{iban!c}`")
+        registry.bind("🏦 IBAN", 'iban')
+        registry.bind("iban", 'iban')
+
+        assert registry.lookup("🏦 IBAN") is registry.lookup("iban")
+        assert registry.lookup("🏦 IBAN").template.render({'iban': 'DE89'}) == "*IBAN:* `DE89`"
+        assert registry.lookup("нет такой") is None
+        assert registry.label("🏦 IBAN") == 'iban'
+        assert registry.label("нет такой") == 'other'
+
+    def test_register_replaces_bound(self):
+        """Тест: повторная регистрация меняет ответ у привязанных текстов."""
+        registry = ReplyRegistry()
+        registry.register('x', template="old {v}")
+        registry.bind("X", 'x')
+        registry.register('x', template="new {v}")
+
+        assert registry.lookup("X").template.render({'v': 1}) == "new 1"
+
+    def test_bind_keyboard(self):
+        """Тест привязки клавиатуры и ошибок конфигурации."""
+        registry = ReplyRegistry()
+        registry.register('a', template="a")
+        registry.bind_keyboard([["A"]], {"A": 'a'})
+        assert registry.lookup("A").key == 'a'
+
+        with pytest.raises(KeyError):
+            registry.bind_keyboard([["B"]], {"A": 'a'})
+        with pytest.raises(KeyError):
+            registry.bind("C", 'missing')
+
+    def test_template_or_action(self):
+        """Тест: ответ задается либо шаблоном, либо действием."""
+        registry = ReplyRegistry()
+        with pytest.raises(ValueError):
+            registry.register('x')
+        with pytest.raises(ValueError):
+            registry.register('x', template="t", action=print)
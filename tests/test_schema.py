@@ -0,0 +1,133 @@
+# tests/test_schema.py
+import json
+import re
+
+import pytest
+
+from schema import USER_SCHEMA, compile_schema, load_schema, transliterate, username_from_name
+
+
+class TestTransliteration:
+    """Тесты транслитерации для email."""
+
+    def test_cyrillic(self):
+        """Тест транслитерации кириллицы."""
+        assert transliterate('Щукин Жора') == 'shchukin zhora'
+        assert username_from_name('Иванов Петр Сергеевич') == 'ivanov.petr'
+
+    def test_latin_with_diacritics(self):
+        """Тест снятия диакритики и лишних символов."""
+        assert username_from_name('Dr. Jürgen Müller-Lüdenscheidt') == 'dr.jurgen'
+        assert username_from_name('!!!') == 'user'
+
+
+class TestCompiledSchema:
+    """Тесты компиляции и генерации по схеме."""
+
+    def test_user_schema(self):
+        """Тест готовой схемы «пользователь»."""
+        users = compile_schema(USER_SCHEMA).generate(200, seed=1)
+
+        assert len(users) == 200
+        assert list(users[0]) == list(USER_SCHEMA['fields'])
+        for user in users:
+            # email связан с ФИО
+            assert user['email'].split('.')[0] == username_from_name(user['full_name']).split('.')[0]
+            assert user['phone'].startswith('+7 (9')
+            # тип карты заполнен ровно там, где есть номер
+            assert (user['card_number'] is None) == (user['card_type'] is None)
+
+        with_card = sum(user['card_number'] is not None for user in users)
+        assert 60 < with_card < 140
+
+    def test_seed_reproducible(self):
+        """Тест воспроизводимости по seed."""
+        schema = compile_schema(USER_SCHEMA)
+        assert schema.generate(20, seed=5) == schema.generate(20, seed=5)
+        assert schema.generate(20, seed=5) != schema.generate(20, seed=6)
+
+    def test_batches(self):
+        """Тест генерации партиями."""
+        schema = compile_schema({'fields': {'n': {'generator': 'integer', 'low': 1, 'high': 3}}})
+        batches = list(schema.iter_batches(25, seed=0, batch_size=10))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert all(1 <= record['n'] <= 3 for batch in batches for record in batch)
+
+    def test_generators_and_probability(self):
+        """Тест простых генераторов и вероятности заполнения."""
+        schema = compile_schema({
+            'locale': 'en',
+            'fields': {
+                'status': {'generator': 'choice', 'values': ['active', 'blocked'], 'weights': [9, 1]},
+                'source': {'generator': 'constant', 'value': 'test'},
+                'email': {'generator': 'temp_email'},
+                'phone': {'generator': 'phone', 'probability': 0.0},
+                'cvv': {'generator': 'card', 'part': 'cvv'},
+            }
+        })
+        records = schema.generate(300, seed=2)
+
+        assert {record['status'] for record in records} <= {'active', 'blocked'}
+        assert sum(record['status'] == 'active' for record in records) > 200
+        assert all(record['source'] == 'test' for record in records)
+        assert all(re.match(r'^[a-z0-9]{10}@', record['email']) for record in records)
+        assert all(record['phone'] is None for record in records)
+        assert all(len(record['cvv']) == 3 for record in records)
+
+    def test_dependency_order(self):
+        """Тест: поле-источник вычисляется раньше, даже если объявлено позже."""
+        schema = compile_schema({'fields': {
+            'email': {'generator': 'email_from_name', 'source': 'name'},
+            'name': {'generator': 'name'},
+        }})
+        record = schema.generate(1, seed=0)[0]
+
+        assert list(record) == ['email', 'name']
+        assert record['email'].startswith(username_from_name(record['name']))
+
+    def test_names_from_corpus(self):
+        """Тест: ФИО, имена и адреса берутся из корпуса и воспроизводимы по seed."""
+        source = {'locale': 'ru', 'fields': {
+            'full_name': {'generator': 'name'},
+            'first_name': {'generator': 'first_name'},
+            'last_name': {'generator': 'last_name'},
+            'address': {'generator': 'address'},
+        }}
+        schema = compile_schema(source)
+        records = schema.generate(200, seed=3)
+
+        assert schema.use_corpus
+        assert records == compile_schema(source).generate(200, seed=3)
+        assert all(len(record['full_name'].split()) >= 2 for record in records)
+        assert all(record['first_name'] and ' ' not in record['last_name'] for record in records)
+        assert len({record['address'] for record in records}) > 150
+
+    def test_corpus_only_when_needed(self):
+        """Тест: схема без ФИО и адресов корпус не собирает, 'corpus': False — Faker."""
+        assert not compile_schema({'fields': {'n': {'generator': 'integer', 'low': 0, 'high': 1}}}).use_corpus
+        schema = compile_schema(dict(USER_SCHEMA, corpus=False))
+
+        assert not schema.use_corpus
+        assert len(schema.generate(5, seed=1)) == 5
+
+    @pytest.mark.parametrize('schema, message', [
+        ({'fields': {}}, 'нет полей'),
+        ({'locale': 'xx', 'fields': {'a': {'generator': 'name'}}}, 'локаль'),
+        ({'fields': {'a': {'generator': 'nope'}}}, 'генератор'),
+        ({'fields': {'a': {'generator': 'name', 'probability': 2}}}, 'Вероятность'),
+        ({'fields': {'a': {'generator': 'email_from_name', 'source': 'b'}}}, 'неизвестного поля'),
+        ({'fields': {'a': {'generator': 'name', 'depends_on': 'b'},
+                     'b': {'generator': 'name', 'depends_on': 'a'}}}, 'Циклическая'),
+    ])
+    def test_invalid_schema(self, schema, message):
+        """Тест ошибок в схеме."""
+        with pytest.raises(ValueError, match=message):
+            compile_schema(schema)
+
+    def test_load_json_schema(self, tmp_path):
+        """Тест загрузки схемы из JSON."""
+        path = tmp_path / 'user.json'
+        path.write_text(json.dumps(USER_SCHEMA), encoding='utf-8')
+
+        assert len(load_schema(str(path)).generate(3)) == 3
@@ -0,0 +1,99 @@
+# tests/test_streams.py
+import re
+
+import pytest
+
+from streams import RecordStream, counter_lanes, stream_key
+
+
+class TestCounterLanes:
+    """Тесты счетчиковых случайных чисел."""
+
+    def test_row_depends_only_on_index(self):
+        """Тест: строка зависит только от (key, номер), а не от соседей."""
+        lanes = counter_lanes(stream_key(1), [5, 6, 7], 5)
+
+        assert lanes.shape == (3, 5)
+        assert counter_lanes(stream_key(1), [7], 5).tolist() == lanes[2:].tolist()
+        assert counter_lanes(stream_key(2), [7], 5).tolist() != lanes[2:].tolist()
+        assert int(lanes.max()) < 2 ** 32
+
+
+class TestRecordStream:
+    """Тесты потоков с произвольным доступом."""
+
+    @pytest.mark.parametrize('kind', ['card', 'email', 'ru', 'en'])
+    def test_random_access(self, kind):
+        """Тест: запись i одинакова при любом способе получения."""
+        stream = RecordStream(kind, seed=42)
+        records = stream[0:30]
+
+        assert records[17] == stream[17] == RecordStream(kind, seed=42)[17]
+        assert records == stream.take(0, 12) + stream.take(12, 30)
+        assert stream[0:30:3] == records[::3]
+        assert RecordStream(kind, seed=43)[17] != records[17]
+
+    @pytest.mark.parametrize('kind', ['ru', 'en'])
+    def test_independent_of_shared_fakers(self, kind):
+        """Тест: генерация в других местах не влияет на поток."""
+        from generators import generate_name_address
+        expected = RecordStream(kind, seed=7)[3]
+        generate_name_address(kind)
+
+        assert RecordStream(kind, seed=7)[3] == expected
+
+    def test_card_format(self):
+        """Тест формата карт из потока."""
+        cards = RecordStream('card', seed=1).take(10 ** 12, 10 ** 12 + 2000)
+
+        assert all(re.match(r'^\d{4} \d{4} \d{4} \d{4}$', card['number']) for card in cards)
+        assert {card['type'] for card in cards} == {'Visa', 'MasterCard', 'Mir'}
+        assert all(1 <= int(card['expiry'][:2]) <= 12 for card in cards)
+        assert all(23 <= int(card['expiry'][3:]) <= 30 for card in cards)
+
+    def test_email_format(self):
+        """Тест формата email из потока."""
+        emails = RecordStream('email', seed=1).take(0, 500)
+
+        assert all(re.match(r'^[a-z0-9]{10}@[a-z0-9.-]+$', record['email']) for record in emails)
+
+    @pytest.mark.parametrize('kind, key', [('card', 'number'), ('email', 'email')])
+    def test_unique_stream(self, kind, key):
+        """Тест уникального потока."""
+        stream = RecordStream(kind, seed=3, unique=True)
+        records = stream.take(0, 5000)
+
+        assert len({record[key] for record in records}) == 5000
+        assert stream[4321] == records[4321]
+
+    def test_iter_chunks(self):
+        """Тест выдачи порциями."""
+        stream = RecordStream('email', seed=2)
+        chunks = list(stream.iter_chunks(5, 30, chunk_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert sum(chunks, []) == stream.take(5, 30)
+
+    def test_invalid_arguments(self):
+        """Тест с неверными аргументами."""
+        with pytest.raises(ValueError):
+            RecordStream('unknown')
+        with pytest.raises(ValueError):
+            RecordStream('ru', unique=True)
+        with pytest.raises(IndexError):
+            RecordStream('card')[-1]
+        with pytest.raises(ValueError):
+            RecordStream('card')[5:]
+
+
+class TestCardStreamBins:
+    """Тесты префиксов карт в потоке."""
+
+    def test_network_matches_prefix(self):
+        """Тест: тип карты в потоке соответствует префиксу."""
+        from cards import validate_luhn
+        from tests.test_cards import network_of
+
+        cards = RecordStream('card', seed=9).take(0, 3000)
+        assert all(network_of(card['number']) == card['type'] for card in cards)
+        assert validate_luhn([card['number'] for card in cards]).all()
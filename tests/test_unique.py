@@ -0,0 +1,148 @@
+# tests/test_unique.py
+import numpy as np
+import pytest
+
+from generators import EMAIL_USERNAME_SPACE, generate_credit_cards, generate_temp_emails
+from tests.test_generators import TestBulkCreditCardGenerator
+from unique import FeistelPermutation, SeenSet, UniqueSpaceExhausted, hash_strings, unique_values
+
+
+class TestFeistelPermutation:
+    """Тесты биективного счетчика."""
+
+    @pytest.mark.parametrize('size', [1, 2, 10, 1000, 4097])
+    def test_is_permutation(self, size):
+        """Тест: все номера диапазона переходят в разные числа того же диапазона."""
+        values = FeistelPermutation(size, seed=3).range(0, size)
+
+        assert sorted(values.tolist()) == list(range(size))
+
+    def test_depends_on_seed(self):
+        """Тест: перестановка задается ключом и воспроизводима."""
+        assert FeistelPermutation(10 ** 15, 1).range(0, 5).tolist() == \
+            FeistelPermutation(10 ** 15, 1).range(0, 5).tolist()
+        assert FeistelPermutation(10 ** 15, 1).range(0, 5).tolist() != \
+            FeistelPermutation(10 ** 15, 2).range(0, 5).tolist()
+
+    @pytest.mark.parametrize('bits', [2, 11, 33, 52, 53, 63])
+    def test_power_of_two_plus_one(self, bits):
+        """Тест: у размера 2**k + 1 домен сети вмещает весь диапазон, последний номер доступен."""
+        size = 2 ** bits + 1
+        permutation = FeistelPermutation(size, seed=5)
+        values = permutation.permute([0, size // 2, size - 1])
+
+        assert 1 << (2 * permutation.half_bits) >= size
+        assert len(set(values.tolist())) == 3
+        assert all(value < size for value in values.tolist())
+
+    def test_full_range(self):
+        """Тест: наибольший допустимый размер 2**64 и его последний номер."""
+        permutation = FeistelPermutation(1 << 64, seed=1)
+
+        assert permutation.half_bits == 32
+        assert int(permutation.range((1 << 64) - 1, 1)[0]) < 1 << 64
+
+    def test_exhausted(self):
+        """Тест: номер за пределами диапазона."""
+        with pytest.raises(UniqueSpaceExhausted):
+            FeistelPermutation(10).range(5, 6)
+
+
+class TestSeenSet:
+    """Тесты компактного множества хешей."""
+
+    def test_add(self):
+        """Тест добавления и проверки значений."""
+        seen = SeenSet(10)
+
+        assert seen.add_many(['a', 'b', 'a', 'c', 'b']).tolist() == [True, True, False, True, False]
+        assert seen.add('a') is False
+        assert seen.add('d') is True
+        assert len(seen) == 4
+        assert 'c' in seen and 'z' not in seen
+
+    def test_matches_python_set(self):
+        """Тест на партиях с большим числом коллизий ячеек."""
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 5000, size=20000, dtype=np.uint64)
+        seen = SeenSet(5000, load_factor=1.0)
+        fresh = np.concatenate([seen.add_hashes(part) for part in np.array_split(values, 7)])
+
+        expected = []
+        known = set()
+        for value in values.tolist():
+            expected.append((value or 1) not in known)
+            known.add(value or 1)
+        assert fresh.tolist() == expected
+        assert len(seen) == len(known)
+
+    def test_capacity(self):
+        """Тест: емкость не превышается, память выделена заранее."""
+        seen = SeenSet(3)
+        seen.add_many(['a', 'b', 'c'])
+
+        assert seen.nbytes == len(seen.table) * 8
+        with pytest.raises(UniqueSpaceExhausted):
+            seen.add('d')
+
+    def test_hash_stable(self):
+        """Тест: хеши не зависят от процесса (не используют hash())."""
+        assert hash_strings(['Иванов']).tolist() == hash_strings(['Иванов']).tolist()
+        assert hash_strings(['a'])[0] != hash_strings(['b'])[0]
+
+
+class TestUniqueValues:
+    """Тесты генерации с отбрасыванием повторов."""
+
+    def test_unique(self):
+        """Тест: результат без повторов даже при частых совпадениях."""
+        rng = np.random.default_rng(1)
+        values = unique_values(lambda k: [str(v) for v in rng.integers(0, 300, size=k)], 250)
+
+        assert len(values) == len(set(values)) == 250
+
+    def test_bounded_retries(self):
+        """Тест: при исчерпании пространства повторы ограничены."""
+        calls = []
+
+        def generate(k):
+            calls.append(k)
+            return ['same'] * k
+
+        with pytest.raises(UniqueSpaceExhausted):
+            unique_values(generate, 10, max_attempts_ratio=3)
+        assert sum(calls) <= 30
+
+
+class TestUniqueGenerators:
+    """Тесты режима уникальности пакетных генераторов."""
+
+    def test_unique_cards(self):
+        """Тест: номера карт уникальны и проходят проверку Луна."""
+        cards = generate_credit_cards(20000, seed=1, unique_key=7)
+        numbers = [number.decode('ascii') for number in cards.number.tolist()]
+
+        assert len(set(numbers)) == 20000
+        assert all(TestBulkCreditCardGenerator.luhn_valid(number.replace(' ', '')) for number in numbers[:1000])
+
+    def test_unique_across_calls(self):
+        """Тест: непересекающиеся диапазоны с одним ключом дают разные номера."""
+        first = generate_credit_cards(100, unique_key=7, start=0).number.tolist()
+        second = generate_credit_cards(100, unique_key=7, start=100).number.tolist()
+        whole = generate_credit_cards(200, unique_key=7, start=0).number.tolist()
+
+        assert not set(first) & set(second)
+        assert first + second == whole
+
+    def test_unique_emails(self):
+        """Тест: уникальные адреса email в прежнем формате."""
+        emails = generate_temp_emails(20000, seed=2, unique_key=7)
+
+        assert len({email.split('@')[0] for email in emails}) == 20000
+        assert all(len(email.split('@')[0]) == 10 for email in emails)
+        assert generate_temp_emails(5, seed=2) == generate_temp_emails(5, seed=2)
+
+    def test_space_exhausted(self):
+        """Тест: запрос за пределами пространства значений."""
+        with pytest.raises(UniqueSpaceExhausted):
+            generate_temp_emails(2, unique_key=1, start=EMAIL_USERNAME_SPACE - 1)
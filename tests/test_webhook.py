@@ -0,0 +1,258 @@
+# tests/test_webhook.py
+import asyncio
+import io
+import queue
+import time
+
+import httpx
+import pytest
+from telegram import Bot
+from telegram.error import RetryAfter
+
+import bot
+from webhook import (
+    FakeTelegramApi,
+    WebhookCluster,
+    WebhookReceiver,
+    message_update,
+    post_json,
+    route_update,
+    serve_updates,
+    update_chat_id
+)
+
+TOKEN = '123:TEST'
+
+
+class TestRouting:
+    """Тесты выбора обработчика по чату."""
+
+    def test_chat_id(self):
+        """Тест: чат берется из сообщения, нажатия кнопки или отправителя."""
+        callback = {'update_id': 2, 'callback_query': {'id': 'x', 'from': {'id': 7},
+                                                       'message': {'chat': {'id': -100}}}}
+        inline = {'update_id': 3, 'inline_query': {'id': 'q', 'from': {'id': 9}, 'query': ''}}
+
+        assert update_chat_id(message_update(1, 5, 'hi')) == 5
+        assert update_chat_id(callback) == -100
+        assert update_chat_id(inline) == 9
+        assert update_chat_id({'update_id': 4}) == 4
+
+    def test_same_chat_same_worker(self):
+        """Тест: обновления одного чата всегда попадают к одному обработчику."""
+        workers = {route_update(message_update(number, 42, 'x'), 4) for number in range(20)}
+
+        assert len(workers) == 1
+        assert route_update(message_update(1, -7, 'x'), 4) in range(4)
+
+
+async def start_receiver(queues, secret=None):
+    return await WebhookReceiver(queues, '127.0.0.1', 0, '/hook', secret).start()
+
+
+class TestReceiver:
+    """Тесты приемника обновлений."""
+
+    @pytest.mark.asyncio
+    async def test_updates_go_to_chat_queue(self):
+        """Тест: обновление разбирается и кладется в очередь своего обработчика."""
+        queues = [queue.Queue(), queue.Queue()]
+        receiver = await start_receiver(queues)
+        url = f'http://127.0.0.1:{receiver.port}/hook'
+        try:
+            for number, chat_id in enumerate([1, 2, 3]):
+                status, _ = await post_json(url, message_update(number, chat_id, '/start'))
+                assert status == 200
+        finally:
+            await receiver.close()
+
+        assert [update['message']['chat']['id'] for update in queues[1].queue] == [1, 3]
+        assert [update['message']['chat']['id'] for update in queues[0].queue] == [2]
+        assert receiver.received == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects(self):
+        """Тест: неверный секрет, не JSON и заполненная очередь."""
+        queues = [queue.Queue(maxsize=1)]
+        receiver = await start_receiver(queues, secret='s3cret')
+        url = f'http://127.0.0.1:{receiver.port}/hook'
+        good = {'X-Telegram-Bot-Api-Secret-Token': 's3cret'}
+        try:
+            assert (await post_json(url, message_update(1, 1, 'x')))[0] == 403
+            assert (await post_json(url, [1, 2], good))[0] == 400
+            assert (await post_json(url, message_update(1, 1, 'x'), good))[0] == 200
+            assert (await post_json(url, message_update(2, 1, 'x'), good))[0] == 503
+        finally:
+            await receiver.close()
+
+        assert receiver.rejected == 1
+        assert queues[0].qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_dead_worker(self):
+        """Тест: обновление для недоступного обработчика получает 503, а не теряется."""
+        queues = [queue.Queue(), queue.Queue()]
+        receiver = await WebhookReceiver(queues, '127.0.0.1', 0, '/hook',
+                                         worker_alive=lambda index: index == 0).start()
+        url = f'http://127.0.0.1:{receiver.port}/hook'
+        try:
+            assert (await post_json(url, message_update(1, 2, 'x')))[0] == 200
+            assert (await post_json(url, message_update(2, 1, 'x')))[0] == 503
+            async with httpx.AsyncClient() as client:
+                health = await client.get(f'http://127.0.0.1:{receiver.port}/health')
+        finally:
+            await receiver.close()
+
+        assert queues[1].empty()
+        assert health.status_code == 503
+        assert health.json()['alive'] == [True, False]
+
+
+class TestFakeTelegramApi:
+    """Тесты поддельного Bot API."""
+
+    @pytest.mark.asyncio
+    async def test_bot_calls(self):
+        """Тест: PTB работает с поддельным API, вызовы записываются."""
+        fake = await FakeTelegramApi().start()
+        try:
+            async with Bot(TOKEN, base_url=fake.base_url) as client:
+                message = await client.send_message(42, 'привет')
+                document = await client.send_document(42, io.BytesIO(b'a,b\n'), filename='data.csv')
+        finally:
+            await fake.close()
+
+        assert message.text == 'привет' and message.chat.id == 42
+        assert document.document.file_name == 'data.csv'
+        assert [method for method, _ in fake.calls] == ['getMe', 'sendMessage', 'sendDocument']
+        assert fake.calls_of('sendDocument')[0]['document'] == {'filename': 'data.csv', 'size': 4}
+
+    @pytest.mark.asyncio
+    async def test_injected_error(self):
+        """Тест: ошибка 429 возвращается клиенту один раз."""
+        fake = await FakeTelegramApi().start()
+        fake.inject_error('sendMessage', 429, 'Too Many Requests', retry_after=3)
+        try:
+            async with Bot(TOKEN, base_url=fake.base_url) as client:
+                with pytest.raises(RetryAfter):
+                    await client.send_message(1, 'x')
+                await client.send_message(1, 'x')
+        finally:
+            await fake.close()
+
+        assert len(fake.calls_of('sendMessage')) == 2
+
+
+class TestWorkers:
+    """Тесты обработки обновлений из очереди."""
+
+    @pytest.mark.asyncio
+    async def test_serve_updates(self):
+        """Тест: обработчики бота отвечают на обновления из очереди."""
+        fake = await FakeTelegramApi().start()
+        updates = queue.Queue()
+        updates.put(message_update(1, 501, '/start'))
+        updates.put(message_update(2, 502, '💳 Номер карты'))
+        updates.put(None)
+        application = bot.build_application(updater=False, token=TOKEN, base_url=fake.base_url)
+        try:
+            async with application:
+                await serve_updates(updates, application)
+            sent = await fake.wait_for('sendMessage', 2)
+        finally:
+            await fake.close()
+
+        assert {params['chat_id'] for params in sent} == {'501', '502'}
+
+    @pytest.mark.asyncio
+    async def test_cluster(self):
+        """Тест: приемник и процессы-обработчики вместе, обновления — через setWebhook."""
+        fake = await FakeTelegramApi().start()
+        cluster = WebhookCluster(workers=2, port=0, path='/hook', secret='s', token=TOKEN,
+                                 base_url=fake.base_url)
+        try:
+            await cluster.start()
+            async with Bot(TOKEN, base_url=fake.base_url) as client:
+                await client.set_webhook(f'http://127.0.0.1:{cluster.receiver.port}/hook', secret_token='s')
+            for number, chat_id in enumerate([11, 12, 13, 14]):
+                status, _ = await fake.deliver(message_update(number, chat_id, '/help'))
+                assert status == 200
+            sent = await fake.wait_for('sendMessage', 4, timeout=120)
+        finally:
+            await cluster.stop()
+            await fake.close()
+
+        assert {params['chat_id'] for params in sent} == {'11', '12', '13', '14'}
+        assert not any(process.is_alive() for process in cluster.processes)
+
+
+def sleeping_cluster(monkeypatch, **options):
+    """Кластер, в котором вместо обработчиков — процессы, ничего не читающие из очереди."""
+    cluster = WebhookCluster(port=0, **options)
+    monkeypatch.setattr(cluster, '_new_process', lambda index: cluster._context.Process(
+        target=time.sleep, args=(60,), daemon=True))
+    cluster.processes = [cluster._new_process(index) for index in range(cluster.workers)]
+    return cluster
+
+
+class TestClusterLifecycle:
+    """Тесты перезапуска и остановки обработчиков."""
+
+    @pytest.mark.asyncio
+    async def test_restart_dead_worker(self, monkeypatch):
+        """Тест: упавший обработчик перезапускается при проверке."""
+        cluster = await sleeping_cluster(monkeypatch, workers=1).start()
+        try:
+            dead = cluster.processes[0]
+            dead.kill()
+            dead.join()
+
+            assert cluster.ensure_worker(0)
+            assert cluster.processes[0] is not dead and cluster.processes[0].is_alive()
+            assert cluster.restarts == 1
+        finally:
+            await cluster.stop(timeout=0.5)
+
+        assert not cluster.ensure_worker(0)
+
+    @pytest.mark.asyncio
+    async def test_health_does_not_restart(self, monkeypatch):
+        """Тест: /health только сообщает об упавшем обработчике, перезапуск — при приеме обновления."""
+        cluster = await sleeping_cluster(monkeypatch, workers=1, path='/hook').start()
+        base = f'http://127.0.0.1:{cluster.receiver.port}'
+        try:
+            dead = cluster.processes[0]
+            dead.kill()
+            dead.join()
+            async with httpx.AsyncClient() as client:
+                health = await client.get(f'{base}/health')
+            assert health.status_code == 503
+            assert health.json()['alive'] == [False]
+            assert cluster.processes[0] is dead and cluster.restarts == 0
+
+            assert (await post_json(f'{base}/hook', message_update(1, 1, 'x')))[0] == 200
+            assert cluster.restarts == 1
+        finally:
+            await cluster.stop(timeout=0.5)
+
+    @pytest.mark.asyncio
+    async def test_stop_with_full_queue(self, monkeypatch):
+        """Тест: остановка при заполненной очереди не блокирует цикл событий и укладывается в срок."""
+        cluster = await sleeping_cluster(monkeypatch, workers=1, queue_size=1).start()
+        cluster.queues[0].put(message_update(1, 1, 'x'))
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        start = time.monotonic()
+        await cluster.stop(timeout=1)
+        ticker.cancel()
+
+        assert time.monotonic() - start < 10
+        assert ticks >= 5
+        assert not cluster.processes[0].is_alive()
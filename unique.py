@@ -0,0 +1,234 @@
+# unique.py
+"""Генерация уникальных значений без множества строк в памяти.
+
+Два механизма:
+
+* Биективный счетчик (FeistelPermutation). Значение с номером i строится из
+  perm(i), где perm — перестановка диапазона [0, size), заданная ключом.
+  Разные номера дают разные значения, поэтому уникальность гарантирована
+  без какой-либо памяти и без повторов. Так генерируются уникальные номера
+  карт и имена ящиков email (см. generators.generate_credit_cards и
+  generators.generate_temp_emails).
+
+* Компактное множество виденных значений (SeenSet) для значений, которые
+  нельзя пронумеровать (ФИО из Faker). Хранятся только 64-битные хеши в
+  открытой адресации NumPy: 8 байт на ячейку вместо ~100 байт на строку в set.
+  Совпадение хешей у разных строк лишь отбрасывает новую строку (лишний
+  повтор генерации), но никогда не пропускает дубликат.
+
+NumPy импортируется лениво.
+"""
+import hashlib
+import math
+
+# Раундов сети Фейстеля: 4 достаточно для псевдослучайной перестановки,
+# берем с запасом — стоимость раунда на порядок ниже сборки строк
+FEISTEL_ROUNDS = 6
+
+# Доля заполнения таблицы SeenSet по умолчанию: при линейном пробировании
+# среднее число проб при 0.8 — около 3 для новых значений
+DEFAULT_LOAD_FACTOR = 0.8
+
+# Во сколько раз больше значений, чем запрошено, разрешено сгенерировать в
+# unique_values, прежде чем считать пространство значений исчерпанным
+DEFAULT_MAX_ATTEMPTS_RATIO = 10
+
+class UniqueSpaceExhausted(RuntimeError):
+    """Уникальных значений больше нет (или их слишком дорого искать)."""
+
+
+def mix64(values):
+    """Перемешивание 64-битных чисел (финализатор SplitMix64) для массива uint64."""
+    import numpy as np
+    z = np.asarray(values, dtype=np.uint64)
+    # Умножение uint64 в NumPy идет по модулю 2**64 — это и нужно
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _round_keys(seed, rounds):
+    digest = hashlib.blake2b(f"feistel:{seed}".encode(), digest_size=8 * rounds).digest()
+    return [int.from_bytes(digest[i * 8:(i + 1) * 8], 'big') for i in range(rounds)]
+
+
+class FeistelPermutation:
+    """Псевдослучайная перестановка чисел [0, size), заданная ключом seed.
+
+    Сеть Фейстеля работает на 2k битах (2**2k >= size); значения вне
+    диапазона повторно шифруются (cycle walking), пока не попадут в него.
+    """
+
+    def __init__(self, size, seed=0, rounds=FEISTEL_ROUNDS):
+        if not 1 <= size <= 1 << 64:
+            raise ValueError("Размер диапазона должен быть от 1 до 2**64")
+        self.size = size
+        # Целочисленно: log2 во float у степеней двойки (2**52 + 1) округляется вниз,
+        # домен получается меньше size, и cycle walking не завершается
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.keys = _round_keys(seed, rounds)
+
+    def _encrypt(self, x):
+        import numpy as np
+        half = np.uint64(self.half_bits)
+        mask = np.uint64((1 << self.half_bits) - 1)
+        left = x >> half
+        right = x & mask
+        for key in self.keys:
+            left, right = right, left ^ (mix64(right ^ np.uint64(key)) & mask)
+        return (left << half) | right
+
+    def permute(self, indexes):
+        """perm(i) для массива номеров i (каждый в [0, size))."""
+        import numpy as np
+        indexes = np.asarray(indexes, dtype=np.uint64)
+        if indexes.size and int(indexes.max()) >= self.size:
+            raise UniqueSpaceExhausted(f"Номер вне диапазона перестановки (размер {self.size})")
+        result = self._encrypt(indexes)
+        if self.size == 1 << (2 * self.half_bits):
+            # Домен сети совпадает с диапазоном (в том числе 2**64, не помещающийся в uint64)
+            return result
+        size = np.uint64(self.size)
+        outside = np.flatnonzero(result >= size)
+        while outside.size:
+            result[outside] = self._encrypt(result[outside])
+            outside = outside[result[outside] >= size]
+        return result
+
+    def range(self, start, count):
+        """perm(i) для номеров start, start+1, ..., start+count-1."""
+        import numpy as np
+        if start < 0 or count < 0:
+            raise ValueError("Начало и количество не могут быть отрицательными")
+        if start + count > self.size:
+            raise UniqueSpaceExhausted(
+                f"Уникальных значений не хватает: запрошено до {start + count}, всего {self.size}"
+            )
+        return self.permute(np.arange(start, start + count, dtype=np.uint64))
+
+
+def hash_strings(values):
+    """64-битные хеши строк (blake2b) в массиве uint64; не зависят от процесса.
+
+    Одиночные суррогаты (строки фаззинга, см. fuzz.py) кодируются как есть.
+    """
+    import numpy as np
+    blake2b = hashlib.blake2b
+    return np.fromiter(
+        (int.from_bytes(blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).digest(),
+                        'little')
+         for value in values),
+        dtype=np.uint64, count=len(values)
+    )
+
+
+class SeenSet:
+    """Множество 64-битных хешей фиксированной емкости (открытая адресация).
+
+    Память — 8 байт на ячейку таблицы, выделяется сразу под capacity значений,
+    поэтому не растет во время генерации. Нулевой хеш зарезервирован под
+    пустую ячейку и заменяется единицей.
+    """
+
+    def __init__(self, capacity, load_factor=DEFAULT_LOAD_FACTOR):
+        import numpy as np
+        if capacity < 1:
+            raise ValueError("Емкость должна быть положительной")
+        if not 0.0 < load_factor <= 1.0:
+            raise ValueError("Доля заполнения должна быть в (0, 1]")
+        self.capacity = capacity
+        self.table = np.zeros(max(capacity + 1, math.ceil(capacity / load_factor)), dtype=np.uint64)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def add_hashes(self, hashes):
+        """Добавляет хеши; возвращает булев массив «значение новое».
+
+        Из одинаковых хешей внутри партии новым считается первый.
+        """
+        import numpy as np
+        hashes = np.array(hashes, dtype=np.uint64)
+        hashes[hashes == 0] = 1
+        table = self.table
+        size = np.uint64(len(table))
+        fresh = np.zeros(len(hashes), dtype=bool)
+        slots = hashes % size
+        pending = np.arange(len(hashes))
+
+        while pending.size:
+            current = table[slots[pending]]
+            empty = current == 0
+            occupied = ~empty & (current != hashes[pending])
+
+            # Свободную ячейку занимает первый из претендентов, остальные
+            # на следующем шаге увидят ее занятой (дубликатом или чужим хешем)
+            candidates = pending[empty]
+            if candidates.size:
+                _, first = np.unique(slots[candidates], return_index=True)
+                winners = candidates[first]
+                if self.count + len(winners) > self.capacity:
+                    raise UniqueSpaceExhausted(f"SeenSet заполнен ({self.capacity} значений)")
+                table[slots[winners]] = hashes[winners]
+                fresh[winners] = True
+                self.count += len(winners)
+                losers = np.setdiff1d(candidates, winners, assume_unique=True)
+            else:
+                losers = candidates
+
+            moved = pending[occupied]
+            slots[moved] = (slots[moved] + np.uint64(1)) % size
+            pending = np.sort(np.concatenate((moved, losers)))
+        return fresh
+
+    def add_many(self, values):
+        """Добавляет строки; возвращает булев массив «значение новое»."""
+        return self.add_hashes(hash_strings(values))
+
+    def add(self, value):
+        """Добавляет строку; True, если ее еще не было."""
+        return bool(self.add_many([value])[0])
+
+    def __contains__(self, value):
+        import numpy as np
+        h = int(hash_strings([value])[0]) or 1
+        table = self.table
+        slot = h % len(table)
+        while table[slot] != 0:
+            if table[slot] == np.uint64(h):
+                return True
+            slot = (slot + 1) % len(table)
+        return False
+
+
+def unique_values(generate, n, key=None, seen=None, max_attempts_ratio=DEFAULT_MAX_ATTEMPTS_RATIO):
+    """n значений без повторов из генератора партий generate(k) -> список.
+
+    key(value) -> строка, по которой проверяется уникальность (по умолчанию
+    само значение). seen — общий SeenSet, если уникальность нужна между
+    вызовами. Всего генерируется не больше n * max_attempts_ratio значений,
+    иначе выбрасывается UniqueSpaceExhausted: стоимость повторов ограничена
+    заранее, даже если пространство значений почти исчерпано.
+    """
+    if seen is None:
+        seen = SeenSet(max(n, 1))
+    budget = n * max_attempts_ratio
+    attempts = 0
+    result = []
+    while len(result) < n:
+        need = n - len(result)
+        if attempts + need > budget:
+            raise UniqueSpaceExhausted(
+                f"Найдено {len(result)} уникальных значений из {n} за {attempts} попыток"
+            )
+        batch = generate(need)
+        attempts += len(batch)
+        keys = batch if key is None else [key(value) for value in batch]
+        fresh = seen.add_many(keys)
+        result.extend(value for value, is_new in zip(batch, fresh.tolist()) if is_new)
+    return result
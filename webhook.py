@@ -0,0 +1,504 @@
+# webhook.py
+"""Режим webhook: прием обновлений отделен от их обработки.
+
+Telegram присылает обновления POST-запросами на WEBHOOK_URL. Приемник
+(WebhookReceiver) — легкий HTTP-сервер на asyncio (api.HttpServer): он
+проверяет секрет, разбирает JSON, кладет обновление в очередь одного из
+процессов-обработчиков и сразу отвечает 200. Обработчики — отдельные процессы
+с теми же обработчиками бота (bot.build_application), поэтому генерация
+занимает все ядра, а медленный /bulk не задерживает прием.
+
+Очередь выбирается по чату (chat_id % workers): обновления одного чата
+обрабатываются по порядку одним процессом, и лимиты чата из ratelimit.py
+продолжают работать. Общие лимиты бота (RATE_GLOBAL_*, SEND_GLOBAL_*)
+делятся между процессами поровну. Если очередь обработчика заполнена,
+приемник отвечает 503 — Telegram повторит доставку позже. Упавший обработчик
+перезапускается при следующем обновлении для его чатов. На нескольких
+хостах приемники с обработчиками ставятся за балансировщик: Telegram знает
+только один URL.
+
+Для проверки без Telegram есть FakeTelegramApi — HTTP-сервер, который
+отвечает на методы Bot API, запоминает вызовы и умеет доставлять обновления
+на зарегистрированный webhook.
+
+Запуск:
+    python -m webhook                       # параметры из config.py
+    python -m webhook --fake --workers 4    # локально, с FakeTelegramApi
+    curl -X POST 'http://127.0.0.1:<порт API>/fake/send?chat_id=1&text=/start'
+"""
+import argparse
+import asyncio
+import email.parser
+import hmac
+import itertools
+import json
+import logging
+import multiprocessing
+import time
+from queue import Full
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import config
+from api import HTTPError, HttpServer, json_response
+
+logger = logging.getLogger(__name__)
+
+# Сколько ждать завершения обработчиков при остановке, с
+WORKER_STOP_TIMEOUT = 10.0
+
+SECRET_HEADER = 'x-telegram-bot-api-secret-token'
+
+
+def update_chat_id(update):
+    """Чат обновления (или отправитель, если чата нет) — ключ выбора обработчика."""
+    for value in update.values():
+        if not isinstance(value, dict):
+            continue
+        chat = value.get('chat') or (value.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+        sender = value.get('from')
+        if sender:
+            return sender['id']
+    return update['update_id']
+
+
+def route_update(update, workers):
+    """Номер обработчика для обновления: все обновления чата — одному процессу."""
+    return update_chat_id(update) % workers
+
+
+class WebhookReceiver(HttpServer):
+    """Приемник обновлений: проверка, разбор и раскладка по очередям обработчиков.
+
+    queues — очереди обработчиков (multiprocessing.Queue или queue.Queue);
+    обновление кладется без ожидания, при заполненной очереди — ответ 503.
+    ensure_worker(index) проверяет (и при необходимости перезапускает)
+    обработчик очереди index перед раскладкой; если он недоступен, ответ тоже
+    503, чтобы обновление не пропало в очереди, которую никто не разбирает.
+    worker_alive(index) только сообщает, жив ли обработчик: /health его
+    вызывает и ничего не перезапускает.
+    """
+
+    METHODS = ('GET', 'POST')
+    title = "Приемник webhook"
+
+    def __init__(self, queues, host=None, port=None, path=None, secret=None, keepalive_timeout=None,
+                 worker_alive=None, ensure_worker=None):
+        super().__init__(host or config.WEBHOOK_HOST, config.WEBHOOK_PORT if port is None else port,
+                         keepalive_timeout)
+        self.queues = queues
+        self.path = path or config.WEBHOOK_PATH
+        self.secret = secret
+        self.worker_alive = worker_alive
+        self.ensure_worker = ensure_worker or worker_alive
+        self.received = 0
+        self.rejected = 0
+        self.routes = {self.path: self.receive, '/health': self.health}
+
+    async def receive(self, request):
+        if request.method != 'POST':
+            raise HTTPError(405, "Обновления принимаются только POST", {'Allow': 'POST'})
+        if self.secret is not None and not hmac.compare_digest(
+            request.headers.get(SECRET_HEADER, '').encode('utf-8'), self.secret.encode('utf-8')
+        ):
+            raise HTTPError(403, "Неверный секрет webhook")
+        try:
+            update = json.loads(request.body)
+        except ValueError:
+            raise HTTPError(400, "Тело запроса — не JSON")
+        if not isinstance(update, dict) or not isinstance(update.get('update_id'), int):
+            raise HTTPError(400, "Обновление должно быть объектом с update_id")
+        index = route_update(update, len(self.queues))
+        if self.ensure_worker is not None and not self.ensure_worker(index):
+            self.rejected += 1
+            raise HTTPError(503, "Обработчик недоступен", {'Retry-After': '1'})
+        try:
+            self.queues[index].put_nowait(update)
+        except Full:
+            self.rejected += 1
+            raise HTTPError(503, "Обработчики перегружены", {'Retry-After': '1'})
+        self.received += 1
+        return json_response({'ok': True})
+
+    async def health(self, request):
+        alive = [self.worker_alive is None or self.worker_alive(index) for index in range(len(self.queues))]
+        return json_response({
+            'status': 'ok' if all(alive) else 'degraded',
+            'received': self.received,
+            'rejected': self.rejected,
+            'queued': [queue.qsize() for queue in self.queues],
+            'alive': alive,
+        }, 200 if all(alive) else 503)
+
+
+# --- Обработчики ------------------------------------------------------------
+
+def share_global_limits(bot_module, parts):
+    """Делит общие лимиты бота между parts процессами (лимиты чатов не меняются)."""
+    from ratelimit import TokenBucket
+    for bucket_owner, rate, burst in (
+        (bot_module.request_limiter, config.RATE_GLOBAL_PER_SECOND, config.RATE_GLOBAL_BURST),
+        (bot_module.send_queue, config.SEND_GLOBAL_PER_SECOND, config.SEND_GLOBAL_BURST),
+    ):
+        bucket_owner.global_bucket = TokenBucket(rate / parts, max(1, burst // parts))
+
+
+async def serve_updates(queue, application):
+    """Передает обновления из очереди в application до значения None.
+
+    Обработка идет как при long polling: application.start() разбирает
+    update_queue с concurrent_updates. Ожидание очереди — в потоке, чтобы не
+    блокировать цикл событий.
+    """
+    from telegram import Update
+    loop = asyncio.get_running_loop()
+    await application.start()
+    try:
+        while True:
+            data = await loop.run_in_executor(None, queue.get)
+            if data is None:
+                break
+            await application.update_queue.put(Update.de_json(data, application.bot))
+    finally:
+        await application.stop()
+
+
+def worker_main(index, queue, workers, token=None, base_url=None):
+    """Процесс-обработчик: те же обработчики, что у бота в режиме long polling."""
+    import bot
+    logger.info("Обработчик %d запущен", index)
+    share_global_limits(bot, workers)
+    application = bot.build_application(updater=False, token=token, base_url=base_url)
+    bot.prepare_generation()
+    bot.record_pools.start()
+
+    async def run():
+        async with application:
+            await bot.warm_inline_cache(application)
+            await serve_updates(queue, application)
+
+    try:
+        asyncio.run(run())
+    finally:
+        bot.record_pools.stop(timeout=1)
+        bot.dispatcher.shutdown(wait=False)
+
+
+class WebhookCluster:
+    """Приемник и процессы-обработчики: запускаются и останавливаются вместе.
+
+    Процессы создаются методом spawn: обработчик не наследует ни потоки, ни
+    цикл событий приемника и поэтому одинаково запускается из бота и из тестов.
+    Упавший обработчик перезапускается с той же очередью: обновления, которые
+    он не успел взять, обработает новый процесс.
+    """
+
+    def __init__(self, workers=None, queue_size=None, host=None, port=None, path=None,
+                 secret=None, token=None, base_url=None):
+        self.workers = workers or config.WEBHOOK_WORKERS
+        self.queue_size = queue_size or config.WEBHOOK_QUEUE_SIZE
+        self.token = token
+        self.base_url = base_url
+        self.restarts = 0
+        self.stopping = False
+        self._context = multiprocessing.get_context('spawn')
+        self.queues = [self._context.Queue(self.queue_size) for _ in range(self.workers)]
+        self.processes = [self._new_process(index) for index in range(self.workers)]
+        self.receiver = WebhookReceiver(self.queues, host, port, path, secret,
+                                        worker_alive=self.worker_alive, ensure_worker=self.ensure_worker)
+
+    def _new_process(self, index):
+        return self._context.Process(
+            target=worker_main, args=(index, self.queues[index], self.workers, self.token, self.base_url),
+            name=f'webhook-worker-{index}', daemon=True
+        )
+
+    def worker_alive(self, index):
+        """Жив ли обработчик index (без перезапуска)."""
+        return self.processes[index].is_alive()
+
+    def ensure_worker(self, index):
+        """Жив ли обработчик index; упавший перезапускается (кроме остановки)."""
+        process = self.processes[index]
+        if process.is_alive():
+            return True
+        if self.stopping:
+            return False
+        logger.warning("Обработчик %s завершился (код %s), перезапускаю", process.name, process.exitcode)
+        process = self.processes[index] = self._new_process(index)
+        process.start()
+        self.restarts += 1
+        return True
+
+    async def start(self):
+        for process in self.processes:
+            process.start()
+        await self.receiver.start()
+        return self
+
+    async def stop(self, timeout=WORKER_STOP_TIMEOUT):
+        """Закрывает прием, дает обработчикам разобрать очереди и ждет их.
+
+        Ожидание — в потоках и не дольше timeout: при заполненной очереди или
+        зависшем обработчике процесс по истечении срока останавливается.
+        """
+        self.stopping = True
+        await self.receiver.close()
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout
+        await asyncio.gather(*(
+            loop.run_in_executor(None, _finish_worker, process, queue, deadline)
+            for process, queue in zip(self.processes, self.queues)
+        ))
+        for process in self.processes:
+            if process.is_alive():
+                logger.warning("Обработчик %s не завершился, останавливаю", process.name)
+                process.terminate()
+                process.join()
+
+
+def _finish_worker(process, queue, deadline):
+    """Посылает обработчику метку конца очереди и ждет его не дольше deadline."""
+    if not process.is_alive():
+        return
+    try:
+        queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+    except Full:
+        return
+    process.join(max(0.0, deadline - time.monotonic()))
+
+
+# --- Поддельный Bot API ------------------------------------------------------
+
+def _message_entities(text):
+    if not text.startswith('/'):
+        return []
+    return [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+
+
+def message_update(update_id, chat_id, text, user_id=None):
+    """Обновление с текстовым сообщением в личном чате (команды размечаются)."""
+    user_id = chat_id if user_id is None else user_id
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private', 'first_name': 'Tester'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'Tester'},
+            'text': text,
+            'entities': _message_entities(text),
+        },
+    }
+
+
+async def post_json(url, data, headers=None):
+    """POST JSON на url (http://); возвращает (статус, тело ответа)."""
+    parts = urlsplit(url)
+    body = json.dumps(data).encode('utf-8')
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        head = (f"POST {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n")
+        head += ''.join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        writer.write((head + "\r\n").encode('latin-1') + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(status_line.split()[1]), response.partition(b'\r\n\r\n')[2]
+
+
+def _form_params(request):
+    """Параметры вызова Bot API: строка запроса, JSON, форма или multipart.
+
+    Значения — в том виде, в каком их передал клиент (PTB кодирует
+    нестроковые значения в JSON); у файлов — имя и размер.
+    """
+    params = dict(request.query)
+    content_type = request.headers.get('content-type', '')
+    if not request.body:
+        return params
+    if content_type.startswith('application/json'):
+        params.update(json.loads(request.body))
+    elif content_type.startswith('multipart/form-data'):
+        message = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + request.body
+        )
+        for part in message.get_payload():
+            name = part.get_param('name', header='content-disposition')
+            payload = part.get_payload(decode=True)
+            filename = part.get_filename()
+            if filename is None:
+                params[name] = payload.decode('utf-8')
+            else:
+                params[name] = {'filename': filename, 'size': len(payload)}
+    else:
+        params.update((key, values[-1]) for key, values in parse_qs(request.body.decode('utf-8')).items())
+    return params
+
+
+class FakeTelegramApi(HttpServer):
+    """Поддельный Bot API для локальной проверки: отвечает на вызовы и запоминает их.
+
+    URL для бота — base_url (передается в bot.build_application или
+    TELEGRAM_API_URL). Вызовы — в calls как (метод, параметры). После
+    setWebhook сервер может доставлять обновления на webhook (deliver,
+    POST /fake/send?chat_id=..&text=..); GET /fake/calls — вызовы в JSON.
+    """
+
+    METHODS = ('GET', 'POST')
+    title = "Поддельный Bot API"
+
+    def __init__(self, host='127.0.0.1', port=0, keepalive_timeout=None):
+        super().__init__(host, port, keepalive_timeout)
+        self.calls = []
+        self.webhook = None
+        self.errors = {}
+        self._message_ids = itertools.count(1)
+        self._update_ids = itertools.count(1)
+        self._called = asyncio.Condition()
+        self.routes = {'/fake/send': self.fake_send, '/fake/calls': self.fake_calls}
+
+    @property
+    def base_url(self):
+        return f'http://{self.host}:{self.port}/bot'
+
+    def inject_error(self, method, error_code, description, retry_after=None):
+        """Следующий вызов method завершится ошибкой (например, 429 с retry_after)."""
+        error = {'ok': False, 'error_code': error_code, 'description': description}
+        if retry_after is not None:
+            error['parameters'] = {'retry_after': retry_after}
+        self.errors[method] = error
+
+    def calls_of(self, method):
+        return [params for name, params in self.calls if name == method]
+
+    async def wait_for(self, method, count=1, timeout=10.0):
+        """Ждет, пока method будет вызван count раз; возвращает параметры вызовов."""
+        async with self._called:
+            await asyncio.wait_for(
+                self._called.wait_for(lambda: len(self.calls_of(method)) >= count), timeout
+            )
+        return self.calls_of(method)
+
+    async def deliver(self, update):
+        """Отправляет обновление на зарегистрированный webhook, как Telegram."""
+        if self.webhook is None:
+            raise RuntimeError("Webhook не зарегистрирован (setWebhook не вызывался)")
+        url, secret = self.webhook
+        headers = {'X-Telegram-Bot-Api-Secret-Token': secret} if secret else None
+        return await post_json(url, update, headers)
+
+    async def dispatch(self, request):
+        if not request.path.startswith('/bot'):
+            return await super().dispatch(request)
+        method = unquote(request.path).rpartition('/')[2]
+        params = _form_params(request)
+        async with self._called:
+            self.calls.append((method, params))
+            self._called.notify_all()
+        error = self.errors.pop(method, None)
+        if error is not None:
+            return json_response(error, error['error_code'])
+        return json_response({'ok': True, 'result': self.result(method, params)})
+
+    def result(self, method, params):
+        """Ответ метода Bot API: объект Message для отправки, True для остального."""
+        if method == 'getMe':
+            return {'id': 1, 'is_bot': True, 'first_name': 'Fake', 'username': 'fake_bot',
+                    'can_join_groups': True, 'can_read_all_group_messages': False,
+                    'supports_inline_queries': True}
+        if method == 'setWebhook':
+            self.webhook = (params['url'], params.get('secret_token'))
+            return True
+        if method == 'deleteWebhook':
+            self.webhook = None
+            return True
+        if method.startswith(('send', 'edit')) and 'chat_id' in params:
+            message = {
+                'message_id': int(params.get('message_id') or next(self._message_ids)),
+                'date': int(time.time()),
+                'chat': {'id': int(params['chat_id']), 'type': 'private'},
+            }
+            if 'text' in params:
+                message['text'] = params['text']
+            if isinstance(params.get('document'), dict):
+                message['document'] = {'file_id': f'file{message["message_id"]}',
+                                       'file_unique_id': f'u{message["message_id"]}',
+                                       'file_name': params['document']['filename']}
+            return message
+        return True
+
+    async def fake_send(self, request):
+        if request.method != 'POST':
+            raise HTTPError(405, "Используйте POST", {'Allow': 'POST'})
+        try:
+            chat_id = int(request.query['chat_id'])
+        except (KeyError, ValueError):
+            raise HTTPError(400, "Нужен целочисленный параметр chat_id")
+        update = message_update(next(self._update_ids), chat_id, request.query.get('text', '/start'))
+        status, _ = await self.deliver(update)
+        return json_response({'update_id': update['update_id'], 'webhook_status': status})
+
+    async def fake_calls(self, request):
+        return json_response([{'method': method, 'params': params} for method, params in self.calls])
+
+
+# --- Запуск -------------------------------------------------------------------
+
+async def register_webhook(url, secret=None, token=None, base_url=None):
+    """Сообщает Bot API адрес приемника (setWebhook)."""
+    from telegram import Bot, Update
+    async with Bot(token or config.BOT_TOKEN, base_url=base_url or config.TELEGRAM_API_URL) as bot:
+        await bot.set_webhook(url=url, secret_token=secret, allowed_updates=Update.ALL_TYPES)
+
+
+async def serve(workers=None, port=None, fake=False):
+    fake_api = None
+    base_url = None
+    url = config.WEBHOOK_URL
+    if fake:
+        fake_api = await FakeTelegramApi().start()
+        base_url = fake_api.base_url
+        logger.info("Поддельный Bot API: http://%s:%d", fake_api.host, fake_api.port)
+    cluster = WebhookCluster(workers, port=port, secret=config.WEBHOOK_SECRET, base_url=base_url)
+    await cluster.start()
+    if fake:
+        url = f'http://127.0.0.1:{cluster.receiver.port}{cluster.receiver.path}'
+    if not url:
+        raise RuntimeError("Не задан WEBHOOK_URL в config.py")
+    await register_webhook(url, config.WEBHOOK_SECRET, base_url=base_url)
+    logger.info("%s: http://%s:%d%s, обработчиков: %d", cluster.receiver.title, cluster.receiver.host,
+                cluster.receiver.port, cluster.receiver.path, cluster.workers)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cluster.stop()
+        if fake_api is not None:
+            await fake_api.close()
+
+
+def run_webhook(workers=None, port=None, fake=False):
+    """Запуск в режиме webhook до Ctrl+C."""
+    try:
+        asyncio.run(serve(workers, port, fake))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бот в режиме webhook с процессами-обработчиками")
+    parser.add_argument('--workers', type=int, default=config.WEBHOOK_WORKERS, help="процессов-обработчиков")
+    parser.add_argument('--port', type=int, default=config.WEBHOOK_PORT, help="порт приемника")
+    parser.add_argument('--fake', action='store_true', help="поддельный Bot API вместо Telegram")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    run_webhook(args.workers, args.port, args.fake)
+
+
+if __name__ == '__main__':
+    main()